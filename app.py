@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
@@ -8,6 +10,7 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+from .config.container import container
 from .routers import slack_router
 
 
@@ -15,7 +18,32 @@ from .routers import slack_router
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warms up the Slack stack in the background and closes its services on shutdown.
+
+    Uvicorn binds as soon as this yields; requests arriving before the warm-up
+    finishes build whatever they need on demand.
+
+    Args:
+        app (FastAPI): The application instance.
+    """
+    warm_up = asyncio.create_task(slack_router.on_startup())
+    warm_up.add_done_callback(_log_warm_up_failure)
+    yield
+    warm_up.cancel()
+    await slack_router.on_shutdown()
+    await container.shutdown()
+
+
+def _log_warm_up_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception():
+        logger.error("Service warm-up failed.", exc_info=task.exception())
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(slack_router.router)
 
@@ -0,0 +1,129 @@
+"""
+Compares per-call requests.get against the pooled per-tenant session used by
+Auth0Service, using a local stub of the Management API.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.auth0_connection_pool_benchmark [--requests N] [--tls]
+"""
+import argparse
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from ..services.http_session_pool import close_sessions, get_session
+
+STUB_BODY = json.dumps({"enabled_locales": ["en"], "friendly_name": "stub"}).encode()
+
+
+class StubManagementApiHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small tenant settings document over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(tls: bool):
+    """
+    Start the stub server on an ephemeral port.
+
+    Args:
+        tls (bool): Whether to serve over TLS with a throwaway self-signed certificate.
+
+    Returns:
+        tuple: The server and its base URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubManagementApiHandler)
+    scheme = "http"
+    if tls:
+        cert_dir = tempfile.mkdtemp()
+        cert_file = os.path.join(cert_dir, "cert.pem")
+        key_file = os.path.join(cert_dir, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key_file, "-out", cert_file, "-days", "1",
+                "-subj", "/CN=127.0.0.1",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file, key_file)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+
+
+def measure(call, n: int) -> list:
+    """
+    Time n sequential calls.
+
+    Args:
+        call (callable): The call to time.
+        n (int): The number of calls.
+
+    Returns:
+        list: Latencies in milliseconds.
+    """
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<24} p50={quantiles[49]:7.3f}ms  p99={quantiles[98]:7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--tls", action="store_true", help="serve the stub over TLS")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+    server, base_url = start_stub_server(args.tls)
+    url = f"{base_url}/api/v2/tenants/settings"
+    session = get_session(base_url)
+
+    try:
+        # Warm up both paths so the comparison excludes first-call overhead
+        requests.get(url, verify=False).json()
+        session.get(url, verify=False).json()
+
+        unpooled = measure(lambda: requests.get(url, verify=False).json(), args.requests)
+        pooled = measure(lambda: session.get(url, verify=False).json(), args.requests)
+    finally:
+        close_sessions()
+        server.shutdown()
+
+    print(f"{args.requests} sequential GETs against {base_url}")
+    report("requests.get (new conn)", unpooled)
+    report("pooled session", pooled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Profiles the cold import of the FastAPI app with ``python -X importtime`` and
+prints where the time goes: the slowest modules overall, the package's own
+modules, and a breakdown by top-level distribution.
+
+Each run happens in a fresh interpreter with placeholder Slack and MongoDB
+settings, so it also checks that importing the app needs no network access.
+Heavy services (MongoDB clients, the Slack App, Dialogflow) must stay unbuilt
+until the lifespan warm-up or the first request.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.import_time_benchmark [--runs N] [--top N]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from ..utils.constants import MONGODB_URI_ENV_VAR
+
+PACKAGE_NAME = __package__.split(".")[0]
+PACKAGE_PARENT = Path(__file__).resolve().parents[2]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Run in the child interpreter after the import
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import {PACKAGE_NAME}.app
+elapsed = time.perf_counter() - start
+from {PACKAGE_NAME}.config.container import container
+built = [name for name in container._factories if container.is_initialized(name)]
+print(f"{{elapsed:.6f}}|{{int('google.cloud.dialogflow_v2' in sys.modules)}}|{{','.join(built)}}")
+"""
+
+
+def profile_import() -> tuple:
+    """
+    Import the app in a fresh interpreter.
+
+    Returns:
+        tuple: Wall time in seconds, whether Dialogflow was imported, the services
+        built during import and the parsed importtime rows.
+    """
+    env = dict(
+        os.environ,
+        SLACK_SIGNING_SECRET="benchmark-signing-secret",
+        SLACK_TOKEN="xoxb-benchmark",
+        **{MONGODB_URI_ENV_VAR: "mongodb://127.0.0.1:1"},
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PACKAGE_PARENT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, dialogflow_loaded, built = result.stdout.strip().splitlines()[-1].split("|")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return float(elapsed), dialogflow_loaded == "1", [b for b in built.split(",") if b], rows
+
+
+def report(rows: list, top: int) -> None:
+    print(f"\nSlowest imports by cumulative time (top {top}):")
+    for module, _, cumulative_us, _ in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {module}")
+
+    print(f"\n{PACKAGE_NAME} modules by self time (top {top}):")
+    own = [r for r in rows if r[0] == PACKAGE_NAME or r[0].startswith(PACKAGE_NAME + ".")]
+    for module, self_us, _, _ in sorted(own, key=lambda r: -r[1])[:top]:
+        print(f"  {self_us / 1000:9.1f} ms  {module}")
+
+    by_distribution = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_distribution[module.split(".")[0]] += self_us
+    print(f"\nSelf time by top-level package (top {top}):")
+    for name, self_us in sorted(by_distribution.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        elapsed, dialogflow_loaded, built, rows = profile_import()
+        timings.append(elapsed)
+
+    print(f"import {PACKAGE_NAME}.app over {args.runs} fresh interpreters:")
+    print(f"  median {statistics.median(timings) * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms")
+    print(f"  Dialogflow SDK imported: {'yes' if dialogflow_loaded else 'no'}")
+    print(f"  services built during import: {', '.join(built) or 'none'}")
+    report(rows, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Seeds synthetic M2M credential documents and compares get_credentials-style
+lookups with and without the unique slack_user_id index.
+
+Uses the mongod at MONGODB_URI when set (a throwaway database is created and
+dropped), otherwise falls back to mongomock. mongomock always scans, so only a
+real mongod shows the index speed-up.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.m2m_credentials_index_benchmark [--documents N] [--lookups N]
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+from pymongo import ASCENDING
+
+from ..utils.constants import (
+    M2M_CREDENTIALS_PROJECTION,
+    MONGODB_URI_ENV_VAR,
+    SLACK_USER_ID_INDEX_NAME,
+)
+
+BENCHMARK_DB_NAME = "auth0-querybot-benchmark"
+BATCH_SIZE = 10_000
+
+
+def get_collection():
+    """
+    Get an empty collection on the local mongod, or on mongomock if none is configured.
+
+    Returns:
+        tuple: The collection, a cleanup callable and the backend name.
+    """
+    mongo_uri = os.getenv(MONGODB_URI_ENV_VAR)
+    if mongo_uri:
+        from pymongo import MongoClient
+
+        client = MongoClient(mongo_uri)
+        backend = "mongod"
+    else:
+        import mongomock
+
+        client = mongomock.MongoClient()
+        backend = "mongomock"
+    client.drop_database(BENCHMARK_DB_NAME)
+    collection = client[BENCHMARK_DB_NAME]["m2m-credentials"]
+    return collection, lambda: client.drop_database(BENCHMARK_DB_NAME), backend
+
+
+def seed(collection, documents: int) -> None:
+    for start in range(0, documents, BATCH_SIZE):
+        collection.insert_many(
+            [
+                {
+                    "slack_user_id": f"U{i:010d}",
+                    "auth0_base_url": f"tenant-{i % 500}.auth0.com",
+                    "auth0_client_id": f"client-{i}",
+                    "auth0_client_secret": "s" * 64,
+                    "access_token": "t" * 900,
+                    "token_expires_at": "2030-01-01T00:00:00",
+                }
+                for i in range(start, min(start + BATCH_SIZE, documents))
+            ]
+        )
+
+
+def measure(collection, user_ids: list) -> list:
+    latencies = []
+    for slack_user_id in user_ids:
+        start = time.perf_counter()
+        collection.find_one({"slack_user_id": slack_user_id}, M2M_CREDENTIALS_PROJECTION)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{name:<16} p50={quantiles[49]:9.3f}ms  p99={quantiles[98]:9.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    collection, cleanup, backend = get_collection()
+    try:
+        start = time.perf_counter()
+        seed(collection, args.documents)
+        print(
+            f"Seeded {args.documents} documents into {backend} "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+        user_ids = [
+            f"U{random.randrange(args.documents):010d}" for _ in range(args.lookups)
+        ]
+        without_index = measure(collection, user_ids)
+
+        collection.create_index(
+            [("slack_user_id", ASCENDING)], unique=True, name=SLACK_USER_ID_INDEX_NAME
+        )
+        with_index = measure(collection, user_ids)
+    finally:
+        cleanup()
+
+    print(f"{args.lookups} lookups by slack_user_id")
+    report("without index", without_index)
+    report("with index", with_index)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Times the daily stats analytics stage over ranges of increasing length: loading the
+``stats/daily`` records into columns, the per-metric summary, and building the
+per-day CSV rows.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.stats_analytics_benchmark [--repeat N]
+"""
+import argparse
+import statistics
+import timeit
+from datetime import date, timedelta
+
+from ..services.stats_analytics import daily_rows, load_daily_stats, summarize
+
+
+def build_records(days: int) -> list:
+    """
+    Build daily stats records with a weekly pattern and occasional spikes.
+
+    Args:
+        days (int): Number of consecutive days.
+
+    Returns:
+        list: The records, shaped like the ``stats/daily`` response.
+    """
+    start = date(2015, 1, 1)
+    return [
+        {
+            "date": f"{start + timedelta(days=day)}T00:00:00.000Z",
+            "logins": 1000 + 200 * (day % 7) + (5000 if day % 90 == 0 else 0),
+            "signups": 50 + day % 11,
+            "leaked_passwords": day % 3,
+            "updated_at": f"{start + timedelta(days=day + 1)}T00:00:00.000Z",
+            "created_at": f"{start + timedelta(days=day)}T00:00:00.000Z",
+        }
+        for day in range(days)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    stages = {
+        "load": lambda records, stats: load_daily_stats(records),
+        "summarize": lambda records, stats: summarize(stats),
+        "daily rows": lambda records, stats: list(daily_rows(stats)),
+    }
+
+    print(f"{'days':>6} {'stage':<12} {'min ms':>9} {'median ms':>10}")
+    for days in (30, 365, 3650):
+        records = build_records(days)
+        stats = load_daily_stats(records)
+        for name, stage in stages.items():
+            timings = timeit.repeat(lambda: stage(records, stats), number=1, repeat=args.repeat)
+            print(
+                f"{days:>6} {name:<12} {min(timings) * 1000:>9.2f} "
+                f"{statistics.median(timings) * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compares StringUtils.remove_format against the original multi-pass
+implementation on long pasted messages with many code spans.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.string_utils_benchmark [--spans N] [--repeat N]
+"""
+import argparse
+import re
+import timeit
+
+from ..utils.string_utils import StringUtils
+
+
+def legacy_remove_format(text):
+    """The original implementation, kept verbatim for comparison."""
+    code_block_pattern = re.compile(r'```(.*?)```', re.DOTALL)
+    code_blocks = []
+    def code_block_replacer(match):
+        code_blocks.append(match.group(0))
+        return f"CODEBLOCK_{len(code_blocks)-1}"
+    text = code_block_pattern.sub(code_block_replacer, text)
+
+    inline_code_pattern = re.compile(r'`([^`]+)`')
+    inline_codes = []
+    def inline_code_replacer(match):
+        inline_codes.append(match.group(0))
+        return f"INLINECODE_{len(inline_codes)-1}"
+    text = inline_code_pattern.sub(inline_code_replacer, text)
+
+    text = re.sub(r'_(.*?)_', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+    text = re.sub(r'~(.*?)~', r'\1', text)
+
+    text = re.sub(r'<[^|>]+\|([^>]+)>', r'\1', text)
+    text = re.sub(r'<([^|>]+)>', r'\1', text)
+
+    for i, code in enumerate(inline_codes):
+        placeholder = f"INLINECODE_{i}"
+        text = text.replace(placeholder, code)
+
+    for i, code in enumerate(code_blocks):
+        placeholder = f"CODEBLOCK_{i}"
+        text = text.replace(placeholder, code)
+
+    return text
+
+
+def build_message(spans: int) -> str:
+    """
+    Build a pasted incident log with inline IDs, code blocks, links and emphasis.
+
+    Args:
+        spans (int): Number of inline code spans.
+
+    Returns:
+        str: The message text.
+    """
+    lines = []
+    for i in range(spans):
+        lines.append(f"*user* `auth0|{i:024x}` failed login, see <https://example.com/logs/{i}|logs>")
+        if i % 10 == 0:
+            lines.append(f"```\n{{\"user_id\": \"auth0|{i}\", \"status\": 401}}\n```")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'spans':>6} {'chars':>8} {'legacy ms':>10} {'single-pass ms':>15}")
+    for spans in (10, 100, 500, 1000):
+        message = build_message(spans)
+        legacy = min(timeit.repeat(lambda: legacy_remove_format(message), number=1, repeat=args.repeat))
+        current = min(timeit.repeat(lambda: StringUtils.remove_format(message), number=1, repeat=args.repeat))
+        print(f"{spans:>6} {len(message):>8} {legacy * 1000:>10.3f} {current * 1000:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
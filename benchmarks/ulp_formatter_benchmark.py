@@ -0,0 +1,102 @@
+"""
+Compares the Universal Login template formatter backends on latency and peak
+memory, over templates of increasing size with inline CSS, Liquid tags and scripts.
+When lxml is importable its HTML serializer is timed too, for reference only: it
+moves {%- auth0:head -%} into <body> and drops <body> attributes, so it is not a
+usable backend.
+
+Run from the directory containing the package:
+    python -m <package>.benchmarks.ulp_formatter_benchmark [--repeat N]
+"""
+import argparse
+import statistics
+import timeit
+import tracemalloc
+
+from ..services.template_formatters import TEMPLATE_FORMATTERS, _cssutils
+
+
+def build_template(sections: int) -> str:
+    """
+    Build a Universal Login template with a custom stylesheet and page content.
+
+    Args:
+        sections (int): Number of styled content sections.
+
+    Returns:
+        str: The template HTML.
+    """
+    css = "".join(
+        f".section-{i}{{margin:0 auto;padding:{i % 8}px 16px;color:#{i % 4096:03x};"
+        f"background:url(data:image/png;base64,iVBORw0KGgo{i}=) no-repeat}}"
+        f"@media (max-width:{480 + i % 4 * 120}px){{.section-{i} h2{{font-size:1.{i % 9}rem}}}}"
+        for i in range(sections)
+    )
+    body = "".join(
+        f'<div class="section-{i}" data-index="{i}"><h2>{{{{ prompt.title }}}} {i}</h2>'
+        f'<p>Read the <a href="https://example.com/terms/{i}">terms &amp; conditions</a>'
+        f'&nbsp;for {{{{ application.name }}}}.</p><img src="/logo-{i}.png" alt="Logo"></div>'
+        for i in range(sections)
+    )
+    return (
+        '<!DOCTYPE html><html lang="{{locale}}"><head>{%- auth0:head -%}'
+        f'<style>{css}</style></head><body class="_widget-auto-layout">'
+        f'{{%- auth0:widget -%}}{body}'
+        '<script>window.dataLayer = window.dataLayer || []; if (a < b) { run(); }</script>'
+        '</body></html>'
+    )
+
+
+def lxml_format(template: str) -> str:
+    from lxml import html
+
+    return html.tostring(html.fromstring(template), pretty_print=True, encoding="unicode")
+
+
+def measure(format_fn, template: str, repeat: int):
+    """
+    Time a formatter and record the peak memory of one call.
+
+    Args:
+        format_fn (Callable[[str], str]): The formatter.
+        template (str): The template HTML.
+        repeat (int): Number of timed calls.
+
+    Returns:
+        Tuple[float, float, int]: Minimum and median milliseconds, and peak bytes.
+    """
+    timings = timeit.repeat(lambda: format_fn(template), number=1, repeat=repeat)
+    tracemalloc.start()
+    format_fn(template)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings) * 1000, statistics.median(timings) * 1000, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    backends = {name: formatter_cls().format_html for name, formatter_cls in TEMPLATE_FORMATTERS.items()}
+    try:
+        import lxml.html  # noqa: F401
+        backends["lxml (reference)"] = lxml_format
+    except ImportError:
+        pass
+    # Configure cssutils before measuring so one-off setup is not counted
+    _cssutils()
+
+    print(f"{'backend':<18} {'KB':>6} {'min ms':>9} {'median ms':>10} {'peak KB':>9}")
+    for sections in (20, 120, 500):
+        template = build_template(sections)
+        for name, format_fn in backends.items():
+            fastest, median, peak = measure(format_fn, template, args.repeat)
+            print(
+                f"{name:<18} {len(template) / 1024:>6.0f} {fastest:>9.2f} "
+                f"{median:>10.2f} {peak / 1024:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
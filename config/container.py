@@ -0,0 +1,170 @@
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Registry of the app's long-lived services, each built on first use.
+
+    Modules register a factory (and optionally a close hook) under a name instead of
+    constructing their singleton at import time, so importing the app never connects
+    to MongoDB, Slack or Dialogflow. The FastAPI lifespan warms the services up and
+    closes them again on shutdown.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty container.
+        """
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._closers: Dict[str, Callable[[Any], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._order: List[str] = []
+        # Re-entrant because factories resolve the services they depend on
+        self._lock = threading.RLock()
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        close: Optional[Callable[[Any], Any]] = None,
+    ) -> "LazyService":
+        """
+        Register a service factory.
+
+        Args:
+            name (str): The service name.
+            factory (Callable[[], Any]): Builds the service; called at most once.
+            close (Optional[Callable[[Any], Any]]): Releases the service on shutdown.
+                May return an awaitable.
+
+        Returns:
+            LazyService: A proxy that resolves the service on first attribute access.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            if close is not None:
+                self._closers[name] = close
+        return LazyService(self, name)
+
+    def get(self, name: str) -> Any:
+        """
+        Get a service, building it if needed.
+
+        Args:
+            name (str): The service name.
+
+        Returns:
+            Any: The service instance.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+            if name not in self._factories:
+                raise KeyError(f"No service registered under '{name}'.")
+            logger.debug(f"Initializing service: {name}")
+            instance = self._factories[name]()
+            self._instances[name] = instance
+            self._order.append(name)
+            return instance
+
+    def is_initialized(self, name: str) -> bool:
+        """
+        Check whether a service has been built.
+
+        Args:
+            name (str): The service name.
+
+        Returns:
+            bool: True if the service exists.
+        """
+        return name in self._instances
+
+    def override(self, name: str, instance: Any) -> None:
+        """
+        Replace a service with a ready-made instance, e.g. a test double.
+
+        Args:
+            name (str): The service name.
+            instance (Any): The instance to serve.
+        """
+        with self._lock:
+            if name not in self._instances:
+                self._order.append(name)
+            self._instances[name] = instance
+
+    async def warm_up(self, *names: str) -> None:
+        """
+        Build services in a worker thread so blocking constructors stay off the loop.
+
+        Args:
+            *names (str): The services to build, in order.
+        """
+        for name in names:
+            await asyncio.to_thread(self.get, name)
+
+    async def shutdown(self) -> None:
+        """
+        Close built services in reverse creation order and forget them.
+        """
+        with self._lock:
+            built = [(name, self._instances[name]) for name in reversed(self._order)]
+            self._instances.clear()
+            self._order.clear()
+
+        for name, instance in built:
+            close = self._closers.get(name)
+            if close is None:
+                continue
+            try:
+                result = close(instance)
+                if inspect.isawaitable(result):
+                    await result
+                logger.debug(f"Closed service: {name}")
+            except Exception:
+                logger.exception(f"Failed to close service: {name}")
+
+
+class LazyService:
+    """
+    Stand-in for a module-level singleton that resolves it from the container.
+
+    Call sites keep using ``mongo_client.get_collection(...)`` unchanged; the real
+    object is built on the first attribute access.
+    """
+
+    __slots__ = ("_container", "_name")
+
+    def __init__(self, container: ServiceContainer, name: str):
+        """
+        Initialize the proxy.
+
+        Args:
+            container (ServiceContainer): The container owning the service.
+            name (str): The service name.
+        """
+        object.__setattr__(self, "_container", container)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._container.get(self._name), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._container.get(self._name), attr, value)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self._container.is_initialized(self._name) else "lazy"
+        return f"<LazyService {self._name} ({state})>"
+
+
+container = ServiceContainer()
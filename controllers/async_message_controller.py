@@ -0,0 +1,232 @@
+import asyncio
+import functools
+import logging
+import uuid
+from typing import List
+
+from .message_controller import MessageController
+from ..dao.async_m2m_credentials_dao import async_m2m_credentials_dao
+from ..services.async_auth0_service import AsyncAuth0Service, Auth0ServiceBridge
+from ..services.dialogflow_service import AsyncDialogflowService
+from ..services.intent_fan_out import (
+    Detection,
+    combine_responses,
+    intent_fan_out_executor,
+    split_queries,
+    unique_detections,
+)
+from ..services.intent_handlers.intent_handler_factory import IntentHandlerFactory
+from ..services.local_intent_service import LocalIntentService
+from ..utils.constants import (
+    AUTH0_CREDENTIALS_PROMPT,
+    DIALOGFLOW_LANGUAGE_CODE_EN,
+    DIALOGFLOW_PROJECT_ID,
+    MULTI_INTENT_ENABLED,
+)
+from ..utils.string_utils import StringUtils
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMessageController(MessageController):
+    """Asyncio controller for processing incoming Slack messages and generating responses."""
+
+    def __init__(self):
+        """Initialize the AsyncMessageController with the async services."""
+        self.dialogflow_service = AsyncDialogflowService()
+        self.local_intent_service = LocalIntentService()
+        self.intent_handler_factory = IntentHandlerFactory()
+
+    async def process_message(self, message: str, slack_user_id: str) -> dict:
+        """
+        Process an incoming message from Slack without blocking the event loop.
+
+        Args:
+            message (str): The message text received from Slack.
+            slack_user_id (str): The Slack user ID of the sender.
+
+        Returns:
+            dict: A response dictionary containing text, payload, and flags.
+        """
+        logger.debug(f"Processing message from user {slack_user_id}: {message}")
+
+        # Validate inputs
+        if not message or not slack_user_id:
+            logger.error("Message or Slack user ID is missing.")
+            return self._error_response(
+                "Invalid input. Please provide a valid message and Slack user ID."
+            )
+
+        # Remove markdown formatting coming in from Slack
+        sanitized_message = StringUtils.remove_format(message)
+
+        # Detect the intents and fetch credentials concurrently
+        detection = self._detect_intents(sanitized_message)
+        lookup = async_m2m_credentials_dao.get_credentials(slack_user_id)
+        detections, user_credentials = await asyncio.gather(
+            detection, lookup, return_exceptions=True
+        )
+
+        if isinstance(detections, Exception):
+            logger.error("Error detecting intent with Dialogflow", exc_info=detections)
+            return self._error_response(
+                "Sorry, I couldn't process your message right now. Please try again later."
+            )
+
+        if isinstance(user_credentials, Exception):
+            raise user_credentials
+        if not user_credentials:
+            logger.info(f"No Auth0 credentials found for user {slack_user_id}")
+            # Prompt user to provide credentials via the /auth0_credentials command
+            return self._simple_response(AUTH0_CREDENTIALS_PROMPT)
+
+        # Instantiate AsyncAuth0Service with the user's credentials
+        try:
+            auth0_service = AsyncAuth0Service(
+                auth0_base_url=user_credentials['auth0_base_url'],
+                client_id=user_credentials['auth0_client_id'],
+                client_secret=user_credentials['auth0_client_secret'],
+                slack_user_id=slack_user_id,
+                access_token=user_credentials.get('access_token'),
+                token_expires_at=user_credentials.get('token_expires_at'),
+            )
+        except KeyError as e:
+            logger.exception(
+                f"Missing Auth0 credential key for user {slack_user_id}: {e}"
+            )
+            return self._simple_response(
+                "Your Auth0 credentials are incomplete. Please update them using the `/auth0_credentials` command."
+            )
+
+        # Handlers are synchronous; run them off the loop and route their
+        # Auth0 calls back onto it through the bridge
+        bridge = Auth0ServiceBridge(auth0_service, asyncio.get_running_loop())
+        if len(detections) == 1:
+            response = await self._handle_async(detections[0], bridge)
+        else:
+            # Compound queries share the Auth0 service and token, so the reply takes
+            # as long as the slowest handler
+            logger.debug(f"Fanning out {len(detections)} intents")
+            responses = await asyncio.gather(
+                *(
+                    self._handle_async(detection, bridge, intent_fan_out_executor)
+                    for detection in detections
+                )
+            )
+            response = combine_responses(responses)
+
+        logger.debug(f"Response: {response}")
+        return response
+
+    async def _detect_intents(self, sanitized_message: str) -> List[Detection]:
+        """
+        Detect the intents of a message, which may hold several queries, concurrently.
+
+        Args:
+            sanitized_message (str): The message text without Slack formatting.
+
+        Returns:
+            List[Detection]: The distinct detected intents, fulfillment texts and
+            parameters, in message order.
+
+        Raises:
+            Exception: If Dialogflow fails to detect an intent.
+        """
+        if not MULTI_INTENT_ENABLED:
+            return [await self._detect_intent(sanitized_message)]
+
+        queries = split_queries(sanitized_message)
+        if len(queries) > 1 and (
+            self.local_intent_service.is_batch_lookup(queries)
+            or self.local_intent_service.is_single_query(sanitized_message, queries)
+        ):
+            # A pasted list of users, one per line, is a single lookup, and a query
+            # that only matches as a whole was written over several lines
+            queries = [sanitized_message]
+        results = await asyncio.gather(*(self._detect_query(query) for query in queries))
+        return unique_detections([detection for result in results for detection in result])
+
+    async def _detect_query(self, query: str) -> List[Detection]:
+        """
+        Detect the intents of a single query.
+
+        Args:
+            query (str): The query text.
+
+        Returns:
+            List[Detection]: Several intents for compound queries matched locally,
+            otherwise exactly one.
+        """
+        compound = self.local_intent_service.detect_intents(query)
+        if compound:
+            return compound
+        return [await self._detect_intent(query)]
+
+    async def _detect_intent(self, query: str) -> Detection:
+        """
+        Detect the intent of a query locally, or through Dialogflow.
+
+        Args:
+            query (str): The query text.
+
+        Returns:
+            Detection: The detected intent, fulfillment text and parameters.
+        """
+        # Confident local matches skip the Dialogflow round trip
+        local_result = self.local_intent_service.detect_intent(query)
+        if local_result:
+            detected_intent, fulfillment_text, parameters = local_result
+        else:
+            # Since we have defined single-turn agents, session can be arbitrary
+            dialogflow_session_id = uuid.uuid4()
+            detected_intent, fulfillment_text, parameters = (
+                await self.dialogflow_service.detect_intent_texts(
+                    DIALOGFLOW_PROJECT_ID,
+                    dialogflow_session_id,
+                    query,
+                    DIALOGFLOW_LANGUAGE_CODE_EN,
+                )
+            )
+        logger.debug(f"Detected intent: {detected_intent}, Parameters: {parameters}")
+        return detected_intent, fulfillment_text, parameters
+
+    async def _handle_async(
+        self, detection: Detection, bridge: Auth0ServiceBridge, executor=None
+    ) -> dict:
+        """
+        Run the handler of a detected intent in a worker thread.
+
+        Args:
+            detection (Detection): The detected intent, fulfillment text and parameters.
+            bridge (Auth0ServiceBridge): Routes the handler's Auth0 calls onto the loop.
+            executor: The pool to run the handler on; defaults to the loop's executor.
+
+        Returns:
+            dict: A response dictionary containing text, payload, and flags.
+        """
+        detected_intent, fulfillment_text, parameters = detection
+
+        # Get the appropriate intent handler
+        handler = self.intent_handler_factory.get_handler(detected_intent)
+
+        if not handler:
+            logger.info(f"No handler found for intent: {detected_intent}")
+            return self._simple_response(fulfillment_text)
+
+        logger.debug(f"Found handler for intent: {detected_intent}")
+        try:
+            if executor is None:
+                handler_result = await asyncio.to_thread(
+                    handler.handle_intent, parameters, bridge
+                )
+            else:
+                handler_result = await asyncio.get_running_loop().run_in_executor(
+                    executor, functools.partial(handler.handle_intent, parameters, bridge)
+                )
+        except Exception as e:
+            logger.exception("Error in intent handler")
+            return self._error_response(
+                "An error occurred while processing your request. Please try again later."
+            )
+
+        return self._build_response(fulfillment_text, handler_result)
@@ -1,14 +1,25 @@
 import logging
 import uuid
+from typing import List
 
 from ..dao.m2m_credentials_dao import m2m_credentials_dao
 from ..services.auth0_service import Auth0Service
 from ..services.dialogflow_service import DialogflowService
+from ..services.intent_fan_out import (
+    Detection,
+    combine_responses,
+    intent_fan_out_executor,
+    split_queries,
+    unique_detections,
+)
 from ..services.intent_handlers.intent_handler_factory import IntentHandlerFactory
+from ..services.job_poller import PendingUpload
+from ..services.local_intent_service import LocalIntentService
 from ..utils.constants import (
     AUTH0_CREDENTIALS_PROMPT,
     DIALOGFLOW_LANGUAGE_CODE_EN,
     DIALOGFLOW_PROJECT_ID,
+    MULTI_INTENT_ENABLED,
 )
 from ..utils.string_utils import StringUtils
 
@@ -21,6 +32,7 @@ class MessageController:
     def __init__(self):
         """Initialize the MessageController with necessary services."""
         self.dialogflow_service = DialogflowService()
+        self.local_intent_service = LocalIntentService()
         self.intent_handler_factory = IntentHandlerFactory()
 
     def process_message(self, message: str, slack_user_id: str) -> dict:
@@ -44,22 +56,10 @@ class MessageController:
             )
 
         # Remove markdown formatting coming in from Slack
-        sanitized_message = StringUtils().remove_format(message)
+        sanitized_message = StringUtils.remove_format(message)
 
-        # Since we have defined single-turn agents, session can be arbitrary
-        dialogflow_session_id = uuid.uuid4()
-
-        # Detect intent using Dialogflow
         try:
-            detected_intent, fulfillment_text, parameters = (
-                self.dialogflow_service.detect_intent_texts(
-                    DIALOGFLOW_PROJECT_ID,
-                    dialogflow_session_id,
-                    sanitized_message,
-                    DIALOGFLOW_LANGUAGE_CODE_EN,
-                )
-            )
-            logger.debug(f"Detected intent: {detected_intent}, Parameters: {parameters}")
+            detections = self._detect_intents(sanitized_message)
         except Exception as e:
             logger.exception("Error detecting intent with Dialogflow")
             return self._error_response(
@@ -92,42 +92,160 @@ class MessageController:
                 "Your Auth0 credentials are incomplete. Please update them using the `/auth0_credentials` command."
             )
 
-        # Get the appropriate intent handler
-        handler = self.intent_handler_factory.get_handler(detected_intent)
+        if len(detections) == 1:
+            response = self._handle(detections[0], auth0_service)
+        else:
+            # Compound queries share the Auth0 service and token, so the reply takes
+            # as long as the slowest handler
+            logger.debug(f"Fanning out {len(detections)} intents")
+            futures = [
+                intent_fan_out_executor.submit(self._handle, detection, auth0_service)
+                for detection in detections
+            ]
+            response = combine_responses([future.result() for future in futures])
+
+        logger.debug(f"Response: {response}")
+        return response
+
+    def _detect_intents(self, sanitized_message: str) -> List[Detection]:
+        """
+        Detect the intents of a message, which may hold several queries.
+
+        Args:
+            sanitized_message (str): The message text without Slack formatting.
+
+        Returns:
+            List[Detection]: The distinct detected intents, fulfillment texts and
+            parameters, in message order.
+
+        Raises:
+            Exception: If Dialogflow fails to detect an intent.
+        """
+        if not MULTI_INTENT_ENABLED:
+            return [self._detect_intent(sanitized_message)]
 
-        if handler:
-            logger.debug(f"Found handler for intent: {detected_intent}")
-            # Pass the user's credentials to the intent handler
-            try:
-                handler_result = handler.handle_intent(parameters, auth0_service)
-            except Exception as e:
-                logger.exception("Error in intent handler")
-                return self._error_response(
-                    "An error occurred while processing your request. Please try again later."
-                )
-
-            # Handle the result from the intent handler
-            payload, needs_file_upload, additional_text = self._parse_handler_result(
-                handler_result
+        queries = split_queries(sanitized_message)
+        if len(queries) > 1 and (
+            self.local_intent_service.is_batch_lookup(queries)
+            or self.local_intent_service.is_single_query(sanitized_message, queries)
+        ):
+            # A pasted list of users, one per line, is a single lookup, and a query
+            # that only matches as a whole was written over several lines
+            queries = [sanitized_message]
+        if len(queries) == 1:
+            return unique_detections(self._detect_query(queries[0]))
+        results = intent_fan_out_executor.map(self._detect_query, queries)
+        return unique_detections([detection for result in results for detection in result])
+
+    def _detect_query(self, query: str) -> List[Detection]:
+        """
+        Detect the intents of a single query.
+
+        Args:
+            query (str): The query text.
+
+        Returns:
+            List[Detection]: Several intents for compound queries matched locally,
+            otherwise exactly one.
+        """
+        compound = self.local_intent_service.detect_intents(query)
+        if compound:
+            return compound
+        return [self._detect_intent(query)]
+
+    def _detect_intent(self, query: str) -> Detection:
+        """
+        Detect the intent of a query locally, or through Dialogflow.
+
+        Args:
+            query (str): The query text.
+
+        Returns:
+            Detection: The detected intent, fulfillment text and parameters.
+        """
+        # Confident local matches skip the Dialogflow round trip
+        local_result = self.local_intent_service.detect_intent(query)
+        if local_result:
+            detected_intent, fulfillment_text, parameters = local_result
+            logger.debug(f"Detected intent locally: {detected_intent}, Parameters: {parameters}")
+            return local_result
+
+        # Since we have defined single-turn agents, session can be arbitrary
+        dialogflow_session_id = uuid.uuid4()
+
+        # Detect intent using Dialogflow
+        detected_intent, fulfillment_text, parameters = (
+            self.dialogflow_service.detect_intent_texts(
+                DIALOGFLOW_PROJECT_ID,
+                dialogflow_session_id,
+                query,
+                DIALOGFLOW_LANGUAGE_CODE_EN,
             )
+        )
+        logger.debug(f"Detected intent: {detected_intent}, Parameters: {parameters}")
+        return detected_intent, fulfillment_text, parameters
 
-            response = {
-                'text': fulfillment_text,
-                'payload': payload,
-                'needs_file_upload': needs_file_upload,
-                'additional_text': additional_text,
-            }
-        else:
+    def _handle(self, detection: Detection, auth0_service) -> dict:
+        """
+        Run the handler of a detected intent.
+
+        Args:
+            detection (Detection): The detected intent, fulfillment text and parameters.
+            auth0_service: The Auth0 service instance for making API calls.
+
+        Returns:
+            dict: A response dictionary containing text, payload, and flags.
+        """
+        detected_intent, fulfillment_text, parameters = detection
+
+        # Get the appropriate intent handler
+        handler = self.intent_handler_factory.get_handler(detected_intent)
+
+        if not handler:
             logger.info(f"No handler found for intent: {detected_intent}")
             # Fallback response if no handler is found
-            response = {
-                'text': fulfillment_text,
-                'payload': None,
-                'needs_file_upload': False,
-                'additional_text': None,
-            }
+            return self._simple_response(fulfillment_text)
 
-        logger.debug(f"Response: {response}")
+        logger.debug(f"Found handler for intent: {detected_intent}")
+        # Pass the user's credentials to the intent handler
+        try:
+            handler_result = handler.handle_intent(parameters, auth0_service)
+        except Exception as e:
+            logger.exception("Error in intent handler")
+            return self._error_response(
+                "An error occurred while processing your request. Please try again later."
+            )
+
+        # Handle the result from the intent handler
+        return self._build_response(fulfillment_text, handler_result)
+
+    @classmethod
+    def _build_response(cls, fulfillment_text: str, handler_result) -> dict:
+        """
+        Build the response to a handled intent.
+
+        Args:
+            fulfillment_text (str): The text replied for the intent.
+            handler_result (tuple or any): The result from the intent handler.
+
+        Returns:
+            dict: A response dictionary containing text, payload, flags, and the
+            name of the file to upload. Files the handler produces later are listed
+            under ``pending_uploads``.
+        """
+        payload, needs_file_upload, additional_text, filename = cls._parse_handler_result(
+            handler_result
+        )
+
+        response = {
+            'text': fulfillment_text,
+            'payload': payload,
+            'needs_file_upload': needs_file_upload,
+            'additional_text': additional_text,
+            'filename': filename,
+        }
+        if isinstance(payload, PendingUpload):
+            response.update(payload=None, needs_file_upload=False, pending_uploads=[payload])
         return response
 
     @staticmethod
@@ -139,10 +257,14 @@ class MessageController:
             handler_result (tuple or any): The result from the intent handler.
 
         Returns:
-            tuple: A tuple containing payload, needs_file_upload, and additional_text.
+            tuple: A tuple containing payload, needs_file_upload, additional_text,
+            and filename.
         """
+        filename = None
         if isinstance(handler_result, tuple):
-            if len(handler_result) == 3:
+            if len(handler_result) == 4:
+                payload, needs_file_upload, additional_text, filename = handler_result
+            elif len(handler_result) == 3:
                 payload, needs_file_upload, additional_text = handler_result
             elif len(handler_result) == 2:
                 payload, needs_file_upload = handler_result
@@ -156,7 +278,7 @@ class MessageController:
             needs_file_upload = False
             additional_text = None
 
-        return payload, needs_file_upload, additional_text
+        return payload, needs_file_upload, additional_text, filename
 
     @staticmethod
     def _error_response(text):
@@ -0,0 +1,148 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import ASCENDING
+
+from ..config.container import container
+from ..db.async_mongo_client import async_mongo_client
+from ..utils.constants import (
+    M2M_CREDENTIALS_CACHE_SIZE,
+    M2M_CREDENTIALS_CACHE_TTL,
+    M2M_CREDENTIALS_COLLECTION,
+    M2M_CREDENTIALS_PROJECTION,
+    SLACK_USER_ID_INDEX_NAME,
+)
+from ..utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncM2MCredentialsDAO:
+    """
+    Asyncio counterpart of M2MCredentialsDAO, backed by the async MongoDB driver
+    and the same read-through credentials cache.
+    """
+
+    def __init__(self):
+        """
+        Initialize the DAO with the async MongoDB collection.
+        """
+        try:
+            self.collection = async_mongo_client.get_collection(
+                M2M_CREDENTIALS_COLLECTION
+            )
+            logger.info(f"Connected to collection: {M2M_CREDENTIALS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to connect to MongoDB collection.")
+            raise
+
+        self.cache = TTLCache(
+            max_size=M2M_CREDENTIALS_CACHE_SIZE, ttl=M2M_CREDENTIALS_CACHE_TTL
+        )
+
+    async def ensure_indexes(self) -> None:
+        """
+        Create the unique index on slack_user_id that every query and upsert filters on.
+        """
+        try:
+            await self.collection.create_index(
+                [("slack_user_id", ASCENDING)],
+                unique=True,
+                name=SLACK_USER_ID_INDEX_NAME,
+            )
+            logger.info(f"Ensured indexes on collection: {M2M_CREDENTIALS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to ensure indexes on the credentials collection.")
+
+    async def get_credentials(self, slack_user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve credentials for a given Slack user ID.
+
+        Args:
+            slack_user_id (str): The Slack user ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The credentials document or None if not found.
+        """
+        if not slack_user_id:
+            logger.error("Slack user ID must be provided.")
+            raise ValueError("Slack user ID must be provided.")
+
+        cached = self.cache.get(slack_user_id)
+        if cached is not None:
+            logger.debug(f"Credentials cache hit for user {slack_user_id}")
+            return dict(cached)
+
+        try:
+            credentials = await self.collection.find_one(
+                {"slack_user_id": slack_user_id}, M2M_CREDENTIALS_PROJECTION
+            )
+            logger.debug(f"Retrieved credentials for user {slack_user_id}: {credentials}")
+            if credentials:
+                self.cache.set(slack_user_id, dict(credentials))
+            return credentials
+        except Exception as e:
+            logger.exception(f"Error retrieving credentials for user {slack_user_id}.")
+            raise
+
+    async def upsert_credentials(
+        self, slack_user_id: str, credentials: Dict[str, Any]
+    ) -> None:
+        """
+        Insert or update credentials for a given Slack user ID.
+
+        Args:
+            slack_user_id (str): The Slack user ID.
+            credentials (Dict[str, Any]): The credentials data to upsert.
+        """
+        if not slack_user_id or not credentials:
+            logger.error("Slack user ID and credentials must be provided.")
+            raise ValueError("Slack user ID and credentials must be provided.")
+
+        try:
+            credentials['slack_user_id'] = slack_user_id
+            result = await self.collection.update_one(
+                {"slack_user_id": slack_user_id},
+                {"$set": credentials},
+                upsert=True
+            )
+            logger.debug(f"Upserted credentials for user {slack_user_id}. Result: {result.raw_result}")
+            self.cache.invalidate(slack_user_id)
+        except Exception as e:
+            logger.exception(f"Error upserting credentials for user {slack_user_id}.")
+            raise
+
+    async def update_access_token(
+        self, slack_user_id: str, access_token: str, expires_in: int
+    ) -> None:
+        """
+        Update the access token and expiry time for a given Slack user ID.
+
+        Args:
+            slack_user_id (str): The Slack user ID.
+            access_token (str): The new access token.
+            expires_in (int): The number of seconds until the token expires.
+        """
+        if not slack_user_id or not access_token or expires_in is None:
+            logger.error("Slack user ID, access token, and expires_in must be provided.")
+            raise ValueError("Slack user ID, access token, and expires_in must be provided.")
+
+        try:
+            token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+            token_fields = {
+                "access_token": access_token,
+                "token_expires_at": token_expires_at.isoformat(),
+            }
+            result = await self.collection.update_one(
+                {"slack_user_id": slack_user_id},
+                {"$set": token_fields}
+            )
+            logger.debug(f"Updated access token for user {slack_user_id}. Result: {result.raw_result}")
+            self.cache.update(slack_user_id, token_fields)
+        except Exception as e:
+            logger.exception(f"Error updating access token for user {slack_user_id}.")
+            raise
+
+
+async_m2m_credentials_dao = container.register("async_m2m_credentials_dao", AsyncM2MCredentialsDAO)
@@ -0,0 +1,67 @@
+import logging
+from datetime import datetime
+
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+
+from ..config.container import container
+from ..db.async_mongo_client import async_mongo_client
+from ..utils.constants import (
+    SLACK_EVENT_DEDUP_TTL,
+    SLACK_EVENTS_COLLECTION,
+    SLACK_EVENTS_TTL_INDEX_NAME,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSlackEventDAO:
+    """
+    Asyncio counterpart of SlackEventDAO, backed by the async MongoDB driver.
+    """
+
+    def __init__(self):
+        """
+        Initialize the DAO with the async MongoDB collection.
+        """
+        try:
+            self.collection = async_mongo_client.get_collection(SLACK_EVENTS_COLLECTION)
+            logger.info(f"Connected to collection: {SLACK_EVENTS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to connect to MongoDB collection.")
+            raise
+
+    async def ensure_indexes(self) -> None:
+        """
+        Create the TTL index that expires event records once Slack has stopped retrying.
+        """
+        try:
+            await self.collection.create_index(
+                [("received_at", ASCENDING)],
+                expireAfterSeconds=int(SLACK_EVENT_DEDUP_TTL),
+                name=SLACK_EVENTS_TTL_INDEX_NAME,
+            )
+            logger.info(f"Ensured indexes on collection: {SLACK_EVENTS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to ensure indexes on the Slack events collection.")
+
+    async def claim_event(self, event_key: str) -> bool:
+        """
+        Record an event unless it was recorded before.
+
+        Args:
+            event_key (str): The event_id or client_msg_id based key.
+
+        Returns:
+            bool: True if this is the first time the event was seen.
+        """
+        try:
+            await self.collection.insert_one(
+                {"_id": event_key, "received_at": datetime.utcnow()}
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+
+async_slack_event_dao = container.register("async_slack_event_dao", AsyncSlackEventDAO)
@@ -0,0 +1,94 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.collection import Collection
+
+from ..config.container import container
+from ..db.mongo_client import mongo_client
+from ..utils.constants import DAILY_STATS_COLLECTION, DAILY_STATS_INDEX_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class DailyStatsDAO:
+    """
+    Data Access Object for the past days of each tenant's ``stats/daily``, one
+    document per tenant and day. Days Auth0 reported nothing for are stored with a
+    null record, so they are known rather than missing.
+    """
+
+    def __init__(self):
+        """
+        Initialize the DAO with the MongoDB collection.
+        """
+        try:
+            self.collection: Collection = mongo_client.get_collection(
+                DAILY_STATS_COLLECTION
+            )
+            logger.info(f"Connected to collection: {DAILY_STATS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to connect to MongoDB collection.")
+            raise
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the unique index on tenant and day that range reads are served from.
+        """
+        try:
+            self.collection.create_index(
+                [("tenant", ASCENDING), ("date", ASCENDING)],
+                unique=True,
+                name=DAILY_STATS_INDEX_NAME,
+            )
+            logger.info(f"Ensured indexes on collection: {DAILY_STATS_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to ensure indexes on the daily stats collection.")
+
+    def get_days(self, tenant: str, first: str, last: str) -> List[dict]:
+        """
+        Get the stored days of a range.
+
+        Args:
+            tenant (str): The tenant's Auth0 domain.
+            first (str): The first day, as YYYYMMDD.
+            last (str): The last day, as YYYYMMDD.
+
+        Returns:
+            List[dict]: The stored days in order, each with its ``date`` and the
+            ``record`` Auth0 returned for it (None for days without activity).
+        """
+        return list(
+            self.collection.find(
+                {"tenant": tenant, "date": {"$gte": first, "$lte": last}},
+                {"_id": 0, "date": 1, "record": 1},
+            ).sort("date", ASCENDING)
+        )
+
+    def save_days(self, tenant: str, days: Dict[str, Optional[dict]]) -> None:
+        """
+        Store days in one batch, replacing any already stored.
+
+        Args:
+            tenant (str): The tenant's Auth0 domain.
+            days (Dict[str, Optional[dict]]): The records by YYYYMMDD day, None for
+                days without activity.
+        """
+        if not days:
+            return
+        stored_at = datetime.utcnow()
+        self.collection.bulk_write(
+            [
+                UpdateOne(
+                    {"tenant": tenant, "date": day},
+                    {"$set": {"record": record, "stored_at": stored_at}},
+                    upsert=True,
+                )
+                for day, record in days.items()
+            ],
+            ordered=False,
+        )
+
+
+daily_stats_dao = container.register("daily_stats_dao", DailyStatsDAO)
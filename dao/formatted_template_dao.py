@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+from ..config.container import container
+from ..db.mongo_client import mongo_client
+from ..utils.constants import (
+    FORMATTED_TEMPLATES_COLLECTION,
+    FORMATTED_TEMPLATES_TTL_INDEX_NAME,
+    ULP_FORMAT_CACHE_MONGO_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FormattedTemplateDAO:
+    """
+    Data Access Object for formatted Universal Login templates, keyed by a hash of
+    the raw template so every replica can reuse the formatting work. Records expire
+    through a TTL index.
+    """
+
+    def __init__(self):
+        """
+        Initialize the DAO with the MongoDB collection.
+        """
+        try:
+            self.collection: Collection = mongo_client.get_collection(
+                FORMATTED_TEMPLATES_COLLECTION
+            )
+            logger.info(f"Connected to collection: {FORMATTED_TEMPLATES_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to connect to MongoDB collection.")
+            raise
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the TTL index that expires formatted templates nobody has stored lately.
+        """
+        try:
+            self.collection.create_index(
+                [("stored_at", ASCENDING)],
+                expireAfterSeconds=ULP_FORMAT_CACHE_MONGO_TTL,
+                name=FORMATTED_TEMPLATES_TTL_INDEX_NAME,
+            )
+            logger.info(f"Ensured indexes on collection: {FORMATTED_TEMPLATES_COLLECTION}")
+        except Exception as e:
+            logger.exception("Failed to ensure indexes on the formatted templates collection.")
+
+    def get_formatted(self, key: str) -> Optional[str]:
+        """
+        Get a formatted template.
+
+        Args:
+            key (str): The hash of the raw template.
+
+        Returns:
+            Optional[str]: The formatted template, or None if it was never stored.
+        """
+        document = self.collection.find_one({"_id": key}, {"_id": 0, "formatted": 1})
+        return document["formatted"] if document else None
+
+    def save_formatted(self, key: str, formatted: str) -> None:
+        """
+        Store a formatted template.
+
+        Args:
+            key (str): The hash of the raw template.
+            formatted (str): The formatted template.
+        """
+        self.collection.update_one(
+            {"_id": key},
+            {"$set": {"formatted": formatted, "stored_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+
+formatted_template_dao = container.register(
+    "formatted_template_dao", FormattedTemplateDAO
+)
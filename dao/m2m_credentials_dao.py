@@ -1,11 +1,22 @@
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
+from pymongo import ASCENDING
 from pymongo.collection import Collection
 
+from ..config.container import container
 from ..db.mongo_client import mongo_client
-from ..utils.constants import M2M_CREDENTIALS_COLLECTION
+from ..utils.constants import (
+    M2M_CREDENTIALS_CACHE_SIZE,
+    M2M_CREDENTIALS_CACHE_TTL,
+    M2M_CREDENTIALS_CHANGE_STREAM_ENABLED,
+    M2M_CREDENTIALS_COLLECTION,
+    M2M_CREDENTIALS_PROJECTION,
+    SLACK_USER_ID_INDEX_NAME,
+)
+from ..utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +24,9 @@ logger = logging.getLogger(__name__)
 class M2MCredentialsDAO:
     """
     Data Access Object for managing machine-to-machine credentials in MongoDB.
+
+    Credentials are served from a read-through LRU/TTL cache; writes made through
+    this DAO keep the cache up to date.
     """
 
     def __init__(self):
@@ -28,6 +42,28 @@ class M2MCredentialsDAO:
             logger.exception("Failed to connect to MongoDB collection.")
             raise
 
+        self.cache = TTLCache(
+            max_size=M2M_CREDENTIALS_CACHE_SIZE, ttl=M2M_CREDENTIALS_CACHE_TTL
+        )
+        if M2M_CREDENTIALS_CHANGE_STREAM_ENABLED:
+            self.start_change_stream()
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the unique index on slack_user_id that every query and upsert filters on.
+        Lookups by the other fields never happen, so no secondary indexes are needed.
+        """
+        try:
+            self.collection.create_index(
+                [("slack_user_id", ASCENDING)],
+                unique=True,
+                name=SLACK_USER_ID_INDEX_NAME,
+            )
+            logger.info(f"Ensured indexes on collection: {M2M_CREDENTIALS_COLLECTION}")
+        except Exception as e:
+            # Serving stays possible without the index, just slower
+            logger.exception("Failed to ensure indexes on the credentials collection.")
+
     def get_credentials(self, slack_user_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve credentials for a given Slack user ID.
@@ -42,9 +78,18 @@ class M2MCredentialsDAO:
             logger.error("Slack user ID must be provided.")
             raise ValueError("Slack user ID must be provided.")
 
+        cached = self.cache.get(slack_user_id)
+        if cached is not None:
+            logger.debug(f"Credentials cache hit for user {slack_user_id}")
+            return dict(cached)
+
         try:
-            credentials = self.collection.find_one({"slack_user_id": slack_user_id})
+            credentials = self.collection.find_one(
+                {"slack_user_id": slack_user_id}, M2M_CREDENTIALS_PROJECTION
+            )
             logger.debug(f"Retrieved credentials for user {slack_user_id}: {credentials}")
+            if credentials:
+                self.cache.set(slack_user_id, dict(credentials))
             return credentials
         except Exception as e:
             logger.exception(f"Error retrieving credentials for user {slack_user_id}.")
@@ -72,6 +117,8 @@ class M2MCredentialsDAO:
                 upsert=True
             )
             logger.debug(f"Upserted credentials for user {slack_user_id}. Result: {result.raw_result}")
+            # New credentials may belong to another tenant, so re-read on next access
+            self.cache.invalidate(slack_user_id)
         except Exception as e:
             logger.exception(f"Error upserting credentials for user {slack_user_id}.")
             raise
@@ -93,19 +140,50 @@ class M2MCredentialsDAO:
 
         try:
             token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
+            token_fields = {
+                "access_token": access_token,
+                "token_expires_at": token_expires_at.isoformat(),
+            }
             result = self.collection.update_one(
                 {"slack_user_id": slack_user_id},
-                {
-                    "$set": {
-                        "access_token": access_token,
-                        "token_expires_at": token_expires_at.isoformat(),
-                    }
-                }
+                {"$set": token_fields}
             )
             logger.debug(f"Updated access token for user {slack_user_id}. Result: {result.raw_result}")
+            self.cache.update(slack_user_id, token_fields)
         except Exception as e:
             logger.exception(f"Error updating access token for user {slack_user_id}.")
             raise
 
+    def start_change_stream(self) -> threading.Thread:
+        """
+        Watch the collection for writes made by other replicas and invalidate
+        the affected cache entries. Requires MongoDB to run as a replica set.
+
+        Returns:
+            threading.Thread: The daemon thread consuming the change stream.
+        """
+        thread = threading.Thread(
+            target=self._consume_change_stream,
+            name="m2m-credentials-change-stream",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _consume_change_stream(self) -> None:
+        try:
+            with self.collection.watch(full_document="updateLookup") as stream:
+                for change in stream:
+                    document = change.get("fullDocument") or {}
+                    slack_user_id = document.get("slack_user_id")
+                    if slack_user_id:
+                        self.cache.invalidate(slack_user_id)
+                    else:
+                        # Deletes only carry the _id, so drop everything
+                        self.cache.clear()
+        except Exception as e:
+            logger.exception("Credentials change stream stopped; clearing cache.")
+            self.cache.clear()
+
 
-m2m_credentials_dao = M2MCredentialsDAO()
+m2m_credentials_dao = container.register("m2m_credentials_dao", M2MCredentialsDAO)
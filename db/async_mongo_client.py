@@ -0,0 +1,59 @@
+import logging
+import os
+
+from pymongo import AsyncMongoClient
+
+from ..config.container import container
+from ..utils.constants import MONGODB_DB_NAME, MONGODB_URI_ENV_VAR
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongoDBClient:
+    """
+    Asyncio MongoDB Client used when the bot runs in async mode.
+    """
+
+    def __init__(self):
+        """
+        Initialize the async MongoDB client with the provided URI and database name.
+        """
+        mongo_uri = os.getenv(MONGODB_URI_ENV_VAR)
+        if not mongo_uri:
+            logger.error(f"{MONGODB_URI_ENV_VAR} environment variable not set.")
+            raise ValueError(f"{MONGODB_URI_ENV_VAR} environment variable not set.")
+
+        try:
+            self.client = AsyncMongoClient(mongo_uri)
+            self.db = self.client[MONGODB_DB_NAME]
+            logger.info("Async MongoDB client initialized successfully.")
+        except Exception as e:
+            logger.exception("Failed to initialize async MongoDB client.")
+            raise
+
+    def get_collection(self, collection_name: str):
+        """
+        Get an async MongoDB collection.
+
+        Args:
+            collection_name (str): The name of the collection to retrieve.
+
+        Returns:
+            AsyncCollection: The async MongoDB collection object.
+        """
+        if not collection_name:
+            logger.error("Collection name must be provided.")
+            raise ValueError("Collection name must be provided.")
+
+        return self.db[collection_name]
+
+    async def close(self) -> None:
+        """
+        Close the underlying connection pool.
+        """
+        await self.client.close()
+
+
+async_mongo_client = container.register(
+    "async_mongo_client", AsyncMongoDBClient, close=AsyncMongoDBClient.close
+)
@@ -3,6 +3,7 @@ import os
 
 from pymongo.mongo_client import MongoClient
 
+from ..config.container import container
 from ..utils.constants import MONGODB_DB_NAME, MONGODB_URI_ENV_VAR
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,14 @@ class MongoDBClient:
 
         return self.db[collection_name]
 
+    def close(self) -> None:
+        """
+        Close the underlying connection pool.
+        """
+        self.client.close()
+
 
-mongo_client = MongoDBClient()
+mongo_client = container.register(
+    "mongo_client", MongoDBClient, close=MongoDBClient.close
+)
 
@@ -1,9 +1,27 @@
+import hmac
 import logging
+import os
 
 from fastapi import APIRouter, Request, Response
 from fastapi.responses import JSONResponse
 
-from ..services.slack_service import app_handler
+from ..utils.constants import METRICS_TOKEN, SLACK_ASYNC_MODE_ENV_VAR
+
+# Only the selected Slack stack is imported, so the other one never connects
+if os.getenv(SLACK_ASYNC_MODE_ENV_VAR, "false").lower() == "true":
+    from ..services.async_slack_service import (
+        app_handler,
+        get_metrics,
+        on_shutdown,
+        on_startup,
+    )
+else:
+    from ..services.slack_service import (
+        app_handler,
+        get_metrics,
+        on_shutdown,
+        on_startup,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -29,3 +47,24 @@ async def handle_request(req: Request) -> Response:
         return JSONResponse(
             content={"error": "Internal Server Error"}, status_code=500
         )
+
+
+@router.get("/slack/metrics")
+async def metrics(req: Request) -> JSONResponse:
+    """
+    Endpoint exposing the message queue and cache counters to operators holding
+    METRICS_TOKEN. It is not found while no token is configured.
+
+    Args:
+        req (Request): The incoming request, with an ``Authorization: Bearer`` header.
+
+    Returns:
+        JSONResponse: The counters of the services built so far.
+    """
+    if not METRICS_TOKEN:
+        return JSONResponse(content={"error": "Not Found"}, status_code=404)
+    expected = f"Bearer {METRICS_TOKEN}"
+    if not hmac.compare_digest(req.headers.get("authorization", "").encode(), expected.encode()):
+        logger.warning("Rejected unauthorized request to /slack/metrics")
+        return JSONResponse(content={"error": "Unauthorized"}, status_code=401)
+    return JSONResponse(content=get_metrics())
@@ -0,0 +1,459 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Iterator
+
+import httpx
+
+from ..dao.async_m2m_credentials_dao import async_m2m_credentials_dao
+from ..utils.constants import (
+    AUTH0_API_AUDIENCE_TEMPLATE,
+    AUTH0_API_BASE_URL_TEMPLATE,
+    AUTH0_TOKEN_URL_TEMPLATE,
+    AUTHORIZATION_HEADER_TEMPLATE,
+)
+from .circuit_breaker import auth0_circuit_breakers
+from .http_session_pool import get_async_client
+from .paginator import paginate
+from .rate_limiter import auth0_rate_limiter
+from .response_cache import NOT_MODIFIED, auth0_response_cache
+from .retry_policy import auth0_retry_policy
+from .single_flight import auth0_single_flight
+from .token_cache import TokenKey, access_token_cache, token_key
+
+logger = logging.getLogger(__name__)
+
+# Failures worth retrying and counting against the tenant's circuit
+TRANSIENT_ERRORS = (httpx.TransportError,)
+
+
+class AsyncAuth0Service:
+    """Asyncio service for interacting with the Auth0 Management API."""
+
+    def __init__(
+        self,
+        auth0_base_url: str,
+        client_id: str,
+        client_secret: str,
+        slack_user_id: str,
+        access_token: str = None,
+        token_expires_at: str = None,
+    ):
+        """
+        Initialize the AsyncAuth0Service with user-specific credentials.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant (e.g., 'your-domain.auth0.com').
+            client_id (str): The client ID for Auth0 Machine-to-Machine application.
+            client_secret (str): The client secret for Auth0 Machine-to-Machine application.
+            slack_user_id (str): The Slack user ID associated with these credentials.
+            access_token (str, optional): The current access token. Defaults to None.
+            token_expires_at (str, optional): The token expiry time in ISO format. Defaults to None.
+        """
+        self.auth0_base_url = auth0_base_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.slack_user_id = slack_user_id
+        self.access_token = access_token
+        self.token_expires_at = token_expires_at
+
+    @property
+    def credential_key(self) -> TokenKey:
+        """
+        The identity of these credentials, including a digest of the client secret.
+
+        Returns:
+            TokenKey: The key tokens and cached responses are held under.
+        """
+        return token_key(self.auth0_base_url, self.client_id, self.client_secret)
+
+    async def get_access_token(self) -> str:
+        """
+        Retrieve a valid access token from the process-wide token cache,
+        refreshing it if necessary.
+
+        Returns:
+            str: The valid access token.
+
+        Raises:
+            Exception: If unable to retrieve a valid access token.
+        """
+        try:
+            key = self.credential_key
+            # Offer the token loaded from MongoDB; the cache keeps whichever lives longer
+            access_token_cache.seed(key, self.access_token, self.token_expires_at)
+            self.access_token = await access_token_cache.aget_or_refresh(
+                key, self.request_new_access_token
+            )
+            return self.access_token
+        except Exception as e:
+            logger.exception(
+                "Failed to get access token for user %s: %s",
+                self.slack_user_id,
+                str(e),
+            )
+            raise
+
+    async def request_new_access_token(self) -> dict:
+        """
+        Request a new access token from Auth0 and update the stored token.
+
+        Returns:
+            dict: The token data including access token and expiry.
+
+        Raises:
+            Exception: If unable to obtain a new access token.
+        """
+        try:
+            url = AUTH0_TOKEN_URL_TEMPLATE.format(
+                auth0_base_url=self.auth0_base_url
+            )
+            audience = AUTH0_API_AUDIENCE_TEMPLATE.format(
+                auth0_base_url=self.auth0_base_url
+            )
+            payload = {
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "audience": audience,
+            }
+            logger.debug(
+                "Requesting new access token from %s for user %s",
+                url,
+                self.slack_user_id,
+            )
+            breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+            breaker.before_request()
+            try:
+                response = await get_async_client(self.auth0_base_url).post(
+                    url, json=payload
+                )
+            except TRANSIENT_ERRORS:
+                breaker.record_failure()
+                raise
+            breaker.record_response(response.status_code)
+            response.raise_for_status()
+            token_data = response.json()
+            # Update the access token and expiry
+            expires_in = token_data["expires_in"]
+            self.access_token = token_data["access_token"]
+            self.token_expires_at = (
+                datetime.utcnow() + timedelta(seconds=expires_in)
+            ).isoformat()
+
+            access_token_cache.store(self.credential_key, self.access_token, expires_in)
+
+            # Write back to MongoDB off the request path
+            access_token_cache.schedule(
+                async_m2m_credentials_dao.update_access_token(
+                    self.slack_user_id, self.access_token, expires_in
+                )
+            )
+
+            logger.info(
+                "New access token obtained for user %s",
+                self.slack_user_id,
+            )
+            return token_data
+        except httpx.HTTPError as e:
+            logger.exception(
+                "HTTP error occurred while requesting new access token for user %s: %s",
+                self.slack_user_id,
+                str(e),
+            )
+            raise
+        except Exception as e:
+            logger.exception(
+                "An error occurred while requesting new access token for user %s: %s",
+                self.slack_user_id,
+                str(e),
+            )
+            raise
+
+    async def get(
+        self, endpoint: str, query_params: dict = None, use_cache: bool = True
+    ) -> dict:
+        """
+        Make a GET request to the Auth0 Management API.
+
+        Args:
+            endpoint (str): The API endpoint to call (e.g., 'users', 'tenants/settings').
+            query_params (dict, optional): Query parameters for the request.
+            use_cache (bool, optional): Whether to serve and store the response
+                through the response cache. Defaults to True.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            Exception: If the GET request fails.
+        """
+        url = AUTH0_API_BASE_URL_TEMPLATE.format(
+            auth0_base_url=self.auth0_base_url, endpoint=endpoint
+        )
+        try:
+            if not use_cache:
+                return await self._fetch(url, endpoint, query_params, None, store=False)
+            cached = auth0_response_cache.lookup(
+                self.credential_key, endpoint, query_params
+            )
+            if cached is not None and cached.is_fresh():
+                logger.debug("Serving %s from the response cache", url)
+                return cached.data
+            # Concurrent identical requests with the same credentials share one HTTP call
+            return await auth0_single_flight.ado(
+                auth0_response_cache.key(self.credential_key, endpoint, query_params),
+                lambda: self._fetch(url, endpoint, query_params, cached),
+            )
+        except httpx.HTTPError as e:
+            logger.exception(
+                "HTTP error occurred during GET request to %s: %s", url, str(e)
+            )
+            raise
+        except Exception as e:
+            logger.exception(
+                "An error occurred during GET request to %s: %s", url, str(e)
+            )
+            raise
+
+    async def post(self, endpoint: str, body: dict = None) -> dict:
+        """
+        Make a POST request to the Auth0 Management API.
+
+        POSTs create resources such as jobs, so they go through the tenant's circuit
+        breaker and rate limiter but are never retried.
+
+        Args:
+            endpoint (str): The API endpoint to call (e.g., 'jobs/users-exports').
+            body (dict, optional): The JSON request body.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            Exception: If the POST request fails.
+        """
+        url = AUTH0_API_BASE_URL_TEMPLATE.format(
+            auth0_base_url=self.auth0_base_url, endpoint=endpoint
+        )
+        try:
+            token = await self.get_access_token()
+            headers = {
+                "Authorization": AUTHORIZATION_HEADER_TEMPLATE.format(token=token)
+            }
+            logger.debug(
+                "Making POST request to %s for user %s", url, self.slack_user_id
+            )
+            breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+            breaker.before_request()
+            await auth0_rate_limiter.aacquire(self.auth0_base_url)
+            try:
+                response = await get_async_client(self.auth0_base_url).post(
+                    url, headers=headers, json=body
+                )
+            except TRANSIENT_ERRORS:
+                breaker.record_failure()
+                raise
+            auth0_rate_limiter.record_response(
+                self.auth0_base_url, response.status_code, response.headers
+            )
+            breaker.record_response(response.status_code)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.exception(
+                "HTTP error occurred during POST request to %s: %s", url, str(e)
+            )
+            raise
+        except Exception as e:
+            logger.exception(
+                "An error occurred during POST request to %s: %s", url, str(e)
+            )
+            raise
+
+    async def _fetch(
+        self, url: str, endpoint: str, query_params: dict, cached, store: bool = True
+    ) -> dict:
+        """
+        Fetch a Management API response, revalidating a stale cached copy if there is one.
+
+        Args:
+            url (str): The Management API URL.
+            endpoint (str): The API endpoint.
+            query_params (dict): Query parameters for the request.
+            cached (Optional[CachedResponse]): A stale cached response with an ETag.
+            store (bool, optional): Whether to store the response in the response
+                cache. Defaults to True.
+
+        Returns:
+            dict: The JSON response from the API.
+        """
+        # Ensure we have a valid access token
+        token = await self.get_access_token()
+        headers = {
+            "Authorization": AUTHORIZATION_HEADER_TEMPLATE.format(token=token)
+        }
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+        logger.debug(
+            "Making GET request to %s for user %s", url, self.slack_user_id
+        )
+        response = await self._send_get(url, headers, query_params)
+        if cached is not None and response.status_code == NOT_MODIFIED:
+            auth0_response_cache.revalidated(self.credential_key, endpoint, query_params)
+            return cached.data
+        response.raise_for_status()
+        data = response.json()
+        if not store:
+            return data
+        auth0_response_cache.store(
+            self.credential_key,
+            endpoint,
+            query_params,
+            data,
+            response.headers.get("ETag"),
+            len(response.content),
+        )
+        return data
+
+    async def _send_get(self, url: str, headers: dict, query_params: dict = None):
+        """
+        Send a GET through the tenant's circuit breaker and rate limiter, retrying
+        network errors, 5xx responses and 429s.
+
+        Args:
+            url (str): The Management API URL.
+            headers (dict): The request headers.
+            query_params (dict, optional): Query parameters for the request.
+
+        Returns:
+            httpx.Response: The final response.
+
+        Raises:
+            CircuitOpenError: If the tenant's circuit is open.
+            RateLimitExceeded: If the tenant's rate limit budget is exhausted.
+            httpx.TransportError: If the last attempt failed on the network.
+        """
+        client = get_async_client(self.auth0_base_url)
+        breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+        retries = auth0_retry_policy.start()
+        while True:
+            breaker.before_request()
+            # Waits for the tenant's budget, or raises RateLimitExceeded to shed early
+            await auth0_rate_limiter.aacquire(self.auth0_base_url)
+            try:
+                response = await client.get(url, headers=headers, params=query_params)
+            except TRANSIENT_ERRORS as e:
+                breaker.record_failure()
+                delay = retries.next_delay()
+                if delay is None:
+                    raise
+                logger.warning("Retrying GET %s after network error: %s", url, str(e))
+                await asyncio.sleep(delay)
+                continue
+
+            auth0_rate_limiter.record_response(
+                self.auth0_base_url, response.status_code, response.headers
+            )
+            breaker.record_response(response.status_code)
+            delay = retries.next_delay(response.status_code)
+            if delay is None:
+                return response
+            logger.warning("Retrying GET %s after HTTP %s", url, response.status_code)
+            await asyncio.sleep(delay)
+
+
+class Auth0ServiceBridge:
+    """
+    Blocking facade over an AsyncAuth0Service.
+
+    Intent handlers are written against the synchronous ``get`` interface. In async
+    mode they run on a worker thread, and this bridge schedules each call back onto
+    the event loop so the HTTP I/O itself stays on the shared async client.
+    """
+
+    def __init__(
+        self, async_service: AsyncAuth0Service, loop: asyncio.AbstractEventLoop
+    ):
+        """
+        Initialize the bridge.
+
+        Args:
+            async_service (AsyncAuth0Service): The async service to delegate to.
+            loop (asyncio.AbstractEventLoop): The event loop the async service runs on.
+        """
+        self.async_service = async_service
+        self.loop = loop
+
+    def __getattr__(self, name):
+        # Expose tenant attributes such as auth0_base_url and slack_user_id
+        return getattr(self.async_service, name)
+
+    def get_access_token(self) -> str:
+        """
+        Retrieve a valid access token from a worker thread.
+
+        Returns:
+            str: The valid access token.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_service.get_access_token(), self.loop
+        )
+        return future.result()
+
+    def get(
+        self, endpoint: str, query_params: dict = None, use_cache: bool = True
+    ) -> dict:
+        """
+        Make a GET request to the Auth0 Management API from a worker thread.
+
+        Args:
+            endpoint (str): The API endpoint to call.
+            query_params (dict, optional): Query parameters for the request.
+            use_cache (bool, optional): Whether to go through the response cache.
+
+        Returns:
+            dict: The JSON response from the API.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_service.get(endpoint, query_params, use_cache), self.loop
+        )
+        return future.result()
+
+    def post(self, endpoint: str, body: dict = None) -> dict:
+        """
+        Make a POST request to the Auth0 Management API from a worker thread.
+
+        Args:
+            endpoint (str): The API endpoint to call.
+            body (dict, optional): The JSON request body.
+
+        Returns:
+            dict: The JSON response from the API.
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.async_service.post(endpoint, body), self.loop
+        )
+        return future.result()
+
+    def paginate(
+        self, endpoint: str, query_params: dict = None, items_key: str = None, **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over every item of a paginated Management API endpoint from a worker
+        thread, fetching the next page in the background.
+
+        Args:
+            endpoint (str): The API endpoint to call.
+            query_params (dict, optional): Query parameters sent with every page.
+            items_key (str, optional): Key of the items in each page.
+            **kwargs: ``per_page`` and ``max_results``, passed to ``paginate``.
+
+        Returns:
+            Iterator[dict]: The items, in the order Auth0 returns them.
+        """
+        # Pages are read once per search, so they skip the process-wide response cache
+        return paginate(
+            partial(self.get, use_cache=False), endpoint, query_params, items_key, **kwargs
+        )
@@ -0,0 +1,444 @@
+import asyncio
+import logging
+import os
+
+import requests
+from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.response import BoltResponse
+from slack_sdk.errors import SlackApiError
+
+from ..config.container import container
+from ..dao.async_m2m_credentials_dao import async_m2m_credentials_dao
+from ..dao.async_slack_event_dao import async_slack_event_dao
+from ..dao.daily_stats_dao import daily_stats_dao
+from ..dao.formatted_template_dao import formatted_template_dao
+from ..utils.constants import (
+    AUTH0_CREDENTIALS_SAVED_MESSAGE,
+    CREDENTIALS_MODAL_CALLBACK_ID,
+    DEFAULT_UPLOAD_FILENAME,
+    HELP_TEXT,
+    MESSAGE_QUEUE_BUSY_TEXT,
+    MESSAGE_QUEUE_DRAIN_TIMEOUT,
+    MESSAGE_QUEUE_SIZE,
+    MESSAGE_WORKERS,
+    SLACK_EVENT_DEDUP_MONGO_ENABLED,
+    STATS_STORE_MONGO_ENABLED,
+    ULP_FORMAT_CACHE_MONGO_ENABLED,
+)
+from .circuit_breaker import auth0_circuit_breakers
+from .event_deduplicator import AsyncEventDeduplicator
+from .http_session_pool import aclose_async_clients
+from .job_poller import job_poller
+from .rate_limiter import auth0_rate_limiter
+from .response_cache import auth0_response_cache
+from .single_flight import auth0_single_flight
+from .slack_upload import stream_file_upload
+from .slack_views import credentials_modal_view
+from .work_queue import AsyncWorkQueue
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def create_slack_app() -> AsyncApp:
+    """
+    Builds the async Slack app and registers its listeners.
+
+    Returns:
+        AsyncApp: The configured Slack app.
+
+    Raises:
+        ValueError: If the Slack signing secret or token is not set.
+    """
+    # Retrieve Slack credentials from environment variables
+    signing_secret = os.getenv("SLACK_SIGNING_SECRET")
+    slack_token = os.getenv("SLACK_TOKEN")
+
+    if not signing_secret or not slack_token:
+        logger.error("Slack signing secret or token is not set in environment variables.")
+        raise ValueError("Slack signing secret or token is not set.")
+
+    app = AsyncApp(
+        signing_secret=signing_secret,
+        token=slack_token,
+    )
+    app.use(deduplicate_events)
+    app.event("message")(handle_message_events)
+    app.command("/help")(handle_help_command)
+    app.command("/authorize")(open_credentials_modal)
+    app.view(CREDENTIALS_MODAL_CALLBACK_ID)(handle_credentials_submission)
+    return app
+
+
+def create_message_controller():
+    """
+    Builds the async message controller.
+
+    Returns:
+        AsyncMessageController: The controller handling Slack messages.
+    """
+    # Imported here so the Dialogflow SDK only loads when the controller is built
+    from ..controllers.async_message_controller import AsyncMessageController
+
+    return AsyncMessageController()
+
+
+app_handler = container.register(
+    "async_slack_app_handler", lambda: AsyncSlackRequestHandler(create_slack_app())
+)
+
+message_controller = container.register(
+    "async_message_controller", create_message_controller
+)
+
+message_work_queue = container.register(
+    "async_message_work_queue",
+    lambda: AsyncWorkQueue("messages", MESSAGE_WORKERS, MESSAGE_QUEUE_SIZE),
+)
+
+
+def create_event_deduplicator() -> AsyncEventDeduplicator:
+    """
+    Builds the deduplicator for Slack event retries.
+
+    Returns:
+        AsyncEventDeduplicator: In-memory, and backed by MongoDB when enabled.
+    """
+    store = async_slack_event_dao if SLACK_EVENT_DEDUP_MONGO_ENABLED else None
+    return AsyncEventDeduplicator(store=store)
+
+
+event_deduplicator = container.register(
+    "async_event_deduplicator", create_event_deduplicator
+)
+
+
+async def on_startup():
+    """
+    Builds the Slack stack and prepares the MongoDB collections.
+    """
+    await container.warm_up(
+        "async_m2m_credentials_dao",
+        "async_message_controller",
+        "async_slack_app_handler",
+        "async_message_work_queue",
+        "async_event_deduplicator",
+    )
+    await async_m2m_credentials_dao.ensure_indexes()
+    if SLACK_EVENT_DEDUP_MONGO_ENABLED:
+        await async_slack_event_dao.ensure_indexes()
+    if ULP_FORMAT_CACHE_MONGO_ENABLED:
+        # Intent handlers run on worker threads, so formatted templates use the sync DAO
+        await asyncio.to_thread(formatted_template_dao.ensure_indexes)
+    if STATS_STORE_MONGO_ENABLED:
+        await asyncio.to_thread(daily_stats_dao.ensure_indexes)
+
+
+async def on_shutdown():
+    """
+    Drains the queued message events, then closes the pooled Auth0 HTTP clients.
+    """
+    if container.is_initialized("async_message_work_queue"):
+        await message_work_queue.shutdown(MESSAGE_QUEUE_DRAIN_TIMEOUT)
+    await aclose_async_clients()
+
+
+def get_metrics() -> dict:
+    """
+    Collects the counters of the message pipeline services built so far.
+
+    Returns:
+        dict: Queue depth and job counts, duplicate events dropped, per-tenant Auth0
+        rate limit budgets and circuit states, the API response, credential, intent
+        and local fast-path caches, and background jobs such as user exports.
+    """
+    metrics = {
+        "auth0_rate_limits": auth0_rate_limiter.stats(),
+        "auth0_circuits": auth0_circuit_breakers.stats(),
+        "auth0_response_cache": auth0_response_cache.stats(),
+        "auth0_coalesced_requests": auth0_single_flight.stats(),
+    }
+    if container.is_initialized("async_message_work_queue"):
+        metrics["message_queue"] = message_work_queue.stats()
+    if container.is_initialized("async_event_deduplicator"):
+        metrics["event_deduplication"] = event_deduplicator.stats()
+    if container.is_initialized("async_m2m_credentials_dao"):
+        metrics["m2m_credentials_cache"] = async_m2m_credentials_dao.cache.stats()
+    if container.is_initialized("async_message_controller"):
+        # The controller has already loaded the Dialogflow module by now
+        from .dialogflow_service import detect_intent_cache
+
+        metrics["dialogflow_cache"] = detect_intent_cache.cache.stats()
+        metrics["local_intents"] = message_controller.local_intent_service.stats()
+    if container.is_initialized("job_poller"):
+        metrics["background_jobs"] = job_poller.stats()
+    return metrics
+
+
+async def deduplicate_events(body: dict, next):
+    """
+    Acks Slack retries of events that were already received without processing them again.
+
+    Args:
+        body (dict): The request body from Slack.
+        next (callable): Coroutine function passing the request on to the listeners.
+
+    Returns:
+        BoltResponse: An empty acknowledgement for duplicates, otherwise the listeners' response.
+    """
+    if await event_deduplicator.is_duplicate(body):
+        return BoltResponse(status=200, body="")
+    return await next()
+
+
+async def handle_message_events(event: dict, say, client):
+    """
+    Queues message events for background processing so the event is acked at once.
+
+    Args:
+        event (dict): The event payload from Slack.
+        say (callable): Coroutine function to send a message back to Slack.
+        client: The async Slack WebClient.
+    """
+    slack_user_id = event.get('user')
+    user_message = event.get('text')
+    channel_id = event.get('channel')
+
+    logger.debug(
+        f"Received message event from user {slack_user_id} in channel {channel_id}: {user_message}"
+    )
+
+    # Input validation
+    if not user_message or not slack_user_id:
+        logger.error("Missing user message or Slack user ID in event.")
+        return
+
+    # Shed load when every worker is busy and the queue is full
+    if not message_work_queue.submit(process_message_event, event, say, client):
+        await say(text=MESSAGE_QUEUE_BUSY_TEXT)
+
+
+async def process_message_event(event: dict, say, client):
+    """
+    Processes a message event and posts the response, uploading it as a file if needed.
+
+    Args:
+        event (dict): The event payload from Slack.
+        say (callable): Coroutine function to send a message back to Slack.
+        client: The async Slack WebClient.
+    """
+    slack_user_id = event.get('user')
+    user_message = event.get('text')
+    channel_id = event.get('channel')
+
+    # Process the message
+    try:
+        response = await message_controller.process_message(user_message, slack_user_id)
+    except Exception as e:
+        logger.exception("Error processing message.")
+        await say(text="An error occurred while processing your message. Please try again later.")
+        return
+
+    # Prepare the message text
+    message_text = response.get('text', '')
+    additional_text = response.get('additional_text')
+    if additional_text:
+        message_text += f"\n{additional_text}"
+
+    # Check if the payload needs to be uploaded as a file
+    if response.get('needs_file_upload'):
+        # Send the initial text response without the payload
+        await say(text=message_text)
+
+        payload = response['payload']
+        # Exports are named by their handler, so Slack shows them as CSV or NDJSON
+        filename = response.get('filename') or DEFAULT_UPLOAD_FILENAME
+        try:
+            # Upload the payload as a file and share it in the channel
+            if isinstance(payload, str):
+                await client.files_upload_v2(
+                    channel=channel_id, filename=filename, title=filename, content=payload
+                )
+            else:
+                # Spooled payloads are streamed from a worker thread, so reading the
+                # file never blocks the event loop
+                loop = asyncio.get_running_loop()
+                await asyncio.to_thread(
+                    stream_file_upload,
+                    on_loop(client.files_getUploadURLExternal, loop),
+                    on_loop(client.files_completeUploadExternal, loop),
+                    channel_id,
+                    payload,
+                    filename,
+                )
+            logger.info(f"File uploaded successfully to channel {channel_id}.")
+        except SlackApiError as e:
+            logger.exception("Failed to upload file to Slack.")
+            await say(text=f"Failed to upload the file: {e.response['error']}")
+        except requests.exceptions.RequestException as e:
+            logger.exception("Failed to send file to Slack's upload URL.")
+            await say(text="Failed to upload the file. Please try again later.")
+        finally:
+            # Streamed payloads are spooled to a temporary file
+            if not isinstance(payload, str):
+                payload.close()
+    else:
+        # Combine the text and payload
+        if response.get('payload'):
+            message_text += f"\n{response['payload']}"
+        # Send the combined message
+        await say(text=message_text)
+        logger.info(f"Sent message to channel {channel_id}.")
+
+    # Files that handlers produce later, such as user exports, are posted when ready
+    for pending in response.get('pending_uploads', ()):
+        start_pending_upload(pending, channel_id, client)
+
+
+def on_loop(method, loop: asyncio.AbstractEventLoop):
+    """
+    Wraps an async Slack client method for blocking calls from a worker thread.
+
+    Args:
+        method: The coroutine method, e.g. ``client.files_completeUploadExternal``.
+        loop (asyncio.AbstractEventLoop): The event loop the client runs on.
+
+    Returns:
+        callable: Runs the method on the loop with the given keyword arguments and
+        returns its result.
+    """
+    return lambda **kwargs: asyncio.run_coroutine_threadsafe(method(**kwargs), loop).result()
+
+
+def start_pending_upload(pending, channel_id: str, client) -> None:
+    """
+    Starts a handler's background work, which uploads its file to the channel when
+    it is ready, or posts why it couldn't. The work runs on the job poller's threads
+    and schedules its Slack calls back onto the event loop.
+
+    Args:
+        pending (PendingUpload): The work returned by the intent handler.
+        channel_id (str): The channel the request came from.
+        client: The async Slack WebClient.
+    """
+    loop = asyncio.get_running_loop()
+
+    def deliver(file, filename: str) -> None:
+        # Slack API calls run on the event loop; the file is sent from this thread
+        stream_file_upload(
+            on_loop(client.files_getUploadURLExternal, loop),
+            on_loop(client.files_completeUploadExternal, loop),
+            channel_id,
+            file,
+            filename,
+        )
+        logger.info(f"File {filename} uploaded successfully to channel {channel_id}.")
+
+    def notify(text: str) -> None:
+        asyncio.run_coroutine_threadsafe(
+            client.chat_postMessage(channel=channel_id, text=text), loop
+        ).result()
+
+    try:
+        pending.start(deliver, notify)
+    except Exception as e:
+        logger.exception("Failed to start background upload.")
+        loop.create_task(
+            client.chat_postMessage(
+                channel=channel_id, text="The file couldn't be prepared. Please try again later."
+            )
+        )
+
+
+async def handle_help_command(ack, respond, command):
+    """
+    Handles the /help command by sending the help text.
+
+    Args:
+        ack (callable): Coroutine function to acknowledge the command request.
+        respond (callable): Coroutine function to send a response to the command.
+        command (dict): The command payload from Slack.
+    """
+    await ack()
+    await respond(HELP_TEXT)
+    logger.debug("Responded to /help command.")
+
+
+async def open_credentials_modal(ack, body, client):
+    """
+    Opens the credentials modal for the user to submit their Auth0 credentials.
+
+    Args:
+        ack (callable): Coroutine function to acknowledge the command request.
+        body (dict): The body of the request from Slack.
+        client: The async Slack WebClient.
+    """
+    await ack()
+    try:
+        await client.views_open(
+            trigger_id=body["trigger_id"],
+            view=credentials_modal_view(),
+        )
+        logger.debug(f"Opened credentials modal for user {body['user_id']}.")
+    except SlackApiError as e:
+        logger.exception("Failed to open credentials modal.")
+        await client.chat_postMessage(
+            channel=body['user_id'],
+            text="An error occurred while opening the credentials modal. Please try again later.",
+        )
+
+
+async def handle_credentials_submission(ack, body, client, view):
+    """
+    Handles the submission of the credentials modal.
+
+    Args:
+        ack (callable): Coroutine function to acknowledge the view submission.
+        body (dict): The body of the request from Slack.
+        client: The async Slack WebClient.
+        view (dict): The view payload from Slack.
+    """
+    await ack()
+    slack_user_id = body['user']['id']
+    values = view['state']['values']
+
+    try:
+        base_url = values['base_url_block']['base_url_input']['value']
+        client_id = values['client_id_block']['client_id_input']['value']
+        client_secret = values['client_secret_block']['client_secret_input']['value']
+
+        # Validate inputs
+        if not base_url or not client_id or not client_secret:
+            raise ValueError("All fields are required.")
+
+        # Save credentials to MongoDB
+        await async_m2m_credentials_dao.upsert_credentials(
+            slack_user_id,
+            {
+                'auth0_base_url': base_url,
+                'auth0_client_id': client_id,
+                'auth0_client_secret': client_secret,
+                'access_token': None,
+                'token_expires_at': None,
+            },
+        )
+        logger.info(f"Auth0 credentials saved for user {slack_user_id}.")
+
+        # Confirm to the user
+        await client.chat_postMessage(
+            channel=slack_user_id,
+            text=AUTH0_CREDENTIALS_SAVED_MESSAGE,
+        )
+    except ValueError as ve:
+        logger.error(f"Validation error: {ve}")
+        await client.chat_postMessage(
+            channel=slack_user_id,
+            text="Please fill in all required fields.",
+        )
+    except Exception as e:
+        logger.exception("Error saving Auth0 credentials.")
+        await client.chat_postMessage(
+            channel=slack_user_id,
+            text="An error occurred while saving your credentials. Please try again.",
+        )
@@ -1,9 +1,20 @@
 import logging
+import time
 from datetime import datetime, timedelta
+from functools import partial
+from typing import Iterator
 
 import requests
 
 from ..dao.m2m_credentials_dao import m2m_credentials_dao
+from .circuit_breaker import auth0_circuit_breakers
+from .http_session_pool import REQUEST_TIMEOUT, get_session
+from .paginator import paginate
+from .rate_limiter import auth0_rate_limiter
+from .response_cache import NOT_MODIFIED, auth0_response_cache
+from .retry_policy import auth0_retry_policy
+from .single_flight import auth0_single_flight
+from .token_cache import TokenKey, access_token_cache, token_key
 from ..utils.constants import (
     AUTH0_API_AUDIENCE_TEMPLATE,
     AUTH0_API_BASE_URL_TEMPLATE,
@@ -13,6 +24,9 @@ from ..utils.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Failures worth retrying and counting against the tenant's circuit
+TRANSIENT_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
 
 class Auth0Service:
     """Service for interacting with the Auth0 Management API."""
@@ -44,9 +58,20 @@ class Auth0Service:
         self.access_token = access_token
         self.token_expires_at = token_expires_at
 
+    @property
+    def credential_key(self) -> TokenKey:
+        """
+        The identity of these credentials, including a digest of the client secret.
+
+        Returns:
+            TokenKey: The key tokens and cached responses are held under.
+        """
+        return token_key(self.auth0_base_url, self.client_id, self.client_secret)
+
     def get_access_token(self) -> str:
         """
-        Retrieve a valid access token, refreshing it if necessary.
+        Retrieve a valid access token from the process-wide token cache,
+        refreshing it if necessary.
 
         Returns:
             str: The valid access token.
@@ -55,21 +80,13 @@ class Auth0Service:
             Exception: If unable to retrieve a valid access token.
         """
         try:
-            if self.access_token and self.token_expires_at:
-                expires_at = datetime.fromisoformat(self.token_expires_at)
-                if datetime.utcnow() < expires_at:
-                    logger.debug(
-                        "Using cached access token for user %s", self.slack_user_id
-                    )
-                    return self.access_token  # Token is still valid
-
-            # Token is missing or expired; request a new one
-            logger.info(
-                "Access token expired or missing for user %s. Requesting new token.",
-                self.slack_user_id,
+            key = self.credential_key
+            # Offer the token loaded from MongoDB; the cache keeps whichever lives longer
+            access_token_cache.seed(key, self.access_token, self.token_expires_at)
+            self.access_token = access_token_cache.get_or_refresh(
+                key, self.request_new_access_token
             )
-            token_data = self.request_new_access_token()
-            return token_data["access_token"]
+            return self.access_token
         except Exception as e:
             logger.exception(
                 "Failed to get access token for user %s: %s",
@@ -106,7 +123,16 @@ class Auth0Service:
                 url,
                 self.slack_user_id,
             )
-            response = requests.post(url, json=payload)
+            breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+            breaker.before_request()
+            try:
+                response = get_session(self.auth0_base_url).post(
+                    url, json=payload, timeout=REQUEST_TIMEOUT
+                )
+            except TRANSIENT_ERRORS:
+                breaker.record_failure()
+                raise
+            breaker.record_response(response.status_code)
             response.raise_for_status()
             token_data = response.json()
             # Update the access token and expiry
@@ -116,13 +142,18 @@ class Auth0Service:
                 datetime.utcnow() + timedelta(seconds=expires_in)
             ).isoformat()
 
-            # Update in MongoDB
-            m2m_credentials_dao.update_access_token(
-                self.slack_user_id, self.access_token, expires_in
+            access_token_cache.store(self.credential_key, self.access_token, expires_in)
+
+            # Write back to MongoDB off the request path
+            access_token_cache.submit(
+                m2m_credentials_dao.update_access_token,
+                self.slack_user_id,
+                self.access_token,
+                expires_in,
             )
 
             logger.info(
-                "New access token obtained and stored for user %s",
+                "New access token obtained for user %s",
                 self.slack_user_id,
             )
             return token_data
@@ -141,13 +172,17 @@ class Auth0Service:
             )
             raise
 
-    def get(self, endpoint: str, query_params: dict = None) -> dict:
+    def get(
+        self, endpoint: str, query_params: dict = None, use_cache: bool = True
+    ) -> dict:
         """
         Make a GET request to the Auth0 Management API.
 
         Args:
             endpoint (str): The API endpoint to call (e.g., 'users', 'tenants/settings').
             query_params (dict, optional): Query parameters for the request.
+            use_cache (bool, optional): Whether to serve and store the response
+                through the response cache. Defaults to True.
 
         Returns:
             dict: The JSON response from the API.
@@ -155,28 +190,200 @@ class Auth0Service:
         Raises:
             Exception: If the GET request fails.
         """
+        url = AUTH0_API_BASE_URL_TEMPLATE.format(
+            auth0_base_url=self.auth0_base_url, endpoint=endpoint
+        )
+        try:
+            if not use_cache:
+                return self._fetch(url, endpoint, query_params, None, store=False)
+            cached = auth0_response_cache.lookup(
+                self.credential_key, endpoint, query_params
+            )
+            if cached is not None and cached.is_fresh():
+                logger.debug("Serving %s from the response cache", url)
+                return cached.data
+            # Concurrent identical requests with the same credentials share one HTTP call
+            return auth0_single_flight.do(
+                auth0_response_cache.key(self.credential_key, endpoint, query_params),
+                lambda: self._fetch(url, endpoint, query_params, cached),
+            )
+        except requests.exceptions.RequestException as e:
+            logger.exception(
+                "HTTP error occurred during GET request to %s: %s", url, str(e)
+            )
+            raise
+        except Exception as e:
+            logger.exception(
+                "An error occurred during GET request to %s: %s", url, str(e)
+            )
+            raise
+
+    def post(self, endpoint: str, body: dict = None) -> dict:
+        """
+        Make a POST request to the Auth0 Management API.
+
+        POSTs create resources such as jobs, so they go through the tenant's circuit
+        breaker and rate limiter but are never retried.
+
+        Args:
+            endpoint (str): The API endpoint to call (e.g., 'jobs/users-exports').
+            body (dict, optional): The JSON request body.
+
+        Returns:
+            dict: The JSON response from the API.
+
+        Raises:
+            Exception: If the POST request fails.
+        """
+        url = AUTH0_API_BASE_URL_TEMPLATE.format(
+            auth0_base_url=self.auth0_base_url, endpoint=endpoint
+        )
         try:
-            # Ensure we have a valid access token
             token = self.get_access_token()
             headers = {
                 "Authorization": AUTHORIZATION_HEADER_TEMPLATE.format(token=token)
             }
-            url = AUTH0_API_BASE_URL_TEMPLATE.format(
-                auth0_base_url=self.auth0_base_url, endpoint=endpoint
-            )
             logger.debug(
-                "Making GET request to %s for user %s", url, self.slack_user_id
+                "Making POST request to %s for user %s", url, self.slack_user_id
+            )
+            breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+            breaker.before_request()
+            auth0_rate_limiter.acquire(self.auth0_base_url)
+            try:
+                response = get_session(self.auth0_base_url).post(
+                    url, headers=headers, json=body, timeout=REQUEST_TIMEOUT
+                )
+            except TRANSIENT_ERRORS:
+                breaker.record_failure()
+                raise
+            auth0_rate_limiter.record_response(
+                self.auth0_base_url, response.status_code, response.headers
             )
-            response = requests.get(url, headers=headers, params=query_params)
+            breaker.record_response(response.status_code)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             logger.exception(
-                "HTTP error occurred during GET request to %s: %s", url, str(e)
+                "HTTP error occurred during POST request to %s: %s", url, str(e)
             )
             raise
         except Exception as e:
             logger.exception(
-                "An error occurred during GET request to %s: %s", url, str(e)
+                "An error occurred during POST request to %s: %s", url, str(e)
+            )
+            raise
+
+    def paginate(
+        self, endpoint: str, query_params: dict = None, items_key: str = None, **kwargs
+    ) -> Iterator[dict]:
+        """
+        Iterate over every item of a paginated Management API endpoint, fetching
+        the next page in the background while the current one is consumed.
+
+        Args:
+            endpoint (str): The API endpoint to call (e.g., 'users').
+            query_params (dict, optional): Query parameters sent with every page.
+            items_key (str, optional): Key of the items in each page; defaults to
+                the last segment of the endpoint.
+            **kwargs: ``per_page`` and ``max_results``, passed to ``paginate``.
+
+        Returns:
+            Iterator[dict]: The items, in the order Auth0 returns them.
+        """
+        # Pages are read once per search, so they skip the process-wide response cache
+        return paginate(
+            partial(self.get, use_cache=False), endpoint, query_params, items_key, **kwargs
+        )
+
+    def _fetch(
+        self, url: str, endpoint: str, query_params: dict, cached, store: bool = True
+    ) -> dict:
+        """
+        Fetch a Management API response, revalidating a stale cached copy if there is one.
+
+        Args:
+            url (str): The Management API URL.
+            endpoint (str): The API endpoint.
+            query_params (dict): Query parameters for the request.
+            cached (Optional[CachedResponse]): A stale cached response with an ETag.
+            store (bool, optional): Whether to store the response in the response
+                cache. Defaults to True.
+
+        Returns:
+            dict: The JSON response from the API.
+        """
+        # Ensure we have a valid access token
+        token = self.get_access_token()
+        headers = {
+            "Authorization": AUTHORIZATION_HEADER_TEMPLATE.format(token=token)
+        }
+        if cached is not None:
+            headers["If-None-Match"] = cached.etag
+        logger.debug(
+            "Making GET request to %s for user %s", url, self.slack_user_id
+        )
+        response = self._send_get(url, headers, query_params)
+        if cached is not None and response.status_code == NOT_MODIFIED:
+            auth0_response_cache.revalidated(self.credential_key, endpoint, query_params)
+            return cached.data
+        response.raise_for_status()
+        data = response.json()
+        if not store:
+            return data
+        auth0_response_cache.store(
+            self.credential_key,
+            endpoint,
+            query_params,
+            data,
+            response.headers.get("ETag"),
+            len(response.content),
+        )
+        return data
+
+    def _send_get(self, url: str, headers: dict, query_params: dict = None):
+        """
+        Send a GET through the tenant's circuit breaker and rate limiter, retrying
+        network errors, 5xx responses and 429s.
+
+        Args:
+            url (str): The Management API URL.
+            headers (dict): The request headers.
+            query_params (dict, optional): Query parameters for the request.
+
+        Returns:
+            requests.Response: The final response.
+
+        Raises:
+            CircuitOpenError: If the tenant's circuit is open.
+            RateLimitExceeded: If the tenant's rate limit budget is exhausted.
+            requests.exceptions.RequestException: If the last attempt failed on the network.
+        """
+        session = get_session(self.auth0_base_url)
+        breaker = auth0_circuit_breakers.get(self.auth0_base_url)
+        retries = auth0_retry_policy.start()
+        while True:
+            breaker.before_request()
+            # Waits for the tenant's budget, or raises RateLimitExceeded to shed early
+            auth0_rate_limiter.acquire(self.auth0_base_url)
+            try:
+                response = session.get(
+                    url, headers=headers, params=query_params, timeout=REQUEST_TIMEOUT
+                )
+            except TRANSIENT_ERRORS as e:
+                breaker.record_failure()
+                delay = retries.next_delay()
+                if delay is None:
+                    raise
+                logger.warning("Retrying GET %s after network error: %s", url, str(e))
+                time.sleep(delay)
+                continue
+
+            auth0_rate_limiter.record_response(
+                self.auth0_base_url, response.status_code, response.headers
             )
-            raise
\ No newline at end of file
+            breaker.record_response(response.status_code)
+            delay = retries.next_delay(response.status_code)
+            if delay is None:
+                return response
+            logger.warning("Retrying GET %s after HTTP %s", url, response.status_code)
+            time.sleep(delay)
@@ -0,0 +1,211 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from ..utils.constants import (
+    AUTH0_CIRCUIT_FAILURE_THRESHOLD,
+    AUTH0_CIRCUIT_RESET_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to a tenant whose circuit is open.
+    """
+
+    def __init__(self, auth0_base_url: str, retry_after: float):
+        """
+        Initialize the exception.
+
+        Args:
+            auth0_base_url (str): The unhealthy tenant.
+            retry_after (float): Seconds until a probe request will be let through.
+        """
+        self.auth0_base_url = auth0_base_url
+        self.retry_after = retry_after
+        super().__init__(
+            f"Auth0 tenant {auth0_base_url} is not responding. "
+            f"Please try again in {max(1, round(retry_after))} seconds."
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one tenant.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests
+    fail immediately. Once ``reset_timeout`` has passed a single probe request is let
+    through; its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = AUTH0_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = AUTH0_CIRCUIT_RESET_TIMEOUT,
+    ):
+        """
+        Initialize a closed circuit.
+
+        Args:
+            name (str): The tenant the circuit guards.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before probing.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+        Check that a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe in flight.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self.probe_started_at = None
+            if self.state == HALF_OPEN:
+                # A probe that never reported back (e.g. it was shed) must not wedge the circuit
+                if self.probe_started_at is None or now - self.probe_started_at >= self.reset_timeout:
+                    self.probe_started_at = now
+                    logger.info(f"Circuit for {self.name} is half-open; sending a probe request.")
+                    return
+                retry_after = self.reset_timeout - (now - self.probe_started_at)
+            else:
+                retry_after = self.reset_timeout - (now - self.opened_at)
+            self.rejected += 1
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        """
+        Record a request the tenant answered, closing the circuit if it was probing.
+        """
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed; tenant is responding again.")
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_started_at = None
+
+    def record_failure(self) -> None:
+        """
+        Record a network error or server error, opening the circuit when the
+        threshold is reached or a probe fails.
+        """
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after {self.failures} failures."
+                    )
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probe_started_at = None
+
+    def record_response(self, status_code: int) -> None:
+        """
+        Record a response: server errors count as failures, anything else as success.
+
+        Args:
+            status_code (int): The response status code.
+        """
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get the circuit state and counters.
+
+        Returns:
+            Dict[str, object]: State, consecutive failures and requests rejected while open.
+        """
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide registry of per-tenant circuit breakers.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = AUTH0_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = AUTH0_CIRCUIT_RESET_TIMEOUT,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open a circuit.
+            reset_timeout (float): Seconds a circuit stays open before probing.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, auth0_base_url: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker for a tenant.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant.
+
+        Returns:
+            CircuitBreaker: The tenant's circuit breaker.
+        """
+        with self._lock:
+            breaker = self._breakers.get(auth0_base_url)
+            if breaker is None:
+                breaker = self._breakers[auth0_base_url] = CircuitBreaker(
+                    auth0_base_url, self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Get the state of every tenant's circuit.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Circuit stats keyed by tenant.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {tenant: breaker.stats() for tenant, breaker in breakers.items()}
+
+    def clear(self) -> None:
+        """
+        Forget every tenant's circuit.
+        """
+        with self._lock:
+            self._breakers.clear()
+
+
+auth0_circuit_breakers = CircuitBreakerRegistry()
@@ -0,0 +1,153 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from ..dao.daily_stats_dao import daily_stats_dao
+from ..utils.constants import DAILY_STATS_ENDPOINT, STATS_STORE_MONGO_ENABLED
+
+logger = logging.getLogger(__name__)
+
+DAY = timedelta(days=1)
+# Format of the stats/daily 'from' and 'to' parameters, and of stored days
+DAY_FORMAT = "%Y%m%d"
+
+
+def day_of(record: dict) -> str:
+    """
+    Get the day of a ``stats/daily`` record.
+
+    Args:
+        record (dict): The record, with an ISO ``date``.
+
+    Returns:
+        str: The day as YYYYMMDD.
+    """
+    return str(record["date"])[:10].replace("-", "")
+
+
+def missing_ranges(first: date, last: date, known: Dict[str, Optional[dict]]) -> List[Tuple[date, date]]:
+    """
+    Find the runs of consecutive days of a range that are not known.
+
+    Args:
+        first (date): The first day of the range.
+        last (date): The last day of the range.
+        known (Dict[str, Optional[dict]]): The known days, keyed by YYYYMMDD.
+
+    Returns:
+        List[Tuple[date, date]]: The first and last day of each run, in order.
+    """
+    ranges = []
+    start = None
+    day = first
+    while day <= last:
+        if day.strftime(DAY_FORMAT) in known:
+            if start is not None:
+                ranges.append((start, day - DAY))
+                start = None
+        elif start is None:
+            start = day
+        day += DAY
+    if start is not None:
+        ranges.append((start, last))
+    return ranges
+
+
+class DailyStatsStore:
+    """
+    Serves ``stats/daily`` ranges from a per-tenant store of past days, fetching
+    only the days it doesn't hold yet.
+
+    Days before today (UTC) no longer change, so each is fetched from Auth0 once
+    and kept, including days Auth0 reported nothing for. Today is always fetched.
+    Stored days are only served once the caller's credentials have obtained an
+    access token. Without a store, or when it fails, every range is fetched from
+    Auth0 as is.
+    """
+
+    def __init__(self, store=None):
+        """
+        Initialize the DailyStatsStore.
+
+        Args:
+            store: Optional DAO with ``get_days(tenant, first, last)`` and
+                ``save_days(tenant, days)``, such as DailyStatsDAO.
+        """
+        self.store = store
+
+    def fetch(self, auth0_service, from_date: Optional[str] = None, to_date: Optional[str] = None) -> List[dict]:
+        """
+        Get the daily stats of a range.
+
+        Args:
+            auth0_service: The Auth0 service instance for making API calls.
+            from_date (Optional[str]): The first day as YYYYMMDD. Open-ended ranges
+                go to Auth0 directly, since only Auth0 knows where they start.
+            to_date (Optional[str]): The last day as YYYYMMDD; defaults to today.
+
+        Returns:
+            List[dict]: The records Auth0 returns for the range, in date order.
+
+        Raises:
+            Exception: If the caller's credentials can't obtain an access token.
+        """
+        params = {key: value for key, value in (("from", from_date), ("to", to_date)) if value}
+        if self.store is None or not from_date:
+            return auth0_service.get(DAILY_STATS_ENDPOINT, query_params=params) or []
+
+        today = datetime.now(timezone.utc).date()
+        first = datetime.strptime(from_date, DAY_FORMAT).date()
+        last = datetime.strptime(to_date, DAY_FORMAT).date() if to_date else today
+        last_final = min(last, today - DAY)
+        tenant = auth0_service.auth0_base_url
+        # A range served wholly from the store makes no Auth0 request, so check the
+        # credentials here; a cached token for them costs nothing
+        auth0_service.get_access_token()
+
+        known: Dict[str, Optional[dict]] = {}
+        if first <= last_final:
+            try:
+                known = {
+                    day["date"]: day.get("record")
+                    for day in self.store.get_days(
+                        tenant, first.strftime(DAY_FORMAT), last_final.strftime(DAY_FORMAT)
+                    )
+                }
+            except Exception as e:
+                logger.exception("Failed to read stored daily stats; fetching the whole range.")
+                return auth0_service.get(DAILY_STATS_ENDPOINT, query_params=params) or []
+
+        # Today is never known, so it joins the run of missing days before it
+        ranges = missing_ranges(first, last, known)
+        logger.debug(
+            f"Daily stats for {tenant}: {len(known)} days stored, fetching {len(ranges)} ranges"
+        )
+        fetched: Dict[str, dict] = {}
+        final: Dict[str, Optional[dict]] = {}
+        for start, end in ranges:
+            records = auth0_service.get(
+                DAILY_STATS_ENDPOINT,
+                query_params={"from": start.strftime(DAY_FORMAT), "to": end.strftime(DAY_FORMAT)},
+            ) or []
+            for record in records:
+                fetched[day_of(record)] = record
+            day = start
+            while day <= min(end, last_final):
+                key = day.strftime(DAY_FORMAT)
+                final[key] = fetched.get(key)
+                day += DAY
+
+        if final:
+            try:
+                self.store.save_days(tenant, final)
+            except Exception as e:
+                logger.exception("Failed to store daily stats.")
+
+        days = {key: record for key, record in known.items() if record}
+        days.update(fetched)
+        return [days[key] for key in sorted(days)]
+
+
+daily_stats_store = DailyStatsStore(
+    store=daily_stats_dao if STATS_STORE_MONGO_ENABLED else None
+)
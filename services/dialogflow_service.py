@@ -1,23 +1,113 @@
+import copy
 import logging
-from typing import Tuple
+import re
+from typing import Optional, Tuple
 
 from google.cloud import dialogflow_v2 as dialogflow
 from google.protobuf.json_format import MessageToDict
 
 from ..utils.constants import (
+    DIALOGFLOW_CACHE_EXCLUDED_INTENTS,
+    DIALOGFLOW_CACHE_SIZE,
+    DIALOGFLOW_CACHE_TTL,
     DIALOGFLOW_LANGUAGE_CODE_DEFAULT,
     DIALOGFLOW_TIMEOUT,
 )
+from ..utils.string_utils import StringUtils
+from ..utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+class DetectIntentCache:
+    """
+    LRU/TTL cache of Dialogflow results keyed by normalized utterance.
+
+    The agents are single-turn, so the same text always resolves to the same
+    intent. Results without parameters are keyed case-insensitively; results that
+    carry parameters (user IDs, emails) keep the original casing so an extracted
+    identifier is never served for a differently-cased one.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DIALOGFLOW_CACHE_SIZE,
+        ttl: float = DIALOGFLOW_CACHE_TTL,
+        excluded_intents: frozenset = DIALOGFLOW_CACHE_EXCLUDED_INTENTS,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of cached utterances.
+            ttl (float): Seconds a cached result stays valid.
+            excluded_intents (frozenset): Intents that are never cached.
+        """
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.excluded_intents = excluded_intents
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Strip Slack formatting and collapse whitespace.
+
+        Args:
+            text (str): The user's input text.
+
+        Returns:
+            str: The normalized text.
+        """
+        return WHITESPACE_PATTERN.sub(' ', StringUtils.remove_format(text)).strip()
+
+    def get(self, text: str, language_code: str) -> Optional[Tuple[str, str, dict]]:
+        """
+        Look up a cached detection result.
+
+        Args:
+            text (str): The user's input text.
+            language_code (str): The language code of the input text.
+
+        Returns:
+            Optional[Tuple[str, str, dict]]: The cached result or None.
+        """
+        normalized = self.normalize(text)
+        result = self.cache.get((language_code, normalized.casefold(), False))
+        if result is None:
+            result = self.cache.get((language_code, normalized, True))
+        # Handlers must not be able to mutate the cached parameters
+        return copy.deepcopy(result)
+
+    def set(self, text: str, language_code: str, result: Tuple[str, str, dict]) -> None:
+        """
+        Cache a detection result unless its intent is excluded.
+
+        Args:
+            text (str): The user's input text.
+            language_code (str): The language code of the input text.
+            result (Tuple[str, str, dict]): The detected intent, fulfillment text and parameters.
+        """
+        detected_intent, _, parameters = result
+        if detected_intent in self.excluded_intents:
+            return
+        normalized = self.normalize(text)
+        has_parameters = any(parameters.values()) if parameters else False
+        key_text = normalized if has_parameters else normalized.casefold()
+        self.cache.set((language_code, key_text, has_parameters), copy.deepcopy(result))
+
+
+detect_intent_cache = DetectIntentCache()
+
 
 class DialogflowService:
     """Service for interacting with Google Dialogflow API."""
 
     def __init__(self):
         """Initialize the DialogflowService."""
-        self.session_client = dialogflow.SessionsClient()
+        # Creating the client loads credentials and opens a gRPC channel, so it
+        # is deferred to the first detection.
+        self.session_client = None
 
     def detect_intent_texts(
         self,
@@ -54,6 +144,14 @@ class DialogflowService:
                 logger.error("Project ID or session ID is missing.")
                 raise ValueError("Project ID and session ID are required.")
 
+            cached = detect_intent_cache.get(text, language_code)
+            if cached is not None:
+                logger.debug(f"Intent cache hit for text: {text}")
+                return cached
+
+            if self.session_client is None:
+                self.session_client = dialogflow.SessionsClient()
+
             session = self.session_client.session_path(project_id, session_id)
 
             text_input = dialogflow.TextInput(text=text, language_code=language_code)
@@ -68,20 +166,106 @@ class DialogflowService:
                 timeout=DIALOGFLOW_TIMEOUT,
             )
 
-            # Convert Protobuf response to a dictionary
-            response_dict = MessageToDict(response._pb)
+            result = parse_detect_intent_response(response)
+            detect_intent_cache.set(text, language_code, result)
+            return result
+
+        except Exception as e:
+            logger.exception("Error detecting intent with Dialogflow")
+            raise
+
+
+class AsyncDialogflowService:
+    """Asyncio service for interacting with Google Dialogflow API."""
+
+    def __init__(self):
+        """Initialize the AsyncDialogflowService."""
+        # The gRPC aio channel binds to the running event loop, so the client
+        # is created on first use rather than at import time.
+        self.session_client = None
+
+    async def detect_intent_texts(
+        self,
+        project_id: str,
+        session_id: str,
+        text: str,
+        language_code: str = DIALOGFLOW_LANGUAGE_CODE_DEFAULT,
+    ) -> Tuple[str, str, dict]:
+        """
+        Detect the intent of a text input using Dialogflow without blocking the event loop.
 
-            detected_intent = response_dict["queryResult"]["intent"]["displayName"]
-            fulfillment_text = response_dict["queryResult"]["fulfillmentText"]
-            parameters = response_dict["queryResult"].get("parameters", {})
+        Args:
+            project_id (str): The Google Cloud project ID.
+            session_id (str): A unique identifier for the Dialogflow session.
+            text (str): The user's input text.
+            language_code (str, optional): The language code of the input text. Defaults to 'en'.
+
+        Returns:
+            tuple: A tuple containing the detected intent, fulfillment text and parameters.
+
+        Raises:
+            Exception: If an error occurs during intent detection.
+        """
+        try:
+            if not text:
+                logger.error("Input text is empty.")
+                raise ValueError("Input text must not be empty.")
+
+            if not project_id or not session_id:
+                logger.error("Project ID or session ID is missing.")
+                raise ValueError("Project ID and session ID are required.")
+
+            cached = detect_intent_cache.get(text, language_code)
+            if cached is not None:
+                logger.debug(f"Intent cache hit for text: {text}")
+                return cached
+
+            if self.session_client is None:
+                self.session_client = dialogflow.SessionsAsyncClient()
+
+            session = self.session_client.session_path(project_id, session_id)
+
+            text_input = dialogflow.TextInput(text=text, language_code=language_code)
+            query_input = dialogflow.QueryInput(text=text_input)
 
             logger.debug(
-                f"Detected intent: {detected_intent}, Parameters: {parameters}"
+                f"Detecting intent for session {session_id} with text: {text}"
             )
 
-            return detected_intent, fulfillment_text, parameters
+            response = await self.session_client.detect_intent(
+                request={"session": session, "query_input": query_input},
+                timeout=DIALOGFLOW_TIMEOUT,
+            )
+
+            result = parse_detect_intent_response(response)
+            detect_intent_cache.set(text, language_code, result)
+            return result
 
         except Exception as e:
             logger.exception("Error detecting intent with Dialogflow")
             raise
 
+
+def parse_detect_intent_response(response) -> Tuple[str, str, dict]:
+    """
+    Extract the intent, fulfillment text and parameters from a DetectIntentResponse.
+
+    Args:
+        response: The DetectIntentResponse returned by Dialogflow.
+
+    Returns:
+        tuple: A tuple containing the detected intent, fulfillment text and parameters.
+    """
+    # Convert Protobuf response to a dictionary
+    response_dict = MessageToDict(response._pb)
+
+    detected_intent = response_dict["queryResult"]["intent"]["displayName"]
+    fulfillment_text = response_dict["queryResult"]["fulfillmentText"]
+    parameters = response_dict["queryResult"].get("parameters", {})
+
+    logger.debug(
+        f"Detected intent: {detected_intent}, Parameters: {parameters}"
+    )
+
+    return detected_intent, fulfillment_text, parameters
+
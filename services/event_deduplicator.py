@@ -0,0 +1,136 @@
+import logging
+import threading
+from typing import Dict, List
+
+from ..utils.constants import SLACK_EVENT_DEDUP_CACHE_SIZE, SLACK_EVENT_DEDUP_TTL
+from ..utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class EventDeduplicator:
+    """
+    Recognizes Slack re-deliveries of events that were already received.
+
+    Events are keyed on the envelope's event_id, which Slack keeps across retries,
+    and on the message's client_msg_id, which identifies the user's message itself.
+    Keys are claimed in memory first and, when a store is given, in MongoDB so that
+    a retry landing on another replica is recognized too.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        ttl: float = SLACK_EVENT_DEDUP_TTL,
+        max_size: int = SLACK_EVENT_DEDUP_CACHE_SIZE,
+    ):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            store: Optional DAO with a ``claim_event(key) -> bool`` method.
+            ttl (float): Seconds an event key is remembered.
+            max_size (int): Maximum number of event keys kept in memory.
+        """
+        self.seen = TTLCache(max_size=max_size, ttl=ttl)
+        self.store = store
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def event_keys(body: dict) -> List[str]:
+        """
+        Get the keys identifying an Events API delivery.
+
+        Args:
+            body (dict): The request body from Slack.
+
+        Returns:
+            List[str]: The event keys, empty for anything but event callbacks.
+        """
+        if body.get("type") != "event_callback":
+            return []
+        keys = []
+        if body.get("event_id"):
+            keys.append(f"event:{body['event_id']}")
+        client_msg_id = (body.get("event") or {}).get("client_msg_id")
+        if client_msg_id:
+            keys.append(f"message:{client_msg_id}")
+        return keys
+
+    def _claim_locally(self, keys: List[str]) -> bool:
+        # Claim every key so a later delivery matches on either of them
+        return all([self.seen.add(key, True) for key in keys])
+
+    def _record(self, duplicate: bool, keys: List[str]) -> bool:
+        if duplicate:
+            with self._lock:
+                self.duplicates += 1
+            logger.info(f"Dropped duplicate Slack event: {', '.join(keys)}")
+        return duplicate
+
+    def is_duplicate(self, body: dict) -> bool:
+        """
+        Claim an event, telling whether it was received before.
+
+        Args:
+            body (dict): The request body from Slack.
+
+        Returns:
+            bool: True if the event is a re-delivery and must not be processed again.
+        """
+        keys = self.event_keys(body)
+        if not keys:
+            return False
+        if not self._claim_locally(keys):
+            return self._record(True, keys)
+        if self.store is None:
+            return False
+        try:
+            claimed = all([self.store.claim_event(key) for key in keys])
+        except Exception as e:
+            # Answering twice beats not answering at all
+            logger.exception("Failed to record Slack event; processing it anyway.")
+            claimed = True
+        return self._record(not claimed, keys)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the deduplication counters.
+
+        Returns:
+            Dict[str, int]: Duplicates dropped plus the in-memory key cache counters.
+        """
+        with self._lock:
+            duplicates = self.duplicates
+        return {"duplicates": duplicates, **self.seen.stats()}
+
+
+class AsyncEventDeduplicator(EventDeduplicator):
+    """
+    Asyncio counterpart of EventDeduplicator, for use with the async event DAO.
+    """
+
+    async def is_duplicate(self, body: dict) -> bool:
+        """
+        Claim an event, telling whether it was received before.
+
+        Args:
+            body (dict): The request body from Slack.
+
+        Returns:
+            bool: True if the event is a re-delivery and must not be processed again.
+        """
+        keys = self.event_keys(body)
+        if not keys:
+            return False
+        if not self._claim_locally(keys):
+            return self._record(True, keys)
+        if self.store is None:
+            return False
+        try:
+            claimed = all([await self.store.claim_event(key) for key in keys])
+        except Exception as e:
+            logger.exception("Failed to record Slack event; processing it anyway.")
+            claimed = True
+        return self._record(not claimed, keys)
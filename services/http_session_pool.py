@@ -0,0 +1,157 @@
+import logging
+import threading
+import time
+from typing import Dict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.constants import (
+    AUTH0_HTTP2_ENABLED,
+    AUTH0_HTTP_CONNECT_TIMEOUT,
+    AUTH0_HTTP_KEEPALIVE_EXPIRY,
+    AUTH0_HTTP_POOL_SIZE,
+    AUTH0_HTTP_READ_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+_sessions: Dict[str, requests.Session] = {}
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+# requests has no session-wide timeout, so every call passes this (connect, read) pair
+REQUEST_TIMEOUT = (AUTH0_HTTP_CONNECT_TIMEOUT, AUTH0_HTTP_READ_TIMEOUT)
+
+
+class IdleExpiryAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that closes its pooled connections once the tenant has been idle.
+
+    urllib3 keeps connections open indefinitely, and servers drop idle ones
+    sooner or later, so the first request after a long pause would otherwise go
+    out on a dead connection. This applies AUTH0_HTTP_KEEPALIVE_EXPIRY, as httpx
+    does for the async client, to the adapter as a whole: connections in use are
+    not interrupted.
+    """
+
+    def __init__(self, keepalive_expiry: float = AUTH0_HTTP_KEEPALIVE_EXPIRY, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            keepalive_expiry (float): Idle seconds after which pooled connections are closed.
+            **kwargs: Passed to HTTPAdapter.
+        """
+        self.keepalive_expiry = keepalive_expiry
+        self.last_used = time.monotonic()
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        now = time.monotonic()
+        if now - self.last_used > self.keepalive_expiry:
+            logger.debug(f"Closing connections idle for more than {self.keepalive_expiry}s")
+            self.poolmanager.clear()
+        self.last_used = now
+        return super().send(request, **kwargs)
+
+
+def _http2_available() -> bool:
+    """
+    Check whether HTTP/2 can be negotiated by the async client.
+
+    Returns:
+        bool: True if HTTP/2 is enabled and the 'h2' package is installed.
+    """
+    if not AUTH0_HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_session(auth0_base_url: str) -> requests.Session:
+    """
+    Get the keep-alive session shared by every Auth0Service talking to a tenant.
+
+    Args:
+        auth0_base_url (str): The base URL of the Auth0 tenant.
+
+    Returns:
+        requests.Session: The pooled session for the tenant.
+    """
+    session = _sessions.get(auth0_base_url)
+    if session is not None:
+        return session
+
+    with _lock:
+        session = _sessions.get(auth0_base_url)
+        if session is None:
+            session = requests.Session()
+            adapter = IdleExpiryAdapter(
+                pool_connections=1,
+                pool_maxsize=AUTH0_HTTP_POOL_SIZE,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[auth0_base_url] = session
+            logger.debug(f"Created pooled HTTP session for {auth0_base_url}")
+        return session
+
+
+def get_async_client(auth0_base_url: str) -> httpx.AsyncClient:
+    """
+    Get the pooled async client shared by every AsyncAuth0Service talking to a tenant.
+
+    Args:
+        auth0_base_url (str): The base URL of the Auth0 tenant.
+
+    Returns:
+        httpx.AsyncClient: The pooled async client for the tenant.
+    """
+    client = _async_clients.get(auth0_base_url)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _lock:
+        client = _async_clients.get(auth0_base_url)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=AUTH0_HTTP_POOL_SIZE,
+                max_keepalive_connections=AUTH0_HTTP_POOL_SIZE,
+                keepalive_expiry=AUTH0_HTTP_KEEPALIVE_EXPIRY,
+            )
+            timeout = httpx.Timeout(
+                AUTH0_HTTP_READ_TIMEOUT, connect=AUTH0_HTTP_CONNECT_TIMEOUT
+            )
+            client = httpx.AsyncClient(
+                limits=limits, timeout=timeout, http2=_http2_available()
+            )
+            _async_clients[auth0_base_url] = client
+            logger.debug(f"Created pooled async HTTP client for {auth0_base_url}")
+        return client
+
+
+def close_sessions() -> None:
+    """
+    Close every pooled synchronous session.
+    """
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+async def aclose_async_clients() -> None:
+    """
+    Close every pooled async client.
+    """
+    with _lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        await client.aclose()
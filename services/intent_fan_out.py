@@ -0,0 +1,143 @@
+import logging
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from ..config.container import container
+from ..utils.constants import (
+    MAX_MESSAGE_LENGTH,
+    MULTI_INTENT_FILE_TEXT,
+    MULTI_INTENT_MAX_QUERIES,
+    MULTI_INTENT_WORKERS,
+    MULTILINE_CODE_DELIMITER,
+    UPLOAD_SPOOL_MAX_MEMORY,
+)
+
+logger = logging.getLogger(__name__)
+
+# A detected intent, its fulfillment text and its parameters
+Detection = Tuple[str, str, dict]
+
+
+def split_queries(message: str, max_queries: int = MULTI_INTENT_MAX_QUERIES) -> List[str]:
+    """
+    Split a batch of queries sent one per line.
+
+    A code block is never split: it stays with the line that introduces it, so
+    a query whose Lucene syntax is fenced in a block is still one query.
+
+    Args:
+        message (str): The sanitized message text.
+        max_queries (int): Most queries answered; later lines are dropped.
+
+    Returns:
+        List[str]: The non-empty lines, or the whole message if it is a single line.
+    """
+    queries = []
+    in_code_block = False
+    for line in message.splitlines():
+        stripped = line.strip()
+        fence = stripped.count(MULTILINE_CODE_DELIMITER) % 2 == 1
+        if in_code_block or (fence and queries):
+            queries[-1] += "\n" + (line if in_code_block else stripped)
+        elif stripped:
+            queries.append(stripped)
+        if fence:
+            in_code_block = not in_code_block
+    if len(queries) > max_queries:
+        logger.info(f"Answering the first {max_queries} of {len(queries)} queries.")
+        queries = queries[:max_queries]
+    return queries or [message]
+
+
+def unique_detections(detections: List[Detection]) -> List[Detection]:
+    """
+    Drop repeated intents with the same parameters, keeping the first of each.
+
+    Args:
+        detections (List[Detection]): The detected intents in message order.
+
+    Returns:
+        List[Detection]: The distinct detections.
+    """
+    seen = set()
+    unique = []
+    for intent, fulfillment_text, parameters in detections:
+        key = (intent, repr(sorted(parameters.items(), key=repr)))
+        if key not in seen:
+            seen.add(key)
+            unique.append((intent, fulfillment_text, parameters))
+    return unique
+
+
+def combine_responses(responses: List[dict], limit: int = MAX_MESSAGE_LENGTH) -> dict:
+    """
+    Assemble the responses to the queries of one message into a single reply.
+
+    The sections are sent inline when they all fit in a message. Otherwise they
+    are written one after another into a spooled temporary file to upload, and the
+    payloads of the responses that were files themselves are closed.
+
+    Args:
+        responses (List[dict]): The controller responses, in message order.
+        limit (int): Longest inline reply, in characters.
+
+    Returns:
+        dict: A response dictionary containing text, payload, and flags, and the
+        ``pending_uploads`` of every response.
+    """
+    pending_uploads = [
+        pending for response in responses for pending in response.get('pending_uploads', ())
+    ]
+    if not any(response.get('needs_file_upload') for response in responses):
+        sections = []
+        for response in responses:
+            parts = [response.get('text'), response.get('additional_text'), response.get('payload')]
+            sections.append("\n".join(part for part in parts if part))
+        text = "\n\n".join(section for section in sections if section)
+        if len(text) <= limit:
+            return {
+                'text': text,
+                'payload': None,
+                'needs_file_upload': False,
+                'additional_text': None,
+                'pending_uploads': pending_uploads,
+            }
+
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    for index, response in enumerate(responses):
+        if index:
+            spool.write(b"\n\n")
+        header = [response.get('text'), response.get('additional_text')]
+        spool.write("\n".join(part for part in header if part).encode("utf-8"))
+        payload = response.get('payload')
+        if not payload:
+            continue
+        spool.write(b"\n")
+        if isinstance(payload, str):
+            # Code fences only matter in a chat message
+            if payload.startswith(MULTILINE_CODE_DELIMITER) and payload.endswith(MULTILINE_CODE_DELIMITER):
+                payload = payload[len(MULTILINE_CODE_DELIMITER):-len(MULTILINE_CODE_DELIMITER)]
+            spool.write(payload.encode("utf-8"))
+        else:
+            with payload:
+                shutil.copyfileobj(payload, spool)
+    spool.seek(0)
+
+    return {
+        'text': MULTI_INTENT_FILE_TEXT.format(count=len(responses)),
+        'payload': spool,
+        'needs_file_upload': True,
+        'additional_text': None,
+        'pending_uploads': pending_uploads,
+    }
+
+
+intent_fan_out_executor = container.register(
+    "intent_fan_out_executor",
+    lambda: ThreadPoolExecutor(
+        max_workers=MULTI_INTENT_WORKERS, thread_name_prefix="intent-fan-out"
+    ),
+    close=lambda executor: executor.shutdown(wait=False),
+)
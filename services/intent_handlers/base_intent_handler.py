@@ -1,5 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Type
+
+# Intent name -> handler class, filled in by @register_intent_handler
+INTENT_HANDLER_REGISTRY: Dict[str, Type["BaseIntentHandler"]] = {}
+
+
+def register_intent_handler(
+    handler_cls: Type["BaseIntentHandler"],
+) -> Type["BaseIntentHandler"]:
+    """
+    Class decorator that registers an intent handler under its INTENT_NAME.
+
+    Args:
+        handler_cls (Type[BaseIntentHandler]): The handler class to register.
+
+    Returns:
+        Type[BaseIntentHandler]: The same class, unchanged.
+    """
+    INTENT_HANDLER_REGISTRY[handler_cls.INTENT_NAME] = handler_cls
+    return handler_cls
 
 
 class BaseIntentHandler(ABC):
@@ -7,6 +26,8 @@ class BaseIntentHandler(ABC):
     Abstract base class for intent handlers.
     """
 
+    INTENT_NAME: str = None
+
     @abstractmethod
     def can_handle(self, intent_name: str) -> bool:
         """
@@ -34,6 +55,8 @@ class BaseIntentHandler(ABC):
         Returns:
             Tuple[str, bool, Optional[str]]: A tuple containing the response,
             a flag indicating if file upload is needed, and any additional text.
+            Responses to upload may be a binary file object instead of a string,
+            and may be named by a fourth element such as "users.csv".
         """
         pass
 
@@ -0,0 +1,299 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
+from ...utils.constants import (
+    BATCH_LOOKUP_CONCURRENCY,
+    BATCH_LOOKUP_FIELDS,
+    BATCH_LOOKUP_FILENAME,
+    BATCH_LOOKUP_MAX_USERS,
+    BATCH_LOOKUP_QUERY_CHUNK,
+    BATCH_LOOKUP_TABLE_FIELDS,
+    BATCH_USER_LOOKUP_INTENT,
+    EMAIL_PARAM,
+    EMAILS_PARAM,
+    MAX_MESSAGE_LENGTH,
+    MULTILINE_CODE_DELIMITER,
+    USER_IDS_PARAM,
+)
+from ...utils.record_export import CSV_FORMAT, format_table, spool_records
+
+logger = logging.getLogger(__name__)
+
+# User attributes requested for the rows; the connection comes from identities
+SEARCH_API_FIELDS = ",".join(
+    [field for field in BATCH_LOOKUP_FIELDS if field not in ("lookup", "found", "connection")]
+    + ["identities"]
+)
+NOT_FOUND = 404
+
+
+def lucene_terms(field: str, values: Sequence[str]) -> str:
+    """
+    Build a query matching any of several exact values of a field.
+
+    Args:
+        field (str): The user attribute, e.g. 'user_id'.
+        values (Sequence[str]): The values, quoted so characters such as '|' and '@'
+            need no escaping.
+
+    Returns:
+        str: The query, e.g. ``user_id:("auth0|1" OR "auth0|2")``.
+    """
+    quoted = ['"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"' for value in values]
+    return f"{field}:({' OR '.join(quoted)})"
+
+
+def chunked(values: Sequence[str], size: int) -> List[Sequence[str]]:
+    """
+    Split values into consecutive chunks.
+
+    Args:
+        values (Sequence[str]): The values.
+        size (int): Most values per chunk.
+
+    Returns:
+        List[Sequence[str]]: The chunks, in order.
+    """
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+@register_intent_handler
+class BatchUserLookupIntentHandler(BaseIntentHandler):
+    """
+    Intent handler for looking up many user IDs and emails pasted in one message.
+    """
+
+    INTENT_NAME = BATCH_USER_LOOKUP_INTENT
+
+    def can_handle(self, intent_name: str) -> bool:
+        """
+        Determines if this handler can handle the given intent.
+
+        Args:
+            intent_name (str): The name of the intent.
+
+        Returns:
+            bool: True if it can handle the intent, False otherwise.
+        """
+        return intent_name == self.INTENT_NAME
+
+    def handle_intent(
+        self, parameters: Dict[str, Any], auth0_service
+    ) -> Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
+        """
+        Liaises with the Auth0 Management API to look up every user ID and email.
+
+        The identifiers are folded into ``user_id:(...)`` and ``email:(...)`` searches
+        of up to BATCH_LOOKUP_QUERY_CHUNK values each, so 50 IDs cost one request
+        rather than 50. The searches run concurrently, at most
+        BATCH_LOOKUP_CONCURRENCY at a time, under the tenant's rate limit. The search
+        index trails writes by a few seconds, so identifiers it misses are fetched
+        directly before they are reported as not found.
+
+        Args:
+            parameters (Dict[str, Any]): Parameters extracted from the user's message.
+            auth0_service: The Auth0 service instance for making API calls.
+
+        Returns:
+            Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
+            A tuple containing a table of the users, or a CSV file when it is too
+            long for a message, a flag indicating if file upload is needed, how many
+            were found, and the name of the CSV file.
+        """
+        user_ids = list(dict.fromkeys(parameters.get(USER_IDS_PARAM) or []))
+        # Emails are matched case-insensitively, so each counts once whatever its case
+        unique_emails: Dict[str, str] = {}
+        for email in parameters.get(EMAILS_PARAM) or []:
+            unique_emails.setdefault(email.lower(), email)
+        emails = list(unique_emails.values())
+        if not user_ids and not emails:
+            logger.error("User IDs and emails parameters are missing.")
+            return "User IDs or emails are required to look up users.", False, None
+
+        requested = len(user_ids) + len(emails)
+        if requested > BATCH_LOOKUP_MAX_USERS:
+            logger.info(f"Looking up the first {BATCH_LOOKUP_MAX_USERS} of {requested} users.")
+            user_ids = user_ids[:BATCH_LOOKUP_MAX_USERS]
+            emails = emails[:BATCH_LOOKUP_MAX_USERS - len(user_ids)]
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=BATCH_LOOKUP_CONCURRENCY, thread_name_prefix="batch-lookup"
+            ) as executor:
+                by_user_id, by_email = self.search(auth0_service, executor, user_ids, emails)
+                self.fetch_missing(auth0_service, executor, user_ids, emails, by_user_id, by_email)
+
+            rows = self.rows(user_ids, emails, by_user_id, by_email)
+            found = sum(1 for user_id in user_ids if by_user_id.get(user_id)) + sum(
+                1 for email in emails if by_email.get(email)
+            )
+            summary = f"Found {found} of {len(user_ids) + len(emails)} users."
+            if requested > BATCH_LOOKUP_MAX_USERS:
+                summary += f" Only the first {BATCH_LOOKUP_MAX_USERS} were looked up."
+
+            formatted_response = self.format_response(rows)
+            needs_file_upload = not isinstance(formatted_response, str)
+            return formatted_response, needs_file_upload, summary, BATCH_LOOKUP_FILENAME
+
+        except Exception as e:
+            logger.exception("Error handling BatchUserLookup intent.")
+            return f"An error occurred: {str(e)}", False, None
+
+    def search(
+        self,
+        auth0_service,
+        executor: ThreadPoolExecutor,
+        user_ids: List[str],
+        emails: List[str],
+    ) -> Tuple[Dict[str, dict], Dict[str, List[dict]]]:
+        """
+        Search for the identifiers, a chunk of them per query.
+
+        Args:
+            auth0_service: The Auth0 service instance for making API calls.
+            executor (ThreadPoolExecutor): Runs the searches concurrently.
+            user_ids (List[str]): The user IDs.
+            emails (List[str]): The emails.
+
+        Returns:
+            Tuple[Dict[str, dict], Dict[str, List[dict]]]: The users found by ID, and
+            the users found for each email (an email may belong to several users).
+        """
+        queries = [
+            lucene_terms("user_id", chunk) for chunk in chunked(user_ids, BATCH_LOOKUP_QUERY_CHUNK)
+        ] + [
+            lucene_terms("email", chunk) for chunk in chunked(emails, BATCH_LOOKUP_QUERY_CHUNK)
+        ]
+        logger.debug(f"Looking up {len(user_ids)} user IDs and {len(emails)} emails in {len(queries)} searches")
+
+        def run(query: str) -> List[dict]:
+            query_params = {
+                "q": query,
+                "search_engine": "v3",
+                "fields": SEARCH_API_FIELDS,
+                "include_fields": "true",
+            }
+            return list(auth0_service.paginate('users', query_params))
+
+        by_user_id: Dict[str, dict] = {}
+        by_email: Dict[str, List[dict]] = {}
+        wanted_emails = {email.lower(): email for email in emails}
+        for users in executor.map(run, queries):
+            for user in users:
+                by_user_id.setdefault(user.get("user_id"), user)
+                email = wanted_emails.get((user.get("email") or "").lower())
+                if email is not None:
+                    by_email.setdefault(email, []).append(user)
+        return by_user_id, by_email
+
+    def fetch_missing(
+        self,
+        auth0_service,
+        executor: ThreadPoolExecutor,
+        user_ids: List[str],
+        emails: List[str],
+        by_user_id: Dict[str, dict],
+        by_email: Dict[str, List[dict]],
+    ) -> None:
+        """
+        Fetch the identifiers the searches missed one by one, filling in the results.
+
+        Args:
+            auth0_service: The Auth0 service instance for making API calls.
+            executor (ThreadPoolExecutor): Runs the requests concurrently.
+            user_ids (List[str]): The user IDs.
+            emails (List[str]): The emails.
+            by_user_id (Dict[str, dict]): The users found by ID so far.
+            by_email (Dict[str, List[dict]]): The users found for each email so far.
+        """
+        missing_ids = [user_id for user_id in user_ids if user_id not in by_user_id]
+        missing_emails = [email for email in emails if email not in by_email]
+        if not missing_ids and not missing_emails:
+            return
+        logger.debug(f"Fetching {len(missing_ids) + len(missing_emails)} users the search missed")
+
+        def get_user(user_id: str) -> Optional[dict]:
+            try:
+                return auth0_service.get(f'users/{user_id}')
+            except Exception as e:
+                if getattr(getattr(e, "response", None), "status_code", None) == NOT_FOUND:
+                    return None
+                raise
+
+        def get_users_by_email(email: str) -> List[dict]:
+            return auth0_service.get('users-by-email', {EMAIL_PARAM: email}) or []
+
+        found_ids = executor.map(get_user, missing_ids)
+        found_emails = executor.map(get_users_by_email, missing_emails)
+        for user_id, user in zip(missing_ids, found_ids):
+            if user:
+                by_user_id[user_id] = user
+        for email, users in zip(missing_emails, found_emails):
+            if users:
+                by_email[email] = users
+
+    @classmethod
+    def rows(
+        cls,
+        user_ids: List[str],
+        emails: List[str],
+        by_user_id: Dict[str, dict],
+        by_email: Dict[str, List[dict]],
+    ) -> List[dict]:
+        """
+        Lay the results out in the order the identifiers were asked for.
+
+        Args:
+            user_ids (List[str]): The user IDs.
+            emails (List[str]): The emails.
+            by_user_id (Dict[str, dict]): The users found by ID.
+            by_email (Dict[str, List[dict]]): The users found for each email.
+
+        Returns:
+            List[dict]: One row per user found, or a ``found=False`` row per
+            identifier that matched nobody.
+        """
+        rows = []
+        for lookup, users in [
+            (user_id, [by_user_id[user_id]] if user_id in by_user_id else []) for user_id in user_ids
+        ] + [(email, by_email.get(email, [])) for email in emails]:
+            if not users:
+                rows.append({"lookup": lookup, "found": False})
+            for user in users:
+                rows.append(cls.row(lookup, user))
+        return rows
+
+    @staticmethod
+    def row(lookup: str, user: dict) -> dict:
+        """
+        Flatten a user into a row.
+
+        Args:
+            lookup (str): The user ID or email the user was looked up by.
+            user (dict): The user from the Management API.
+
+        Returns:
+            dict: The row, with the connection of the user's primary identity.
+        """
+        identities = user.get("identities") or [{}]
+        return dict(user, lookup=lookup, found=True, connection=identities[0].get("connection"))
+
+    def format_response(self, res: Iterable[dict]) -> Union[str, IO[bytes]]:
+        """
+        Format the rows as a table, or as a CSV file when the table is too long for
+        a Slack message.
+
+        Args:
+            res (Iterable[dict]): The rows.
+
+        Returns:
+            Union[str, IO[bytes]]: The table in a code block, or a file holding the rows.
+        """
+        rows = list(res)
+        table = format_table(rows, BATCH_LOOKUP_TABLE_FIELDS)
+        if len(table) + 2 * len(MULTILINE_CODE_DELIMITER) <= MAX_MESSAGE_LENGTH:
+            return f"{MULTILINE_CODE_DELIMITER}{table}{MULTILINE_CODE_DELIMITER}"
+        payload, _ = spool_records(rows, CSV_FORMAT, BATCH_LOOKUP_FIELDS)
+        return payload
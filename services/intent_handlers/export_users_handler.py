@@ -0,0 +1,71 @@
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
+from ..users_export import UsersExportJob
+from ...utils.constants import (
+    EXPORT_USERS_INTENT,
+    USERS_EXPORT_ENDPOINT,
+    USERS_EXPORT_STARTED_TEXT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@register_intent_handler
+class ExportUsersIntentHandler(BaseIntentHandler):
+    """
+    Intent handler for exporting every user of the tenant through the jobs API.
+    """
+
+    INTENT_NAME = EXPORT_USERS_INTENT
+
+    def can_handle(self, intent_name: str) -> bool:
+        """
+        Determines if this handler can handle the given intent.
+
+        Args:
+            intent_name (str): The name of the intent.
+
+        Returns:
+            bool: True if it can handle the intent, False otherwise.
+        """
+        return intent_name == self.INTENT_NAME
+
+    def handle_intent(
+        self, parameters: Dict[str, Any], auth0_service
+    ) -> Tuple[Union[str, UsersExportJob], bool, Optional[str]]:
+        """
+        Liaises with the Auth0 Management API to start a users export job. The job
+        is polled in the background and its file posted once it is ready, so the
+        reply doesn't wait for it.
+
+        Args:
+            parameters (Dict[str, Any]): Parameters extracted from the user's message.
+            auth0_service: The Auth0 service instance for making API calls.
+
+        Returns:
+            Tuple[Union[str, UsersExportJob], bool, Optional[str]]: A tuple containing
+            the export to deliver later, a flag indicating if file upload is needed
+            now (False), and the job status.
+        """
+        try:
+            logger.debug(f"Creating users export job at {USERS_EXPORT_ENDPOINT}")
+            job = auth0_service.post(USERS_EXPORT_ENDPOINT, {"format": "json"})
+            return UsersExportJob(auth0_service, job), False, self.format_response(job)
+
+        except Exception as e:
+            logger.exception("Error handling ExportUsers intent.")
+            return f"An error occurred: {str(e)}", False, None
+
+    def format_response(self, res: Any) -> str:
+        """
+        Describe the export job that was created.
+
+        Args:
+            res (Any): The job returned by the API.
+
+        Returns:
+            str: The job ID and status, and when the file will be posted.
+        """
+        return f"Export job `{res['id']}` is {res.get('status', 'pending')}. {USERS_EXPORT_STARTED_TEXT}"
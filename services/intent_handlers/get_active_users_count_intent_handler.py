@@ -1,7 +1,7 @@
 import logging
 from typing import Any, Dict, Tuple
 
-from .base_intent_handler import BaseIntentHandler
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
 from ...utils.constants import (
     GET_ACTIVE_USERS_COUNT_INTENT,
     NO_DATA_MESSAGE,
@@ -10,6 +10,7 @@ from ...utils.constants import (
 logger = logging.getLogger(__name__)
 
 
+@register_intent_handler
 class GetActiveUsersCountIntentHandler(BaseIntentHandler):
     """
     Intent handler for retrieving the count of active users.
@@ -1,20 +1,25 @@
-import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import IO, Any, Dict, Optional, Tuple, Union
 
-from .base_intent_handler import BaseIntentHandler
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
+from ..daily_stats_store import daily_stats_store
+from ..stats_analytics import daily_fields, daily_rows, load_daily_stats, summarize
 from ...utils.constants import (
     DATE_PERIOD_PARAM,
     GET_STATS_INTENT,
-    MAX_MESSAGE_LENGTH,
     MULTILINE_CODE_DELIMITER,
     NO_DATA_MESSAGE,
+    STATS_CSV_FILENAME,
+    STATS_CSV_MIN_DAYS,
+    STATS_SUMMARY_FIELDS,
 )
+from ...utils.record_export import CSV_FORMAT, format_table, spool_records
 
 logger = logging.getLogger(__name__)
 
 
+@register_intent_handler
 class GetStatsIntentHandler(BaseIntentHandler):
     """
     Intent handler for retrieving daily statistics from Auth0.
@@ -36,17 +41,24 @@ class GetStatsIntentHandler(BaseIntentHandler):
 
     def handle_intent(
         self, parameters: Dict[str, Any], auth0_service
-    ) -> Tuple[str, bool, Optional[str]]:
+    ) -> Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
         """
         Handle the 'GetStats' intent.
 
+        The daily records are summarized per metric in a table. Ranges of at least
+        STATS_CSV_MIN_DAYS days also get a CSV of every day with its rolling mean,
+        week-over-week change and anomaly flag; the table then goes with the date
+        information so both reach the channel.
+
         Args:
             parameters (Dict[str, Any]): The parameters extracted from the user's message.
             auth0_service: The Auth0 service instance for making API calls.
 
         Returns:
-            Tuple[str, bool, Optional[str]]: A tuple containing the formatted response,
-            a flag indicating if file upload is needed, and any additional text.
+            Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
+            A tuple containing the summary table or the per-day CSV, a flag
+            indicating if file upload is needed, any additional text, and the name
+            of the CSV file.
         """
         date_period_list = parameters.get(DATE_PERIOD_PARAM)
         date_period = date_period_list[0] if date_period_list else None
@@ -98,27 +110,25 @@ class GetStatsIntentHandler(BaseIntentHandler):
             else:
                 date_info = "Daily stats:"
 
-            # Call the Auth0 Management API
-            endpoint = 'stats/daily'
-            logger.debug(f"Requesting stats from Auth0 API with params: {params}")
-            response_data = auth0_service.get(endpoint, query_params=params)
+            # Past days come from the local store when enabled; the rest from Auth0
+            logger.debug(f"Requesting stats with params: {params}")
+            response_data = daily_stats_store.fetch(
+                auth0_service, params.get('from'), params.get('to')
+            )
 
             if not response_data:
                 logger.info("No data received from Auth0 API.")
                 return NO_DATA_MESSAGE, False, None
 
-            formatted_response = self.format_response(response_data)
-
-            # Check if the formatted response exceeds Slack's limit
-            if len(formatted_response) > MAX_MESSAGE_LENGTH:
-                needs_file_upload = True
-            else:
-                needs_file_upload = False
-                formatted_response = (
-                    f"{MULTILINE_CODE_DELIMITER}{formatted_response}{MULTILINE_CODE_DELIMITER}"
-                )
+            stats = load_daily_stats(response_data)
+            summary = (
+                f"{MULTILINE_CODE_DELIMITER}{self.format_response(stats)}{MULTILINE_CODE_DELIMITER}"
+            )
+            if STATS_CSV_MIN_DAYS and len(stats) >= STATS_CSV_MIN_DAYS:
+                payload, _ = spool_records(daily_rows(stats), CSV_FORMAT, daily_fields())
+                return payload, True, f"{date_info}\n{summary}", STATS_CSV_FILENAME
 
-            return formatted_response, needs_file_upload, date_info
+            return summary, False, date_info
 
         except Exception as e:
             logger.exception("Error handling GetStats intent.")
@@ -149,13 +159,13 @@ class GetStatsIntentHandler(BaseIntentHandler):
 
     def format_response(self, res: Any) -> str:
         """
-        Format the API response.
+        Summarize the daily stats in a table.
 
         Args:
-            res (Any): The response data from the API.
+            res (Any): The daily stats loaded by ``load_daily_stats``.
 
         Returns:
-            str: The formatted response string.
+            str: A row per metric with its totals, peak, week-over-week change and
+            anomalous days.
         """
-        formatted_json = json.dumps(res, indent=4)
-        return formatted_json
+        return format_table(summarize(res), STATS_SUMMARY_FIELDS)
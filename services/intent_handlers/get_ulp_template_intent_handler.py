@@ -1,17 +1,119 @@
+import hashlib
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from bs4 import BeautifulSoup
-
-from .base_intent_handler import BaseIntentHandler
+from ...dao.formatted_template_dao import formatted_template_dao
+from ..single_flight import SingleFlight
+from ..template_formatters import SoupTemplateFormatter, get_template_formatter
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
 from ...utils.constants import (
     GET_ULP_TEMPLATE_INTENT,
     NO_DATA_MESSAGE,
+    ULP_FORMAT_CACHE_MONGO_ENABLED,
+    ULP_FORMAT_CACHE_SIZE,
 )
+from ...utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Bump when the formatting output changes, so stored templates are formatted again
+FORMAT_VERSION = 1
+
+
+class FormattedTemplateCache:
+    """
+    LRU cache of formatted templates keyed by a SHA-256 of the raw template.
+
+    Templates rarely change, so repeat requests cost a hash and a lookup. When a
+    store is given, formatted templates are also kept in MongoDB for other replicas
+    and restarts. Concurrent requests for the same new template format it once.
+    """
+
+    def __init__(self, max_size: int = ULP_FORMAT_CACHE_SIZE, store=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of formatted templates kept in memory.
+            store: Optional DAO with ``get_formatted`` and ``save_formatted`` methods.
+        """
+        self.cache = TTLCache(max_size=max_size)
+        self.store = store
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key(template: str, variant: str = "") -> str:
+        """
+        Build the cache key of a raw template.
+
+        Args:
+            template (str): The raw template.
+            variant (str): Names the formatter, since backends format differently.
+
+        Returns:
+            str: The versioned SHA-256 hex digest of the template.
+        """
+        digest = hashlib.sha256(template.encode("utf-8")).hexdigest()
+        prefix = f"{FORMAT_VERSION}:{variant}" if variant else f"{FORMAT_VERSION}"
+        return f"{prefix}:{digest}"
+
+    def get_or_format(
+        self, template: str, format_fn: Callable[[str], str], variant: str = ""
+    ) -> str:
+        """
+        Get a formatted template, formatting it only if it was never seen.
+
+        Args:
+            template (str): The raw template.
+            format_fn (Callable[[str], str]): Formats the template; empty output is not cached.
+            variant (str): Names the formatter, since backends format differently.
+
+        Returns:
+            str: The formatted template.
+        """
+        key = self.key(template, variant)
+        formatted = self.cache.get(key)
+        if formatted is not None:
+            return formatted
+        return self._flights.do(key, lambda: self._load_or_format(key, template, format_fn))
+
+    def _load_or_format(self, key: str, template: str, format_fn: Callable[[str], str]) -> str:
+        formatted = self._load(key)
+        if formatted is None:
+            formatted = format_fn(template)
+            if not formatted:
+                return formatted
+            self._save(key, formatted)
+        self.cache.set(key, formatted)
+        return formatted
+
+    def _load(self, key: str) -> Optional[str]:
+        if self.store is None:
+            return None
+        try:
+            return self.store.get_formatted(key)
+        except Exception as e:
+            logger.exception("Failed to load formatted template; formatting it again.")
+            return None
+
+    def _save(self, key: str, formatted: str) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save_formatted(key, formatted)
+        except Exception as e:
+            logger.exception("Failed to store formatted template.")
 
+
+formatted_template_cache = FormattedTemplateCache(
+    store=formatted_template_dao if ULP_FORMAT_CACHE_MONGO_ENABLED else None
+)
+
+
+template_formatter = get_template_formatter()
+
+
+@register_intent_handler
 class GetULPTemplateIntentHandler(BaseIntentHandler):
     """
     Intent handler for retrieving and formatting the Universal Login Page template.
@@ -75,8 +177,8 @@ class GetULPTemplateIntentHandler(BaseIntentHandler):
 
     def format_response(self, html_string: str) -> str:
         """
-        Parses and formats the HTML string with proper indentations,
-        including formatting CSS inside <style> tags.
+        Formats the HTML string, reusing the result of an earlier request for the
+        same template.
 
         Args:
             html_string (str): The raw HTML string to format.
@@ -84,28 +186,44 @@ class GetULPTemplateIntentHandler(BaseIntentHandler):
         Returns:
             str: The formatted HTML string.
         """
-        try:
-            soup = BeautifulSoup(html_string, 'html.parser')
+        return formatted_template_cache.get_or_format(
+            html_string, self.format_html, variant=template_formatter.name
+        )
 
-            # Format CSS inside <style> tags
-            for style_tag in soup.find_all('style'):
-                if style_tag.string:
-                    formatted_css = self.format_css(style_tag.string)
-                    # Replace the existing CSS with formatted CSS
-                    style_tag.string.replace_with(formatted_css)
+    def format_html(self, html_string: str) -> str:
+        """
+        Parses and formats the HTML string with proper indentations,
+        including formatting CSS inside <style> tags.
 
-            # Prettify the HTML with proper indentation
-            prettified_html = soup.prettify(formatter="html")
+        Uses the ULP_FORMATTER_BACKEND formatter, falling back to the BeautifulSoup
+        formatter if it fails.
 
-            return prettified_html
+        Args:
+            html_string (str): The raw HTML string to format.
 
+        Returns:
+            str: The formatted HTML string.
+        """
+        try:
+            return template_formatter.format_html(html_string)
+        except Exception as e:
+            if template_formatter.name == SoupTemplateFormatter.name:
+                logger.exception("Error formatting the HTML content.")
+                return ""
+            logger.exception(
+                f"Error formatting the HTML content with the '{template_formatter.name}' "
+                f"formatter; retrying with '{SoupTemplateFormatter.name}'."
+            )
+
+        try:
+            return SoupTemplateFormatter().format_html(html_string)
         except Exception as e:
             logger.exception("Error formatting the HTML content.")
             return ""
 
     def format_css(self, css_content: str) -> str:
         """
-        Formats CSS content with proper indentation using cssutils.
+        Formats CSS content with proper indentation.
 
         Args:
             css_content (str): The raw CSS content.
@@ -113,31 +231,4 @@ class GetULPTemplateIntentHandler(BaseIntentHandler):
         Returns:
             str: The formatted CSS content.
         """
-        try:
-            import cssutils
-
-            # Suppress cssutils warnings and errors
-            cssutils.log.setLevel(logging.CRITICAL)
-
-            # Set serializer preferences
-            cssutils.ser.prefs.indent = '    '  # 4 spaces
-            cssutils.ser.prefs.keepAllProperties = True
-            cssutils.ser.prefs.lineSeparator = '\n'
-            cssutils.ser.prefs.omitLastSemicolon = False
-            cssutils.ser.prefs.validOnly = False  # Include all rules, even if invalid
-
-            # Parse the CSS content
-            sheet = cssutils.parseString(css_content, validate=False)
-            formatted_css = sheet.cssText.decode('utf-8')
-
-            # Post-process to add newlines between rules
-            formatted_css = formatted_css.replace('}\n', '}\n\n')
-
-            return formatted_css
-
-        except ImportError as e:
-            logger.exception("cssutils library is not installed.")
-            raise ImportError("Please install 'cssutils' to format CSS.") from e
-        except Exception as e:
-            logger.exception("Error formatting the CSS content.")
-            return css_content  # Return unformatted CSS as a fallback
+        return template_formatter.format_css(css_content)
@@ -1,8 +1,7 @@
-import json
 import logging
-from typing import Any, Dict, Tuple
+from typing import IO, Any, Dict, Tuple, Union
 
-from .base_intent_handler import BaseIntentHandler
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
 from ...utils.constants import (
     GET_USER_BY_ID_INTENT,
     MAX_MESSAGE_LENGTH,
@@ -10,10 +9,12 @@ from ...utils.constants import (
     NO_DATA_MESSAGE,
     USER_ID_PARAM,
 )
+from ...utils.json_stream import stream_json
 
 logger = logging.getLogger(__name__)
 
 
+@register_intent_handler
 class GetUserByIdIntentHandler(BaseIntentHandler):
     """
     Intent handler for retrieving a user by ID.
@@ -65,11 +66,9 @@ class GetUserByIdIntentHandler(BaseIntentHandler):
 
             formatted_response = self.format_response(response_data)
 
-            # Check if the formatted response exceeds Slack's limit
-            if len(formatted_response) > MAX_MESSAGE_LENGTH:
-                needs_file_upload = True
-            else:
-                needs_file_upload = False
+            # Responses past Slack's limit come back as a file to upload
+            needs_file_upload = not isinstance(formatted_response, str)
+            if not needs_file_upload:
                 formatted_response = (
                     f"{MULTILINE_CODE_DELIMITER}{formatted_response}{MULTILINE_CODE_DELIMITER}"
                 )
@@ -80,15 +79,15 @@ class GetUserByIdIntentHandler(BaseIntentHandler):
             logger.exception("Error handling GetUserById intent.")
             return f"An error occurred: {str(e)}", False, None
 
-    def format_response(self, res: Any) -> str:
+    def format_response(self, res: Any) -> Union[str, IO[bytes]]:
         """
-        Pretty print JSON response from Auth0.
+        Pretty print JSON response from Auth0, streaming it to a file when it is too
+        long for a Slack message.
 
         Args:
             res (Any): The response data from the API.
 
         Returns:
-            str: The formatted JSON string.
+            Union[str, IO[bytes]]: The formatted JSON string, or a file holding it.
         """
-        formatted_json = json.dumps(res, indent=4)
-        return formatted_json
+        return stream_json(res, MAX_MESSAGE_LENGTH)
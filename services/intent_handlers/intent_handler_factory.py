@@ -1,13 +1,37 @@
-from typing import Optional
+import importlib
+import logging
+import threading
+from typing import Dict, Optional
 
-from .get_active_users_count_intent_handler import GetActiveUsersCountIntentHandler
-from .get_stats_intent_handler import GetStatsIntentHandler
-from .get_tenant_settings_intent_handler import GetTenantSettingsIntentHandler
-from .get_ulp_template_intent_handler import GetULPTemplateIntentHandler
-from .get_user_by_id_handler import GetUserByIdIntentHandler
-from .search_user_by_email_handler import SearchUsersByEmailIntentHandler
+from .base_intent_handler import INTENT_HANDLER_REGISTRY, BaseIntentHandler
+from ...utils.constants import (
+    BATCH_USER_LOOKUP_INTENT,
+    EXPORT_USERS_INTENT,
+    GET_ACTIVE_USERS_COUNT_INTENT,
+    GET_STATS_INTENT,
+    GET_TENANT_SETTINGS_INTENT,
+    GET_ULP_TEMPLATE_INTENT,
+    GET_USER_BY_ID_INTENT,
+    SEARCH_USERS_BY_EMAIL_INTENT,
+    SEARCH_USERS_INTENT,
+)
 
-from .base_intent_handler import BaseIntentHandler
+logger = logging.getLogger(__name__)
+
+# Intent name -> module (in this package) defining its handler. Modules are only
+# imported the first time their intent is dispatched, so heavy dependencies such as
+# bs4/cssutils for the ULP template never load for bots that don't use them.
+INTENT_HANDLER_MODULES: Dict[str, str] = {
+    GET_USER_BY_ID_INTENT: ".get_user_by_id_handler",
+    SEARCH_USERS_BY_EMAIL_INTENT: ".search_user_by_email_handler",
+    SEARCH_USERS_INTENT: ".search_users_handler",
+    EXPORT_USERS_INTENT: ".export_users_handler",
+    BATCH_USER_LOOKUP_INTENT: ".batch_user_lookup_handler",
+    GET_ACTIVE_USERS_COUNT_INTENT: ".get_active_users_count_intent_handler",
+    GET_TENANT_SETTINGS_INTENT: ".get_tenant_settings_intent_handler",
+    GET_STATS_INTENT: ".get_stats_intent_handler",
+    GET_ULP_TEMPLATE_INTENT: ".get_ulp_template_intent_handler",
+}
 
 
 class IntentHandlerFactory:
@@ -17,16 +41,10 @@ class IntentHandlerFactory:
 
     def __init__(self):
         """
-        Initialize the IntentHandlerFactory with all available handlers.
+        Initialize the IntentHandlerFactory. Handlers are created on first dispatch.
         """
-        self.handlers = [
-            GetUserByIdIntentHandler(),
-            SearchUsersByEmailIntentHandler(),
-            GetActiveUsersCountIntentHandler(),
-            GetTenantSettingsIntentHandler(),
-            GetStatsIntentHandler(),
-            GetULPTemplateIntentHandler(),
-        ]
+        self.handlers: Dict[str, BaseIntentHandler] = {}
+        self._lock = threading.Lock()
 
     def get_handler(self, intent_name: str) -> Optional[BaseIntentHandler]:
         """
@@ -38,7 +56,43 @@ class IntentHandlerFactory:
         Returns:
             Optional[BaseIntentHandler]: The handler instance if found, else None.
         """
-        for handler in self.handlers:
-            if handler.can_handle(intent_name):
-                return handler
-        return None  # No handler found for the intent
+        handler = self.handlers.get(intent_name)
+        if handler is not None:
+            return handler
+
+        if (
+            intent_name not in INTENT_HANDLER_REGISTRY
+            and intent_name not in INTENT_HANDLER_MODULES
+        ):
+            return None  # No handler found for the intent
+
+        with self._lock:
+            handler = self.handlers.get(intent_name)
+            if handler is None:
+                handler_cls = self._load_handler_class(intent_name)
+                if handler_cls is None:
+                    return None
+                handler = handler_cls()
+                self.handlers[intent_name] = handler
+            return handler
+
+    @staticmethod
+    def _load_handler_class(intent_name: str):
+        """
+        Import the handler module for an intent, which registers its handler class.
+
+        Args:
+            intent_name (str): The name of the intent.
+
+        Returns:
+            The registered handler class, or None if the module didn't register one.
+        """
+        if intent_name not in INTENT_HANDLER_REGISTRY:
+            module_name = INTENT_HANDLER_MODULES[intent_name]
+            logger.debug(f"Loading handler module {module_name} for intent {intent_name}")
+            importlib.import_module(module_name, __package__)
+
+        handler_cls = INTENT_HANDLER_REGISTRY.get(intent_name)
+        if handler_cls is None:
+            logger.error(f"Module for intent {intent_name} did not register a handler.")
+        return handler_cls
@@ -0,0 +1,127 @@
+import logging
+from typing import IO, Any, Dict, Iterable, Optional, Tuple, Union
+
+from .base_intent_handler import BaseIntentHandler, register_intent_handler
+from ...utils.constants import (
+    AUTH0_USER_SEARCH_MAX_RESULTS,
+    EXPORT_FORMAT_PARAM,
+    NO_DATA_MESSAGE,
+    SEARCH_QUERY_PARAM,
+    SEARCH_USERS_INTENT,
+    USER_SEARCH_CSV_FIELDS,
+    USER_SEARCH_FILENAME,
+)
+from ...utils.record_export import CSV_FORMAT, EXPORT_FORMATS, spool_records
+
+logger = logging.getLogger(__name__)
+
+# User attributes requested for the CSV columns; the connection comes from identities
+CSV_API_FIELDS = ",".join(
+    [field for field in USER_SEARCH_CSV_FIELDS if field != "connection"] + ["identities"]
+)
+
+
+@register_intent_handler
+class SearchUsersIntentHandler(BaseIntentHandler):
+    """
+    Intent handler for Lucene searches of the users endpoint, exported as a file.
+    """
+
+    INTENT_NAME = SEARCH_USERS_INTENT
+
+    def can_handle(self, intent_name: str) -> bool:
+        """
+        Determines if this handler can handle the given intent.
+
+        Args:
+            intent_name (str): The name of the intent.
+
+        Returns:
+            bool: True if it can handle the intent, False otherwise.
+        """
+        return intent_name == self.INTENT_NAME
+
+    def handle_intent(
+        self, parameters: Dict[str, Any], auth0_service
+    ) -> Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
+        """
+        Liaises with the Auth0 Management API to search users page by page, writing
+        each page to a CSV or NDJSON file while the next one is fetched.
+
+        Args:
+            parameters (Dict[str, Any]): Parameters extracted from the user's message.
+            auth0_service: The Auth0 service instance for making API calls.
+
+        Returns:
+            Union[Tuple[str, bool, Optional[str]], Tuple[Union[str, IO[bytes]], bool, str, str]]:
+            A tuple containing the file of matching users, a flag indicating if file
+            upload is needed, the number of users found, and the file name.
+        """
+        query = (parameters.get(SEARCH_QUERY_PARAM) or "").strip()
+        if not query:
+            logger.error("Search query parameter is missing.")
+            return "A search query is required to search for users.", False, None
+
+        export_format = (parameters.get(EXPORT_FORMAT_PARAM) or CSV_FORMAT).lower()
+        if export_format not in EXPORT_FORMATS:
+            return (
+                f"Unsupported export format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}.",
+                False,
+                None,
+            )
+
+        query_params = {"q": query, "search_engine": "v3"}
+        if export_format == CSV_FORMAT:
+            query_params.update(fields=CSV_API_FIELDS, include_fields="true")
+
+        try:
+            logger.debug(f"Searching users: {query}")
+            users = auth0_service.paginate(
+                'users', query_params, max_results=AUTH0_USER_SEARCH_MAX_RESULTS
+            )
+            payload, count = self.format_response(users, export_format)
+            if not count:
+                payload.close()
+                logger.info(f"No users found for query {query}.")
+                return NO_DATA_MESSAGE, False, None
+
+            summary = f"{count} users matched `{query}`."
+            if count >= AUTH0_USER_SEARCH_MAX_RESULTS:
+                summary += (
+                    f" Auth0 returns at most {AUTH0_USER_SEARCH_MAX_RESULTS} users per search;"
+                    " narrow the query to see the rest."
+                )
+            return payload, True, summary, USER_SEARCH_FILENAME.format(export_format=export_format)
+
+        except Exception as e:
+            logger.exception("Error handling SearchUsers intent.")
+            return f"An error occurred: {str(e)}", False, None
+
+    def format_response(
+        self, res: Iterable[dict], export_format: str = CSV_FORMAT
+    ) -> Tuple[IO[bytes], int]:
+        """
+        Write users to a file as they arrive.
+
+        Args:
+            res (Iterable[dict]): The users, e.g. from the paginator.
+            export_format (str): "csv" or "ndjson".
+
+        Returns:
+            Tuple[IO[bytes], int]: The file and the number of users in it.
+        """
+        return spool_records(res, export_format, USER_SEARCH_CSV_FIELDS, self.csv_row)
+
+    @staticmethod
+    def csv_row(user: dict) -> dict:
+        """
+        Flatten a user into a CSV row.
+
+        Args:
+            user (dict): The user from the Management API.
+
+        Returns:
+            dict: The row, with the connection of the user's primary identity.
+        """
+        identities = user.get("identities") or [{}]
+        return dict(user, connection=identities[0].get("connection"))
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Dict, List, Optional, Tuple
+
+from ..config.container import container
+from ..utils.constants import EXPORT_JOB_POLL_WORKERS
+
+logger = logging.getLogger(__name__)
+
+
+class PendingUpload(ABC):
+    """
+    A file an intent handler produces after its reply has been sent.
+
+    Handlers return one as their payload. The Slack layer calls ``start`` with
+    callbacks that post into the conversation, and the work then runs on the job
+    poller rather than holding a Slack worker.
+    """
+
+    @abstractmethod
+    def start(
+        self,
+        deliver: Callable[[IO[bytes], str], None],
+        notify: Callable[[str], None],
+    ) -> None:
+        """
+        Start the background work.
+
+        Args:
+            deliver (Callable[[IO[bytes], str], None]): Uploads a file under a filename.
+            notify (Callable[[str], None]): Posts a message, e.g. to report a failure.
+        """
+        pass
+
+
+class JobPoller:
+    """
+    Background scheduler for checks that repeat until a long-running job finishes.
+
+    A single timer thread keeps the checks in a heap ordered by due time and hands
+    each one to a small worker pool when it is due. A check returns the seconds to
+    wait before the next one, or None when it is done.
+    """
+
+    def __init__(self, workers: int = EXPORT_JOB_POLL_WORKERS):
+        """
+        Initialize the poller. The timer thread starts with the first scheduled check.
+
+        Args:
+            workers (int): Checks run concurrently.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-poller")
+        self._due: List[Tuple[float, int, Callable[[], Optional[float]]]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+
+    def schedule(self, check: Callable[[], Optional[float]], delay: float) -> None:
+        """
+        Run a check after a delay, and again after every delay it returns.
+
+        Args:
+            check (Callable[[], Optional[float]]): Returns the seconds until the next
+                check, or None when the job is finished.
+            delay (float): Seconds before the first check.
+
+        Raises:
+            RuntimeError: If the poller has been closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The job poller is closed.")
+            self.active += 1
+            self._push(check, delay)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="job-poller-timer", daemon=True
+                )
+                self._thread.start()
+
+    def _push(self, check: Callable[[], Optional[float]], delay: float) -> None:
+        heapq.heappush(self._due, (time.monotonic() + delay, next(self._sequence), check))
+        self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if not self._due:
+                        self._condition.wait()
+                        continue
+                    wait = self._due[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if self._closed:
+                    return
+                _, _, check = heapq.heappop(self._due)
+            try:
+                self._executor.submit(self._check, check)
+            except RuntimeError:
+                # Closed while the check was being handed over
+                return
+
+    def _check(self, check: Callable[[], Optional[float]]) -> None:
+        try:
+            delay = check()
+        except Exception as e:
+            logger.exception("Background job check failed; dropping the job.")
+            with self._condition:
+                self.active -= 1
+                self.failed += 1
+            return
+
+        with self._condition:
+            if delay is None:
+                self.active -= 1
+                self.completed += 1
+            elif not self._closed:
+                self._push(check, delay)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the poller counters.
+
+        Returns:
+            Dict[str, int]: Jobs being polled, and jobs finished or dropped after an error.
+        """
+        with self._condition:
+            return {
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def close(self) -> None:
+        """
+        Stop the timer thread and abandon the jobs that are still running.
+        """
+        with self._condition:
+            self._closed = True
+            if self.active:
+                logger.warning(f"Abandoning {self.active} background jobs on shutdown.")
+            self._condition.notify_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+job_poller = container.register("job_poller", JobPoller, close=JobPoller.close)
@@ -0,0 +1,341 @@
+import logging
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ..utils.constants import (
+    BATCH_LOOKUP_MAX_USERS,
+    BATCH_USER_LOOKUP_INTENT,
+    EMAIL_PARAM,
+    EMAILS_PARAM,
+    EXPORT_FORMAT_PARAM,
+    EXPORT_USERS_INTENT,
+    GET_ACTIVE_USERS_COUNT_INTENT,
+    GET_STATS_INTENT,
+    GET_TENANT_SETTINGS_INTENT,
+    GET_ULP_TEMPLATE_INTENT,
+    GET_USER_BY_ID_INTENT,
+    LOCAL_INTENT_CONFIDENCE_THRESHOLD,
+    LOCAL_INTENT_ENABLED,
+    LOCAL_INTENT_FULFILLMENT_TEXTS,
+    SEARCH_QUERY_PARAM,
+    SEARCH_USERS_BY_EMAIL_INTENT,
+    SEARCH_USERS_INTENT,
+    USER_ID_PARAM,
+    USER_IDS_PARAM,
+)
+
+logger = logging.getLogger(__name__)
+
+# Auth0 user IDs are '<provider>|<id>', where the id may itself contain '|' (e.g. samlp|conn|user)
+USER_ID_PATTERN = re.compile(r'(?<![\w|])[a-z0-9][\w-]*(?:\|[\w.@+-]+)+', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+
+# "search users where <lucene query> [as csv|ndjson]"; the query keeps its case
+USER_SEARCH_PATTERN = re.compile(
+    r'^\s*(?:search|find|list|export)\s+(?:all\s+)?users\s+(?:where|matching)\s+'
+    r'(?P<query>.+?)(?:\s+as\s+(?P<format>csv|ndjson))?\s*$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+USER_KEYWORDS = re.compile(r'\b(users?|usr|id|details?|info(?:rmation)?|json|profile)\b')
+SEARCH_KEYWORDS = re.compile(r'\b(find|search|look\s*up|lookup|users?|email|details?)\b')
+TENANT_SETTINGS_PATTERN = re.compile(r'\btenant\'?s?\b.*\b(settings?|config(?:uration)?s?)\b|\b(settings?|config(?:uration)?s?)\b.*\btenant\b')
+ACTIVE_USERS_PATTERN = re.compile(r'\b(mau|monthly active users?|active users?)\b')
+ULP_PATTERN = re.compile(r'\b(ulp|universal login)\b')
+EXPORT_USERS_PATTERN = re.compile(r'\b(export|dump|download)\s+(all\s+|every\s+)?(the\s+|our\s+|my\s+)?users\b')
+STATS_PATTERN = re.compile(r'\b(daily )?(stats|statistics)\b')
+# Dates need Dialogflow's system entities to resolve, so any of these defer to it
+DATE_WORDS_PATTERN = re.compile(
+    r'\b(today|yesterday|tomorrow|since|from|to|until|between|last|past|this|next|ago|'
+    r'day|days|week|weeks|month|months|year|years|'
+    r'jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|'
+    r'january|february|march|april|june|july|august|september|october|november|december|'
+    r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|\d{1,4})\b'
+)
+
+
+class IntentMatch(NamedTuple):
+    """A locally detected intent and how sure the engine is about it."""
+
+    intent: str
+    parameters: Dict[str, str]
+    confidence: float
+
+
+class RuleBasedIntentEngine:
+    """
+    Precompiled keyword and pattern rules for the bot's narrow, single-turn intents.
+    """
+
+    def classify(self, text: str) -> Optional[IntentMatch]:
+        """
+        Classify a message.
+
+        Args:
+            text (str): The sanitized message text.
+
+        Returns:
+            Optional[IntentMatch]: The best match, or None if no rule applies.
+        """
+        return self._best(self.classify_all(text))
+
+    def classify_all(self, text: str) -> List[IntentMatch]:
+        """
+        Find every intent a message asks for.
+
+        Args:
+            text (str): The sanitized message text.
+
+        Returns:
+            List[IntentMatch]: The matches, each with its own confidence.
+        """
+        lowered = text.casefold()
+        matches: List[IntentMatch] = []
+
+        search = USER_SEARCH_PATTERN.match(text)
+        if search:
+            # Inline code keeps Slack from formatting query characters such as '_'
+            parameters = {SEARCH_QUERY_PARAM: search.group("query").strip("` \n")}
+            if search.group("format"):
+                parameters[EXPORT_FORMAT_PARAM] = search.group("format").lower()
+            return [IntentMatch(SEARCH_USERS_INTENT, parameters, 0.95)]
+
+        user_ids, emails = self.identifiers(text)
+        if len(user_ids) + len(emails) > 1:
+            # Pasted lists of users are looked up together rather than one by one
+            parameters = {
+                USER_IDS_PARAM: user_ids[:BATCH_LOOKUP_MAX_USERS],
+                EMAILS_PARAM: emails[:max(0, BATCH_LOOKUP_MAX_USERS - len(user_ids))],
+            }
+            return [IntentMatch(BATCH_USER_LOOKUP_INTENT, parameters, 0.95)]
+
+        if len(user_ids) == 1:
+            confidence = 0.95 if USER_KEYWORDS.search(lowered) else 0.8
+            matches.append(
+                IntentMatch(GET_USER_BY_ID_INTENT, {USER_ID_PARAM: user_ids[0]}, confidence)
+            )
+        if len(emails) == 1:
+            confidence = 0.95 if SEARCH_KEYWORDS.search(lowered) else 0.8
+            matches.append(
+                IntentMatch(SEARCH_USERS_BY_EMAIL_INTENT, {EMAIL_PARAM: emails[0]}, confidence)
+            )
+        if user_ids or emails:
+            # Identifiers dominate; keyword intents never take identifiers
+            return matches
+
+        if TENANT_SETTINGS_PATTERN.search(lowered):
+            matches.append(IntentMatch(GET_TENANT_SETTINGS_INTENT, {}, 0.9))
+        if ACTIVE_USERS_PATTERN.search(lowered):
+            matches.append(IntentMatch(GET_ACTIVE_USERS_COUNT_INTENT, {}, 0.9))
+        if EXPORT_USERS_PATTERN.search(lowered):
+            matches.append(IntentMatch(EXPORT_USERS_INTENT, {}, 0.9))
+        if ULP_PATTERN.search(lowered):
+            matches.append(IntentMatch(GET_ULP_TEMPLATE_INTENT, {}, 0.9))
+        if STATS_PATTERN.search(lowered) and not DATE_WORDS_PATTERN.search(lowered):
+            matches.append(IntentMatch(GET_STATS_INTENT, {}, 0.9))
+
+        return matches
+
+    @staticmethod
+    def identifiers(text: str) -> Tuple[List[str], List[str]]:
+        """
+        Find the user IDs and emails in a message.
+
+        Args:
+            text (str): The sanitized message text.
+
+        Returns:
+            Tuple[List[str], List[str]]: The distinct user IDs and emails, in message
+            order. Emails differing only in case count once.
+        """
+        user_ids = list(dict.fromkeys(USER_ID_PATTERN.findall(text)))
+        emails = {}
+        for email in EMAIL_PATTERN.findall(text):
+            # An email embedded in a user ID (samlp|conn|jane@x.com) belongs to the ID
+            if not any(email in user_id for user_id in user_ids):
+                emails.setdefault(email.lower(), email)
+        return user_ids, list(emails.values())
+
+    @staticmethod
+    def _best(matches: List[IntentMatch]) -> Optional[IntentMatch]:
+        if not matches:
+            return None
+        if len(matches) == 1:
+            return matches[0]
+        # Several intents fit, which is exactly the case Dialogflow should decide
+        best = max(matches, key=lambda match: match.confidence)
+        return best._replace(confidence=best.confidence / len(matches))
+
+
+class LocalIntentService:
+    """
+    Fast path that answers confident intent matches locally and leaves the rest to Dialogflow.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        confidence_threshold: float = LOCAL_INTENT_CONFIDENCE_THRESHOLD,
+        enabled: bool = LOCAL_INTENT_ENABLED,
+    ):
+        """
+        Initialize the LocalIntentService.
+
+        Args:
+            engine: Any object with a ``classify(text) -> Optional[IntentMatch]`` method.
+                Defaults to RuleBasedIntentEngine.
+            confidence_threshold (float): Minimum confidence to skip Dialogflow.
+            enabled (bool): Whether the fast path is used at all.
+        """
+        self.engine = engine or RuleBasedIntentEngine()
+        self.confidence_threshold = confidence_threshold
+        self.enabled = enabled
+        self.hits = 0
+        self.low_confidence = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def detect_intent(self, text: str) -> Optional[Tuple[str, str, dict]]:
+        """
+        Detect an intent locally.
+
+        Args:
+            text (str): The sanitized message text.
+
+        Returns:
+            Optional[Tuple[str, str, dict]]: The detected intent, fulfillment text and
+            parameters in the same shape as DialogflowService, or None to fall back.
+        """
+        if not self.enabled or not text:
+            return None
+
+        try:
+            match = self.engine.classify(text)
+        except Exception as e:
+            logger.exception("Local intent engine failed; falling back to Dialogflow.")
+            match = None
+
+        with self._lock:
+            if match is None:
+                self.misses += 1
+                return None
+            if match.confidence < self.confidence_threshold:
+                self.low_confidence += 1
+                logger.debug(
+                    f"Local match {match.intent} below threshold ({match.confidence:.2f})"
+                )
+                return None
+            self.hits += 1
+
+        logger.debug(f"Local fast path matched {match.intent} ({match.confidence:.2f})")
+        fulfillment_text = LOCAL_INTENT_FULFILLMENT_TEXTS.get(match.intent, "")
+        return match.intent, fulfillment_text, dict(match.parameters)
+
+    def detect_intents(self, text: str) -> Optional[List[Tuple[str, str, dict]]]:
+        """
+        Detect a compound message asking for several intents at once.
+
+        Args:
+            text (str): The sanitized message text.
+
+        Returns:
+            Optional[List[Tuple[str, str, dict]]]: The detected intents, fulfillment
+            texts and parameters when at least two rules match confidently, otherwise
+            None so the message goes through ``detect_intent``.
+        """
+        classify_all = getattr(self.engine, "classify_all", None)
+        if not self.enabled or not text or classify_all is None:
+            return None
+
+        try:
+            matches = classify_all(text)
+        except Exception as e:
+            logger.exception("Local intent engine failed; falling back to single intent detection.")
+            return None
+
+        if len(matches) < 2 or any(
+            match.confidence < self.confidence_threshold for match in matches
+        ):
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        logger.debug(f"Local fast path matched {[match.intent for match in matches]}")
+        return [
+            (match.intent, LOCAL_INTENT_FULFILLMENT_TEXTS.get(match.intent, ""), dict(match.parameters))
+            for match in matches
+        ]
+
+    def is_batch_lookup(self, queries: List[str]) -> bool:
+        """
+        Tell whether the lines of a message are a pasted list of users to look up
+        together, rather than separate queries.
+
+        Args:
+            queries (List[str]): The lines of the message.
+
+        Returns:
+            bool: True when at least two lines name users and the other lines, such
+            as "can you look these up:", ask for nothing else the rules know.
+        """
+        identifiers = getattr(self.engine, "identifiers", None)
+        classify_all = getattr(self.engine, "classify_all", None)
+        if not self.enabled or identifiers is None or classify_all is None:
+            return False
+
+        try:
+            lookup_lines = 0
+            for query in queries:
+                user_ids, emails = identifiers(query)
+                if user_ids or emails:
+                    lookup_lines += 1
+                elif classify_all(query):
+                    return False
+        except Exception as e:
+            logger.exception("Local intent engine failed; answering the lines separately.")
+            return False
+        return lookup_lines > 1
+
+    def is_single_query(self, message: str, queries: List[str]) -> bool:
+        """
+        Tell whether the lines of a message are one query written over several
+        lines, such as a user search with its Lucene query on the following lines.
+
+        Args:
+            message (str): The whole sanitized message text.
+            queries (List[str]): The lines of the message.
+
+        Returns:
+            bool: True when the whole message confidently matches a single rule
+            and none of its lines matches a rule on its own.
+        """
+        classify_all = getattr(self.engine, "classify_all", None)
+        if not self.enabled or classify_all is None:
+            return False
+
+        try:
+            matches = classify_all(message)
+            if len(matches) != 1 or matches[0].confidence < self.confidence_threshold:
+                return False
+            return not any(classify_all(query) for query in queries)
+        except Exception as e:
+            logger.exception("Local intent engine failed; answering the lines separately.")
+            return False
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the fast-path counters.
+
+        Returns:
+            Dict[str, float]: Hits, low-confidence matches, misses and the hit rate.
+        """
+        with self._lock:
+            total = self.hits + self.low_confidence + self.misses
+            return {
+                "hits": self.hits,
+                "low_confidence": self.low_confidence,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,93 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+from ..config.container import container
+from ..utils.constants import AUTH0_PAGE_PREFETCH_WORKERS, AUTH0_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+page_prefetch_executor = container.register(
+    "auth0_page_prefetch_executor",
+    lambda: ThreadPoolExecutor(
+        max_workers=AUTH0_PAGE_PREFETCH_WORKERS, thread_name_prefix="auth0-prefetch"
+    ),
+    close=lambda executor: executor.shutdown(wait=False, cancel_futures=True),
+)
+
+
+def paginate(
+    get: Callable[[str, dict], Any],
+    endpoint: str,
+    query_params: Optional[dict] = None,
+    items_key: Optional[str] = None,
+    per_page: int = AUTH0_PAGE_SIZE,
+    max_results: Optional[int] = None,
+) -> Iterator[dict]:
+    """
+    Iterate over every item of a paginated Management API endpoint.
+
+    Pages are requested with ``page``/``per_page``/``include_totals``. The first
+    page is fetched before this returns, so its errors surface at the call. While
+    the caller consumes one page, the next is already being fetched on the prefetch
+    pool, so at most two pages are held in memory however many items there are.
+
+    Args:
+        get (Callable[[str, dict], Any]): Makes a GET request, e.g. ``Auth0Service.get``.
+        endpoint (str): The API endpoint, e.g. 'users'.
+        query_params (Optional[dict]): Query parameters sent with every page.
+        items_key (Optional[str]): Key of the items in the response; defaults to the
+            last segment of the endpoint.
+        per_page (int): Items per page.
+        max_results (Optional[int]): Stop after this many items.
+
+    Returns:
+        Iterator[dict]: The items, in the order Auth0 returns them.
+
+    Raises:
+        Exception: Whatever ``get`` raises for the first page.
+    """
+    items_key = items_key or endpoint.rsplit('/', 1)[-1]
+
+    def fetch(page: int) -> Any:
+        params = dict(query_params or {}, page=page, per_page=per_page, include_totals='true')
+        return get(endpoint, params)
+
+    return _iterate_pages(fetch, fetch(0), items_key, per_page, max_results)
+
+
+def _iterate_pages(
+    fetch: Callable[[int], Any],
+    data: Any,
+    items_key: str,
+    per_page: int,
+    max_results: Optional[int],
+) -> Iterator[dict]:
+    page = 0
+    yielded = 0
+    pending: Optional[Future] = None
+    try:
+        while True:
+            items = data.get(items_key, []) if isinstance(data, dict) else data or []
+            total = data.get('total') if isinstance(data, dict) else None
+            fetched = page * per_page + len(items)
+            limits = [limit for limit in (total, max_results) if limit is not None]
+            has_more = len(items) == per_page and (not limits or fetched < min(limits))
+            if has_more:
+                pending = page_prefetch_executor.submit(fetch, page + 1)
+
+            for item in items:
+                if max_results is not None and yielded >= max_results:
+                    return
+                yield item
+                yielded += 1
+
+            if not has_more:
+                return
+            data = pending.result()
+            pending = None
+            page += 1
+    finally:
+        # The consumer stopped early; drop the page fetched ahead of it
+        if pending is not None:
+            pending.cancel()
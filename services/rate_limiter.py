@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from ..utils.constants import (
+    AUTH0_RATE_LIMIT_BURST,
+    AUTH0_RATE_LIMIT_DEFAULT_RETRY_AFTER,
+    AUTH0_RATE_LIMIT_MAX_WAIT,
+    AUTH0_RATE_LIMIT_RATE,
+)
+
+logger = logging.getLogger(__name__)
+
+TOO_MANY_REQUESTS = 429
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a request is shed because the tenant's rate limit budget won't
+    allow it within the maximum wait.
+    """
+
+    def __init__(self, auth0_base_url: str, retry_after: float):
+        """
+        Initialize the exception.
+
+        Args:
+            auth0_base_url (str): The tenant whose budget is exhausted.
+            retry_after (float): Seconds until a request would be allowed.
+        """
+        self.auth0_base_url = auth0_base_url
+        self.retry_after = retry_after
+        super().__init__(
+            f"Auth0 rate limit reached for {auth0_base_url}. "
+            f"Please try again in {max(1, round(retry_after))} seconds."
+        )
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket mirroring one tenant's Auth0 rate limit.
+
+    Requests reserve a token up front; when the bucket is empty the reservation
+    puts it in debt and the caller waits until the debt has been refilled, so
+    concurrent callers queue in order without polling.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            capacity (float): Maximum number of tokens (the burst size).
+            rate (float): Tokens added per second.
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self.updated_at = time.monotonic()
+        self.throttled = 0
+        self.shed = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve a token.
+
+        Args:
+            max_wait (float): Longest acceptable wait in seconds.
+
+        Returns:
+            Optional[float]: Seconds to wait before sending, or None if the request
+            should be shed because the wait would exceed max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            deficit = max(0.0, 1 - self.tokens)
+            wait = max(self.blocked_until - now, deficit / self.rate)
+            if wait > max_wait:
+                self.shed += 1
+                return None
+            self.tokens -= 1
+            if wait > 0:
+                self.throttled += 1
+            return wait
+
+    def retry_after(self) -> float:
+        """
+        Get the time until the next request would be allowed.
+
+        Returns:
+            float: Seconds until a token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            deficit = max(0.0, 1 - self.tokens)
+            return max(self.blocked_until - now, deficit / self.rate)
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Align the bucket with the budget Auth0 reported.
+
+        Args:
+            status_code (int): The response status code.
+            headers (Mapping[str, str]): The response headers.
+        """
+        limit = _header_float(headers, "X-RateLimit-Limit")
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset = _header_float(headers, "X-RateLimit-Reset")  # UTC epoch seconds
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            until_reset = None if reset is None else max(0.0, reset - time.time())
+
+            if limit:
+                self.capacity = limit
+            if remaining is not None:
+                # Other replicas spend the same budget, so trust Auth0's count
+                self.tokens = min(self.tokens, remaining)
+                if limit and until_reset and remaining < limit:
+                    # The bucket refills from `remaining` to `limit` by the reset time
+                    self.rate = (limit - remaining) / until_reset
+
+            if status_code == TOO_MANY_REQUESTS:
+                self.rate_limited += 1
+                retry_after = _header_float(headers, "Retry-After")
+                if retry_after is None:
+                    retry_after = until_reset or AUTH0_RATE_LIMIT_DEFAULT_RETRY_AFTER
+                self.tokens = min(self.tokens, 0.0)
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the bucket state and counters.
+
+        Returns:
+            Dict[str, float]: Budget, tokens left and throttled, shed and 429 counts.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "capacity": self.capacity,
+                "rate": self.rate,
+                "tokens": round(self.tokens, 2),
+                "throttled": self.throttled,
+                "shed": self.shed,
+                "rate_limited": self.rate_limited,
+            }
+
+
+class Auth0RateLimiter:
+    """
+    Process-wide registry of per-tenant token buckets for the Management API.
+    """
+
+    def __init__(
+        self,
+        burst: float = AUTH0_RATE_LIMIT_BURST,
+        rate: float = AUTH0_RATE_LIMIT_RATE,
+        max_wait: float = AUTH0_RATE_LIMIT_MAX_WAIT,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            burst (float): Bucket size assumed for a tenant until Auth0 reports one.
+            rate (float): Refill rate assumed for a tenant until Auth0 reports one.
+            max_wait (float): Seconds a request may queue before it is shed.
+        """
+        self.burst = burst
+        self.rate = rate
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, auth0_base_url: str) -> TokenBucket:
+        """
+        Get the bucket for a tenant.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant.
+
+        Returns:
+            TokenBucket: The tenant's bucket.
+        """
+        with self._lock:
+            bucket = self._buckets.get(auth0_base_url)
+            if bucket is None:
+                bucket = self._buckets[auth0_base_url] = TokenBucket(self.burst, self.rate)
+            return bucket
+
+    def _reserve(self, auth0_base_url: str) -> float:
+        bucket = self.bucket(auth0_base_url)
+        wait = bucket.reserve(self.max_wait)
+        if wait is None:
+            retry_after = bucket.retry_after()
+            logger.warning(
+                f"Shedding Auth0 request for {auth0_base_url}; budget frees up in {retry_after:.1f}s"
+            )
+            raise RateLimitExceeded(auth0_base_url, retry_after)
+        if wait > 0:
+            logger.debug(f"Throttling Auth0 request for {auth0_base_url} by {wait:.2f}s")
+        return wait
+
+    def acquire(self, auth0_base_url: str) -> None:
+        """
+        Block until the tenant's budget allows a request.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant.
+
+        Raises:
+            RateLimitExceeded: If the request would have to wait longer than max_wait.
+        """
+        wait = self._reserve(auth0_base_url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, auth0_base_url: str) -> None:
+        """
+        Asyncio counterpart of ``acquire``.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant.
+
+        Raises:
+            RateLimitExceeded: If the request would have to wait longer than max_wait.
+        """
+        wait = self._reserve(auth0_base_url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_response(
+        self, auth0_base_url: str, status_code: int, headers: Mapping[str, str]
+    ) -> None:
+        """
+        Update the tenant's budget from a Management API response.
+
+        Args:
+            auth0_base_url (str): The base URL of the Auth0 tenant.
+            status_code (int): The response status code.
+            headers (Mapping[str, str]): The response headers.
+        """
+        self.bucket(auth0_base_url).update(status_code, headers)
+        if status_code == TOO_MANY_REQUESTS:
+            logger.warning(f"Auth0 rate limited requests for {auth0_base_url}")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get the state of every tenant's bucket.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Bucket stats keyed by tenant.
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {tenant: bucket.stats() for tenant, bucket in buckets.items()}
+
+    def clear(self) -> None:
+        """
+        Forget every tenant's budget.
+        """
+        with self._lock:
+            self._buckets.clear()
+
+
+auth0_rate_limiter = Auth0RateLimiter()
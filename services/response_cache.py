@@ -0,0 +1,257 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional
+
+from ..utils.constants import (
+    AUTH0_RESPONSE_CACHE_MAX_BYTES,
+    AUTH0_RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    AUTH0_RESPONSE_CACHE_TTLS,
+    DAILY_STATS_ENDPOINT,
+)
+
+logger = logging.getLogger(__name__)
+
+NOT_MODIFIED = 304
+_UNCACHEABLE = object()
+
+
+class CachedResponse:
+    """
+    A cached Management API response body with its validator.
+    """
+
+    __slots__ = ("data", "etag", "fresh_until", "size")
+
+    def __init__(self, data: Any, etag: Optional[str], fresh_until: Optional[float], size: int):
+        self.data = data
+        self.etag = etag
+        self.fresh_until = fresh_until
+        self.size = size
+
+    def is_fresh(self) -> bool:
+        """
+        Check whether the response may be served without asking Auth0.
+
+        Returns:
+            bool: True until the entry's TTL has passed; always True for immutable entries.
+        """
+        return self.fresh_until is None or time.monotonic() < self.fresh_until
+
+
+class ResponseCache:
+    """
+    Process-wide cache of Management API GET responses for slow-changing endpoints.
+
+    Entries are keyed by (credentials, endpoint, query params) and served until their
+    endpoint's TTL passes. The credentials are the caller's ``token_key``, so a
+    response is only served to callers holding the credentials that fetched it.
+    Stale entries that came with an ETag are kept so the next request can revalidate
+    them with If-None-Match; a 304 renews the entry without downloading the body
+    again. The cache is an LRU bounded by the total size of the response bodies it
+    holds.
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float] = AUTH0_RESPONSE_CACHE_TTLS,
+        max_bytes: int = AUTH0_RESPONSE_CACHE_MAX_BYTES,
+        max_entry_bytes: int = AUTH0_RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttls (Dict[str, float]): Seconds each cacheable endpoint is served from memory.
+            max_bytes (int): Total size of the cached response bodies.
+            max_entry_bytes (int): Size above which a response is not cached.
+        """
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(credentials: Hashable, endpoint: str, query_params: Optional[dict]) -> Hashable:
+        """
+        Build the cache key of a request.
+
+        Args:
+            credentials (Hashable): The caller's credential identity, from ``token_key``.
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+
+        Returns:
+            Hashable: The cache key.
+        """
+        # Values are stringified the way they go on the query string
+        params = tuple(sorted((name, str(value)) for name, value in (query_params or {}).items()))
+        return credentials, endpoint, params
+
+    def ttl(self, endpoint: str, query_params: Optional[dict]) -> Any:
+        """
+        Get how long a response may be served from the cache.
+
+        Args:
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+
+        Returns:
+            Any: Seconds of freshness, None if the response never changes, or
+            ``_UNCACHEABLE`` for endpoints that are not cached.
+        """
+        ttl = self.ttls.get(endpoint, _UNCACHEABLE)
+        if endpoint == DAILY_STATS_ENDPOINT and self._is_past_range(query_params):
+            return None
+        return ttl
+
+    @staticmethod
+    def _is_past_range(query_params: Optional[dict]) -> bool:
+        # Stats ranges are YYYYMMDD strings; without 'to' the range runs until today
+        to_date = (query_params or {}).get("to")
+        if not to_date:
+            return False
+        return str(to_date) < datetime.now(timezone.utc).strftime("%Y%m%d")
+
+    def is_cacheable(self, endpoint: str, query_params: Optional[dict]) -> bool:
+        """
+        Check whether responses of an endpoint are cached.
+
+        Args:
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+
+        Returns:
+            bool: True if the endpoint has a TTL.
+        """
+        return self.ttl(endpoint, query_params) is not _UNCACHEABLE
+
+    def lookup(
+        self, credentials: Hashable, endpoint: str, query_params: Optional[dict]
+    ) -> Optional[CachedResponse]:
+        """
+        Find the cached response of a request.
+
+        Args:
+            credentials (Hashable): The caller's credential identity, from ``token_key``.
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+
+        Returns:
+            Optional[CachedResponse]: A fresh entry to serve, a stale entry with an ETag
+            to revalidate, or None.
+        """
+        key = self.key(credentials, endpoint, query_params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.is_fresh():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            if entry.etag is None:
+                self._remove(key)
+                return None
+            return entry
+
+    def store(
+        self,
+        credentials: Hashable,
+        endpoint: str,
+        query_params: Optional[dict],
+        data: Any,
+        etag: Optional[str],
+        size: int,
+    ) -> None:
+        """
+        Cache a response body.
+
+        Args:
+            credentials (Hashable): The caller's credential identity, from ``token_key``.
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+            data (Any): The decoded response body.
+            etag (Optional[str]): The response's ETag header, if any.
+            size (int): The size of the response body in bytes.
+        """
+        ttl = self.ttl(endpoint, query_params)
+        if ttl is _UNCACHEABLE:
+            return
+        if size > self.max_entry_bytes:
+            logger.debug(f"Not caching {endpoint} response of {size} bytes")
+            return
+        fresh_until = None if ttl is None else time.monotonic() + ttl
+        key = self.key(credentials, endpoint, query_params)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = CachedResponse(data, etag, fresh_until, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+    def revalidated(
+        self, credentials: Hashable, endpoint: str, query_params: Optional[dict]
+    ) -> None:
+        """
+        Renew an entry after Auth0 answered 304 Not Modified.
+
+        Args:
+            credentials (Hashable): The caller's credential identity, from ``token_key``.
+            endpoint (str): The API endpoint.
+            query_params (Optional[dict]): The query parameters.
+        """
+        ttl = self.ttl(endpoint, query_params)
+        key = self.key(credentials, endpoint, query_params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or ttl is _UNCACHEABLE:
+                return
+            entry.fresh_until = None if ttl is None else time.monotonic() + ttl
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, 304 revalidations, evictions, entries and bytes held.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size,
+            }
+
+
+auth0_response_cache = ResponseCache()
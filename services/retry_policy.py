@@ -0,0 +1,100 @@
+import random
+from typing import Optional
+
+from ..utils.constants import (
+    AUTH0_RATE_LIMIT_MAX_RETRIES,
+    AUTH0_RETRY_BASE_DELAY,
+    AUTH0_RETRY_MAX_DELAY,
+    AUTH0_RETRY_MAX_RETRIES,
+)
+from .rate_limiter import TOO_MANY_REQUESTS
+
+
+class RetryPolicy:
+    """
+    Bounded retries with full-jitter exponential backoff for idempotent requests.
+
+    Network errors and 5xx responses are retried after a random delay between zero
+    and ``base_delay * 2 ** retry`` (capped at ``max_delay``), so callers that failed
+    together don't retry together. 429s are retried without extra delay because the
+    rate limiter already holds the next request until Retry-After has passed.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = AUTH0_RETRY_MAX_RETRIES,
+        base_delay: float = AUTH0_RETRY_BASE_DELAY,
+        max_delay: float = AUTH0_RETRY_MAX_DELAY,
+        max_rate_limit_retries: int = AUTH0_RATE_LIMIT_MAX_RETRIES,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries (int): Retries after network errors and 5xx responses.
+            base_delay (float): Backoff ceiling of the first retry in seconds.
+            max_delay (float): Upper bound of any single backoff in seconds.
+            max_rate_limit_retries (int): Retries after 429 responses.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+    def backoff(self, retry: int) -> float:
+        """
+        Get a jittered delay.
+
+        Args:
+            retry (int): Zero-based number of the retry.
+
+        Returns:
+            float: Seconds to sleep before the retry.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    def start(self) -> "RetryState":
+        """
+        Start tracking the attempts of one request.
+
+        Returns:
+            RetryState: The per-request retry counters.
+        """
+        return RetryState(self)
+
+
+class RetryState:
+    """
+    Retry counters of a single request.
+    """
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.retries = 0
+        self.rate_limit_retries = 0
+
+    def next_delay(self, status_code: Optional[int] = None) -> Optional[float]:
+        """
+        Decide whether to retry after an attempt.
+
+        Args:
+            status_code (Optional[int]): The response status, or None after a network error.
+
+        Returns:
+            Optional[float]: Seconds to wait before retrying, or None if the attempt is final.
+        """
+        if status_code == TOO_MANY_REQUESTS:
+            if self.rate_limit_retries >= self.policy.max_rate_limit_retries:
+                return None
+            self.rate_limit_retries += 1
+            return 0.0
+        if status_code is not None and status_code < 500:
+            return None
+        if self.retries >= self.policy.max_retries:
+            return None
+        delay = self.policy.backoff(self.retries)
+        self.retries += 1
+        return delay
+
+
+auth0_retry_policy = RetryPolicy()
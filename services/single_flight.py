@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """
+    An in-flight call whose result is shared with every caller of the same key.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    The first caller of a key runs the call; callers arriving while it is in flight
+    wait for it and receive the same result, or the same exception. Nothing is
+    remembered once the call completes, so later callers start a new one.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run a call, or join the identical one already in flight on another thread.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            fn (Callable[[], Any]): The call to run.
+
+        Returns:
+            Any: The call's result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            logger.debug(f"Joining in-flight call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asyncio counterpart of ``do``.
+
+        The call runs as its own task, so a caller being cancelled does not cancel
+        the call for the others waiting on it.
+
+        Args:
+            key (Hashable): Identifies identical calls.
+            fn (Callable[[], Awaitable[Any]]): Returns the coroutine to run.
+
+        Returns:
+            Any: The call's result.
+        """
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None:
+                self.shared += 1
+            else:
+                task = self._tasks[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda _: self._forget_task(key, task))
+                self.calls += 1
+        return await asyncio.shield(task)
+
+    def _forget_task(self, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the coalescing counters.
+
+        Returns:
+            Dict[str, int]: Calls run, calls that joined one in flight, and calls in flight.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+
+auth0_single_flight = SingleFlight()
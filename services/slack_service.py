@@ -1,48 +1,205 @@
 import logging
 import os
 
+import requests
 from slack_bolt import App
 from slack_bolt.adapter.fastapi import SlackRequestHandler
+from slack_bolt.response import BoltResponse
 from slack_sdk.errors import SlackApiError
+from starlette.concurrency import run_in_threadpool
 
-from ..controllers.message_controller import MessageController
+from ..config.container import container
+from ..dao.daily_stats_dao import daily_stats_dao
+from ..dao.formatted_template_dao import formatted_template_dao
 from ..dao.m2m_credentials_dao import m2m_credentials_dao
+from ..dao.slack_event_dao import slack_event_dao
 from ..utils.constants import (
     AUTH0_CREDENTIALS_SAVED_MESSAGE,
     CREDENTIALS_MODAL_CALLBACK_ID,
+    DEFAULT_UPLOAD_FILENAME,
     HELP_TEXT,
+    MESSAGE_QUEUE_BUSY_TEXT,
+    MESSAGE_QUEUE_DRAIN_TIMEOUT,
+    MESSAGE_QUEUE_SIZE,
+    MESSAGE_WORKERS,
+    SLACK_EVENT_DEDUP_MONGO_ENABLED,
+    STATS_STORE_MONGO_ENABLED,
+    ULP_FORMAT_CACHE_MONGO_ENABLED,
 )
+from .circuit_breaker import auth0_circuit_breakers
+from .event_deduplicator import EventDeduplicator
+from .http_session_pool import close_sessions
+from .job_poller import job_poller
+from .rate_limiter import auth0_rate_limiter
+from .response_cache import auth0_response_cache
+from .single_flight import auth0_single_flight
+from .slack_upload import stream_file_upload
+from .slack_views import credentials_modal_view
+from .work_queue import WorkQueue
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Retrieve Slack credentials from environment variables
-SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
-SLACK_TOKEN = os.getenv("SLACK_TOKEN")
 
-if not SIGNING_SECRET or not SLACK_TOKEN:
-    logger.error("Slack signing secret or token is not set in environment variables.")
-    raise ValueError("Slack signing secret or token is not set.")
+def create_slack_app() -> App:
+    """
+    Builds the Slack app and registers its listeners.
+
+    Returns:
+        App: The configured Slack app.
+
+    Raises:
+        ValueError: If the Slack signing secret or token is not set.
+    """
+    # Retrieve Slack credentials from environment variables
+    signing_secret = os.getenv("SLACK_SIGNING_SECRET")
+    slack_token = os.getenv("SLACK_TOKEN")
+
+    if not signing_secret or not slack_token:
+        logger.error("Slack signing secret or token is not set in environment variables.")
+        raise ValueError("Slack signing secret or token is not set.")
+
+    # Constructing the App calls auth.test, so it only happens on first use
+    app = App(
+        signing_secret=signing_secret,
+        token=slack_token,
+    )
+    app.use(deduplicate_events)
+    app.event("message")(handle_message_events)
+    app.command("/help")(handle_help_command)
+    app.command("/authorize")(open_credentials_modal)
+    app.view(CREDENTIALS_MODAL_CALLBACK_ID)(handle_credentials_submission)
+    return app
+
+
+def create_message_controller():
+    """
+    Builds the message controller.
+
+    Returns:
+        MessageController: The controller handling Slack messages.
+    """
+    # Imported here so the Dialogflow SDK only loads when the controller is built
+    from ..controllers.message_controller import MessageController
+
+    return MessageController()
+
 
-# Initialize the Slack app with secrets from the environment
-app = App(
-    signing_secret=SIGNING_SECRET,
-    token=SLACK_TOKEN,
+app_handler = container.register(
+    "slack_app_handler", lambda: SlackRequestHandler(create_slack_app())
 )
 
-app_handler = SlackRequestHandler(app)
+message_controller = container.register(
+    "message_controller", create_message_controller
+)
+
+message_work_queue = container.register(
+    "message_work_queue",
+    lambda: WorkQueue("messages", MESSAGE_WORKERS, MESSAGE_QUEUE_SIZE),
+)
+
+
+def create_event_deduplicator() -> EventDeduplicator:
+    """
+    Builds the deduplicator for Slack event retries.
+
+    Returns:
+        EventDeduplicator: In-memory, and backed by MongoDB when enabled.
+    """
+    store = slack_event_dao if SLACK_EVENT_DEDUP_MONGO_ENABLED else None
+    return EventDeduplicator(store=store)
+
+
+event_deduplicator = container.register(
+    "event_deduplicator", create_event_deduplicator
+)
+
+
+async def on_startup():
+    """
+    Builds the Slack stack and prepares the MongoDB collections.
+    """
+    await container.warm_up(
+        "m2m_credentials_dao",
+        "message_controller",
+        "slack_app_handler",
+        "message_work_queue",
+        "event_deduplicator",
+    )
+    await run_in_threadpool(m2m_credentials_dao.ensure_indexes)
+    if SLACK_EVENT_DEDUP_MONGO_ENABLED:
+        await run_in_threadpool(slack_event_dao.ensure_indexes)
+    if ULP_FORMAT_CACHE_MONGO_ENABLED:
+        await run_in_threadpool(formatted_template_dao.ensure_indexes)
+    if STATS_STORE_MONGO_ENABLED:
+        await run_in_threadpool(daily_stats_dao.ensure_indexes)
+
+
+async def on_shutdown():
+    """
+    Drains the queued message events, then closes the pooled Auth0 HTTP sessions.
+    """
+    if container.is_initialized("message_work_queue"):
+        await run_in_threadpool(message_work_queue.shutdown, MESSAGE_QUEUE_DRAIN_TIMEOUT)
+    await run_in_threadpool(close_sessions)
+
+
+def get_metrics() -> dict:
+    """
+    Collects the counters of the message pipeline services built so far.
+
+    Returns:
+        dict: Queue depth and job counts, duplicate events dropped, per-tenant Auth0
+        rate limit budgets and circuit states, the API response, credential, intent
+        and local fast-path caches, and background jobs such as user exports.
+    """
+    metrics = {
+        "auth0_rate_limits": auth0_rate_limiter.stats(),
+        "auth0_circuits": auth0_circuit_breakers.stats(),
+        "auth0_response_cache": auth0_response_cache.stats(),
+        "auth0_coalesced_requests": auth0_single_flight.stats(),
+    }
+    if container.is_initialized("message_work_queue"):
+        metrics["message_queue"] = message_work_queue.stats()
+    if container.is_initialized("event_deduplicator"):
+        metrics["event_deduplication"] = event_deduplicator.stats()
+    if container.is_initialized("m2m_credentials_dao"):
+        metrics["m2m_credentials_cache"] = m2m_credentials_dao.cache.stats()
+    if container.is_initialized("message_controller"):
+        # The controller has already loaded the Dialogflow module by now
+        from .dialogflow_service import detect_intent_cache
+
+        metrics["dialogflow_cache"] = detect_intent_cache.cache.stats()
+        metrics["local_intents"] = message_controller.local_intent_service.stats()
+    if container.is_initialized("job_poller"):
+        metrics["background_jobs"] = job_poller.stats()
+    return metrics
+
+
+def deduplicate_events(body: dict, next):
+    """
+    Acks Slack retries of events that were already received without processing them again.
+
+    Args:
+        body (dict): The request body from Slack.
+        next (callable): Function passing the request on to the listeners.
 
-message_controller = MessageController()
+    Returns:
+        BoltResponse: An empty acknowledgement for duplicates, otherwise the listeners' response.
+    """
+    if event_deduplicator.is_duplicate(body):
+        return BoltResponse(status=200, body="")
+    return next()
 
 
-@app.event("message")
-def handle_message_events(event: dict, say):
+def handle_message_events(event: dict, say, client):
     """
-    Processes message events and determines response and optional file upload if needed.
+    Queues message events for background processing so the event is acked at once.
 
     Args:
         event (dict): The event payload from Slack.
         say (callable): Function to send a message back to Slack.
+        client: The Slack WebClient.
     """
     slack_user_id = event.get('user')
     user_message = event.get('text')
@@ -57,6 +214,24 @@ def handle_message_events(event: dict, say):
         logger.error("Missing user message or Slack user ID in event.")
         return
 
+    # Shed load when every worker is busy and the queue is full
+    if not message_work_queue.submit(process_message_event, event, say, client):
+        say(text=MESSAGE_QUEUE_BUSY_TEXT)
+
+
+def process_message_event(event: dict, say, client):
+    """
+    Processes a message event and posts the response, uploading it as a file if needed.
+
+    Args:
+        event (dict): The event payload from Slack.
+        say (callable): Function to send a message back to Slack.
+        client: The Slack WebClient.
+    """
+    slack_user_id = event.get('user')
+    user_message = event.get('text')
+    channel_id = event.get('channel')
+
     # Process the message
     try:
         response = message_controller.process_message(user_message, slack_user_id)
@@ -76,18 +251,35 @@ def handle_message_events(event: dict, say):
         # Send the initial text response without the payload
         say(text=message_text)
 
+        payload = response['payload']
+        # Exports are named by their handler, so Slack shows them as CSV or NDJSON
+        filename = response.get('filename') or DEFAULT_UPLOAD_FILENAME
         try:
             # Upload the payload as a file and share it in the channel
-            app.client.files_upload_v2(
-                channel=channel_id,
-                content=response['payload'],
-                filename="response.txt",
-                title="Response",
-            )
+            if isinstance(payload, str):
+                client.files_upload_v2(
+                    channel=channel_id, filename=filename, title=filename, content=payload
+                )
+            else:
+                # Spooled payloads are streamed rather than read into memory
+                stream_file_upload(
+                    client.files_getUploadURLExternal,
+                    client.files_completeUploadExternal,
+                    channel_id,
+                    payload,
+                    filename,
+                )
             logger.info(f"File uploaded successfully to channel {channel_id}.")
         except SlackApiError as e:
             logger.exception("Failed to upload file to Slack.")
             say(text=f"Failed to upload the file: {e.response['error']}")
+        except requests.exceptions.RequestException as e:
+            logger.exception("Failed to send file to Slack's upload URL.")
+            say(text="Failed to upload the file. Please try again later.")
+        finally:
+            # Streamed payloads are spooled to a temporary file
+            if not isinstance(payload, str):
+                payload.close()
     else:
         # Combine the text and payload
         if response.get('payload'):
@@ -96,8 +288,41 @@ def handle_message_events(event: dict, say):
         say(text=message_text)
         logger.info(f"Sent message to channel {channel_id}.")
 
+    # Files that handlers produce later, such as user exports, are posted when ready
+    for pending in response.get('pending_uploads', ()):
+        start_pending_upload(pending, channel_id, client)
+
+
+def start_pending_upload(pending, channel_id: str, client) -> None:
+    """
+    Starts a handler's background work, which uploads its file to the channel when
+    it is ready, or posts why it couldn't.
+
+    Args:
+        pending (PendingUpload): The work returned by the intent handler.
+        channel_id (str): The channel the request came from.
+        client: The Slack WebClient.
+    """
+    def deliver(file, filename: str) -> None:
+        stream_file_upload(
+            client.files_getUploadURLExternal,
+            client.files_completeUploadExternal,
+            channel_id,
+            file,
+            filename,
+        )
+        logger.info(f"File {filename} uploaded successfully to channel {channel_id}.")
+
+    def notify(text: str) -> None:
+        client.chat_postMessage(channel=channel_id, text=text)
+
+    try:
+        pending.start(deliver, notify)
+    except Exception as e:
+        logger.exception("Failed to start background upload.")
+        notify("The file couldn't be prepared. Please try again later.")
+
 
-@app.command("/help")
 def handle_help_command(ack, respond, command):
     """
     Handles the /help command by sending the help text.
@@ -112,7 +337,6 @@ def handle_help_command(ack, respond, command):
     logger.debug("Responded to /help command.")
 
 
-@app.command("/authorize")
 def open_credentials_modal(ack, body, client):
     """
     Opens the credentials modal for the user to submit their Auth0 credentials.
@@ -137,51 +361,6 @@ def open_credentials_modal(ack, body, client):
         )
 
 
-def credentials_modal_view() -> dict:
-    """
-    Returns the view definition for the credentials modal.
-
-    Returns:
-        dict: The modal view definition.
-    """
-    return {
-        "type": "modal",
-        "callback_id": CREDENTIALS_MODAL_CALLBACK_ID,
-        "title": {"type": "plain_text", "text": "Auth0 Credentials"},
-        "submit": {"type": "plain_text", "text": "Submit"},
-        "blocks": [
-            {
-                "type": "input",
-                "block_id": "base_url_block",
-                "label": {"type": "plain_text", "text": "Auth0 Base URL"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "base_url_input",
-                },
-            },
-            {
-                "type": "input",
-                "block_id": "client_id_block",
-                "label": {"type": "plain_text", "text": "Client ID"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "client_id_input",
-                },
-            },
-            {
-                "type": "input",
-                "block_id": "client_secret_block",
-                "label": {"type": "plain_text", "text": "Client Secret"},
-                "element": {
-                    "type": "plain_text_input",
-                    "action_id": "client_secret_input",
-                },
-            },
-        ],
-    }
-
-
-@app.view(CREDENTIALS_MODAL_CALLBACK_ID)
 def handle_credentials_submission(ack, body, client, view):
     """
     Handles the submission of the credentials modal.
@@ -0,0 +1,51 @@
+import logging
+import os
+from typing import IO, Any, Callable
+
+import requests
+
+from .http_session_pool import REQUEST_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+def stream_file_upload(
+    get_upload_url: Callable[..., Any],
+    complete_upload: Callable[..., Any],
+    channel_id: str,
+    file: IO[bytes],
+    filename: str,
+) -> None:
+    """
+    Upload a file to a channel, streaming it from disk rather than reading it whole.
+
+    ``files_upload_v2`` reads the entire file into memory before sending it. Here
+    Slack is asked for an upload URL with ``files.getUploadURLExternal``, the file
+    is sent to it in blocks, and ``files.completeUploadExternal`` shares it.
+
+    Args:
+        get_upload_url (Callable[..., Any]): Calls ``files.getUploadURLExternal``.
+        complete_upload (Callable[..., Any]): Calls ``files.completeUploadExternal``.
+        channel_id (str): The channel to share the file in.
+        file (IO[bytes]): The binary file, read from its current position.
+        filename (str): The name the file is shared under.
+
+    Raises:
+        SlackApiError: If Slack rejects either call.
+        requests.exceptions.RequestException: If sending the file fails.
+    """
+    start = file.tell()
+    length = file.seek(0, os.SEEK_END) - start
+    file.seek(start)
+
+    ticket = get_upload_url(filename=filename, length=length)
+    # The upload URL is signed; the body is read from the file a block at a time
+    with requests.post(
+        ticket["upload_url"],
+        data=file,
+        headers={"Content-Type": "application/octet-stream"},
+        timeout=REQUEST_TIMEOUT,
+    ) as response:
+        response.raise_for_status()
+    complete_upload(files=[{"id": ticket["file_id"], "title": filename}], channel_id=channel_id)
+    logger.debug(f"Streamed {length} bytes of {filename} to channel {channel_id}")
@@ -0,0 +1,45 @@
+from ..utils.constants import CREDENTIALS_MODAL_CALLBACK_ID
+
+
+def credentials_modal_view() -> dict:
+    """
+    Returns the view definition for the credentials modal.
+
+    Returns:
+        dict: The modal view definition.
+    """
+    return {
+        "type": "modal",
+        "callback_id": CREDENTIALS_MODAL_CALLBACK_ID,
+        "title": {"type": "plain_text", "text": "Auth0 Credentials"},
+        "submit": {"type": "plain_text", "text": "Submit"},
+        "blocks": [
+            {
+                "type": "input",
+                "block_id": "base_url_block",
+                "label": {"type": "plain_text", "text": "Auth0 Base URL"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "base_url_input",
+                },
+            },
+            {
+                "type": "input",
+                "block_id": "client_id_block",
+                "label": {"type": "plain_text", "text": "Client ID"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "client_id_input",
+                },
+            },
+            {
+                "type": "input",
+                "block_id": "client_secret_block",
+                "label": {"type": "plain_text", "text": "Client Secret"},
+                "element": {
+                    "type": "plain_text_input",
+                    "action_id": "client_secret_input",
+                },
+            },
+        ],
+    }
@@ -0,0 +1,208 @@
+import logging
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence
+
+import numpy as np
+
+from ..utils.constants import (
+    STATS_ANOMALY_THRESHOLD,
+    STATS_METRICS,
+    STATS_ROLLING_WINDOW,
+)
+
+logger = logging.getLogger(__name__)
+
+# Days compared by the week-over-week figures
+WEEK = 7
+# Floor of the baseline's standard deviation, so a flat run of zeros doesn't make
+# every small count an anomaly
+MIN_STD = 1.0
+
+
+class DailyStats(NamedTuple):
+    """Daily stats in columnar form, one slot per calendar day."""
+
+    dates: np.ndarray  # datetime64[D], contiguous from the first day to the last
+    values: Dict[str, np.ndarray]  # int64 counts per metric, aligned with dates
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def load_daily_stats(records: Sequence[dict], metrics: Sequence[str] = STATS_METRICS) -> DailyStats:
+    """
+    Load ``stats/daily`` records into columnar arrays.
+
+    Auth0 leaves out days without activity, so the records are laid onto a
+    contiguous calendar with those days at zero; records sharing a date are summed.
+
+    Args:
+        records (Sequence[dict]): The records, each with an ISO ``date``.
+        metrics (Sequence[str]): The counters to load.
+
+    Returns:
+        DailyStats: The calendar and a column per metric.
+    """
+    if not records:
+        return DailyStats(np.array([], dtype="datetime64[D]"), {m: np.zeros(0, np.int64) for m in metrics})
+
+    days = np.array([str(record["date"])[:10] for record in records], dtype="datetime64[D]")
+    first = days.min()
+    slots = (days - first).astype(np.int64)
+    length = int(slots.max()) + 1
+    values = {}
+    for metric in metrics:
+        column = np.fromiter(
+            (record.get(metric) or 0 for record in records), dtype=np.int64, count=len(records)
+        )
+        values[metric] = np.bincount(slots, weights=column, minlength=length).astype(np.int64)
+    return DailyStats(first + np.arange(length), values)
+
+
+def rolling_mean(values: np.ndarray, window: int = STATS_ROLLING_WINDOW) -> np.ndarray:
+    """
+    Trailing mean of each day and up to ``window - 1`` days before it.
+
+    Args:
+        values (np.ndarray): The daily counts.
+        window (int): Days averaged; the first days average what there is.
+
+    Returns:
+        np.ndarray: The means, aligned with the values.
+    """
+    sums = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+def anomalies(
+    values: np.ndarray,
+    window: int = STATS_ROLLING_WINDOW,
+    threshold: float = STATS_ANOMALY_THRESHOLD,
+) -> np.ndarray:
+    """
+    Flag days that stray from the ``window`` days before them.
+
+    A day is an anomaly when it is more than ``threshold`` standard deviations
+    away from the mean of its baseline. Days with less than a full window before
+    them are never flagged.
+
+    Args:
+        values (np.ndarray): The daily counts.
+        window (int): Days in the baseline.
+        threshold (float): Standard deviations that count as an anomaly.
+
+    Returns:
+        np.ndarray: A boolean flag per day.
+    """
+    flags = np.zeros(len(values), dtype=bool)
+    if len(values) <= window:
+        return flags
+    counts = values.astype(np.float64)
+    sums = np.concatenate(([0.0], np.cumsum(counts)))
+    squares = np.concatenate(([0.0], np.cumsum(counts * counts)))
+    days = np.arange(window, len(values))
+    mean = (sums[days] - sums[days - window]) / window
+    variance = np.maximum((squares[days] - squares[days - window]) / window - mean * mean, 0.0)
+    std = np.maximum(np.sqrt(variance), MIN_STD)
+    flags[window:] = np.abs(counts[window:] - mean) > threshold * std
+    return flags
+
+
+def week_over_week(values: np.ndarray) -> np.ndarray:
+    """
+    Percentage change of each day from the same weekday a week earlier.
+
+    Args:
+        values (np.ndarray): The daily counts.
+
+    Returns:
+        np.ndarray: The changes; NaN for the first week and after days of zero.
+    """
+    changes = np.full(len(values), np.nan)
+    if len(values) > WEEK:
+        previous = values[:-WEEK].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes[WEEK:] = np.where(previous > 0, (values[WEEK:] - previous) / previous * 100, np.nan)
+    return changes
+
+
+def summarize(stats: DailyStats) -> List[dict]:
+    """
+    Summarize each metric over the whole range.
+
+    Args:
+        stats (DailyStats): The daily stats.
+
+    Returns:
+        List[dict]: A row per metric with its total, daily average, peak day, the
+        last week's total, its change from the week before, and the number of
+        anomalous days.
+    """
+    rows = []
+    for metric, values in stats.values.items():
+        row = {"metric": metric, "total": int(values.sum())}
+        if len(values):
+            peak = int(values.argmax())
+            last_week = int(values[-WEEK:].sum())
+            # Without two full weeks there is nothing to compare the last one with
+            previous_week = int(values[-2 * WEEK:-WEEK].sum()) if len(values) >= 2 * WEEK else 0
+            row.update(
+                daily_avg=f"{values.mean():.1f}",
+                peak=int(values[peak]),
+                peak_date=str(stats.dates[peak]),
+                last_7d=last_week,
+                wow_change=_percent(last_week, previous_week),
+                anomalies=int(anomalies(values).sum()),
+            )
+        rows.append(row)
+    return rows
+
+
+def daily_fields(metrics: Iterable[str] = STATS_METRICS) -> List[str]:
+    """
+    Get the columns of the per-day rows.
+
+    Args:
+        metrics (Iterable[str]): The metrics.
+
+    Returns:
+        List[str]: The date, then each metric's count, rolling mean, week-over-week
+        change and anomaly flag.
+    """
+    window = STATS_ROLLING_WINDOW
+    return ["date"] + [
+        column
+        for metric in metrics
+        for column in (metric, f"{metric}_{window}d_avg", f"{metric}_wow_pct", f"{metric}_anomaly")
+    ]
+
+
+def daily_rows(stats: DailyStats) -> Iterator[dict]:
+    """
+    Get a row per day with each metric's derived series, computed a column at a time.
+
+    Args:
+        stats (DailyStats): The daily stats.
+
+    Yields:
+        dict: The day's row, keyed by ``daily_fields``.
+    """
+    window = STATS_ROLLING_WINDOW
+    columns = {"date": np.datetime_as_string(stats.dates).tolist()}
+    for metric, values in stats.values.items():
+        columns[metric] = values.tolist()
+        columns[f"{metric}_{window}d_avg"] = np.round(rolling_mean(values, window), 2).tolist()
+        # NaN is the only value unequal to itself; blank cells read better in a CSV
+        columns[f"{metric}_wow_pct"] = [
+            change if change == change else None
+            for change in np.round(week_over_week(values), 1).tolist()
+        ]
+        columns[f"{metric}_anomaly"] = anomalies(values, window).tolist()
+    names = list(columns)
+    for row in zip(*columns.values()):
+        yield dict(zip(names, row))
+
+
+def _percent(current: int, previous: int) -> str:
+    return f"{(current - previous) / previous * 100:+.1f}%" if previous else "n/a"
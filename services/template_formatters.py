@@ -0,0 +1,310 @@
+import functools
+import logging
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Type
+
+from ..utils.constants import ULP_FORMATTER_BACKEND
+
+logger = logging.getLogger(__name__)
+
+# Elements without an end tag
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+# Elements whose content is emitted exactly as written
+PREFORMATTED_ELEMENTS = frozenset({"pre", "script", "textarea"})
+
+CSS_INDENT = "    "
+CSS_TOKEN_PATTERN = re.compile(
+    r'(?P<comment>/\*.*?(?:\*/|$))'
+    r'|(?P<string>"(?:\\.|[^"\\])*"?|\'(?:\\.|[^\'\\])*\'?)'
+    r'|(?P<punct>[{};])'
+    # Unquoted urls may contain ';' (e.g. data URIs), which must not end a declaration
+    r'|(?P<text>(?:url\([^)"\']*\)|[^{};"\'/])+|/)',
+    re.DOTALL | re.IGNORECASE,
+)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=None)
+def _cssutils():
+    """
+    Import cssutils and set its process-wide logging and serializer preferences once.
+
+    Returns:
+        module: The configured cssutils module.
+    """
+    import cssutils
+
+    # Suppress cssutils warnings and errors
+    cssutils.log.setLevel(logging.CRITICAL)
+
+    # Set serializer preferences
+    cssutils.ser.prefs.indent = '    '  # 4 spaces
+    cssutils.ser.prefs.keepAllProperties = True
+    cssutils.ser.prefs.lineSeparator = '\n'
+    cssutils.ser.prefs.omitLastSemicolon = False
+    cssutils.ser.prefs.validOnly = False  # Include all rules, even if invalid
+    return cssutils
+
+
+class TemplateFormatter(ABC):
+    """
+    Base class of the HTML/CSS prettifiers used for Universal Login templates.
+    """
+
+    name: str = None
+
+    @abstractmethod
+    def format_html(self, html_string: str) -> str:
+        """
+        Format an HTML document, including the CSS inside its <style> tags.
+
+        Args:
+            html_string (str): The raw HTML.
+
+        Returns:
+            str: The formatted HTML.
+        """
+        pass
+
+    @abstractmethod
+    def format_css(self, css_content: str) -> str:
+        """
+        Format a stylesheet.
+
+        Args:
+            css_content (str): The raw CSS.
+
+        Returns:
+            str: The formatted CSS.
+        """
+        pass
+
+
+class SoupTemplateFormatter(TemplateFormatter):
+    """
+    BeautifulSoup ``html.parser`` tree, cssutils for stylesheets, then ``prettify``.
+
+    Slow on large templates, but it is the original formatter and the fallback.
+    """
+
+    name = "soup"
+
+    def format_html(self, html_string: str) -> str:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html_string, 'html.parser')
+
+        # Format CSS inside <style> tags
+        for style_tag in soup.find_all('style'):
+            if style_tag.string:
+                formatted_css = self.format_css(style_tag.string)
+                # Replace the existing CSS with formatted CSS
+                style_tag.string.replace_with(formatted_css)
+
+        # Prettify the HTML with proper indentation
+        return soup.prettify(formatter="html")
+
+    def format_css(self, css_content: str) -> str:
+        try:
+            cssutils = _cssutils()
+
+            # Parse the CSS content
+            sheet = cssutils.parseString(css_content, validate=False)
+            formatted_css = sheet.cssText.decode('utf-8')
+
+            # Post-process to add newlines between rules
+            formatted_css = formatted_css.replace('}\n', '}\n\n')
+
+            return formatted_css
+
+        except ImportError as e:
+            logger.exception("cssutils library is not installed.")
+            raise ImportError("Please install 'cssutils' to format CSS.") from e
+        except Exception as e:
+            logger.exception("Error formatting the CSS content.")
+            return css_content  # Return unformatted CSS as a fallback
+
+
+class _StreamingHTMLWriter(HTMLParser):
+    """
+    Writes each tag, text run and comment on its own indented line as the stdlib
+    tokenizer reports them, without building a document tree. Start tags are copied
+    verbatim, so attribute order, quoting and Liquid placeholders are preserved, and
+    nothing is moved between <head> and <body>.
+    """
+
+    def __init__(self, formatter: "StreamingTemplateFormatter"):
+        super().__init__(convert_charrefs=False)
+        self.formatter = formatter
+        self.lines: List[str] = []
+        self.open_tags: List[str] = []
+        self.text: List[str] = []
+
+    def _emit(self, line: str) -> None:
+        self.lines.append(" " * len(self.open_tags) + line)
+
+    def _flush_text(self) -> None:
+        if not self.text:
+            return
+        text = "".join(self.text)
+        self.text = []
+        current = self.open_tags[-1] if self.open_tags else None
+        if current == "style":
+            css = self.formatter.format_css(text)
+            for line in css.rstrip("\n").splitlines():
+                if line:
+                    self._emit(line)
+                else:
+                    self.lines.append("")
+        elif current in PREFORMATTED_ELEMENTS:
+            self.lines.append(text)
+        else:
+            for line in text.splitlines():
+                line = line.strip()
+                if line:
+                    self._emit(line)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        self._emit(self.get_starttag_text())
+        if tag not in VOID_ELEMENTS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush_text()
+        self._emit(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in self.open_tags:
+            # Close elements left open inside this one, as browsers do
+            while self.open_tags.pop() != tag:
+                pass
+        self._emit(f"</{tag}>")
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_entityref(self, name):
+        self.text.append(f"&{name};")
+
+    def handle_charref(self, name):
+        self.text.append(f"&#{name};")
+
+    def handle_comment(self, data):
+        self._flush_text()
+        self._emit(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._flush_text()
+        self._emit(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._flush_text()
+        self._emit(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._flush_text()
+        self._emit(f"<![{data}]>")
+
+    def close(self):
+        super().close()
+        self._flush_text()
+
+
+class StreamingTemplateFormatter(TemplateFormatter):
+    """
+    Single-pass formatter built on the stdlib HTML tokenizer and a regex CSS tokenizer.
+    """
+
+    name = "streaming"
+
+    def format_html(self, html_string: str) -> str:
+        writer = _StreamingHTMLWriter(self)
+        writer.feed(html_string)
+        writer.close()
+        return "\n".join(writer.lines) + "\n"
+
+    def format_css(self, css_content: str) -> str:
+        out: List[str] = []
+        depth = 0
+        # Selector or declaration text seen since the last '{', ';' or '}'
+        pending: List[str] = []
+
+        def take_pending() -> str:
+            text = "".join(pending).strip()
+            pending.clear()
+            return text
+
+        def emit_declaration(declaration: str) -> None:
+            name, colon, value = declaration.partition(":")
+            # Statements such as @import url(https://...) have no property name
+            if colon and depth and not declaration.startswith("@"):
+                declaration = f"{name.strip()}: {value.strip()}"
+            out.append(f"{CSS_INDENT * depth}{declaration};\n")
+
+        for match in CSS_TOKEN_PATTERN.finditer(css_content):
+            kind = match.lastgroup
+            token = match.group()
+            if kind == "comment":
+                if "".join(pending).strip():
+                    pending.append(token)
+                else:
+                    pending.clear()
+                    out.append(f"{CSS_INDENT * depth}{token}\n")
+            elif kind == "punct" and token == "{":
+                out.append(f"{CSS_INDENT * depth}{take_pending()} {{\n")
+                depth += 1
+            elif kind == "punct" and token == ";":
+                declaration = take_pending()
+                if declaration:
+                    emit_declaration(declaration)
+            elif kind == "punct":
+                declaration = take_pending()
+                if declaration:
+                    emit_declaration(declaration)
+                depth = max(0, depth - 1)
+                out.append(f"{CSS_INDENT * depth}}}\n")
+                if depth == 0:
+                    out.append("\n")
+            elif kind == "string":
+                pending.append(token)
+            else:
+                # Whitespace is collapsed everywhere except inside strings
+                pending.append(WHITESPACE_PATTERN.sub(" ", token))
+
+        # Text after the last ';' or '}', e.g. a statement missing its semicolon
+        remainder = take_pending()
+        if remainder:
+            out.append(f"{CSS_INDENT * depth}{remainder}\n")
+        return "".join(out)
+
+
+TEMPLATE_FORMATTERS: Dict[str, Type[TemplateFormatter]] = {
+    SoupTemplateFormatter.name: SoupTemplateFormatter,
+    StreamingTemplateFormatter.name: StreamingTemplateFormatter,
+}
+
+
+def get_template_formatter(name: Optional[str] = None) -> TemplateFormatter:
+    """
+    Get a formatter backend by name.
+
+    Args:
+        name (Optional[str]): The backend name; defaults to ULP_FORMATTER_BACKEND.
+            Unknown names fall back to the soup formatter.
+
+    Returns:
+        TemplateFormatter: The formatter.
+    """
+    name = name or ULP_FORMATTER_BACKEND
+    formatter_cls = TEMPLATE_FORMATTERS.get(name)
+    if formatter_cls is None:
+        logger.warning(f"Unknown ULP formatter backend '{name}'; using '{SoupTemplateFormatter.name}'.")
+        formatter_cls = SoupTemplateFormatter
+    return formatter_cls()
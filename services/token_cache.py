@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from ..utils.constants import AUTH0_TOKEN_REFRESH_SKEW
+
+logger = logging.getLogger(__name__)
+
+TokenKey = Tuple[str, str, str]  # (auth0_base_url, client_id, client secret digest)
+
+
+def token_key(auth0_base_url: str, client_id: str, client_secret: str) -> TokenKey:
+    """
+    Build the credential identity that tokens, and responses fetched with them, are
+    cached under.
+
+    The client secret is part of the identity, so credentials naming another user's
+    tenant and client ID with a made-up secret never match their cached token. Only
+    a SHA-256 digest of the secret is kept.
+
+    Args:
+        auth0_base_url (str): The base URL of the Auth0 tenant.
+        client_id (str): The client ID of the M2M application.
+        client_secret (str): The client secret of the M2M application.
+
+    Returns:
+        TokenKey: The (auth0_base_url, client_id, secret digest) triple.
+    """
+    digest = hashlib.sha256((client_secret or "").encode("utf-8")).hexdigest()
+    return auth0_base_url, client_id, digest
+
+
+class AccessTokenCache:
+    """
+    Process-wide, thread-safe cache of Auth0 Management API access tokens.
+
+    Tokens are keyed by ``token_key`` so every Slack user sharing an M2M application,
+    secret included, shares one token. Refreshes are single-flight per key: while one
+    caller fetches a new token, concurrent callers wait for it instead of sending
+    their own request. Tokens inside the refresh skew window are still served while
+    a background refresh replaces them.
+    """
+
+    def __init__(self, refresh_skew: float = AUTH0_TOKEN_REFRESH_SKEW):
+        """
+        Initialize the cache.
+
+        Args:
+            refresh_skew (float): Seconds before expiry at which a token is refreshed.
+        """
+        self.refresh_skew = refresh_skew
+        self._tokens: Dict[TokenKey, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[TokenKey, threading.Lock] = {}
+        self._async_key_locks: Dict[TokenKey, asyncio.Lock] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="token-cache"
+        )
+        self._pending = set()
+
+    def _key_lock(self, key: TokenKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _async_key_lock(self, key: TokenKey) -> asyncio.Lock:
+        with self._lock:
+            return self._async_key_locks.setdefault(key, asyncio.Lock())
+
+    def seed(
+        self,
+        key: TokenKey,
+        access_token: Optional[str],
+        token_expires_at: Optional[str],
+    ) -> None:
+        """
+        Offer a token loaded from MongoDB, kept only if it outlives the cached one.
+
+        Args:
+            key (TokenKey): The credential identity from ``token_key``.
+            access_token (Optional[str]): The stored access token.
+            token_expires_at (Optional[str]): The stored expiry time in ISO format (UTC).
+        """
+        if not access_token or not token_expires_at:
+            return
+        expires_at = (
+            datetime.fromisoformat(token_expires_at)
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+        )
+        with self._lock:
+            cached = self._tokens.get(key)
+            if cached is None or cached[1] < expires_at:
+                self._tokens[key] = (access_token, expires_at)
+
+    def store(self, key: TokenKey, access_token: str, expires_in: float) -> None:
+        """
+        Cache a freshly issued token.
+
+        Args:
+            key (TokenKey): The credential identity from ``token_key``.
+            access_token (str): The new access token.
+            expires_in (float): The number of seconds until the token expires.
+        """
+        with self._lock:
+            self._tokens[key] = (access_token, time.time() + expires_in)
+
+    def _lookup(self, key: TokenKey) -> Tuple[Optional[str], bool]:
+        """
+        Look up a token that has not expired yet.
+
+        Returns:
+            tuple: The token (or None) and whether it is inside the refresh skew window.
+        """
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached is None:
+            return None, False
+        access_token, expires_at = cached
+        now = time.time()
+        if now >= expires_at:
+            return None, False
+        return access_token, now >= expires_at - self.refresh_skew
+
+    def get_or_refresh(self, key: TokenKey, refresh: Callable[[], dict]) -> str:
+        """
+        Return a valid token, fetching a new one at most once per expiry.
+
+        Args:
+            key (TokenKey): The credential identity from ``token_key``.
+            refresh (Callable[[], dict]): Fetches token data containing 'access_token'
+                and caches it through ``store``.
+
+        Returns:
+            str: A valid access token.
+        """
+        access_token, expiring = self._lookup(key)
+        if access_token:
+            if expiring:
+                self._refresh_in_background(key, refresh)
+            return access_token
+
+        with self._key_lock(key):
+            # Another thread may have refreshed while we waited for the lock
+            access_token, _ = self._lookup(key)
+            if access_token:
+                return access_token
+            return refresh()["access_token"]
+
+    def _refresh_in_background(self, key: TokenKey, refresh: Callable[[], dict]) -> None:
+        lock = self._key_lock(key)
+        if not lock.acquire(blocking=False):
+            return  # A refresh for this key is already in flight
+
+        def run():
+            try:
+                refresh()
+            except Exception:
+                logger.exception(f"Background token refresh failed for {key[0]}")
+            finally:
+                lock.release()
+
+        self.submit(run)
+
+    async def aget_or_refresh(
+        self, key: TokenKey, refresh: Callable[[], Awaitable[dict]]
+    ) -> str:
+        """
+        Asyncio counterpart of ``get_or_refresh``.
+
+        Args:
+            key (TokenKey): The credential identity from ``token_key``.
+            refresh (Callable[[], Awaitable[dict]]): Coroutine function fetching token data.
+
+        Returns:
+            str: A valid access token.
+        """
+        access_token, expiring = self._lookup(key)
+        if access_token:
+            lock = self._async_key_lock(key)
+            if expiring and not lock.locked():
+                self._track(asyncio.ensure_future(self._arefresh_locked(key, refresh)))
+            return access_token
+
+        async with self._async_key_lock(key):
+            access_token, _ = self._lookup(key)
+            if access_token:
+                return access_token
+            return (await refresh())["access_token"]
+
+    async def _arefresh_locked(
+        self, key: TokenKey, refresh: Callable[[], Awaitable[dict]]
+    ) -> None:
+        async with self._async_key_lock(key):
+            _, expiring = self._lookup(key)
+            if not expiring:
+                return
+            try:
+                await refresh()
+            except Exception:
+                logger.exception(f"Background token refresh failed for {key[0]}")
+
+    def submit(self, fn: Callable, *args) -> None:
+        """
+        Run a callable off the request path, e.g. writing a token back to MongoDB.
+
+        Args:
+            fn (Callable): The callable to run.
+            *args: Positional arguments for the callable.
+        """
+        self._track(self._executor.submit(fn, *args))
+
+    def schedule(self, coro: Awaitable) -> None:
+        """
+        Run a coroutine off the request path on the current event loop.
+
+        Args:
+            coro (Awaitable): The coroutine to run.
+        """
+        self._track(asyncio.ensure_future(coro))
+
+    def _track(self, future) -> None:
+        # Keep a reference so pending work isn't garbage collected mid-flight
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for background refreshes and write-backs running on worker threads.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending: Set = {
+                    f for f in self._pending if not isinstance(f, asyncio.Future)
+                }
+            if not pending:
+                return
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return
+            # Refreshes may queue write-backs, so loop until nothing is left
+            wait(pending, timeout=remaining)
+
+    def clear(self) -> None:
+        """
+        Drop every cached token.
+        """
+        with self._lock:
+            self._tokens.clear()
+
+
+access_token_cache = AccessTokenCache()
@@ -0,0 +1,175 @@
+import logging
+import tempfile
+import time
+from typing import IO, Callable, Optional
+
+import requests
+
+from .http_session_pool import REQUEST_TIMEOUT
+from .job_poller import PendingUpload, job_poller
+from ..utils.constants import (
+    EXPORT_DOWNLOAD_CHUNK_SIZE,
+    EXPORT_JOB_MAX_POLL_INTERVAL,
+    EXPORT_JOB_MIN_POLL_INTERVAL,
+    EXPORT_JOB_TIMEOUT,
+    UPLOAD_SPOOL_MAX_MEMORY,
+    USERS_EXPORT_FAILED_TEXT,
+    USERS_EXPORT_FILENAME,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses of a job Auth0 is still working on
+RUNNING_STATUSES = frozenset({"pending", "processing"})
+# Checks that may fail in a row before the export is given up
+MAX_CHECK_ERRORS = 3
+# Growth of the interval between checks when Auth0 gives no estimate
+BACKOFF_FACTOR = 1.5
+
+
+def download_export(location: str, chunk_size: int = EXPORT_DOWNLOAD_CHUNK_SIZE) -> IO[bytes]:
+    """
+    Download an export file chunk by chunk into a spooled temporary file.
+
+    The file is kept gzipped as Auth0 produced it, and moves from memory to disk
+    past UPLOAD_SPOOL_MAX_MEMORY bytes.
+
+    Args:
+        location (str): The signed URL of the export file.
+        chunk_size (int): Bytes read at a time.
+
+    Returns:
+        IO[bytes]: The file positioned at its start. The caller closes it.
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    try:
+        # The signed URL carries its own credentials and points outside the tenant
+        with requests.get(location, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.raw.stream(chunk_size, decode_content=False):
+                spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+class UsersExportJob(PendingUpload):
+    """
+    A ``jobs/users-exports`` job, checked on the job poller until Auth0 finishes it.
+
+    The interval between checks follows Auth0's ``time_left_seconds`` estimate
+    when the job reports one, and otherwise grows from the minimum to the maximum.
+    """
+
+    def __init__(
+        self,
+        auth0_service,
+        job: dict,
+        poller=None,
+        min_interval: float = EXPORT_JOB_MIN_POLL_INTERVAL,
+        max_interval: float = EXPORT_JOB_MAX_POLL_INTERVAL,
+        timeout: float = EXPORT_JOB_TIMEOUT,
+    ):
+        """
+        Initialize the export job.
+
+        Args:
+            auth0_service: The Auth0 service that created the job.
+            job (dict): The job returned by ``POST jobs/users-exports``.
+            poller (JobPoller): Runs the checks in the background; defaults to the
+                shared job poller.
+            min_interval (float): Seconds before the first check, and the shortest interval.
+            max_interval (float): Longest interval between checks.
+            timeout (float): Seconds before the export is given up.
+        """
+        self.auth0_service = auth0_service
+        self.job_id = job["id"]
+        self.poller = poller or job_poller
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.interval = min_interval
+        self.errors = 0
+        self.deliver: Optional[Callable[[IO[bytes], str], None]] = None
+        self.notify: Optional[Callable[[str], None]] = None
+        self.deadline: Optional[float] = None
+
+    def start(
+        self,
+        deliver: Callable[[IO[bytes], str], None],
+        notify: Callable[[str], None],
+    ) -> None:
+        """
+        Start checking the job in the background.
+
+        Args:
+            deliver (Callable[[IO[bytes], str], None]): Uploads the export file.
+            notify (Callable[[str], None]): Reports a failed export.
+        """
+        self.deliver = deliver
+        self.notify = notify
+        self.deadline = time.monotonic() + self.timeout
+        self.poller.schedule(self.check, self.min_interval)
+
+    def check(self) -> Optional[float]:
+        """
+        Check the job once, delivering the export if it has completed.
+
+        Returns:
+            Optional[float]: Seconds until the next check, or None when finished.
+        """
+        try:
+            job = self.auth0_service.get(f"jobs/{self.job_id}")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Failed to check export job {self.job_id} ({self.errors}): {e}")
+            if self.errors >= MAX_CHECK_ERRORS:
+                return self._fail(f"its status couldn't be checked ({e}).")
+            return self._next_interval({})
+        self.errors = 0
+
+        status = job.get("status")
+        if status == "completed":
+            self._deliver(job["location"])
+            return None
+        if status not in RUNNING_STATUSES:
+            return self._fail(f"Auth0 reported the job as {status}.")
+        if time.monotonic() >= self.deadline:
+            return self._fail(f"it was still {status} after {self.timeout:.0f} seconds.")
+        logger.debug(f"Export job {self.job_id} is {status}: {job.get('percentage_done', 0)}% done")
+        return self._next_interval(job)
+
+    def _next_interval(self, job: dict) -> float:
+        time_left = job.get("time_left_seconds")
+        if time_left:
+            interval = time_left / 2
+        else:
+            interval = self.interval * BACKOFF_FACTOR
+        self.interval = min(self.max_interval, max(self.min_interval, interval))
+        return self.interval
+
+    def _deliver(self, location: str) -> None:
+        try:
+            export = download_export(location)
+        except requests.exceptions.RequestException as e:
+            logger.exception(f"Failed to download export of job {self.job_id}.")
+            self._fail("the export file couldn't be downloaded.")
+            return
+        with export:
+            try:
+                self.deliver(export, USERS_EXPORT_FILENAME)
+            except Exception as e:
+                logger.exception(f"Failed to upload export of job {self.job_id}.")
+                self._fail("the export file couldn't be uploaded.")
+                return
+        logger.info(f"Delivered export of job {self.job_id}.")
+
+    def _fail(self, reason: str) -> None:
+        logger.error(f"Export job {self.job_id} failed: {reason}")
+        self.notify(USERS_EXPORT_FAILED_TEXT.format(reason=reason))
+        return None
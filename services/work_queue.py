@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _WorkQueueMetrics(ABC):
+    """
+    Counters shared by the thread and asyncio work queues.
+    """
+
+    def __init__(self, name: str, workers: int, max_size: int):
+        if workers <= 0 or max_size <= 0:
+            raise ValueError("workers and max_size must be positive.")
+        self.name = name
+        self.workers = workers
+        self.max_size = max_size
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._accepting = True
+        self._metrics_lock = threading.Lock()
+
+    def _record_submitted(self, depth: int) -> None:
+        with self._metrics_lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, depth)
+
+    def _record_rejected(self, reason: str) -> None:
+        with self._metrics_lock:
+            self.rejected += 1
+        logger.warning(f"Work queue '{self.name}' rejected a job: {reason}")
+
+    def _record_started(self, enqueued_at: float) -> None:
+        waited = time.monotonic() - enqueued_at
+        with self._metrics_lock:
+            self.busy += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def _record_finished(self, succeeded: bool) -> None:
+        with self._metrics_lock:
+            self.busy -= 1
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    @abstractmethod
+    def _depth(self) -> int:
+        """
+        Get the number of jobs waiting for a worker.
+
+        Returns:
+            int: The queue depth.
+        """
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the queue counters.
+
+        Returns:
+            Dict[str, Any]: Current depth and capacity, busy workers, job counts and
+            queue wait times in milliseconds.
+        """
+        with self._metrics_lock:
+            started = self.completed + self.failed + self.busy
+            return {
+                "depth": self._depth(),
+                "capacity": self.max_size,
+                "workers": self.workers,
+                "busy": self.busy,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "max_depth": self.max_depth,
+                "avg_wait_ms": self.total_wait / started * 1000 if started else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+class WorkQueue(_WorkQueueMetrics):
+    """
+    Bounded job queue served by a fixed pool of worker threads.
+
+    ``submit`` never blocks: when the queue is full the job is rejected so the
+    caller can shed load instead of piling up work that will time out anyway.
+    """
+
+    def __init__(self, name: str, workers: int, max_size: int):
+        """
+        Initialize the queue and start its workers.
+
+        Args:
+            name (str): Name used in logs and thread names.
+            workers (int): Number of worker threads.
+            max_size (int): Jobs that may wait for a worker.
+        """
+        super().__init__(name, workers, max_size)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._threads: List[threading.Thread] = []
+        for i in range(workers):
+            thread = threading.Thread(
+                target=self._work, name=f"{name}-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, fn: Callable, *args) -> bool:
+        """
+        Queue a job.
+
+        Args:
+            fn (Callable): The callable to run on a worker thread.
+            *args: Positional arguments for the callable.
+
+        Returns:
+            bool: False if the job was rejected because the queue is full or draining.
+        """
+        if not self._accepting:
+            self._record_rejected("shutting down")
+            return False
+        try:
+            self._queue.put_nowait((fn, args, time.monotonic()))
+        except queue.Full:
+            self._record_rejected("queue full")
+            return False
+        self._record_submitted(self._queue.qsize())
+        return True
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            fn, args, enqueued_at = item
+            self._record_started(enqueued_at)
+            succeeded = False
+            try:
+                fn(*args)
+                succeeded = True
+            except Exception:
+                logger.exception(f"Job failed in work queue '{self.name}'.")
+            finally:
+                self._record_finished(succeeded)
+                self._queue.task_done()
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs, wait for queued and running ones, then stop the workers.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if every job finished before the timeout.
+        """
+        self._accepting = False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._queue.all_tasks_done.wait(remaining)
+            drained = not self._queue.unfinished_tasks
+
+        if not drained:
+            dropped = 0
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._queue.task_done()
+                dropped += 1
+            logger.warning(
+                f"Work queue '{self.name}' did not drain in time; dropped {dropped} queued jobs."
+            )
+
+        for _ in self._threads:
+            self._queue.put(None)
+        if drained:
+            for thread in self._threads:
+                thread.join()
+        return drained
+
+
+class AsyncWorkQueue(_WorkQueueMetrics):
+    """
+    Asyncio counterpart of WorkQueue: a bounded queue of coroutine jobs served by
+    a fixed number of worker tasks.
+    """
+
+    def __init__(self, name: str, workers: int, max_size: int):
+        """
+        Initialize the queue. Workers start with the first job, on its event loop.
+
+        Args:
+            name (str): Name used in logs and task names.
+            workers (int): Number of worker tasks.
+            max_size (int): Jobs that may wait for a worker.
+        """
+        super().__init__(name, workers, max_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def submit(self, fn: Callable[..., Awaitable], *args) -> bool:
+        """
+        Queue a job. Must be called from the event loop.
+
+        Args:
+            fn (Callable[..., Awaitable]): The coroutine function to run.
+            *args: Positional arguments for the coroutine function.
+
+        Returns:
+            bool: False if the job was rejected because the queue is full or draining.
+        """
+        if not self._accepting:
+            self._record_rejected("shutting down")
+            return False
+        if self._queue is None:
+            self._start()
+        try:
+            self._queue.put_nowait((fn, args, time.monotonic()))
+        except asyncio.QueueFull:
+            self._record_rejected("queue full")
+            return False
+        self._record_submitted(self._queue.qsize())
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            fn, args, enqueued_at = await self._queue.get()
+            self._record_started(enqueued_at)
+            succeeded = False
+            try:
+                await fn(*args)
+                succeeded = True
+            except Exception:
+                logger.exception(f"Job failed in work queue '{self.name}'.")
+            finally:
+                self._record_finished(succeeded)
+                self._queue.task_done()
+
+    async def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs, wait for queued and running ones, then cancel the workers.
+
+        Args:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if every job finished before the timeout.
+        """
+        self._accepting = False
+        if self._queue is None:
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            drained = True
+        except asyncio.TimeoutError:
+            drained = False
+            logger.warning(
+                f"Work queue '{self.name}' did not drain in time; cancelling "
+                f"{self._queue.qsize()} queued and {self.busy} running jobs."
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        return drained
@@ -4,7 +4,12 @@ from datetime import datetime, timedelta
 
 import requests
 
+from ...services import auth0_service as auth0_service_module
 from ...services.auth0_service import Auth0Service
+from ...services.circuit_breaker import auth0_circuit_breakers
+from ...services.rate_limiter import auth0_rate_limiter
+from ...services.response_cache import auth0_response_cache
+from ...services.token_cache import access_token_cache
 from ...dao.m2m_credentials_dao import m2m_credentials_dao
 from ..testutils.constants import (
     AUTH0_API_AUDIENCE_TEMPLATE,
@@ -16,6 +21,10 @@ from ..testutils.constants import (
 class TestAuth0Service(unittest.TestCase):
 
     def setUp(self):
+        access_token_cache.clear()
+        auth0_rate_limiter.clear()
+        auth0_circuit_breakers.clear()
+        auth0_response_cache.clear()
         self.auth0_base_url = 'your-domain.auth0.com'
         self.client_id = 'test_client_id'
         self.client_secret = 'test_client_secret'
@@ -32,9 +41,9 @@ class TestAuth0Service(unittest.TestCase):
             token_expires_at=self.token_expires_at
         )
 
-    @patch('...services.auth0_service.requests.post')
-    @patch('...services.auth0_service.m2m_credentials_dao')
-    def test_request_new_access_token_success(self, mock_m2m_credentials_dao, mock_requests_post):
+    @patch.object(auth0_service_module, 'get_session')
+    @patch.object(auth0_service_module, 'm2m_credentials_dao')
+    def test_request_new_access_token_success(self, mock_m2m_credentials_dao, mock_get_session):
         # Mock the response from Auth0 token endpoint
         mock_response = MagicMock()
         mock_response.json.return_value = {
@@ -44,7 +53,7 @@ class TestAuth0Service(unittest.TestCase):
         }
         mock_response.status_code = 200
         mock_response.raise_for_status.return_value = None
-        mock_requests_post.return_value = mock_response
+        mock_get_session.return_value.post.return_value = mock_response
 
         # Call the method under test
         token_data = self.auth0_service.request_new_access_token()
@@ -54,12 +63,13 @@ class TestAuth0Service(unittest.TestCase):
         self.assertEqual(self.auth0_service.access_token, 'new_access_token')
         self.assertIsNotNone(self.auth0_service.token_expires_at)
 
-        # Ensure that the access token and expiry were updated in the DAO
+        # Ensure that the access token and expiry were written back to the DAO
+        access_token_cache.flush(timeout=5)
         mock_m2m_credentials_dao.update_access_token.assert_called_once()
 
-    @patch('...services.auth0_service.Auth0Service.get_access_token')
-    @patch('...services.auth0_service.requests.get')
-    def test_get_success(self, mock_requests_get, mock_get_access_token):
+    @patch.object(Auth0Service, 'get_access_token')
+    @patch.object(auth0_service_module, 'get_session')
+    def test_get_success(self, mock_get_session, mock_get_access_token):
         # Mock the access token retrieval
         mock_get_access_token.return_value = 'valid_access_token'
 
@@ -68,7 +78,7 @@ class TestAuth0Service(unittest.TestCase):
         mock_response.json.return_value = {'data': 'test_data'}
         mock_response.status_code = 200
         mock_response.raise_for_status.return_value = None
-        mock_requests_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
 
         # Call the method under test
         endpoint = 'users'
@@ -77,20 +87,20 @@ class TestAuth0Service(unittest.TestCase):
         # Assertions
         self.assertEqual(response, {'data': 'test_data'})
         mock_get_access_token.assert_called_once()
-        mock_requests_get.assert_called_once()
+        mock_get_session.return_value.get.assert_called_once()
 
-    @patch('...services.auth0_service.requests.post')
-    def test_request_new_access_token_failure(self, mock_requests_post):
+    @patch.object(auth0_service_module, 'get_session')
+    def test_request_new_access_token_failure(self, mock_get_session):
         # Simulate a failed token request
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("401 Client Error")
-        mock_requests_post.return_value = mock_response
+        mock_get_session.return_value.post.return_value = mock_response
 
         # Call the method under test and expect an exception
         with self.assertRaises(Exception):
             self.auth0_service.request_new_access_token()
 
-    @patch('...services.auth0_service.Auth0Service.request_new_access_token')
+    @patch.object(Auth0Service, 'request_new_access_token')
     def test_get_access_token_uses_cached_token(self, mock_request_new_token):
         # Set a valid cached token
         self.auth0_service.access_token = 'cached_access_token'
@@ -103,7 +113,7 @@ class TestAuth0Service(unittest.TestCase):
         self.assertEqual(token, 'cached_access_token')
         mock_request_new_token.assert_not_called()
 
-    @patch('...services.auth0_service.Auth0Service.request_new_access_token')
+    @patch.object(Auth0Service, 'request_new_access_token')
     def test_get_access_token_refreshes_expired_token(self, mock_request_new_token):
         # Set an expired token
         self.auth0_service.access_token = 'expired_access_token'
@@ -119,29 +129,47 @@ class TestAuth0Service(unittest.TestCase):
         self.assertEqual(token, 'new_access_token')
         mock_request_new_token.assert_called_once()
 
-    @patch('...services.auth0_service.Auth0Service.get_access_token')
-    @patch('...services.auth0_service.requests.get')
-    def test_get_http_error(self, mock_requests_get, mock_get_access_token):
+    @patch.object(Auth0Service, 'request_new_access_token')
+    def test_get_access_token_is_not_shared_with_another_secret(self, mock_request_new_token):
+        # Cache a token minted with the real secret
+        access_token_cache.store(self.auth0_service.credential_key, 'cached_access_token', 3600)
+        impostor = Auth0Service(
+            auth0_base_url=self.auth0_base_url,
+            client_id=self.client_id,
+            client_secret='guessed_secret',
+            slack_user_id='U87654321',
+        )
+        mock_request_new_token.side_effect = requests.exceptions.HTTPError("401 Client Error")
+
+        # The same tenant and client ID with another secret must mint its own token
+        with self.assertRaises(requests.exceptions.HTTPError):
+            impostor.get_access_token()
+        mock_request_new_token.assert_called_once()
+        self.assertEqual(self.auth0_service.get_access_token(), 'cached_access_token')
+
+    @patch.object(Auth0Service, 'get_access_token')
+    @patch.object(auth0_service_module, 'get_session')
+    def test_get_http_error(self, mock_get_session, mock_get_access_token):
         # Mock the access token retrieval
         mock_get_access_token.return_value = 'valid_access_token'
 
         # Simulate an HTTP error during GET request
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
-        mock_requests_get.return_value = mock_response
+        mock_get_session.return_value.get.return_value = mock_response
 
         # Call the method under test and expect an exception
         with self.assertRaises(Exception):
             self.auth0_service.get('invalid/endpoint')
 
-    @patch('...services.auth0_service.Auth0Service.get_access_token')
-    @patch('...services.auth0_service.requests.get')
-    def test_get_unexpected_error(self, mock_requests_get, mock_get_access_token):
+    @patch.object(Auth0Service, 'get_access_token')
+    @patch.object(auth0_service_module, 'get_session')
+    def test_get_unexpected_error(self, mock_get_session, mock_get_access_token):
         # Mock the access token retrieval
         mock_get_access_token.return_value = 'valid_access_token'
 
         # Simulate an unexpected error during GET request
-        mock_requests_get.side_effect = Exception("Unexpected Error")
+        mock_get_session.return_value.get.side_effect = Exception("Unexpected Error")
 
         # Call the method under test and expect an exception
         with self.assertRaises(Exception):
@@ -0,0 +1,203 @@
+import csv
+import io
+import re
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from ...controllers import message_controller as controller_module
+from ...controllers.message_controller import MessageController
+from ...services.intent_handlers import batch_user_lookup_handler as handler_module
+from ...services.intent_handlers.batch_user_lookup_handler import (
+    BatchUserLookupIntentHandler,
+    lucene_terms,
+)
+from ...services.local_intent_service import LocalIntentService
+from ...services.paginator import paginate
+
+CREDENTIALS = {
+    'auth0_base_url': 'tenant.auth0.com',
+    'auth0_client_id': 'client',
+    'auth0_client_secret': 'secret',
+    'slack_user_id': 'U1',
+}
+
+
+def user(user_id, email):
+    return {'user_id': user_id, 'email': email, 'identities': [{'connection': user_id.split('|')[0]}]}
+
+
+class FakeTenant:
+    """Answers user searches, direct user GETs and users-by-email from a fixed set of users."""
+
+    def __init__(self, users, unindexed=(), delay=0):
+        self.users = users
+        self.unindexed = set(unindexed)
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, query_params=None):
+        with self.lock:
+            self.requests.append((endpoint, query_params))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return self.answer(endpoint, query_params)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def answer(self, endpoint, query_params):
+        if endpoint == 'users':
+            field, terms = re.match(r'(\w+):\((.*)\)$', query_params['q']).groups()
+            values = {value.lower() for value in re.findall(r'"((?:[^"\\]|\\.)*)"', terms)}
+            matches = [
+                u for u in self.users
+                if u['user_id'] not in self.unindexed and u[field].lower() in values
+            ]
+            return {'users': matches, 'total': len(matches)}
+        if endpoint == 'users-by-email':
+            return [u for u in self.users if u['email'].lower() == query_params['email'].lower()]
+        for u in self.users:
+            if endpoint == f"users/{u['user_id']}":
+                return u
+        response = requests.Response()
+        response.status_code = 404
+        raise requests.exceptions.HTTPError('404 Not Found', response=response)
+
+    def paginate(self, endpoint, query_params=None, items_key=None, **kwargs):
+        return paginate(self.get, endpoint, query_params, items_key, **kwargs)
+
+    def searches(self):
+        return [params['q'] for endpoint, params in self.requests if endpoint == 'users']
+
+
+class TestBatchLookupDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.local_intent_service = LocalIntentService(confidence_threshold=0.9, enabled=True)
+
+    def test_identifiers_are_collected_and_deduplicated(self):
+        intent, _, parameters = self.local_intent_service.detect_intent(
+            'look up auth0|1, google-oauth2|2, auth0|1 and Jane@Example.com, jane@example.com'
+        )
+
+        self.assertEqual(intent, 'BatchUserLookupIntent')
+        self.assertEqual(parameters, {'user-ids': ['auth0|1', 'google-oauth2|2'], 'emails': ['Jane@Example.com']})
+
+    def test_single_identifiers_keep_their_intents(self):
+        self.assertEqual(self.local_intent_service.detect_intent('user auth0|1 and auth0|1')[0], 'GetUserByIdIntent')
+        self.assertEqual(self.local_intent_service.detect_intent('search jane@example.com')[0], 'SearchUsersByEmailIntent')
+
+    def test_pasted_lines_are_one_lookup(self):
+        self.assertTrue(self.local_intent_service.is_batch_lookup(['can you check these:', 'auth0|1', 'a@b.com']))
+        self.assertFalse(self.local_intent_service.is_batch_lookup(['show tenant settings', 'auth0|1', 'auth0|2']))
+        self.assertFalse(self.local_intent_service.is_batch_lookup(['show tenant settings', 'auth0|1']))
+
+
+class TestBatchUserLookupIntentHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.users = [user(f'auth0|{index}', f'user{index}@example.com') for index in range(120)]
+        self.handler = BatchUserLookupIntentHandler()
+
+    def test_identifiers_are_folded_into_chunked_searches(self):
+        tenant = FakeTenant(self.users)
+        user_ids = [f'auth0|{index}' for index in range(60)]
+
+        with patch.object(handler_module, 'MAX_MESSAGE_LENGTH', 100000):
+            payload, needs_file_upload, summary, _ = self.handler.handle_intent(
+                {'user-ids': user_ids, 'emails': ['USER100@example.com']}, tenant
+            )
+
+        self.assertFalse(needs_file_upload)
+        self.assertEqual(summary, 'Found 61 of 61 users.')
+        self.assertEqual(len(tenant.searches()), 3)
+        self.assertEqual(len(tenant.requests), 3)
+        lines = payload.strip('`').splitlines()
+        self.assertEqual(lines[0].split(), ['lookup', 'found', 'user_id', 'email', 'last_login', 'logins_count'])
+        self.assertEqual(lines[2].split()[:3], ['auth0|0', 'True', 'auth0|0'])
+        self.assertEqual(lines[-1].split()[:3], ['USER100@example.com', 'True', 'auth0|100'])
+
+    def test_searches_run_concurrently_within_the_bound(self):
+        tenant = FakeTenant(self.users, delay=0.1)
+        user_ids = [f'auth0|{index}' for index in range(100)]
+
+        with patch.object(handler_module, 'BATCH_LOOKUP_QUERY_CHUNK', 10), \
+                patch.object(handler_module, 'BATCH_LOOKUP_CONCURRENCY', 4):
+            started = time.monotonic()
+            self.handler.handle_intent({'user-ids': user_ids}, tenant)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(tenant.searches()), 10)
+        self.assertEqual(tenant.max_in_flight, 4)
+        self.assertLess(elapsed, 0.6)
+
+    def test_misses_are_fetched_directly(self):
+        tenant = FakeTenant(self.users, unindexed={'auth0|2'})
+
+        payload, _, summary, _ = self.handler.handle_intent(
+            {'user-ids': ['auth0|1', 'auth0|2', 'auth0|999'], 'emails': ['nobody@example.com']}, tenant
+        )
+
+        self.assertEqual(summary, 'Found 2 of 4 users.')
+        self.assertIn(('users/auth0|2', None), tenant.requests)
+        self.assertIn(('users/auth0|999', None), tenant.requests)
+        self.assertIn(('users-by-email', {'email': 'nobody@example.com'}), tenant.requests)
+        rows = [line.split() for line in payload.strip('`').splitlines()[2:]]
+        self.assertEqual([row[:2] for row in rows], [
+            ['auth0|1', 'True'], ['auth0|2', 'True'], ['auth0|999', 'False'], ['nobody@example.com', 'False'],
+        ])
+
+    def test_long_results_come_back_as_csv(self):
+        tenant = FakeTenant(self.users)
+        user_ids = [f'auth0|{index}' for index in range(100)]
+
+        payload, needs_file_upload, _, filename = self.handler.handle_intent({'user-ids': user_ids}, tenant)
+
+        self.assertTrue(needs_file_upload)
+        self.assertEqual(filename, 'user-lookup.csv')
+        with payload:
+            rows = list(csv.DictReader(io.TextIOWrapper(payload, encoding='utf-8')))
+        self.assertEqual(len(rows), 100)
+        self.assertEqual(rows[0]['connection'], 'auth0')
+        self.assertEqual(rows[0]['found'], 'True')
+
+    def test_quotes_are_escaped(self):
+        self.assertEqual(lucene_terms('email', ['a"b@x.com', 'c@x.com']), r'email:("a\"b@x.com" OR "c@x.com")')
+
+    def test_missing_identifiers(self):
+        self.assertEqual(
+            self.handler.handle_intent({}, MagicMock()),
+            ("User IDs or emails are required to look up users.", False, None),
+        )
+
+
+class TestBatchLookupMessage(unittest.TestCase):
+
+    @patch.object(controller_module, 'Auth0Service')
+    @patch.object(controller_module, 'm2m_credentials_dao')
+    def test_pasted_list_is_answered_as_one_lookup(self, mock_dao, mock_auth0_service):
+        mock_dao.get_credentials.return_value = CREDENTIALS
+        controller = MessageController()
+        controller.dialogflow_service = MagicMock()
+        handler = MagicMock()
+        handler.handle_intent.return_value = ('```table```', False, 'Found 3 of 3 users.')
+        controller.intent_handler_factory = MagicMock(**{'get_handler.return_value': handler})
+
+        result = controller.process_message('please look these up:\nauth0|1\nauth0|2\njane@example.com', 'U1')
+
+        controller.dialogflow_service.detect_intent_texts.assert_not_called()
+        handler.handle_intent.assert_called_once()
+        self.assertEqual(
+            handler.handle_intent.call_args.args[0],
+            {'user-ids': ['auth0|1', 'auth0|2'], 'emails': ['jane@example.com']},
+        )
+        self.assertEqual(result['text'], 'Here are the users you asked about:')
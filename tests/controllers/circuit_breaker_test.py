@@ -0,0 +1,261 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import httpx
+import requests
+
+from ...services import async_auth0_service as async_auth0_service_module
+from ...services import auth0_service as auth0_service_module
+from ...services.async_auth0_service import AsyncAuth0Service
+from ...services.auth0_service import Auth0Service
+from ...services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from ...services.http_session_pool import aclose_async_clients, close_sessions
+from ...services.rate_limiter import Auth0RateLimiter
+from ...services.retry_policy import RetryPolicy
+
+HTTP_API_BASE_URL_TEMPLATE = 'http://{auth0_base_url}/api/v2/{endpoint}'
+
+
+class FlakyAuth0Handler(BaseHTTPRequestHandler):
+    """Replays scripted (status, delay) responses and counts the requests received."""
+
+    disable_nagle_algorithm = True
+    responses = []
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        status, delay = type(self).responses.pop(0) if type(self).responses else (200, 0)
+        if delay:
+            time.sleep(delay)
+        body = json.dumps({'status': status}).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker('tenant', failure_threshold=3, reset_timeout=30)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.before_request()
+        self.assertGreater(context.exception.retry_after, 25)
+        self.assertEqual(breaker.stats()['rejected'], 1)
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker('tenant', failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.before_request()
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = CircuitBreaker('tenant', failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        breaker.before_request()
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+
+    def test_unanswered_probe_expires(self):
+        breaker = CircuitBreaker('tenant', failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.before_request()
+        time.sleep(0.06)
+
+        # The first probe never reported back, so another one is allowed
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+    def test_registry_keeps_one_breaker_per_tenant(self):
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        registry.get('a').record_failure()
+
+        self.assertIs(registry.get('a'), registry.get('a'))
+        self.assertEqual(registry.stats()['a']['state'], OPEN)
+        self.assertEqual(registry.get('b').state, CLOSED)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=2)
+
+        for retry in range(6):
+            ceiling = min(2, 0.5 * 2 ** retry)
+            delays = [policy.backoff(retry) for _ in range(50)]
+            self.assertTrue(all(0 <= delay <= ceiling for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_retries_are_bounded(self):
+        state = RetryPolicy(max_retries=2, max_rate_limit_retries=1).start()
+
+        self.assertIsNotNone(state.next_delay(503))
+        self.assertIsNotNone(state.next_delay())
+        self.assertIsNone(state.next_delay(503))
+        self.assertEqual(state.next_delay(429), 0.0)
+        self.assertIsNone(state.next_delay(429))
+
+    def test_client_errors_are_not_retried(self):
+        state = RetryPolicy().start()
+
+        self.assertIsNone(state.next_delay(200))
+        self.assertIsNone(state.next_delay(404))
+
+
+class TestAuth0ServiceResilience(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyAuth0Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.auth0_base_url = f'127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FlakyAuth0Handler.responses = []
+        FlakyAuth0Handler.hits = 0
+        self.breakers = CircuitBreakerRegistry(failure_threshold=3, reset_timeout=30)
+        limiter = Auth0RateLimiter(burst=100, rate=100, max_wait=5)
+        retry_policy = RetryPolicy(max_retries=2, base_delay=0.01, max_delay=0.02)
+        patchers = []
+        for module in (auth0_service_module, async_auth0_service_module):
+            patchers += [
+                patch.object(module, 'AUTH0_API_BASE_URL_TEMPLATE', HTTP_API_BASE_URL_TEMPLATE),
+                patch.object(module, 'auth0_rate_limiter', limiter),
+                patch.object(module, 'auth0_circuit_breakers', self.breakers),
+                patch.object(module, 'auth0_retry_policy', retry_policy),
+            ]
+        patchers += [
+            patch.object(auth0_service_module, 'REQUEST_TIMEOUT', (1, 0.2)),
+            patch.object(Auth0Service, 'get_access_token', return_value='valid_access_token'),
+            patch.object(AsyncAuth0Service, 'get_access_token', return_value='valid_access_token'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(close_sessions)
+
+        credentials = dict(
+            auth0_base_url=self.auth0_base_url,
+            client_id='test_client_id',
+            client_secret='test_client_secret',
+            slack_user_id='U12345678',
+        )
+        self.auth0_service = Auth0Service(**credentials)
+        self.async_auth0_service = AsyncAuth0Service(**credentials)
+
+    def breaker(self):
+        return self.breakers.get(self.auth0_base_url)
+
+    def test_server_errors_are_retried(self):
+        FlakyAuth0Handler.responses = [(503, 0), (502, 0), (200, 0)]
+
+        self.assertEqual(self.auth0_service.get('users'), {'status': 200})
+
+        self.assertEqual(FlakyAuth0Handler.hits, 3)
+        self.assertEqual(self.breaker().state, CLOSED)
+
+    def test_gives_up_after_max_retries(self):
+        FlakyAuth0Handler.responses = [(503, 0)] * 3
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.auth0_service.get('users')
+
+        self.assertEqual(FlakyAuth0Handler.hits, 3)
+        self.assertEqual(self.breaker().state, OPEN)
+
+    def test_open_circuit_fails_fast(self):
+        FlakyAuth0Handler.responses = [(503, 0)] * 3
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.auth0_service.get('users')
+        start = time.monotonic()
+
+        with self.assertRaises(CircuitOpenError):
+            self.auth0_service.get('users')
+
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(FlakyAuth0Handler.hits, 3)
+
+    def test_client_errors_are_not_retried(self):
+        FlakyAuth0Handler.responses = [(404, 0)]
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.auth0_service.get('users/missing')
+
+        self.assertEqual(FlakyAuth0Handler.hits, 1)
+        self.assertEqual(self.breaker().failures, 0)
+
+    def test_slow_responses_time_out_and_are_retried(self):
+        FlakyAuth0Handler.responses = [(200, 0.5), (200, 0)]
+        start = time.monotonic()
+
+        self.assertEqual(self.auth0_service.get('users'), {'status': 200})
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(FlakyAuth0Handler.hits, 2)
+
+    def test_async_service_retries_and_opens_circuit(self):
+        FlakyAuth0Handler.responses = [(503, 0), (200, 0)] + [(500, 0)] * 3
+
+        async def scenario():
+            try:
+                result = await self.async_auth0_service.get('users')
+                with self.assertRaises(httpx.HTTPStatusError):
+                    await self.async_auth0_service.get('users')
+                with self.assertRaises(CircuitOpenError):
+                    await self.async_auth0_service.get('users')
+                return result
+            finally:
+                await aclose_async_clients()
+
+        self.assertEqual(asyncio.run(scenario()), {'status': 200})
+        self.assertEqual(FlakyAuth0Handler.hits, 5)
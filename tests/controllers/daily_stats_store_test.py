@@ -0,0 +1,147 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from ...services.daily_stats_store import DailyStatsStore, missing_ranges
+from ...services.intent_handlers import get_stats_intent_handler as handler_module
+from ...services.intent_handlers.get_stats_intent_handler import GetStatsIntentHandler
+
+TODAY = datetime.now(timezone.utc).date()
+
+
+def day(offset):
+    """The YYYYMMDD day ``offset`` days from today."""
+    return (TODAY + timedelta(days=offset)).strftime('%Y%m%d')
+
+
+class FakeStatsEndpoint:
+    """Serves stats/daily for the last year, leaving out days without activity like Auth0."""
+
+    def __init__(self):
+        self.auth0_base_url = 'tenant.auth0.com'
+        self.requests = []
+        self.get_access_token = MagicMock(return_value='valid_access_token')
+
+    def get(self, endpoint, query_params=None):
+        self.requests.append((query_params['from'], query_params['to']))
+        records = []
+        for offset in range(-365, 1):
+            key = day(offset)
+            # Every tenth day had no logins or signups
+            if query_params['from'] <= key <= query_params['to'] and offset % 10:
+                iso = f'{key[:4]}-{key[4:6]}-{key[6:]}T00:00:00.000Z'
+                records.append({'date': iso, 'logins': -offset, 'signups': 1, 'leaked_passwords': 0})
+        return records
+
+
+class FakeDailyStatsDAO:
+    """Keeps stored days in memory, like DailyStatsDAO."""
+
+    def __init__(self):
+        self.days = {}
+        self.saves = []
+
+    def get_days(self, tenant, first, last):
+        return [
+            {'date': date, 'record': record}
+            for (stored_tenant, date), record in sorted(self.days.items())
+            if stored_tenant == tenant and first <= date <= last
+        ]
+
+    def save_days(self, tenant, days):
+        self.saves.append(sorted(days))
+        self.days.update({(tenant, date): record for date, record in days.items()})
+
+
+class TestDailyStatsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.auth0 = FakeStatsEndpoint()
+        self.dao = FakeDailyStatsDAO()
+        self.store = DailyStatsStore(store=self.dao)
+
+    def test_missing_ranges(self):
+        first = TODAY - timedelta(days=5)
+        known = {day(-4): None, day(-3): {}, day(-1): {}}
+
+        self.assertEqual(missing_ranges(first, TODAY, known), [
+            (first, first),
+            (TODAY - timedelta(days=2), TODAY - timedelta(days=2)),
+            (TODAY, TODAY),
+        ])
+        self.assertEqual(missing_ranges(first, TODAY, {}), [(first, TODAY)])
+
+    def test_past_days_are_fetched_once(self):
+        first = self.store.fetch(self.auth0, day(-30), day(-1))
+        second = self.store.fetch(self.auth0, day(-30), day(-1))
+
+        self.assertEqual(self.auth0.requests, [(day(-30), day(-1))])
+        self.assertEqual(second, first)
+        self.assertEqual(len(first), 27)
+        # Days without activity are stored too, so they are not fetched again
+        self.assertEqual(self.dao.saves, [[day(offset) for offset in range(-30, 0)]])
+        self.assertIsNone(self.dao.days[('tenant.auth0.com', day(-30))])
+
+    def test_longer_ranges_fetch_only_the_missing_days(self):
+        self.store.fetch(self.auth0, day(-60), day(-31))
+        self.store.fetch(self.auth0, day(-20), day(-11))
+        self.auth0.requests.clear()
+
+        records = self.store.fetch(self.auth0, day(-90), day(-1))
+
+        self.assertEqual(self.auth0.requests, [
+            (day(-90), day(-61)), (day(-30), day(-21)), (day(-10), day(-1)),
+        ])
+        self.assertEqual([record['logins'] for record in records],
+                         [offset for offset in range(90, 0, -1) if offset % 10])
+
+    def test_today_is_always_fetched(self):
+        self.store.fetch(self.auth0, day(-7), day(-1))
+        self.auth0.requests.clear()
+
+        self.store.fetch(self.auth0, day(-7), None)
+        self.store.fetch(self.auth0, day(-7), None)
+
+        self.assertEqual(self.auth0.requests, [(day(0), day(0)), (day(0), day(0))])
+        self.assertNotIn(('tenant.auth0.com', day(0)), self.dao.days)
+
+    def test_stored_days_need_valid_credentials(self):
+        self.store.fetch(self.auth0, day(-7), day(-1))
+        self.auth0.get_access_token.side_effect = RuntimeError('401 Client Error')
+
+        with self.assertRaises(RuntimeError):
+            self.store.fetch(self.auth0, day(-7), day(-1))
+        self.assertEqual(self.auth0.requests, [(day(-7), day(-1))])
+
+    def test_store_failures_fall_back_to_auth0(self):
+        self.dao.get_days = MagicMock(side_effect=RuntimeError('down'))
+
+        records = self.store.fetch(self.auth0, day(-5), day(-1))
+
+        self.assertEqual(len(records), 5)
+        self.assertEqual(self.auth0.requests, [(day(-5), day(-1))])
+
+    def test_without_a_store_or_start_ranges_go_to_auth0(self):
+        auth0_service = MagicMock()
+        auth0_service.get.return_value = [{'date': '2024-01-01T00:00:00.000Z'}]
+
+        DailyStatsStore().fetch(auth0_service, day(-5), day(-1))
+        self.store.fetch(auth0_service, None, day(-1))
+
+        self.assertEqual(
+            [call.kwargs['query_params'] for call in auth0_service.get.call_args_list],
+            [{'from': day(-5), 'to': day(-1)}, {'to': day(-1)}],
+        )
+
+    def test_handler_reads_through_the_store(self):
+        date_period = {'startDate': f'{(TODAY - timedelta(days=14)).isoformat()}T12:00:00+00:00',
+                       'endDate': f'{(TODAY - timedelta(days=1)).isoformat()}T12:00:00+00:00'}
+
+        with patch.object(handler_module, 'daily_stats_store', self.store):
+            for _ in range(2):
+                _, needs_file_upload, _, _ = GetStatsIntentHandler().handle_intent(
+                    {'date-period': [date_period]}, self.auth0
+                )
+
+        self.assertTrue(needs_file_upload)
+        self.assertEqual(self.auth0.requests, [(day(-14), day(-1))])
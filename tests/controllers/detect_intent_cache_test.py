@@ -0,0 +1,36 @@
+import unittest
+
+from ...services.dialogflow_service import DetectIntentCache
+
+
+class TestDetectIntentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DetectIntentCache(
+            max_size=10, ttl=60, excluded_intents=frozenset({'GetStatsIntent'})
+        )
+
+    def test_parameterless_results_match_any_case_and_spacing(self):
+        result = ('GetTenantSettingsIntent', 'Here are your settings', {})
+        self.cache.set('Show tenant settings', 'en', result)
+
+        self.assertEqual(self.cache.get('  show   *TENANT* settings ', 'en'), result)
+        self.assertIsNone(self.cache.get('show tenant settings', 'fr'))
+
+    def test_results_with_parameters_keep_case(self):
+        result = ('GetUserByIdIntent', 'Here is the user', {'Auth0-User-ID': 'auth0|ABC'})
+        self.cache.set('get user auth0|ABC', 'en', result)
+
+        self.assertEqual(self.cache.get('get  user auth0|ABC', 'en'), result)
+        self.assertIsNone(self.cache.get('get user auth0|abc', 'en'))
+
+    def test_excluded_intents_are_not_cached(self):
+        self.cache.set('get stats for last week', 'en', ('GetStatsIntent', '', {}))
+
+        self.assertIsNone(self.cache.get('get stats for last week', 'en'))
+
+    def test_cached_parameters_cannot_be_mutated(self):
+        self.cache.set('find jane@test.au', 'en', ('SearchUsersByEmailIntent', '', {'email': 'jane@test.au'}))
+        self.cache.get('find jane@test.au', 'en')[2]['email'] = 'mutated'
+
+        self.assertEqual(self.cache.get('find jane@test.au', 'en')[2]['email'], 'jane@test.au')
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from slack_bolt import App
+from slack_bolt.authorization import AuthorizeResult
+from slack_bolt.request import BoltRequest
+from slack_sdk.signature import SignatureVerifier
+
+from ...services import slack_service as slack_service_module
+from ...services.event_deduplicator import AsyncEventDeduplicator, EventDeduplicator
+
+SIGNING_SECRET = 'test-signing-secret'
+
+
+def event_body(event_id='Ev001', client_msg_id='c0ffee'):
+    return {
+        'type': 'event_callback',
+        'event_id': event_id,
+        'event': {
+            'type': 'message',
+            'user': 'U12345678',
+            'text': 'get tenant settings',
+            'channel': 'D1',
+            'client_msg_id': client_msg_id,
+        },
+    }
+
+
+class TestEventDeduplicator(unittest.TestCase):
+
+    def test_event_keys(self):
+        self.assertEqual(
+            EventDeduplicator.event_keys(event_body()),
+            ['event:Ev001', 'message:c0ffee'],
+        )
+        self.assertEqual(EventDeduplicator.event_keys({'type': 'url_verification'}), [])
+
+    def test_retries_are_duplicates(self):
+        deduplicator = EventDeduplicator()
+
+        self.assertFalse(deduplicator.is_duplicate(event_body()))
+        self.assertTrue(deduplicator.is_duplicate(event_body()))
+        self.assertEqual(deduplicator.stats()['duplicates'], 1)
+
+    def test_same_message_under_new_event_id_is_duplicate(self):
+        deduplicator = EventDeduplicator()
+
+        self.assertFalse(deduplicator.is_duplicate(event_body(event_id='Ev001')))
+        self.assertTrue(deduplicator.is_duplicate(event_body(event_id='Ev002')))
+
+    def test_other_requests_pass_through(self):
+        deduplicator = EventDeduplicator()
+        body = {'type': 'view_submission'}
+
+        self.assertFalse(deduplicator.is_duplicate(body))
+        self.assertFalse(deduplicator.is_duplicate(body))
+
+    def test_store_recognizes_events_seen_by_other_replicas(self):
+        store = MagicMock()
+        store.claim_event.return_value = False
+        deduplicator = EventDeduplicator(store=store)
+
+        self.assertTrue(deduplicator.is_duplicate(event_body()))
+        self.assertEqual(store.claim_event.call_count, 2)
+
+    def test_store_failures_fail_open(self):
+        store = MagicMock()
+        store.claim_event.side_effect = ConnectionError("down")
+        deduplicator = EventDeduplicator(store=store)
+
+        self.assertFalse(deduplicator.is_duplicate(event_body()))
+        # The in-memory claim still catches the retry
+        self.assertTrue(deduplicator.is_duplicate(event_body()))
+
+    def test_async_deduplicator_uses_async_store(self):
+        claimed = set()
+
+        class Store:
+            async def claim_event(self, key):
+                if key in claimed:
+                    return False
+                claimed.add(key)
+                return True
+
+        async def scenario():
+            first = AsyncEventDeduplicator(store=Store())
+            other_replica = AsyncEventDeduplicator(store=Store())
+            return (
+                await first.is_duplicate(event_body()),
+                await other_replica.is_duplicate(event_body()),
+            )
+
+        self.assertEqual(asyncio.run(scenario()), (False, True))
+
+
+class TestDeduplicationMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.original = slack_service_module.event_deduplicator
+        slack_service_module.event_deduplicator = EventDeduplicator()
+        self.listener = MagicMock()
+
+        self.app = App(
+            signing_secret=SIGNING_SECRET,
+            # Stands in for the auth.test call made by the single-workspace setup
+            authorize=lambda enterprise_id, team_id, user_id: AuthorizeResult(
+                enterprise_id=enterprise_id, team_id=team_id, bot_token='xoxb-test'
+            ),
+            process_before_response=True,
+        )
+        self.app.use(slack_service_module.deduplicate_events)
+
+        @self.app.event('message')
+        def handle(event):
+            self.listener(event)
+
+    def tearDown(self):
+        slack_service_module.event_deduplicator = self.original
+
+    def dispatch(self, body, retry_num=None):
+        raw = json.dumps(body)
+        timestamp = str(int(time.time()))
+        headers = {
+            'content-type': ['application/json'],
+            'x-slack-request-timestamp': [timestamp],
+            'x-slack-signature': [
+                SignatureVerifier(SIGNING_SECRET).generate_signature(
+                    timestamp=timestamp, body=raw
+                )
+            ],
+        }
+        if retry_num is not None:
+            headers['x-slack-retry-num'] = [str(retry_num)]
+        return self.app.dispatch(BoltRequest(body=raw, headers=headers))
+
+    def test_retries_are_acked_without_reaching_listeners(self):
+        first = self.dispatch(event_body())
+        retry = self.dispatch(event_body(), retry_num=1)
+
+        self.assertEqual(first.status, 200)
+        self.assertEqual(retry.status, 200)
+        self.listener.assert_called_once()
@@ -0,0 +1,130 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from ...services import template_formatters
+from ...services.intent_handlers import get_ulp_template_intent_handler as ulp_handler_module
+from ...services.intent_handlers.get_ulp_template_intent_handler import (
+    FormattedTemplateCache,
+    GetULPTemplateIntentHandler,
+)
+
+TEMPLATE = (
+    '<!DOCTYPE html><html><head>{%- auth0:head -%}<style>body{margin:0}</style></head>'
+    '<body>{%- auth0:widget -%}</body></html>'
+)
+
+
+class TestFormattedTemplateCache(unittest.TestCase):
+
+    def test_formats_each_template_once(self):
+        cache = FormattedTemplateCache(max_size=2)
+        format_fn = MagicMock(side_effect=lambda template: template.upper())
+
+        self.assertEqual(cache.get_or_format('a', format_fn), 'A')
+        self.assertEqual(cache.get_or_format('a', format_fn), 'A')
+        self.assertEqual(cache.get_or_format('b', format_fn), 'B')
+
+        self.assertEqual(format_fn.call_count, 2)
+
+    def test_least_recently_used_template_is_evicted(self):
+        cache = FormattedTemplateCache(max_size=1)
+        format_fn = MagicMock(side_effect=lambda template: template.upper())
+
+        for template in ('a', 'b', 'a'):
+            cache.get_or_format(template, format_fn)
+
+        self.assertEqual(format_fn.call_count, 3)
+
+    def test_failed_formatting_is_not_cached(self):
+        cache = FormattedTemplateCache()
+        format_fn = MagicMock(return_value='')
+
+        cache.get_or_format('a', format_fn)
+        cache.get_or_format('a', format_fn)
+
+        self.assertEqual(format_fn.call_count, 2)
+
+    def test_keys_are_content_hashes(self):
+        self.assertEqual(FormattedTemplateCache.key('a'), FormattedTemplateCache.key('a'))
+        self.assertNotEqual(FormattedTemplateCache.key('a'), FormattedTemplateCache.key('a '))
+
+    def test_keys_depend_on_the_formatter(self):
+        self.assertNotEqual(
+            FormattedTemplateCache.key('a', 'soup'), FormattedTemplateCache.key('a', 'streaming')
+        )
+
+    def test_concurrent_requests_format_once(self):
+        cache = FormattedTemplateCache()
+        calls = []
+
+        def slow_format(template):
+            calls.append(template)
+            time.sleep(0.1)
+            return template.upper()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: cache.get_or_format('a', slow_format), range(4)))
+
+        self.assertEqual(results, ['A'] * 4)
+        self.assertEqual(len(calls), 1)
+
+    def test_formatted_templates_are_shared_through_the_store(self):
+        stored = {}
+        store = MagicMock()
+        store.get_formatted.side_effect = stored.get
+        store.save_formatted.side_effect = stored.__setitem__
+        format_fn = MagicMock(side_effect=lambda template: template.upper())
+
+        FormattedTemplateCache(store=store).get_or_format('a', format_fn)
+        # Another replica, or this one after a restart
+        self.assertEqual(FormattedTemplateCache(store=store).get_or_format('a', format_fn), 'A')
+
+        self.assertEqual(format_fn.call_count, 1)
+        self.assertEqual(list(stored), [FormattedTemplateCache.key('a')])
+
+    def test_store_failures_fall_back_to_formatting(self):
+        store = MagicMock()
+        store.get_formatted.side_effect = Exception('MongoDB is down')
+        store.save_formatted.side_effect = Exception('MongoDB is down')
+        cache = FormattedTemplateCache(store=store)
+
+        self.assertEqual(cache.get_or_format('a', str.upper), 'A')
+        self.assertEqual(cache.get_or_format('a', str.upper), 'A')
+        store.get_formatted.assert_called_once()
+
+
+class TestGetULPTemplateIntentHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = FormattedTemplateCache()
+        patcher = patch.object(ulp_handler_module, 'formatted_template_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = GetULPTemplateIntentHandler()
+        self.auth0_service = MagicMock()
+        self.auth0_service.get.return_value = {'body': TEMPLATE}
+
+    def test_repeat_requests_reuse_the_formatted_template(self):
+        with patch.object(
+            GetULPTemplateIntentHandler, 'format_html', wraps=self.handler.format_html
+        ) as format_html:
+            first = self.handler.handle_intent({}, self.auth0_service)
+            second = self.handler.handle_intent({}, self.auth0_service)
+
+        self.assertEqual(first, second)
+        self.assertTrue(first[1])
+        self.assertIn('margin: 0;', first[0])
+        format_html.assert_called_once()
+
+    def test_cssutils_is_configured_once(self):
+        cssutils = template_formatters._cssutils()
+        cssutils.ser.prefs.indent = '\t'
+
+        template_formatters.SoupTemplateFormatter().format_css('a{color:red}')
+
+        # Preferences are no longer reset on every call
+        self.assertIs(template_formatters._cssutils(), cssutils)
+        self.assertEqual(cssutils.ser.prefs.indent, '\t')
+        cssutils.ser.prefs.indent = '    '
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from requests.adapters import HTTPAdapter
+
+from ...services import http_session_pool
+from ...services.http_session_pool import IdleExpiryAdapter, close_sessions, get_session
+
+
+class TestHttpSessionPool(unittest.TestCase):
+
+    def tearDown(self):
+        close_sessions()
+
+    def test_get_session_reuses_session_per_tenant(self):
+        session = get_session('tenant-a.auth0.com')
+
+        self.assertIs(get_session('tenant-a.auth0.com'), session)
+        self.assertIsNot(get_session('tenant-b.auth0.com'), session)
+
+    def test_get_session_mounts_pooled_adapter(self):
+        session = get_session('tenant-a.auth0.com')
+        adapter = session.get_adapter('https://tenant-a.auth0.com/api/v2/users')
+
+        self.assertEqual(adapter._pool_maxsize, http_session_pool.AUTH0_HTTP_POOL_SIZE)
+
+    def test_close_sessions_drops_pooled_sessions(self):
+        session = get_session('tenant-a.auth0.com')
+        close_sessions()
+
+        self.assertIsNot(get_session('tenant-a.auth0.com'), session)
+
+    def test_idle_connections_are_closed_before_the_next_request(self):
+        adapter = IdleExpiryAdapter(keepalive_expiry=60)
+        adapter.poolmanager = MagicMock()
+
+        with patch.object(HTTPAdapter, 'send') as send, \
+                patch.object(http_session_pool.time, 'monotonic') as monotonic:
+            monotonic.return_value = adapter.last_used + 30
+            adapter.send(MagicMock())
+            adapter.poolmanager.clear.assert_not_called()
+
+            monotonic.return_value = adapter.last_used + 61
+            adapter.send(MagicMock())
+
+        adapter.poolmanager.clear.assert_called_once()
+        self.assertEqual(send.call_count, 2)
@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ...controllers import async_message_controller as async_controller_module
+from ...controllers import message_controller as controller_module
+from ...controllers.async_message_controller import AsyncMessageController
+from ...controllers.message_controller import MessageController
+from ...services.intent_fan_out import combine_responses, split_queries, unique_detections
+from ...services.local_intent_service import LocalIntentService
+from ...utils.json_stream import stream_json
+
+CREDENTIALS = {
+    'auth0_base_url': 'tenant.auth0.com',
+    'auth0_client_id': 'client',
+    'auth0_client_secret': 'secret',
+    'slack_user_id': 'U1',
+}
+
+
+def response(text, payload=None, needs_file_upload=False):
+    return {'text': text, 'payload': payload, 'needs_file_upload': needs_file_upload, 'additional_text': None}
+
+
+class SlowHandler:
+    """Answers after a delay, recording the Auth0 service it was given."""
+
+    def __init__(self, name, delay=0.2):
+        self.name = name
+        self.delay = delay
+        self.services = []
+        self.threads = set()
+
+    def handle_intent(self, parameters, auth0_service):
+        self.services.append(auth0_service)
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return f'{self.name} result', False, None
+
+
+class TestIntentFanOutHelpers(unittest.TestCase):
+
+    def test_split_queries(self):
+        self.assertEqual(split_queries('show tenant settings'), ['show tenant settings'])
+        self.assertEqual(split_queries('tenant settings\n\n  mau count \n'), ['tenant settings', 'mau count'])
+        self.assertEqual(split_queries('a\nb\nc', max_queries=2), ['a', 'b'])
+
+    def test_split_queries_keeps_code_blocks_whole(self):
+        self.assertEqual(
+            split_queries('search users where\n```\nemail:*\n\n  AND blocked:true\n```\nmau count'),
+            ['search users where\n```\nemail:*\n\n  AND blocked:true\n```', 'mau count'],
+        )
+
+    def test_unique_detections(self):
+        detections = [
+            ('GetStatsIntent', 'Stats:', {}),
+            ('GetUserByIdIntent', 'User:', {'id': 'a'}),
+            ('GetStatsIntent', 'Stats again:', {}),
+            ('GetUserByIdIntent', 'User:', {'id': 'b'}),
+        ]
+
+        self.assertEqual(
+            [detection[1:] for detection in unique_detections(detections)],
+            [('Stats:', {}), ('User:', {'id': 'a'}), ('User:', {'id': 'b'})],
+        )
+
+    def test_short_responses_are_combined_inline(self):
+        combined = combine_responses([response('Settings:', '```{}```'), response('Sorry, no handler.')])
+
+        self.assertEqual(combined['text'], 'Settings:\n```{}```\n\nSorry, no handler.')
+        self.assertFalse(combined['needs_file_upload'])
+
+    def test_long_responses_are_combined_into_one_file(self):
+        streamed = stream_json({'users': ['x' * 50] * 10}, limit=10)
+        combined = combine_responses(
+            [response('Settings:', '```{"a": 1}```'), response('Users:', streamed, True)]
+        )
+
+        with combined['payload'] as payload:
+            content = payload.read().decode('utf-8')
+        self.assertTrue(combined['needs_file_upload'])
+        self.assertEqual(combined['text'], 'Here are the answers to your 2 questions:')
+        self.assertTrue(content.startswith('Settings:\n{"a": 1}\n\nUsers:\n{'))
+        self.assertTrue(streamed.closed)
+
+    def test_inline_responses_past_the_limit_go_to_a_file(self):
+        combined = combine_responses([response('a' * 8), response('b' * 8)], limit=10)
+
+        self.assertTrue(combined['needs_file_upload'])
+        combined['payload'].close()
+
+
+class TestLocalCompoundIntents(unittest.TestCase):
+
+    def setUp(self):
+        self.local_intent_service = LocalIntentService(confidence_threshold=0.9, enabled=True)
+
+    def test_compound_queries_detect_every_intent(self):
+        detections = self.local_intent_service.detect_intents('show tenant settings and MAU count')
+
+        self.assertEqual(
+            [intent for intent, _, _ in detections],
+            ['GetTenantSettingsIntent', 'GetActiveUsersCountIntent'],
+        )
+
+    def test_single_and_unclear_queries_are_not_compound(self):
+        for text in ('show tenant settings', 'stats for last week and mau', 'hello'):
+            self.assertIsNone(self.local_intent_service.detect_intents(text), text)
+
+
+class TestMessageControllerFanOut(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (
+            ('m2m_credentials_dao', MagicMock(**{'get_credentials.return_value': CREDENTIALS})),
+            ('Auth0Service', MagicMock()),
+        ):
+            patcher = patch.object(controller_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.controller = MessageController()
+        self.handlers = {
+            'GetTenantSettingsIntent': SlowHandler('settings'),
+            'GetActiveUsersCountIntent': SlowHandler('mau'),
+        }
+        self.controller.intent_handler_factory = MagicMock()
+        self.controller.intent_handler_factory.get_handler.side_effect = self.handlers.get
+
+    def test_compound_query_runs_handlers_concurrently(self):
+        started = time.monotonic()
+        result = self.controller.process_message('show tenant settings and MAU count', 'U1')
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(
+            result['text'],
+            'Here are your tenant settings:\nsettings result\n\n'
+            'Here is your active users count:\nmau result',
+        )
+        settings, mau = self.handlers.values()
+        # One Auth0 service, and so one token, for every handler
+        self.assertIs(settings.services[0], mau.services[0])
+        self.assertNotEqual(settings.threads, mau.threads)
+
+    def test_batch_of_queries_is_answered_in_one_reply(self):
+        self.controller.dialogflow_service = MagicMock()
+        self.controller.dialogflow_service.detect_intent_texts.return_value = (
+            'GetActiveUsersCountIntent', 'Active users:', {}
+        )
+
+        result = self.controller.process_message('Show tenant settings.\nhow are we doing on actives', 'U1')
+
+        self.assertIn('settings result', result['text'])
+        self.assertIn('Active users:\nmau result', result['text'])
+        self.controller.dialogflow_service.detect_intent_texts.assert_called_once()
+
+    def test_search_written_over_several_lines_is_one_query(self):
+        self.controller.dialogflow_service = MagicMock()
+        for message in (
+            'Search users where\n```\nidentities.connection:"google-oauth2" AND last_login:[2024-01-01 TO *]\n```',
+            'find users matching\nidentities.connection:"google-oauth2"\nAND last_login:[2024-01-01 TO *]',
+        ):
+            detections = self.controller._detect_intents(message)
+
+            self.assertEqual(len(detections), 1, message)
+            intent, _, parameters = detections[0]
+            self.assertEqual(intent, 'SearchUsersIntent')
+            self.assertEqual(
+                parameters['query'].split(),
+                ['identities.connection:"google-oauth2"', 'AND', 'last_login:[2024-01-01', 'TO', '*]'],
+            )
+        self.controller.dialogflow_service.detect_intent_texts.assert_not_called()
+
+    def test_failed_handler_does_not_fail_the_reply(self):
+        self.handlers['GetActiveUsersCountIntent'].handle_intent = MagicMock(side_effect=RuntimeError)
+
+        result = self.controller.process_message('show tenant settings and MAU count', 'U1')
+
+        self.assertIn('settings result', result['text'])
+        self.assertIn('An error occurred while processing your request.', result['text'])
+
+    def test_fan_out_can_be_disabled(self):
+        with patch.object(controller_module, 'MULTI_INTENT_ENABLED', False):
+            self.controller.dialogflow_service = MagicMock()
+            self.controller.dialogflow_service.detect_intent_texts.return_value = (
+                'GetTenantSettingsIntent', 'Settings:', {}
+            )
+            result = self.controller.process_message('show tenant settings and MAU count', 'U1')
+
+        self.assertEqual(result['payload'], 'settings result')
+
+
+class TestAsyncMessageControllerFanOut(unittest.TestCase):
+
+    def setUp(self):
+        for name, value in (
+            ('async_m2m_credentials_dao', MagicMock(get_credentials=AsyncMock(return_value=CREDENTIALS))),
+            ('AsyncAuth0Service', MagicMock()),
+        ):
+            patcher = patch.object(async_controller_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.controller = AsyncMessageController()
+        self.handlers = {
+            'GetTenantSettingsIntent': SlowHandler('settings'),
+            'GetULPTemplateIntent': SlowHandler('ulp'),
+        }
+        self.controller.intent_handler_factory = MagicMock()
+        self.controller.intent_handler_factory.get_handler.side_effect = self.handlers.get
+
+    def test_compound_query_runs_handlers_concurrently(self):
+        started = time.monotonic()
+        result = asyncio.run(self.controller.process_message('tenant settings and the ulp', 'U1'))
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertIn('settings result', result['text'])
+        self.assertIn('ulp result', result['text'])
+        settings, ulp = self.handlers.values()
+        self.assertIs(settings.services[0], ulp.services[0])
+
+    def test_search_written_over_several_lines_is_one_query(self):
+        self.controller.dialogflow_service = MagicMock()
+
+        detections = asyncio.run(self.controller._detect_intents(
+            'Search users where\n```\nidentities.connection:"google-oauth2" AND last_login:[2024-01-01 TO *]\n```'
+        ))
+
+        self.assertEqual(
+            detections,
+            [('SearchUsersIntent', detections[0][1], {
+                'query': 'identities.connection:"google-oauth2" AND last_login:[2024-01-01 TO *]'
+            })],
+        )
+        self.controller.dialogflow_service.detect_intent_texts.assert_not_called()
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from ...services.intent_handlers.base_intent_handler import (
+    INTENT_HANDLER_REGISTRY,
+    BaseIntentHandler,
+    register_intent_handler,
+)
+from ...services.intent_handlers.intent_handler_factory import (
+    INTENT_HANDLER_MODULES,
+    IntentHandlerFactory,
+)
+
+PACKAGE_NAME = __package__.split('.')[0]
+
+
+class TestIntentHandlerFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = IntentHandlerFactory()
+
+    def test_get_handler_dispatches_every_known_intent(self):
+        for intent_name in INTENT_HANDLER_MODULES:
+            handler = self.factory.get_handler(intent_name)
+            self.assertEqual(handler.INTENT_NAME, intent_name)
+            self.assertTrue(handler.can_handle(intent_name))
+
+    def test_get_handler_reuses_handler_instances(self):
+        self.assertIs(
+            self.factory.get_handler("GetTenantSettingsIntent"),
+            self.factory.get_handler("GetTenantSettingsIntent"),
+        )
+
+    def test_get_handler_returns_none_for_unknown_intent(self):
+        self.assertIsNone(self.factory.get_handler("Default Fallback Intent"))
+
+    def test_registered_handlers_are_dispatched(self):
+        @register_intent_handler
+        class EchoIntentHandler(BaseIntentHandler):
+            INTENT_NAME = "EchoIntent"
+
+            def can_handle(self, intent_name):
+                return intent_name == self.INTENT_NAME
+
+            def handle_intent(self, parameters, auth0_service):
+                return self.format_response(parameters), False, None
+
+            def format_response(self, res):
+                return str(res)
+
+        try:
+            self.assertIsInstance(self.factory.get_handler("EchoIntent"), EchoIntentHandler)
+        finally:
+            INTENT_HANDLER_REGISTRY.pop("EchoIntent", None)
+
+    def test_ulp_handler_dependencies_load_on_first_dispatch(self):
+        script = (
+            "import sys\n"
+            f"from {PACKAGE_NAME}.services.intent_handlers.intent_handler_factory import IntentHandlerFactory\n"
+            "factory = IntentHandlerFactory()\n"
+            "factory.get_handler('GetTenantSettingsIntent')\n"
+            f"assert '{PACKAGE_NAME}.services.template_formatters' not in sys.modules\n"
+            "factory.get_handler('GetULPTemplateIntent')\n"
+            f"assert '{PACKAGE_NAME}.services.template_formatters' in sys.modules\n"
+            # The default streaming formatter needs neither BeautifulSoup nor cssutils
+            "assert 'bs4' not in sys.modules and 'cssutils' not in sys.modules\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[3],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_stats_handler_loads_numpy_on_first_dispatch(self):
+        script = (
+            "import sys\n"
+            f"from {PACKAGE_NAME}.services.intent_handlers.intent_handler_factory import IntentHandlerFactory\n"
+            "factory = IntentHandlerFactory()\n"
+            "factory.get_handler('GetTenantSettingsIntent')\n"
+            "assert 'numpy' not in sys.modules\n"
+            "factory.get_handler('GetStatsIntent')\n"
+            "assert 'numpy' in sys.modules\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[3],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -0,0 +1,151 @@
+import asyncio
+import csv
+import io
+import json
+import unittest
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from ...services import async_slack_service as async_slack_service_module
+from ...services import slack_service as slack_service_module
+from ...services.intent_handlers.get_stats_intent_handler import GetStatsIntentHandler
+from ...utils import json_stream
+from ...utils.constants import MULTILINE_CODE_DELIMITER
+from ...utils.json_stream import stream_json
+from ..testutils.fake_slack_upload import start_upload_server, upload_ticket
+
+
+def daily_stats(days):
+    return [
+        {'date': f'{date(2024, 1, 1) + timedelta(days=day)}T00:00:00.000Z', 'logins': day, 'signups': 0,
+         'leaked_passwords': 0, 'updated_at': '2024-01-02T00:00:00.000Z', 'created_at': '2024-01-02'}
+        for day in range(days)
+    ]
+
+
+class TestStreamJson(unittest.TestCase):
+
+    def test_short_payload_is_returned_as_string(self):
+        res = {'friendly_name': 'Tenant', 'flags': {'enable_sso': True}}
+
+        self.assertEqual(stream_json(res, limit=1000), json.dumps(res, indent=4))
+
+    def test_payload_at_the_limit_stays_inline(self):
+        res = {'name': 'x' * 20}
+        limit = len(json.dumps(res, indent=4))
+
+        self.assertIsInstance(stream_json(res, limit=limit), str)
+        self.assertNotIsInstance(stream_json(res, limit=limit - 1), str)
+
+    def test_long_payload_is_streamed_to_a_file(self):
+        res = daily_stats(365)
+
+        with stream_json(res, limit=100) as payload:
+            self.assertEqual(payload.read().decode('utf-8'), json.dumps(res, indent=4))
+
+    def test_non_ascii_is_encoded_as_utf8(self):
+        res = {'name': 'Zoë ' * 50}
+
+        with stream_json(res, limit=10) as payload:
+            self.assertEqual(json.loads(payload.read().decode('utf-8')), res)
+
+    def test_large_payload_spills_to_disk(self):
+        with patch.object(json_stream, 'UPLOAD_SPOOL_MAX_MEMORY', 1024):
+            payload = stream_json(daily_stats(365), limit=100)
+
+        with payload:
+            self.assertTrue(payload._rolled)
+
+
+class TestStreamedUpload(unittest.TestCase):
+
+    def test_handler_wraps_short_payloads_in_code_block(self):
+        auth0_service = MagicMock()
+        auth0_service.get.return_value = daily_stats(1)
+
+        payload, needs_file_upload, _ = GetStatsIntentHandler().handle_intent({}, auth0_service)
+
+        self.assertFalse(needs_file_upload)
+        self.assertTrue(payload.startswith(MULTILINE_CODE_DELIMITER))
+
+    def test_handler_returns_file_for_long_payloads(self):
+        auth0_service = MagicMock()
+        auth0_service.get.return_value = daily_stats(365)
+
+        payload, needs_file_upload, additional_text, filename = GetStatsIntentHandler().handle_intent(
+            {}, auth0_service
+        )
+
+        self.assertTrue(needs_file_upload)
+        self.assertEqual(filename, 'daily-stats.csv')
+        self.assertIn('logins', additional_text)
+        with payload:
+            rows = list(csv.DictReader(io.TextIOWrapper(payload, encoding='utf-8')))
+        self.assertEqual(len(rows), 365)
+        self.assertEqual(rows[-1]['date'], '2024-12-30')
+        self.assertEqual(rows[-1]['logins'], '364')
+
+    def response(self):
+        return {
+            'text': 'Here are your stats:',
+            'payload': stream_json(daily_stats(365)),
+            'needs_file_upload': True,
+            'additional_text': None,
+        }
+
+    def setUp(self):
+        self.server = start_upload_server(self)
+
+    def assert_streamed(self, client, filename):
+        # files_upload_v2 reads the whole file into memory, so files must never reach it
+        client.files_upload_v2.assert_not_called()
+        client.files_getUploadURLExternal.assert_called_once()
+        self.assertEqual(client.files_getUploadURLExternal.call_args.kwargs['filename'], filename)
+        [(path, _, body)] = self.server.uploads
+        self.assertEqual(path, '/upload/F1')
+        self.assertEqual(json.loads(body), daily_stats(365))
+        client.files_completeUploadExternal.assert_called_once_with(
+            files=[{'id': 'F1', 'title': filename}], channel_id='C1'
+        )
+
+    @patch.object(slack_service_module, 'message_controller')
+    def test_file_payload_is_streamed_and_closed(self, mock_message_controller):
+        response = self.response()
+        mock_message_controller.process_message.return_value = response
+        client = MagicMock()
+        client.files_getUploadURLExternal.return_value = upload_ticket(self.server)
+
+        slack_service_module.process_message_event(
+            {'user': 'U1', 'text': 'stats', 'channel': 'C1'}, MagicMock(), client
+        )
+
+        self.assert_streamed(client, 'response.txt')
+        self.assertTrue(response['payload'].closed)
+
+    @patch.object(slack_service_module, 'message_controller')
+    def test_text_payload_is_uploaded_as_content(self, mock_message_controller):
+        mock_message_controller.process_message.return_value = dict(self.response(), payload='text')
+        client = MagicMock()
+
+        slack_service_module.process_message_event(
+            {'user': 'U1', 'text': 'stats', 'channel': 'C1'}, MagicMock(), client
+        )
+
+        self.assertEqual(client.files_upload_v2.call_args.kwargs['content'], 'text')
+        client.files_getUploadURLExternal.assert_not_called()
+
+    @patch.object(async_slack_service_module, 'message_controller')
+    def test_async_file_payload_is_streamed_and_closed(self, mock_message_controller):
+        response = dict(self.response(), filename='daily-stats.csv')
+        mock_message_controller.process_message = AsyncMock(return_value=response)
+        client = MagicMock()
+        client.files_upload_v2 = AsyncMock()
+        client.files_getUploadURLExternal = AsyncMock(return_value=upload_ticket(self.server))
+        client.files_completeUploadExternal = AsyncMock()
+
+        asyncio.run(async_slack_service_module.process_message_event(
+            {'user': 'U1', 'text': 'stats', 'channel': 'C1'}, AsyncMock(), client
+        ))
+
+        self.assert_streamed(client, 'daily-stats.csv')
+        self.assertTrue(response['payload'].closed)
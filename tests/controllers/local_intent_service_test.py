@@ -0,0 +1,79 @@
+import unittest
+
+from ...services.local_intent_service import IntentMatch, LocalIntentService
+
+
+class TestLocalIntentService(unittest.TestCase):
+
+    def setUp(self):
+        self.local_intent_service = LocalIntentService(confidence_threshold=0.9, enabled=True)
+
+    def detected_intent(self, text):
+        result = self.local_intent_service.detect_intent(text)
+        return result[0] if result else None
+
+    """
+    Training phrases from the help text and Dialogflow tests resolve locally
+    """
+    def test_detect_intent_training_phrases(self):
+        cases = {
+            "get json for user ID auth0|12345678": "GetUserByIdIntent",
+            "retrieve configs usr id auth0|12345678": "GetUserByIdIntent",
+            "search for jane.doe@test.au": "SearchUsersByEmailIntent",
+            "Find user with email nicholasgcc@gmail.com": "SearchUsersByEmailIntent",
+            "Show tenant settings.": "GetTenantSettingsIntent",
+            "Display the tenant's configurations.": "GetTenantSettingsIntent",
+            "What's our MAU count?": "GetActiveUsersCountIntent",
+            "How many active users do we have?": "GetActiveUsersCountIntent",
+            "Get daily stats": "GetStatsIntent",
+            "Fetch ULP template": "GetULPTemplateIntent",
+            "Export all users": "ExportUsersIntent",
+            "please dump our users": "ExportUsersIntent",
+        }
+        for text, intent in cases.items():
+            self.assertEqual(self.detected_intent(text), intent, text)
+
+    def test_detect_intent_extracts_parameters(self):
+        _, _, parameters = self.local_intent_service.detect_intent(
+            "pls gimme raw json for `samlp|Okta-SAML-SP|nicholas.canete@okta.com`"
+        )
+        self.assertEqual(parameters, {"Auth0-User-ID": "samlp|Okta-SAML-SP|nicholas.canete@okta.com"})
+
+        _, _, parameters = self.local_intent_service.detect_intent("search for jane.doe@test.au.")
+        self.assertEqual(parameters, {"email": "jane.doe@test.au"})
+
+    """
+    Anything Dialogflow has to resolve (dates, malformed identifiers, small talk,
+    ambiguous requests) falls back
+    """
+    def test_detect_intent_falls_back(self):
+        texts = [
+            "Get daily stats from Jan 1 to Jan 7.",
+            "Show stats for last week.",
+            "retrieve configs usr id auth0-12345678",
+            "find me details for jane.doe(at)test.au",
+            "show tenant settings and MAU count",
+            "spam and eggs",
+            "hello",
+        ]
+        for text in texts:
+            self.assertIsNone(self.detected_intent(text), text)
+
+    def test_low_confidence_matches_fall_back(self):
+        class StubEngine:
+            def classify(self, text):
+                return IntentMatch("GetTenantSettingsIntent", {}, 0.5)
+
+        service = LocalIntentService(engine=StubEngine(), confidence_threshold=0.9, enabled=True)
+
+        self.assertIsNone(service.detect_intent("tenant settings maybe"))
+        self.assertEqual(service.stats()["low_confidence"], 1)
+
+    def test_stats_track_hit_rate(self):
+        self.local_intent_service.detect_intent("Show tenant settings")
+        self.local_intent_service.detect_intent("hello")
+
+        stats = self.local_intent_service.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+
+from ...dao.m2m_credentials_dao import M2MCredentialsDAO
+
+
+class TestM2MCredentialsDAOCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = M2MCredentialsDAO()
+        self.dao.collection = MagicMock()
+        self.document = {
+            'slack_user_id': 'U12345678',
+            'auth0_base_url': 'your-domain.auth0.com',
+            'auth0_client_id': 'test_client_id',
+            'auth0_client_secret': 'test_client_secret',
+        }
+        self.dao.collection.find_one.return_value = dict(self.document)
+
+    def test_get_credentials_reads_through_cache(self):
+        first = self.dao.get_credentials('U12345678')
+        second = self.dao.get_credentials('U12345678')
+
+        self.assertEqual(first, self.document)
+        self.assertEqual(second, self.document)
+        self.dao.collection.find_one.assert_called_once()
+        self.assertEqual(self.dao.cache.stats()['hits'], 1)
+        self.assertEqual(self.dao.cache.stats()['misses'], 1)
+
+    def test_missing_credentials_are_not_cached(self):
+        self.dao.collection.find_one.return_value = None
+
+        self.assertIsNone(self.dao.get_credentials('U12345678'))
+        self.assertIsNone(self.dao.get_credentials('U12345678'))
+        self.assertEqual(self.dao.collection.find_one.call_count, 2)
+
+    def test_upsert_credentials_invalidates_cache(self):
+        self.dao.get_credentials('U12345678')
+        self.dao.upsert_credentials('U12345678', {'auth0_base_url': 'other.auth0.com'})
+        self.dao.get_credentials('U12345678')
+
+        self.assertEqual(self.dao.collection.find_one.call_count, 2)
+
+    def test_update_access_token_writes_through_cache(self):
+        self.dao.get_credentials('U12345678')
+        self.dao.update_access_token('U12345678', 'new_access_token', 3600)
+
+        credentials = self.dao.get_credentials('U12345678')
+
+        self.assertEqual(credentials['access_token'], 'new_access_token')
+        self.assertIsNotNone(credentials['token_expires_at'])
+        self.dao.collection.find_one.assert_called_once()
+
+    def test_cached_credentials_are_copies(self):
+        self.dao.get_credentials('U12345678')['auth0_base_url'] = 'mutated'
+
+        self.assertEqual(
+            self.dao.get_credentials('U12345678')['auth0_base_url'],
+            'your-domain.auth0.com',
+        )
+
+    def test_get_credentials_uses_projection(self):
+        self.dao.get_credentials('U12345678')
+
+        args, _ = self.dao.collection.find_one.call_args
+        self.assertEqual(args[0], {'slack_user_id': 'U12345678'})
+        self.assertEqual(args[1]['_id'], 0)
+
+    def test_ensure_indexes_creates_unique_slack_user_id_index(self):
+        self.dao.ensure_indexes()
+
+        args, kwargs = self.dao.collection.create_index.call_args
+        self.assertEqual(args[0], [('slack_user_id', 1)])
+        self.assertTrue(kwargs['unique'])
@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ...services import auth0_service as auth0_service_module
+from ...services.auth0_service import Auth0Service
+from ...services.intent_handlers.search_users_handler import SearchUsersIntentHandler
+from ...services.local_intent_service import RuleBasedIntentEngine
+from ...services.paginator import paginate
+from ...utils import record_export
+from ...utils.constants import NO_DATA_MESSAGE
+from ...utils.record_export import spool_records
+
+
+def user(index):
+    return {
+        'user_id': f'auth0|{index}',
+        'email': f'user{index}@example.com',
+        'identities': [{'connection': 'Username-Password-Authentication'}],
+        'logins_count': index,
+    }
+
+
+class FakeUsersEndpoint:
+    """Serves ``total`` users in pages, like GET /api/v2/users with include_totals."""
+
+    def __init__(self, total):
+        self.total = total
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, endpoint, query_params):
+        with self.lock:
+            self.requests.append(query_params)
+        start = query_params['page'] * query_params['per_page']
+        end = min(start + query_params['per_page'], self.total)
+        return {
+            'start': start,
+            'limit': query_params['per_page'],
+            'length': max(0, end - start),
+            'total': self.total,
+            'users': [user(index) for index in range(start, end)],
+        }
+
+
+class TestPaginate(unittest.TestCase):
+
+    def test_yields_every_item_across_pages(self):
+        endpoint = FakeUsersEndpoint(total=25)
+
+        users = list(paginate(endpoint.get, 'users', {'q': 'x'}, per_page=10))
+
+        self.assertEqual([u['user_id'] for u in users], [f'auth0|{i}' for i in range(25)])
+        self.assertEqual([r['page'] for r in endpoint.requests], [0, 1, 2])
+        self.assertEqual(endpoint.requests[0], {'q': 'x', 'page': 0, 'per_page': 10, 'include_totals': 'true'})
+
+    def test_stops_at_the_total_without_an_empty_page(self):
+        endpoint = FakeUsersEndpoint(total=20)
+
+        self.assertEqual(len(list(paginate(endpoint.get, 'users', per_page=10))), 20)
+        self.assertEqual(len(endpoint.requests), 2)
+
+    def test_next_page_is_fetched_while_the_current_one_is_consumed(self):
+        endpoint = FakeUsersEndpoint(total=20)
+        second_page_requested = threading.Event()
+
+        def get(endpoint_name, query_params):
+            if query_params['page'] == 1:
+                second_page_requested.set()
+            return endpoint.get(endpoint_name, query_params)
+
+        users = paginate(get, 'users', per_page=10)
+        next(users)
+
+        # Only the first item of the first page has been consumed
+        self.assertTrue(second_page_requested.wait(timeout=2))
+        self.assertEqual(len(list(users)), 19)
+
+    def test_max_results_stops_early(self):
+        endpoint = FakeUsersEndpoint(total=100)
+
+        users = list(paginate(endpoint.get, 'users', per_page=10, max_results=15))
+
+        self.assertEqual(len(users), 15)
+        self.assertEqual(len(endpoint.requests), 2)
+
+    def test_first_page_errors_surface_at_the_call(self):
+        get = MagicMock(side_effect=RuntimeError('401 Client Error'))
+
+        with self.assertRaises(RuntimeError):
+            paginate(get, 'users')
+        get.assert_called_once()
+
+    def test_plain_list_responses(self):
+        pages = [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+
+        items = list(paginate(lambda endpoint, params: pages[params['page']], 'roles', per_page=2))
+
+        self.assertEqual(items, [{'id': 1}, {'id': 2}, {'id': 3}])
+
+    def test_auth0_service_pages_through_get(self):
+        endpoint = FakeUsersEndpoint(total=3)
+        service = Auth0Service('tenant.auth0.com', 'client', 'secret', 'U1')
+
+        def get(endpoint_name, query_params, use_cache=True):
+            self.assertFalse(use_cache)
+            return endpoint.get(endpoint_name, query_params)
+
+        with patch.object(service, 'get', side_effect=get):
+            users = list(service.paginate('users', {'q': 'x'}, per_page=2))
+
+        self.assertEqual(len(users), 3)
+
+    def test_auth0_service_pages_skip_the_response_cache(self):
+        endpoint = FakeUsersEndpoint(total=3)
+        service = Auth0Service('tenant.auth0.com', 'client', 'secret', 'U1')
+
+        def send_get(url, headers, query_params=None):
+            response = MagicMock(status_code=200)
+            response.json.return_value = endpoint.get('users', query_params)
+            return response
+
+        with patch.object(auth0_service_module, 'auth0_response_cache') as mock_cache, \
+                patch.object(service, 'get_access_token', return_value='token'), \
+                patch.object(service, '_send_get', side_effect=send_get):
+            users = list(service.paginate('users', {'q': 'x'}, per_page=2))
+
+        self.assertEqual(len(users), 3)
+        self.assertEqual(len(endpoint.requests), 2)
+        self.assertEqual(mock_cache.mock_calls, [])
+
+
+class TestSpoolRecords(unittest.TestCase):
+
+    def test_csv_rows(self):
+        payload, count = spool_records([{'a': 1, 'b': 'x'}, {'a': 2, 'c': 'ignored'}], 'csv', ('a', 'b'))
+
+        with payload:
+            self.assertEqual(payload.read().decode('utf-8'), 'a,b\r\n1,x\r\n2,\r\n')
+        self.assertEqual(count, 2)
+
+    def test_ndjson_lines(self):
+        payload, count = spool_records(iter([{'name': 'Zoë'}, {'name': 'Ana'}]), 'ndjson')
+
+        with payload:
+            lines = payload.read().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{'name': 'Zoë'}, {'name': 'Ana'}])
+
+    def test_large_exports_spill_to_disk(self):
+        with patch.object(record_export, 'UPLOAD_SPOOL_MAX_MEMORY', 1024):
+            payload, count = spool_records((user(i) for i in range(500)), 'ndjson')
+
+        with payload:
+            self.assertTrue(payload._rolled)
+        self.assertEqual(count, 500)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            spool_records([], 'xml')
+
+
+class TestSearchUsersIntentHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = SearchUsersIntentHandler()
+        self.endpoint = FakeUsersEndpoint(total=250)
+        self.auth0_service = MagicMock()
+        self.auth0_service.paginate.side_effect = (
+            lambda endpoint, query_params, **kwargs: paginate(self.endpoint.get, endpoint, query_params, **kwargs)
+        )
+
+    def test_results_are_exported_as_csv(self):
+        payload, needs_file_upload, summary, filename = self.handler.handle_intent(
+            {'query': 'logins_count:[1 TO *]'}, self.auth0_service
+        )
+
+        with payload:
+            rows = list(csv.DictReader(io.TextIOWrapper(payload, encoding='utf-8', newline='')))
+        self.assertTrue(needs_file_upload)
+        self.assertEqual(filename, 'users.csv')
+        self.assertEqual(summary, '250 users matched `logins_count:[1 TO *]`.')
+        self.assertEqual(len(rows), 250)
+        self.assertEqual(rows[1]['connection'], 'Username-Password-Authentication')
+        self.assertEqual(rows[1]['user_id'], 'auth0|1')
+        query_params = self.endpoint.requests[0]
+        self.assertEqual(query_params['q'], 'logins_count:[1 TO *]')
+        self.assertIn('identities', query_params['fields'])
+
+    def test_results_are_exported_as_ndjson(self):
+        payload, _, _, filename = self.handler.handle_intent(
+            {'query': 'email:*', 'export-format': 'NDJSON'}, self.auth0_service
+        )
+
+        with payload:
+            self.assertEqual(json.loads(payload.readline()), user(0))
+        self.assertEqual(filename, 'users.ndjson')
+        self.assertNotIn('fields', self.endpoint.requests[0])
+
+    def test_search_cap_is_reported(self):
+        self.endpoint.total = 5000
+
+        payload, _, summary, _ = self.handler.handle_intent({'query': 'email:*'}, self.auth0_service)
+
+        payload.close()
+        self.assertTrue(summary.startswith('1000 users matched'))
+        self.assertIn('at most 1000', summary)
+
+    def test_no_matches(self):
+        self.endpoint.total = 0
+
+        self.assertEqual(
+            self.handler.handle_intent({'query': 'email:nobody'}, self.auth0_service),
+            (NO_DATA_MESSAGE, False, None),
+        )
+
+    def test_invalid_parameters(self):
+        self.assertFalse(self.handler.handle_intent({}, self.auth0_service)[1])
+        self.assertIn(
+            'Unsupported export format',
+            self.handler.handle_intent({'query': 'x', 'export-format': 'xml'}, self.auth0_service)[0],
+        )
+
+    def test_local_engine_detects_searches(self):
+        match = RuleBasedIntentEngine().classify(
+            'Search users where `identities.connection:"db" AND email:jane@example.com` as ndjson'
+        )
+
+        self.assertEqual(match.intent, 'SearchUsersIntent')
+        self.assertEqual(
+            match.parameters,
+            {'query': 'identities.connection:"db" AND email:jane@example.com', 'export-format': 'ndjson'},
+        )
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from ...services import async_auth0_service as async_auth0_service_module
+from ...services import auth0_service as auth0_service_module
+from ...services.async_auth0_service import AsyncAuth0Service
+from ...services.auth0_service import Auth0Service
+from ...services.http_session_pool import aclose_async_clients, close_sessions
+from ...services.rate_limiter import Auth0RateLimiter, RateLimitExceeded, TokenBucket
+from ...services.response_cache import ResponseCache
+
+HTTP_API_BASE_URL_TEMPLATE = 'http://{auth0_base_url}/api/v2/{endpoint}'
+
+
+class StubAuth0Handler(BaseHTTPRequestHandler):
+    """Replays scripted (status, headers) responses and records when requests arrive."""
+
+    disable_nagle_algorithm = True
+    responses = []
+    arrivals = []
+
+    def do_GET(self):
+        type(self).arrivals.append(time.monotonic())
+        status, headers = type(self).responses.pop(0) if type(self).responses else (200, {})
+        body = json.dumps({'status': status}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_waits_for_refill(self):
+        bucket = TokenBucket(capacity=2, rate=1)
+
+        self.assertEqual(bucket.reserve(max_wait=5), 0)
+        self.assertEqual(bucket.reserve(max_wait=5), 0)
+        self.assertAlmostEqual(bucket.reserve(max_wait=5), 1, delta=0.05)
+        # Each queued reservation waits behind the previous one
+        self.assertAlmostEqual(bucket.reserve(max_wait=5), 2, delta=0.05)
+
+    def test_sheds_instead_of_waiting_too_long(self):
+        bucket = TokenBucket(capacity=1, rate=0.5)
+        bucket.reserve(max_wait=5)
+
+        self.assertIsNone(bucket.reserve(max_wait=1))
+        self.assertEqual(bucket.stats()['shed'], 1)
+
+    def test_headers_set_budget(self):
+        bucket = TokenBucket(capacity=10, rate=2)
+        bucket.update(200, {
+            'X-RateLimit-Limit': '50',
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': str(time.time() + 10),
+        })
+
+        self.assertEqual(bucket.capacity, 50)
+        self.assertAlmostEqual(bucket.rate, 5, delta=0.1)
+        self.assertAlmostEqual(bucket.retry_after(), 0.2, delta=0.05)
+
+    def test_429_blocks_for_retry_after(self):
+        bucket = TokenBucket(capacity=10, rate=100)
+        bucket.update(429, {'Retry-After': '3'})
+
+        self.assertAlmostEqual(bucket.retry_after(), 3, delta=0.05)
+        self.assertIsNone(bucket.reserve(max_wait=1))
+
+
+class TestAuth0ServiceRateLimiting(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAuth0Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.auth0_base_url = f'127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubAuth0Handler.responses = []
+        StubAuth0Handler.arrivals = []
+        self.limiter = Auth0RateLimiter(burst=10, rate=10, max_wait=5)
+        # Every request must reach the stub server
+        no_cache = ResponseCache(ttls={})
+        patchers = [
+            patch.object(auth0_service_module, 'auth0_response_cache', no_cache),
+            patch.object(async_auth0_service_module, 'auth0_response_cache', no_cache),
+            patch.object(auth0_service_module, 'AUTH0_API_BASE_URL_TEMPLATE', HTTP_API_BASE_URL_TEMPLATE),
+            patch.object(auth0_service_module, 'auth0_rate_limiter', self.limiter),
+            patch.object(Auth0Service, 'get_access_token', return_value='valid_access_token'),
+            patch.object(async_auth0_service_module, 'AUTH0_API_BASE_URL_TEMPLATE', HTTP_API_BASE_URL_TEMPLATE),
+            patch.object(async_auth0_service_module, 'auth0_rate_limiter', self.limiter),
+            patch.object(AsyncAuth0Service, 'get_access_token', return_value='valid_access_token'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(close_sessions)
+
+        credentials = dict(
+            auth0_base_url=self.auth0_base_url,
+            client_id='test_client_id',
+            client_secret='test_client_secret',
+            slack_user_id='U12345678',
+        )
+        self.auth0_service = Auth0Service(**credentials)
+        self.async_auth0_service = AsyncAuth0Service(**credentials)
+
+    def gap(self):
+        return StubAuth0Handler.arrivals[1] - StubAuth0Handler.arrivals[0]
+
+    def test_requests_are_paced_by_reported_budget(self):
+        StubAuth0Handler.responses = [(200, {
+            'X-RateLimit-Limit': 2,
+            'X-RateLimit-Remaining': 0,
+            'X-RateLimit-Reset': time.time() + 1,
+        })]
+
+        self.auth0_service.get('tenants/settings')
+        self.auth0_service.get('tenants/settings')
+
+        self.assertEqual(self.limiter.bucket(self.auth0_base_url).capacity, 2)
+        self.assertGreaterEqual(self.gap(), 0.4)
+
+    def test_429_is_retried_after_retry_after(self):
+        StubAuth0Handler.responses = [(429, {'Retry-After': 1}), (200, {})]
+
+        self.assertEqual(self.auth0_service.get('users'), {'status': 200})
+
+        self.assertEqual(len(StubAuth0Handler.arrivals), 2)
+        self.assertGreaterEqual(self.gap(), 0.9)
+        self.assertEqual(self.limiter.stats()[self.auth0_base_url]['rate_limited'], 1)
+
+    def test_long_retry_after_sheds_request(self):
+        StubAuth0Handler.responses = [(429, {'Retry-After': 30})]
+        start = time.monotonic()
+
+        with self.assertRaises(RateLimitExceeded) as context:
+            self.auth0_service.get('users')
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(len(StubAuth0Handler.arrivals), 1)
+        self.assertGreater(context.exception.retry_after, 25)
+
+    def test_async_service_retries_after_429(self):
+        StubAuth0Handler.responses = [(429, {'Retry-After': 1}), (200, {})]
+
+        async def scenario():
+            try:
+                return await self.async_auth0_service.get('users')
+            finally:
+                await aclose_async_clients()
+
+        self.assertEqual(asyncio.run(scenario()), {'status': 200})
+        self.assertGreaterEqual(self.gap(), 0.9)
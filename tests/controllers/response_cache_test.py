@@ -0,0 +1,219 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from ...services import async_auth0_service as async_auth0_service_module
+from ...services import auth0_service as auth0_service_module
+from ...services.async_auth0_service import AsyncAuth0Service
+from ...services.auth0_service import Auth0Service
+from ...services.http_session_pool import aclose_async_clients, close_sessions
+from ...services.rate_limiter import Auth0RateLimiter
+from ...services.response_cache import ResponseCache
+
+HTTP_API_BASE_URL_TEMPLATE = 'http://{auth0_base_url}/api/v2/{endpoint}'
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y%m%d')
+
+
+class ETagAuth0Handler(BaseHTTPRequestHandler):
+    """Serves a versioned body with an ETag, answering 304 when the client's copy is current."""
+
+    disable_nagle_algorithm = True
+    version = 1
+    requests = []
+
+    def do_GET(self):
+        etag = f'"v{type(self).version}"'
+        if_none_match = self.headers.get('If-None-Match')
+        type(self).requests.append((self.path, if_none_match))
+        if if_none_match == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = json.dumps({'path': self.path, 'version': type(self).version}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(
+            ttls={'tenants/settings': 60, 'stats/daily': 60},
+            max_bytes=100,
+            max_entry_bytes=50,
+        )
+
+    def test_serves_fresh_entries(self):
+        self.cache.store('t', 'tenants/settings', None, {'a': 1}, None, 10)
+
+        entry = self.cache.lookup('t', 'tenants/settings', {})
+
+        self.assertTrue(entry.is_fresh())
+        self.assertEqual(entry.data, {'a': 1})
+        self.assertIsNone(self.cache.lookup('other', 'tenants/settings', None))
+
+    def test_unlisted_endpoints_are_not_cached(self):
+        self.cache.store('t', 'users', None, [], None, 10)
+
+        self.assertFalse(self.cache.is_cacheable('users', None))
+        self.assertIsNone(self.cache.lookup('t', 'users', None))
+
+    def test_keys_include_params(self):
+        self.cache.store('t', 'stats/daily', {'from': '1', 'to': '2'}, ['a'], None, 10)
+
+        self.assertIsNotNone(self.cache.lookup('t', 'stats/daily', {'to': '2', 'from': '1'}))
+        self.assertIsNone(self.cache.lookup('t', 'stats/daily', {'from': '1'}))
+
+    def test_past_day_stats_never_expire(self):
+        self.assertIsNone(self.cache.ttl('stats/daily', {'from': days_ago(7), 'to': days_ago(1)}))
+        self.assertEqual(self.cache.ttl('stats/daily', {'from': days_ago(7), 'to': days_ago(0)}), 60)
+        self.assertEqual(self.cache.ttl('stats/daily', {'from': days_ago(7)}), 60)
+
+    def test_stale_entries_are_kept_only_with_an_etag(self):
+        with patch.object(self.cache, 'ttls', {'tenants/settings': 0}):
+            self.cache.store('t', 'tenants/settings', None, {'a': 1}, '"v1"', 10)
+            self.cache.store('u', 'tenants/settings', None, {'a': 1}, None, 10)
+
+        stale = self.cache.lookup('t', 'tenants/settings', None)
+        self.assertFalse(stale.is_fresh())
+        self.assertEqual(stale.etag, '"v1"')
+        self.assertIsNone(self.cache.lookup('u', 'tenants/settings', None))
+
+        self.cache.revalidated('t', 'tenants/settings', None)
+        self.assertTrue(self.cache.lookup('t', 'tenants/settings', None).is_fresh())
+
+    def test_bounded_by_body_size(self):
+        self.cache.store('t', 'tenants/settings', None, 'too big', None, 51)
+        self.assertIsNone(self.cache.lookup('t', 'tenants/settings', None))
+
+        for tenant in ('a', 'b', 'c'):
+            self.cache.store(tenant, 'tenants/settings', None, tenant, None, 40)
+
+        self.assertIsNone(self.cache.lookup('a', 'tenants/settings', None))
+        self.assertIsNotNone(self.cache.lookup('c', 'tenants/settings', None))
+        self.assertEqual(self.cache.stats()['bytes'], 80)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+
+class TestAuth0ServiceResponseCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ETagAuth0Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.auth0_base_url = f'127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ETagAuth0Handler.version = 1
+        ETagAuth0Handler.requests = []
+        self.cache = ResponseCache(ttls={'tenants/settings': 60, 'stats/daily': 60})
+        limiter = Auth0RateLimiter(burst=100, rate=100, max_wait=5)
+        patchers = []
+        for module in (auth0_service_module, async_auth0_service_module):
+            patchers += [
+                patch.object(module, 'AUTH0_API_BASE_URL_TEMPLATE', HTTP_API_BASE_URL_TEMPLATE),
+                patch.object(module, 'auth0_rate_limiter', limiter),
+                patch.object(module, 'auth0_response_cache', self.cache),
+            ]
+        patchers += [
+            patch.object(Auth0Service, 'get_access_token', return_value='valid_access_token'),
+            patch.object(AsyncAuth0Service, 'get_access_token', return_value='valid_access_token'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(close_sessions)
+
+        self.credentials = credentials = dict(
+            auth0_base_url=self.auth0_base_url,
+            client_id='test_client_id',
+            client_secret='test_client_secret',
+            slack_user_id='U12345678',
+        )
+        self.auth0_service = Auth0Service(**credentials)
+        self.async_auth0_service = AsyncAuth0Service(**credentials)
+
+    def expire(self, endpoint, query_params=None):
+        self.cache.lookup(self.auth0_service.credential_key, endpoint, query_params).fresh_until = time.monotonic()
+
+    def test_fresh_response_is_served_from_memory(self):
+        first = self.auth0_service.get('tenants/settings')
+        second = self.auth0_service.get('tenants/settings')
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(ETagAuth0Handler.requests), 1)
+
+    def test_stale_response_is_revalidated_with_etag(self):
+        self.auth0_service.get('tenants/settings')
+        self.expire('tenants/settings')
+
+        self.assertEqual(self.auth0_service.get('tenants/settings')['version'], 1)
+        self.assertEqual(ETagAuth0Handler.requests[-1][1], '"v1"')
+        self.assertEqual(self.cache.stats()['revalidations'], 1)
+
+        self.expire('tenants/settings')
+        ETagAuth0Handler.version = 2
+        self.assertEqual(self.auth0_service.get('tenants/settings')['version'], 2)
+
+    def test_responses_are_not_served_to_other_credentials(self):
+        self.auth0_service.get('tenants/settings')
+        impostor = Auth0Service(**dict(self.credentials, client_secret='guessed_secret'))
+
+        impostor.get('tenants/settings')
+
+        self.assertEqual(len(ETagAuth0Handler.requests), 2)
+        self.assertIsNone(ETagAuth0Handler.requests[-1][1])
+
+    def test_uncached_endpoints_always_reach_auth0(self):
+        self.auth0_service.get('users')
+        self.auth0_service.get('users')
+
+        self.assertEqual(len(ETagAuth0Handler.requests), 2)
+        self.assertTrue(all(if_none_match is None for _, if_none_match in ETagAuth0Handler.requests))
+
+    def test_past_day_stats_are_cached_indefinitely(self):
+        params = {'from': days_ago(3), 'to': days_ago(1)}
+        self.auth0_service.get('stats/daily', query_params=params)
+
+        entry = self.cache.lookup(self.auth0_service.credential_key, 'stats/daily', params)
+        self.assertIsNone(entry.fresh_until)
+        self.auth0_service.get('stats/daily', query_params=dict(params))
+        self.assertEqual(len(ETagAuth0Handler.requests), 1)
+
+    def test_async_service_shares_the_cache(self):
+        async def scenario():
+            try:
+                first = await self.async_auth0_service.get('tenants/settings')
+                self.expire('tenants/settings')
+                second = await self.async_auth0_service.get('tenants/settings')
+                return first, second
+            finally:
+                await aclose_async_clients()
+
+        first, second = asyncio.run(scenario())
+
+        self.assertEqual(first, second)
+        self.assertEqual(ETagAuth0Handler.requests[-1][1], '"v1"')
+        self.assertEqual(self.auth0_service.get('tenants/settings'), first)
+        self.assertEqual(len(ETagAuth0Handler.requests), 2)
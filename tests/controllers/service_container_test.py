@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from ...config.container import ServiceContainer
+from ...controllers.async_message_controller import AsyncMessageController
+from ...controllers.message_controller import MessageController
+from ...services import async_slack_service, slack_service
+
+
+class TestServiceContainer(unittest.TestCase):
+
+    def setUp(self):
+        self.container = ServiceContainer()
+
+    def test_services_are_built_on_first_use_only(self):
+        factory = MagicMock(return_value=MagicMock(name="service"))
+        service = self.container.register("service", factory)
+
+        factory.assert_not_called()
+        self.assertFalse(self.container.is_initialized("service"))
+
+        service.get_collection("users")
+        service.get_collection("users")
+
+        factory.assert_called_once()
+        self.assertEqual(self.container.get("service").get_collection.call_count, 2)
+
+    def test_concurrent_first_use_builds_once(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        self.container.register("service", factory)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.container.get("service")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+    def test_failed_build_is_retried(self):
+        factory = MagicMock(side_effect=[ConnectionError("down"), "service"])
+        self.container.register("service", factory)
+
+        with self.assertRaises(ConnectionError):
+            self.container.get("service")
+        self.assertEqual(self.container.get("service"), "service")
+
+    def test_unknown_service_raises(self):
+        with self.assertRaises(KeyError):
+            self.container.get("missing")
+
+    def test_override_replaces_service(self):
+        factory = MagicMock()
+        service = self.container.register("service", factory)
+        double = MagicMock()
+        self.container.override("service", double)
+
+        service.ping()
+
+        double.ping.assert_called_once()
+        factory.assert_not_called()
+
+    def test_shutdown_closes_built_services_in_reverse_order(self):
+        closed = []
+
+        async def close_async(instance):
+            closed.append(instance)
+
+        self.container.register("client", lambda: "client", close=closed.append)
+        self.container.register("dao", lambda: "dao", close=close_async)
+        self.container.register("unused", lambda: "unused", close=closed.append)
+        self.container.get("client")
+        self.container.get("dao")
+
+        asyncio.run(self.container.shutdown())
+
+        self.assertEqual(closed, ["dao", "client"])
+        self.assertFalse(self.container.is_initialized("client"))
+
+    def test_warm_up_builds_services(self):
+        self.container.register("a", lambda: "a")
+        self.container.register("b", lambda: "b")
+
+        asyncio.run(self.container.warm_up("a", "b"))
+
+        self.assertTrue(self.container.is_initialized("a"))
+        self.assertTrue(self.container.is_initialized("b"))
+
+
+
+class TestSlackServiceFactories(unittest.TestCase):
+
+    def test_message_controller_factories_build_controllers(self):
+        self.assertIsInstance(slack_service.create_message_controller(), MessageController)
+        self.assertIsInstance(
+            async_slack_service.create_message_controller(), AsyncMessageController
+        )
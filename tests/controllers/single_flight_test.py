@@ -0,0 +1,202 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from ...services import async_auth0_service as async_auth0_service_module
+from ...services import auth0_service as auth0_service_module
+from ...services.async_auth0_service import AsyncAuth0Service
+from ...services.auth0_service import Auth0Service
+from ...services.http_session_pool import aclose_async_clients, close_sessions
+from ...services.rate_limiter import Auth0RateLimiter
+from ...services.response_cache import ResponseCache
+from ...services.single_flight import SingleFlight
+
+HTTP_API_BASE_URL_TEMPLATE = 'http://{auth0_base_url}/api/v2/{endpoint}'
+
+
+class SlowAuth0Handler(BaseHTTPRequestHandler):
+    """Answers every GET after a short delay, counting the requests received."""
+
+    disable_nagle_algorithm = True
+    delay = 0.2
+    paths = []
+
+    def do_GET(self):
+        type(self).paths.append(self.path)
+        time.sleep(type(self).delay)
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flights = SingleFlight()
+
+    def run_concurrently(self, key, fn, callers=5):
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(self.flights.do, key, fn) for _ in range(callers)]
+            return [future.exception() or future.result() for future in futures]
+
+    def test_concurrent_calls_share_one_result(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'value': len(calls)}
+
+        results = self.run_concurrently('key', fetch)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self.flights.stats(), {'calls': 1, 'shared': 4, 'in_flight': 0})
+
+    def test_concurrent_callers_share_the_exception(self):
+        def fail():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        results = self.run_concurrently('key', fail)
+
+        self.assertEqual(self.flights.stats()['calls'], 1)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_completed_calls_are_not_reused(self):
+        self.assertEqual(self.flights.do('key', lambda: 1), 1)
+        self.assertEqual(self.flights.do('key', lambda: 2), 2)
+        self.assertEqual(self.flights.stats()['shared'], 0)
+
+    def test_async_calls_share_one_task(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def scenario():
+            return await asyncio.gather(*[self.flights.ado('key', fetch) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(scenario()), [1] * 5)
+        self.assertEqual(self.flights.stats(), {'calls': 1, 'shared': 4, 'in_flight': 0})
+
+    def test_cancelled_caller_does_not_cancel_the_call(self):
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return 'done'
+
+        async def scenario():
+            first = asyncio.ensure_future(self.flights.ado('key', fetch))
+            second = asyncio.ensure_future(self.flights.ado('key', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(scenario()), 'done')
+
+
+class TestAuth0ServiceCoalescing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SlowAuth0Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.auth0_base_url = f'127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        SlowAuth0Handler.paths = []
+        self.flights = SingleFlight()
+        limiter = Auth0RateLimiter(burst=100, rate=100, max_wait=5)
+        # Coalescing must hold on its own, without the response cache
+        no_cache = ResponseCache(ttls={})
+        patchers = []
+        for module in (auth0_service_module, async_auth0_service_module):
+            patchers += [
+                patch.object(module, 'AUTH0_API_BASE_URL_TEMPLATE', HTTP_API_BASE_URL_TEMPLATE),
+                patch.object(module, 'auth0_rate_limiter', limiter),
+                patch.object(module, 'auth0_response_cache', no_cache),
+                patch.object(module, 'auth0_single_flight', self.flights),
+            ]
+        patchers += [
+            patch.object(Auth0Service, 'get_access_token', return_value='valid_access_token'),
+            patch.object(AsyncAuth0Service, 'get_access_token', return_value='valid_access_token'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(close_sessions)
+
+    def service(self, service_class, slack_user_id, client_secret='test_client_secret'):
+        return service_class(
+            auth0_base_url=self.auth0_base_url,
+            client_id='test_client_id',
+            client_secret=client_secret,
+            slack_user_id=slack_user_id,
+        )
+
+    def test_identical_requests_from_threads_share_one_call(self):
+        services = [self.service(Auth0Service, f'U{i}') for i in range(5)]
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(
+                lambda service: service.get('stats/active-users'), services
+            ))
+
+        self.assertEqual(len(SlowAuth0Handler.paths), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_different_params_are_not_coalesced(self):
+        services = [self.service(Auth0Service, f'U{i}') for i in range(2)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(
+                lambda pair: pair[0].get('users', query_params={'page': pair[1]}),
+                zip(services, range(2)),
+            ))
+
+        self.assertEqual(len(SlowAuth0Handler.paths), 2)
+
+    def test_requests_with_other_credentials_are_not_coalesced(self):
+        services = [self.service(Auth0Service, f'U{i}', f'secret_{i}') for i in range(2)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda service: service.get('stats/active-users'), services))
+
+        self.assertEqual(len(SlowAuth0Handler.paths), 2)
+        self.assertEqual(self.flights.stats()['shared'], 0)
+
+    def test_identical_async_requests_share_one_call(self):
+        services = [self.service(AsyncAuth0Service, f'U{i}') for i in range(5)]
+
+        async def scenario():
+            try:
+                return await asyncio.gather(*[
+                    service.get('tenants/settings', query_params={'fields': 'friendly_name'})
+                    for service in services
+                ])
+            finally:
+                await aclose_async_clients()
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(len(SlowAuth0Handler.paths), 1)
+        self.assertEqual(results, [results[0]] * 5)
+        self.assertEqual(self.flights.stats()['shared'], 4)
@@ -0,0 +1,127 @@
+import time
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from ...services.intent_handlers import get_stats_intent_handler as handler_module
+from ...services.intent_handlers.get_stats_intent_handler import GetStatsIntentHandler
+from ...services.stats_analytics import (
+    anomalies,
+    daily_fields,
+    daily_rows,
+    load_daily_stats,
+    rolling_mean,
+    summarize,
+    week_over_week,
+)
+from ...utils.constants import MULTILINE_CODE_DELIMITER
+
+
+def record(day, logins, signups=0):
+    return {
+        'date': f'{date(2024, 1, 1) + timedelta(days=day)}T00:00:00.000Z',
+        'logins': logins,
+        'signups': signups,
+        'leaked_passwords': 0,
+        'updated_at': '2024-01-02T00:00:00.000Z',
+        'created_at': '2024-01-02T00:00:00.000Z',
+    }
+
+
+class TestStatsAnalytics(unittest.TestCase):
+
+    def test_records_are_laid_onto_a_calendar(self):
+        stats = load_daily_stats([record(3, 5), record(0, 1), record(3, 2, signups=4)])
+
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(str(stats.dates[0]), '2024-01-01')
+        self.assertEqual(stats.values['logins'].tolist(), [1, 0, 0, 7])
+        self.assertEqual(stats.values['signups'].tolist(), [0, 0, 0, 4])
+
+    def test_empty_records(self):
+        stats = load_daily_stats([])
+
+        self.assertEqual(len(stats), 0)
+        self.assertEqual(summarize(stats)[0], {'metric': 'logins', 'total': 0})
+
+    def test_rolling_mean(self):
+        self.assertEqual(rolling_mean(np.array([1, 2, 3, 4]), window=2).tolist(), [1, 1.5, 2.5, 3.5])
+
+    def test_spikes_are_flagged_as_anomalies(self):
+        values = np.array([100, 102, 98, 101, 99, 100, 103, 97, 400, 100, 101])
+
+        self.assertEqual(np.flatnonzero(anomalies(values, window=7, threshold=3)).tolist(), [8])
+        self.assertFalse(anomalies(values[:7], window=7).any())
+
+    def test_flat_baseline_tolerates_small_changes(self):
+        values = np.array([0] * 7 + [2, 10])
+
+        self.assertEqual(anomalies(values, window=7, threshold=3).tolist(), [False] * 7 + [False, True])
+
+    def test_week_over_week(self):
+        changes = week_over_week(np.array([10, 0, 10, 10, 10, 10, 10, 15, 5, 10]))
+
+        self.assertTrue(np.isnan(changes[:7]).all())
+        self.assertEqual(changes[7], 50)
+        self.assertTrue(np.isnan(changes[8]))
+        self.assertEqual(changes[9], 0)
+
+    def test_summary(self):
+        stats = load_daily_stats([record(day, 10 if day < 7 else 20) for day in range(14)])
+
+        logins = summarize(stats)[0]
+
+        self.assertEqual(logins['total'], 210)
+        self.assertEqual(logins['daily_avg'], '15.0')
+        self.assertEqual((logins['peak'], logins['peak_date']), (20, '2024-01-08'))
+        self.assertEqual((logins['last_7d'], logins['wow_change']), (140, '+100.0%'))
+
+    def test_daily_rows_match_the_fields(self):
+        stats = load_daily_stats([record(day, day) for day in range(10)])
+
+        rows = list(daily_rows(stats))
+
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(list(rows[0]), daily_fields())
+        self.assertEqual(rows[9]['logins_7d_avg'], 6.0)
+        self.assertIsNone(rows[0]['logins_wow_pct'])
+
+    def test_years_of_data_are_fast(self):
+        records = [record(day, day % 97, day % 13) for day in range(3650)]
+
+        started = time.perf_counter()
+        stats = load_daily_stats(records)
+        summarize(stats)
+        rows = list(daily_rows(stats))
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(rows), 3650)
+        self.assertLess(elapsed, 0.5)
+
+
+class TestGetStatsIntentHandler(unittest.TestCase):
+
+    def test_short_ranges_get_the_summary_inline(self):
+        auth0_service = MagicMock()
+        auth0_service.get.return_value = [record(day, 10) for day in range(3)]
+
+        payload, needs_file_upload, date_info = GetStatsIntentHandler().handle_intent({}, auth0_service)
+
+        self.assertFalse(needs_file_upload)
+        self.assertEqual(date_info, 'Daily stats:')
+        lines = payload[len(MULTILINE_CODE_DELIMITER):-len(MULTILINE_CODE_DELIMITER)].splitlines()
+        self.assertEqual(lines[0].split(), ['metric', 'total', 'daily_avg', 'peak', 'peak_date',
+                                            'last_7d', 'wow_change', 'anomalies'])
+        self.assertEqual(lines[2].split(), ['logins', '30', '10.0', '10', '2024-01-01', '30', 'n/a', '0'])
+
+    def test_csv_can_be_turned_off(self):
+        auth0_service = MagicMock()
+        auth0_service.get.return_value = [record(day, 10) for day in range(30)]
+
+        with patch.object(handler_module, 'STATS_CSV_MIN_DAYS', 0):
+            payload, needs_file_upload, _ = GetStatsIntentHandler().handle_intent({}, auth0_service)
+
+        self.assertFalse(needs_file_upload)
+        self.assertTrue(payload.startswith(MULTILINE_CODE_DELIMITER))
@@ -0,0 +1,75 @@
+import unittest
+
+from ...utils.string_utils import StringUtils
+
+# Slack messages and the output of the original multi-pass implementation, except
+# where noted
+GOLDEN_CORPUS = [
+    ("get json for user ID auth0|12345678", "get json for user ID auth0|12345678"),
+    (
+        "Get user details for user ID `auth0|6724489270033bac7e8e0c0c`",
+        "Get user details for user ID `auth0|6724489270033bac7e8e0c0c`",
+    ),
+    (
+        "pls gimme raw json for `samlp|Okta-SAML-SP|nicholas.canete@okta.com`",
+        "pls gimme raw json for `samlp|Okta-SAML-SP|nicholas.canete@okta.com`",
+    ),
+    ("search for <mailto:jane.doe@test.au|jane.doe@test.au>", "search for jane.doe@test.au"),
+    ("*Show* tenant settings", "Show tenant settings"),
+    ("_please_ show *tenant settings* ~now~", "please show tenant settings now"),
+    ("*_bold italic_* text", "bold italic text"),
+    ("~*strike bold*~", "strike bold"),
+    (
+        "visit <https://example.com> or <https://example.com/docs|the docs>",
+        "visit https://example.com or the docs",
+    ),
+    (
+        "```\ncode block with *stars* and _underscores_\n```\nthen *bold*",
+        "```\ncode block with *stars* and _underscores_\n```\nthen bold",
+    ),
+    ("inline `code *not bold*` and *bold*", "inline `code *not bold*` and bold"),
+    ("*bold `code` bold*", "bold `code` bold"),
+    ("multi\n*line* _text_\n~here~", "multi\nline text\nhere"),
+    ("unclosed *bold and _italic", "unclosed *bold and _italic"),
+    ("a*b*c and x_y_z", "abc and xyz"),
+    ("Get daily stats from Jan 1 to Mar 14", "Get daily stats from Jan 1 to Mar 14"),
+    ("What's our MAU count?", "What's our MAU count?"),
+    ("", ""),
+    ("emoji :smile: *hi*", "emoji :smile: hi"),
+    ("*one* *two* *three*", "one two three"),
+    ("<@U12345|nick> please fetch *ULP template*", "nick please fetch ULP template"),
+    ("<#C123|general>", "general"),
+    # The original stripped every _..._ pair before any *...*, so underscores in
+    # bold text paired with later ones: 'get userid for foobar'
+    ("get *user_id* for foo_bar", "get user_id for foo_bar"),
+    # Markers are now matched left to right, so overlapping emphasis leaves the
+    # later pair in place: the original gave 'italic bold text'
+    ("_italic *bold_ text*", "italic *bold text*"),
+]
+
+
+class TestStringUtils(unittest.TestCase):
+
+    def test_remove_format_matches_golden_corpus(self):
+        for text, expected in GOLDEN_CORPUS:
+            self.assertEqual(StringUtils.remove_format(text), expected, text)
+
+    """
+    The original implementation swapped code spans for CODEBLOCK_n/INLINECODE_n
+    placeholders, corrupting text that already contained them
+    """
+    def test_remove_format_preserves_placeholder_like_text(self):
+        self.assertEqual(
+            StringUtils.remove_format("INLINECODE_0 and `auth0|123`"),
+            "INLINECODE_0 and `auth0|123`",
+        )
+        self.assertEqual(
+            StringUtils.remove_format("```a``` `b` ```c```"),
+            "```a``` `b` ```c```",
+        )
+
+    def test_remove_format_keeps_many_code_spans_intact(self):
+        text = " and ".join(f"`auth0|{i}` *x*" for i in range(200))
+        expected = " and ".join(f"`auth0|{i}` x" for i in range(200))
+
+        self.assertEqual(StringUtils.remove_format(text), expected)
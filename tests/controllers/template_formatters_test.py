@@ -0,0 +1,99 @@
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ...services.intent_handlers import get_ulp_template_intent_handler as ulp_handler_module
+from ...services.intent_handlers.get_ulp_template_intent_handler import GetULPTemplateIntentHandler
+from ...services.template_formatters import (
+    SoupTemplateFormatter,
+    StreamingTemplateFormatter,
+    get_template_formatter,
+)
+
+TEMPLATE = (
+    '<!DOCTYPE html><html lang="{{locale}}"><head>{%- auth0:head -%}'
+    '<style>body{margin:0;background:url(data:image/png;base64,AAA=)}'
+    '@media (max-width:600px){.box{padding:0 4px}}</style></head>'
+    '<body class="_widget-auto-layout" data-theme="dark">'
+    '<p>Terms &amp; conditions&nbsp;apply</p>{%- auth0:widget -%}'
+    '<script>if (a < b) { run(); }</script></body></html>'
+)
+
+
+def text_content(html):
+    return re.sub(r'\s+', '', re.sub(r'<[^>]+>', '', html))
+
+
+class TestStreamingTemplateFormatter(unittest.TestCase):
+
+    def setUp(self):
+        self.formatter = StreamingTemplateFormatter()
+        self.formatted = self.formatter.format_html(TEMPLATE)
+
+    def test_liquid_head_tag_stays_in_head(self):
+        lines = [line.strip() for line in self.formatted.splitlines()]
+
+        self.assertLess(lines.index('{%- auth0:head -%}'), lines.index('</head>'))
+        self.assertLess(lines.index('</head>'), lines.index('{%- auth0:widget -%}'))
+
+    def test_start_tags_and_entities_are_kept(self):
+        self.assertIn('<body class="_widget-auto-layout" data-theme="dark">', self.formatted)
+        self.assertIn('<html lang="{{locale}}">', self.formatted)
+        self.assertIn('Terms &amp; conditions&nbsp;apply', self.formatted)
+
+    def test_script_is_kept_verbatim(self):
+        self.assertIn('if (a < b) { run(); }', self.formatted)
+
+    def test_nesting_is_indented(self):
+        self.assertIn('\n <head>\n  {%- auth0:head -%}\n', self.formatted)
+
+    def test_css_rules_are_formatted(self):
+        self.assertEqual(
+            self.formatter.format_css('@media (max-width:600px){.box{padding:0 4px}}'),
+            '@media (max-width:600px) {\n'
+            '    .box {\n'
+            '        padding: 0 4px;\n'
+            '    }\n'
+            '}\n\n',
+        )
+
+    def test_css_urls_and_strings_are_kept(self):
+        css = self.formatter.format_css(
+            'a{background:url(data:image/png;base64,AAA=)}b::before{content:"x ;  y"}'
+        )
+
+        self.assertIn('background: url(data:image/png;base64,AAA=);', css)
+        self.assertIn('content: "x ;  y";', css)
+
+    def test_css_import_is_left_unchanged(self):
+        self.assertEqual(
+            self.formatter.format_css('@import url(https://fonts.example.com/a.css);'),
+            '@import url(https://fonts.example.com/a.css);\n',
+        )
+
+    def test_same_text_as_soup_formatter(self):
+        soup = SoupTemplateFormatter().format_html('<div><p>Hello <b>world</b></p><br/></div>')
+        streaming = self.formatter.format_html('<div><p>Hello <b>world</b></p><br/></div>')
+
+        self.assertEqual(text_content(streaming), text_content(soup))
+
+
+class TestTemplateFormatterSelection(unittest.TestCase):
+
+    def test_backends_by_name(self):
+        self.assertIsInstance(get_template_formatter('streaming'), StreamingTemplateFormatter)
+        self.assertIsInstance(get_template_formatter('soup'), SoupTemplateFormatter)
+
+    def test_unknown_backend_uses_soup(self):
+        self.assertIsInstance(get_template_formatter('lxml'), SoupTemplateFormatter)
+
+    def test_handler_falls_back_to_soup(self):
+        formatter = MagicMock()
+        formatter.name = 'streaming'
+        formatter.format_html.side_effect = ValueError('bad template')
+
+        with patch.object(ulp_handler_module, 'template_formatter', formatter):
+            formatted = GetULPTemplateIntentHandler().format_html('<p>Hello</p>')
+
+        self.assertEqual(formatted, SoupTemplateFormatter().format_html('<p>Hello</p>'))
+
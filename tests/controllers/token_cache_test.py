@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+from ...services.token_cache import AccessTokenCache
+
+KEY = ('your-domain.auth0.com', 'test_client_id')
+
+
+class TestAccessTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = AccessTokenCache(refresh_skew=60)
+        self.refresh_calls = 0
+
+    def refresh(self, expires_in=3600, delay=0.0):
+        self.refresh_calls += 1
+        time.sleep(delay)
+        token = f'token_{self.refresh_calls}'
+        self.cache.store(KEY, token, expires_in)
+        return {'access_token': token, 'expires_in': expires_in}
+
+    def test_concurrent_callers_share_one_refresh(self):
+        results = []
+
+        def worker():
+            results.append(
+                self.cache.get_or_refresh(KEY, lambda: self.refresh(delay=0.1))
+            )
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.refresh_calls, 1)
+        self.assertEqual(results, ['token_1'] * 10)
+
+    def test_seeded_token_is_served_without_refresh(self):
+        expires_at = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+        self.cache.seed(KEY, 'stored_token', expires_at)
+
+        token = self.cache.get_or_refresh(KEY, self.refresh)
+
+        self.assertEqual(token, 'stored_token')
+        self.assertEqual(self.refresh_calls, 0)
+
+    def test_seed_keeps_longer_lived_token(self):
+        self.cache.store(KEY, 'fresh_token', 3600)
+        stale_expiry = (datetime.utcnow() + timedelta(minutes=10)).isoformat()
+        self.cache.seed(KEY, 'stale_token', stale_expiry)
+
+        self.assertEqual(self.cache.get_or_refresh(KEY, self.refresh), 'fresh_token')
+
+    def test_expiring_token_is_served_while_refreshing_in_background(self):
+        self.cache.store(KEY, 'expiring_token', 30)
+
+        token = self.cache.get_or_refresh(KEY, self.refresh)
+        self.cache.flush(timeout=5)
+
+        self.assertEqual(token, 'expiring_token')
+        self.assertEqual(self.refresh_calls, 1)
+        self.assertEqual(self.cache.get_or_refresh(KEY, self.refresh), 'token_1')
+
+    def test_expired_token_is_refreshed_inline(self):
+        expired_at = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+        self.cache.seed(KEY, 'expired_token', expired_at)
+
+        self.assertEqual(self.cache.get_or_refresh(KEY, self.refresh), 'token_1')
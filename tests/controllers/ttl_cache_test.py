@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+
+from ...utils import ttl_cache
+from ...utils.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    @patch.object(ttl_cache.time, 'monotonic')
+    def test_entries_expire_after_ttl(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        cache = TTLCache(max_size=10, ttl=30)
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=None)
+
+        mock_monotonic.return_value = 131.0
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+
+    @patch.object(ttl_cache.time, 'monotonic')
+    def test_add_only_inserts_missing_or_expired_keys(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        cache = TTLCache(max_size=10, ttl=30)
+
+        self.assertTrue(cache.add('a', 1))
+        self.assertFalse(cache.add('a', 2))
+        self.assertEqual(cache.get('a'), 1)
+
+        mock_monotonic.return_value = 131.0
+
+        self.assertTrue(cache.add('a', 3))
+        self.assertEqual(cache.get('a'), 3)
+
+    def test_update_merges_fields(self):
+        cache = TTLCache(max_size=10)
+        cache.set('a', {'x': 1})
+
+        self.assertTrue(cache.update('a', {'y': 2}))
+        self.assertFalse(cache.update('missing', {'y': 2}))
+        self.assertEqual(cache.get('a'), {'x': 1, 'y': 2})
+
+    def test_counts_hits_and_misses(self):
+        cache = TTLCache(max_size=10)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1})
@@ -0,0 +1,252 @@
+import gzip
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from ...services import auth0_service as auth0_service_module
+from ...services import slack_service as slack_service_module
+from ...services.auth0_service import Auth0Service
+from ...services.circuit_breaker import auth0_circuit_breakers
+from ...services.intent_handlers.export_users_handler import ExportUsersIntentHandler
+from ...services.job_poller import JobPoller
+from ...services.rate_limiter import auth0_rate_limiter
+from ...services.response_cache import auth0_response_cache
+from ...services.token_cache import access_token_cache
+from ...services.users_export import UsersExportJob
+from ..testutils.fake_slack_upload import start_upload_server, upload_ticket
+
+USERS = [{'user_id': f'auth0|{index}', 'email': f'user{index}@example.com'} for index in range(2000)]
+EXPORT = gzip.compress(''.join(json.dumps(user) + '\n' for user in USERS).encode('utf-8'))
+
+
+class FakeAuth0(BaseHTTPRequestHandler):
+    """Stand-in for the Auth0 token and jobs endpoints, and the export file's signed URL."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self.path == '/oauth/token':
+            self.send_json({'access_token': 'token', 'expires_in': 86400, 'token_type': 'Bearer'})
+        elif self.path == '/api/v2/jobs/users-exports':
+            self.server.export_requests.append((body, self.headers['Authorization']))
+            self.send_json({'id': 'job_abc', 'type': 'users_export', 'status': 'pending', 'format': 'json'}, 201)
+        else:
+            self.send_json({'error': 'Not Found'}, 404)
+
+    def do_GET(self):
+        if self.path == '/api/v2/jobs/job_abc':
+            self.server.checks += 1
+            if self.server.checks < self.server.checks_until_done:
+                self.send_json({'id': 'job_abc', 'status': 'processing', 'percentage_done': 50})
+            else:
+                host, port = self.server.server_address
+                self.send_json({
+                    'id': 'job_abc',
+                    'status': self.server.final_status,
+                    'location': f'http://{host}:{port}/exports/job_abc.json.gz',
+                })
+        elif self.path == '/exports/job_abc.json.gz':
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/gzip')
+            self.send_header('Content-Length', str(len(EXPORT)))
+            self.end_headers()
+            self.wfile.write(EXPORT)
+        else:
+            self.send_json({'error': 'Not Found'}, 404)
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestUsersExport(unittest.TestCase):
+
+    def setUp(self):
+        access_token_cache.clear()
+        auth0_rate_limiter.clear()
+        auth0_circuit_breakers.clear()
+        auth0_response_cache.clear()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAuth0)
+        self.server.export_requests = []
+        self.server.checks = 0
+        self.server.checks_until_done = 3
+        self.server.final_status = 'completed'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        for name, value in (
+            ('AUTH0_API_BASE_URL_TEMPLATE', 'http://{auth0_base_url}/api/v2/{endpoint}'),
+            ('AUTH0_TOKEN_URL_TEMPLATE', 'http://{auth0_base_url}/oauth/token'),
+            ('m2m_credentials_dao', MagicMock()),
+        ):
+            patcher = patch.object(auth0_service_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        host, port = self.server.server_address
+        self.auth0_service = Auth0Service(f'{host}:{port}', 'client', 'secret', 'U1')
+        self.poller = JobPoller(workers=2)
+        self.addCleanup(self.poller.close)
+        self.delivered = []
+        self.notified = []
+        self.done = threading.Event()
+
+    def deliver(self, file, filename):
+        self.delivered.append((filename, file.read()))
+        self.done.set()
+
+    def notify(self, text):
+        self.notified.append(text)
+        self.done.set()
+
+    def start_export(self):
+        started = time.monotonic()
+        pending, needs_file_upload, text = ExportUsersIntentHandler().handle_intent({}, self.auth0_service)
+        elapsed = time.monotonic() - started
+        self.assertIsInstance(pending, UsersExportJob)
+        self.assertFalse(needs_file_upload)
+        pending.poller = self.poller
+        pending.min_interval = 0.01
+        pending.max_interval = 0.05
+        pending.start(self.deliver, self.notify)
+        self.assertTrue(self.done.wait(timeout=5))
+        return elapsed, text
+
+    def test_export_is_polled_in_the_background_and_uploaded_gzipped(self):
+        elapsed, text = self.start_export()
+
+        # The handler returned as soon as the job was created
+        self.assertLess(elapsed, 1)
+        self.assertIn('job_abc', text)
+        self.assertEqual(self.server.export_requests, [({'format': 'json'}, 'Bearer token')])
+        self.assertEqual(self.server.checks, 3)
+        filename, content = self.delivered[0]
+        self.assertEqual(filename, 'users-export.ndjson.gz')
+        self.assertEqual(content, EXPORT)
+        lines = gzip.decompress(content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], USERS)
+        self.assertEqual(self.poller.stats(), {'active': 0, 'completed': 1, 'failed': 0})
+
+    def test_failed_job_is_reported(self):
+        self.server.final_status = 'failed'
+
+        self.start_export()
+
+        self.assertEqual(self.delivered, [])
+        self.assertEqual(self.notified, ["The user export didn't finish: Auth0 reported the job as failed."])
+
+    def test_upload_failure_is_reported(self):
+        def deliver(file, filename):
+            raise RuntimeError('upload failed')
+        self.deliver = deliver
+
+        self.start_export()
+
+        self.assertEqual(self.notified, ["The user export didn't finish: the export file couldn't be uploaded."])
+        self.assertEqual(self.poller.stats()['failed'], 0)
+
+    def test_job_is_given_up_after_the_timeout(self):
+        self.server.checks_until_done = 1000
+        pending, _, _ = ExportUsersIntentHandler().handle_intent({}, self.auth0_service)
+        pending.poller = self.poller
+        pending.min_interval = pending.max_interval = 0.01
+        pending.timeout = 0.05
+
+        pending.start(self.deliver, self.notify)
+
+        self.assertTrue(self.done.wait(timeout=5))
+        self.assertIn('still processing', self.notified[0])
+
+    def test_interval_follows_auth0_estimate(self):
+        job = UsersExportJob(MagicMock(), {'id': 'job_abc'}, self.poller, min_interval=2, max_interval=30)
+
+        self.assertEqual(job._next_interval({'time_left_seconds': 20}), 10)
+        self.assertEqual(job._next_interval({'time_left_seconds': 1}), 2)
+        self.assertEqual(job._next_interval({}), 3)
+        self.assertEqual(job._next_interval({'time_left_seconds': 600}), 30)
+
+
+class TestJobPoller(unittest.TestCase):
+
+    def test_checks_repeat_until_done(self):
+        poller = JobPoller(workers=1)
+        self.addCleanup(poller.close)
+        calls = []
+        done = threading.Event()
+
+        def check():
+            calls.append(time.monotonic())
+            if len(calls) == 3:
+                done.set()
+                return None
+            return 0.01
+
+        poller.schedule(check, 0)
+
+        self.assertTrue(done.wait(timeout=2))
+        time.sleep(0.05)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(poller.stats()['completed'], 1)
+
+    def test_checks_run_in_due_order(self):
+        poller = JobPoller(workers=1)
+        self.addCleanup(poller.close)
+        order = []
+        done = threading.Event()
+        poller.schedule(lambda: order.append('late') or done.set(), 0.1)
+        poller.schedule(lambda: order.append('early'), 0.01)
+
+        self.assertTrue(done.wait(timeout=2))
+        self.assertEqual(order, ['early', 'late'])
+
+    def test_closed_poller_rejects_jobs(self):
+        poller = JobPoller()
+        poller.close()
+
+        with self.assertRaises(RuntimeError):
+            poller.schedule(lambda: None, 0)
+
+
+class TestPendingUploadDelivery(unittest.TestCase):
+
+    def setUp(self):
+        self.server = start_upload_server(self)
+
+    @patch.object(slack_service_module, 'message_controller')
+    def test_pending_uploads_are_streamed_to_the_channel(self, mock_message_controller):
+        pending = MagicMock()
+        pending.start.side_effect = lambda deliver, notify: deliver(io.BytesIO(EXPORT), 'users.ndjson.gz')
+        mock_message_controller.process_message.return_value = {
+            'text': "I've asked Auth0 to export all your users.",
+            'payload': None,
+            'needs_file_upload': False,
+            'additional_text': 'Export job `job_abc` is pending.',
+            'pending_uploads': [pending],
+        }
+        say = MagicMock()
+        client = MagicMock()
+        client.files_getUploadURLExternal.return_value = upload_ticket(self.server)
+
+        slack_service_module.process_message_event(
+            {'user': 'U1', 'text': 'export all users', 'channel': 'C1'}, say, client
+        )
+
+        say.assert_called_once()
+        client.files_upload_v2.assert_not_called()
+        client.files_getUploadURLExternal.assert_called_once_with(filename='users.ndjson.gz', length=len(EXPORT))
+        self.assertEqual(self.server.uploads, [('/upload/F1', str(len(EXPORT)), EXPORT)])
+        client.files_completeUploadExternal.assert_called_once_with(
+            files=[{'id': 'F1', 'title': 'users.ndjson.gz'}], channel_id='C1'
+        )
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ...services import slack_service as slack_service_module
+from ...services.work_queue import AsyncWorkQueue, WorkQueue
+from ...utils.constants import MESSAGE_QUEUE_BUSY_TEXT
+
+
+class TestWorkQueue(unittest.TestCase):
+
+    def test_jobs_run_on_workers(self):
+        work_queue = WorkQueue("test", workers=2, max_size=10)
+        results = []
+
+        for i in range(5):
+            self.assertTrue(work_queue.submit(results.append, i))
+        self.assertTrue(work_queue.shutdown(timeout=5))
+
+        self.assertEqual(sorted(results), [0, 1, 2, 3, 4])
+        stats = work_queue.stats()
+        self.assertEqual(stats['submitted'], 5)
+        self.assertEqual(stats['completed'], 5)
+        self.assertEqual(stats['depth'], 0)
+
+    def test_full_queue_rejects_jobs(self):
+        work_queue = WorkQueue("test", workers=1, max_size=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        self.assertTrue(work_queue.submit(block))
+        started.wait(5)
+        self.assertTrue(work_queue.submit(block))  # Waits in the queue
+        self.assertFalse(work_queue.submit(block))
+
+        stats = work_queue.stats()
+        self.assertEqual(stats['depth'], 1)
+        self.assertEqual(stats['busy'], 1)
+        self.assertEqual(stats['rejected'], 1)
+
+        release.set()
+        self.assertTrue(work_queue.shutdown(timeout=5))
+
+    def test_failed_jobs_are_counted_and_do_not_stop_workers(self):
+        work_queue = WorkQueue("test", workers=1, max_size=10)
+        results = []
+
+        work_queue.submit(lambda: 1 / 0)
+        work_queue.submit(results.append, 'after')
+        work_queue.shutdown(timeout=5)
+
+        self.assertEqual(results, ['after'])
+        self.assertEqual(work_queue.stats()['failed'], 1)
+        self.assertEqual(work_queue.stats()['completed'], 1)
+
+    def test_shutdown_rejects_new_jobs(self):
+        work_queue = WorkQueue("test", workers=1, max_size=10)
+        work_queue.shutdown(timeout=5)
+
+        self.assertFalse(work_queue.submit(print))
+
+    def test_shutdown_times_out_and_drops_queued_jobs(self):
+        work_queue = WorkQueue("test", workers=1, max_size=10)
+        release = threading.Event()
+        results = []
+        work_queue.submit(release.wait, 5)
+        work_queue.submit(results.append, 'dropped')
+
+        start = time.monotonic()
+        self.assertFalse(work_queue.shutdown(timeout=0.1))
+        self.assertLess(time.monotonic() - start, 2)
+        release.set()
+
+        self.assertEqual(results, [])
+
+
+class TestAsyncWorkQueue(unittest.TestCase):
+
+    def test_jobs_run_and_drain(self):
+        async def scenario():
+            work_queue = AsyncWorkQueue("test", workers=2, max_size=10)
+            results = []
+
+            async def job(i):
+                await asyncio.sleep(0.01)
+                results.append(i)
+
+            for i in range(5):
+                self.assertTrue(work_queue.submit(job, i))
+            self.assertTrue(await work_queue.shutdown(timeout=5))
+            self.assertFalse(work_queue.submit(job, 99))
+            return results, work_queue.stats()
+
+        results, stats = asyncio.run(scenario())
+
+        self.assertEqual(sorted(results), [0, 1, 2, 3, 4])
+        self.assertEqual(stats['completed'], 5)
+        self.assertEqual(stats['rejected'], 1)
+
+    def test_full_queue_rejects_jobs(self):
+        async def scenario():
+            work_queue = AsyncWorkQueue("test", workers=1, max_size=1)
+            release = asyncio.Event()
+
+            self.assertTrue(work_queue.submit(release.wait))
+            await asyncio.sleep(0)  # Let the worker pick up the first job
+            self.assertTrue(work_queue.submit(release.wait))
+            self.assertFalse(work_queue.submit(release.wait))
+
+            release.set()
+            self.assertTrue(await work_queue.shutdown(timeout=5))
+            return work_queue.stats()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['max_depth'], 1)
+
+
+class TestMessageEventQueueing(unittest.TestCase):
+
+    def setUp(self):
+        self.event = {'user': 'U12345678', 'text': 'get tenant settings', 'channel': 'C1'}
+
+    @patch.object(slack_service_module, 'message_work_queue')
+    def test_message_events_are_queued(self, mock_work_queue):
+        mock_work_queue.submit.return_value = True
+        say, client = MagicMock(), MagicMock()
+
+        slack_service_module.handle_message_events(self.event, say, client)
+
+        mock_work_queue.submit.assert_called_once_with(
+            slack_service_module.process_message_event, self.event, say, client
+        )
+        say.assert_not_called()
+
+    @patch.object(slack_service_module, 'message_work_queue')
+    def test_user_is_told_to_retry_when_queue_is_full(self, mock_work_queue):
+        mock_work_queue.submit.return_value = False
+        say = MagicMock()
+
+        slack_service_module.handle_message_events(self.event, say, MagicMock())
+
+        say.assert_called_once_with(text=MESSAGE_QUEUE_BUSY_TEXT)
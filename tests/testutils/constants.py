@@ -7,4 +7,7 @@ AUTH0_BASE_URL = os.getenv("AUTH0_BASE_URL")
 AUTH0_CLIENT_ID = os.getenv("AUTH0_CLIENT_ID")
 AUTH0_CLIENT_SECRET = os.getenv("AUTH0_CLIENT_SECRET")
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-
+AUTH0_TOKEN_URL_TEMPLATE = 'https://{auth0_base_url}/oauth/token'
+AUTH0_API_AUDIENCE_TEMPLATE = 'https://{auth0_base_url}/api/v2/'
+AUTH0_API_BASE_URL_TEMPLATE = 'https://{auth0_base_url}/api/v2/{endpoint}'
+AUTHORIZATION_HEADER_TEMPLATE = 'Bearer {token}'
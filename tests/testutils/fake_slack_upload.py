@@ -0,0 +1,32 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSlackUpload(BaseHTTPRequestHandler):
+    """Stand-in for the upload URL returned by files.getUploadURLExternal."""
+
+    def do_POST(self):
+        length = self.headers['Content-Length']
+        self.server.uploads.append((self.path, length, self.rfile.read(int(length))))
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_upload_server(test_case):
+    """Serve FakeSlackUpload until the test ends; received uploads collect in ``server.uploads``."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSlackUpload)
+    server.uploads = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+    return server
+
+
+def upload_ticket(server, file_id='F1'):
+    """The files.getUploadURLExternal response pointing at the fake server."""
+    host, port = server.server_address
+    return {'upload_url': f'http://{host}:{port}/upload/{file_id}', 'file_id': file_id}
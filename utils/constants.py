@@ -1,3 +1,5 @@
+import os
+
 # Dialogflow constants
 DIALOGFLOW_PROJECT_ID = "querybot-auth0"
 DIALOGFLOW_LANGUAGE_CODE_EN = "en"
@@ -14,8 +16,49 @@ GET_ULP_TEMPLATE_INTENT = "GetULPTemplateIntent"
 
 SEARCH_USERS_BY_EMAIL_INTENT = "SearchUsersByEmailIntent"
 EMAIL_PARAM = "email"
+SEARCH_USERS_INTENT = "SearchUsersIntent"
+SEARCH_QUERY_PARAM = "query"  # Lucene query syntax of the users endpoint's q parameter
+EXPORT_FORMAT_PARAM = "export-format"  # "csv" (default) or "ndjson"
+EXPORT_USERS_INTENT = "ExportUsersIntent"
+BATCH_USER_LOOKUP_INTENT = "BatchUserLookupIntent"
+USER_IDS_PARAM = "user-ids"
+EMAILS_PARAM = "emails"
 DATE_PERIOD_PARAM = "date-period"
 
+# Dialogflow intent detection cache
+DIALOGFLOW_CACHE_SIZE = int(os.getenv("DIALOGFLOW_CACHE_SIZE", "2048"))  # Utterances kept in memory
+DIALOGFLOW_CACHE_TTL = float(os.getenv("DIALOGFLOW_CACHE_TTL", "3600"))  # Seconds before asking Dialogflow again
+# Intents resolving relative dates ("last week") must be detected fresh every time
+DIALOGFLOW_CACHE_EXCLUDED_INTENTS = frozenset({GET_STATS_INTENT})
+
+# Universal Login template formatting cache, keyed by a hash of the raw template
+ULP_FORMAT_CACHE_SIZE = int(os.getenv("ULP_FORMAT_CACHE_SIZE", "64"))  # Formatted templates kept in memory
+ULP_FORMAT_CACHE_MONGO_ENABLED = os.getenv("ULP_FORMAT_CACHE_MONGO_ENABLED", "false").lower() == "true"  # Share formatted templates across replicas
+ULP_FORMAT_CACHE_MONGO_TTL = int(os.getenv("ULP_FORMAT_CACHE_MONGO_TTL", str(30 * 24 * 3600)))  # Seconds a stored template outlives its last write
+ULP_FORMATTER_BACKEND = os.getenv("ULP_FORMATTER_BACKEND", "streaming")  # "streaming" or "soup" (BeautifulSoup + cssutils)
+
+# Local fast-path intent detection, tried before Dialogflow
+LOCAL_INTENT_ENABLED = os.getenv("LOCAL_INTENT_ENABLED", "true").lower() == "true"
+LOCAL_INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_INTENT_CONFIDENCE_THRESHOLD", "0.9"))
+LOCAL_INTENT_FULFILLMENT_TEXTS = {
+    GET_USER_BY_ID_INTENT: "Here are the details for that user:",
+    SEARCH_USERS_BY_EMAIL_INTENT: "Here are the users matching that email:",
+    SEARCH_USERS_INTENT: "Here are the users matching your search:",
+    EXPORT_USERS_INTENT: "I've asked Auth0 to export all your users.",
+    BATCH_USER_LOOKUP_INTENT: "Here are the users you asked about:",
+    GET_TENANT_SETTINGS_INTENT: "Here are your tenant settings:",
+    GET_ACTIVE_USERS_COUNT_INTENT: "Here is your active users count:",
+    GET_STATS_INTENT: "Here are your daily stats:",
+    GET_ULP_TEMPLATE_INTENT: "Here is your Universal Login page template:",
+}
+
+# Compound messages ("tenant settings and MAU count", or one query per line),
+# answered by running their intent handlers concurrently and replying once
+MULTI_INTENT_ENABLED = os.getenv("MULTI_INTENT_ENABLED", "true").lower() == "true"
+MULTI_INTENT_MAX_QUERIES = int(os.getenv("MULTI_INTENT_MAX_QUERIES", "5"))  # Queries answered from one message
+MULTI_INTENT_WORKERS = int(os.getenv("MULTI_INTENT_WORKERS", "8"))  # Handlers run concurrently across all messages
+MULTI_INTENT_FILE_TEXT = "Here are the answers to your {count} questions:"
+
 # String constants
 MULTILINE_CODE_DELIMITER = "```"
 NEWLINE_DELIMITER = "\n"
@@ -23,6 +66,21 @@ NO_DATA_MESSAGE = "Unfortunately, we couldn't find any data on this."
 
 # Slack constants
 MAX_MESSAGE_LENGTH = 3800 # there's a limit for 4000, reduce a little to account for initial fulfilment text
+SLACK_ASYNC_MODE_ENV_VAR = "SLACK_ASYNC_MODE"  # "true" serves events through AsyncApp end-to-end
+UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv("UPLOAD_SPOOL_MAX_MEMORY", str(1024 * 1024)))  # Bytes of an upload kept in memory before spilling to disk
+DEFAULT_UPLOAD_FILENAME = "response.txt"  # Name of uploaded replies whose handler didn't name the file
+
+# Background processing of message events
+MESSAGE_QUEUE_SIZE = int(os.getenv("MESSAGE_QUEUE_SIZE", "100"))  # Events waiting for a worker before new ones are turned away
+MESSAGE_WORKERS = int(os.getenv("MESSAGE_WORKERS", "8"))  # Messages processed concurrently
+MESSAGE_QUEUE_DRAIN_TIMEOUT = float(os.getenv("MESSAGE_QUEUE_DRAIN_TIMEOUT", "25"))  # Seconds to finish queued work on shutdown
+MESSAGE_QUEUE_BUSY_TEXT = "I'm handling a lot of requests right now. Please try again in a moment."
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # Bearer token GET /slack/metrics requires; unset disables the endpoint
+
+# Deduplication of Slack event retries
+SLACK_EVENT_DEDUP_TTL = float(os.getenv("SLACK_EVENT_DEDUP_TTL", "900"))  # Slack retries for up to ~5 minutes
+SLACK_EVENT_DEDUP_CACHE_SIZE = int(os.getenv("SLACK_EVENT_DEDUP_CACHE_SIZE", "10000"))  # Event keys kept in memory
+SLACK_EVENT_DEDUP_MONGO_ENABLED = os.getenv("SLACK_EVENT_DEDUP_MONGO_ENABLED", "false").lower() == "true"  # Share seen events across replicas
 
 # Text response when calling /help
 HELP_TEXT = """
@@ -46,7 +104,7 @@ Simply send a message to the bot with your query in plain English. This bot uses
      - `"Get daily stats from Jan 1 to Jan 7."`
      - `"Show stats for last week."`
      - `"Retrieve daily statistics since last Monday."`
-   - *Note:* Supports unstructured and relative dates like "yesterday," "last month," etc.
+   - *Note:* Supports unstructured and relative dates like "yesterday," "last month," etc. Replies with totals, averages, peaks, week-over-week changes and unusual days per metric, plus a per-day CSV for ranges over a week.
 
 3. *Get Tenant Settings*
    - *Description:* Retrieve your tenant's settings.
@@ -72,10 +130,29 @@ Simply send a message to the bot with your query in plain English. This bot uses
      - `"Could you give me my tenant's Universal Login page template?"`
      - `"Fetch ULP template"`
 
+7. *Search Users*
+   - *Description:* Export every user matching a <https://auth0.com/docs/manage-users/user-search/user-search-query-syntax|user search query> as a CSV file, or NDJSON with `as ndjson`. Auth0 returns at most 1000 users per search.
+   - *Usage Example:*
+     - Search users where `identities.connection:"Username-Password-Authentication" AND last_login:[2024-10-01 TO *]`
+     - Export users matching `email.domain:"example.com"` as ndjson
+   - *Note:* Put the query in backticks so Slack leaves characters such as `_` alone.
+
+8. *Export All Users*
+   - *Description:* Starts an Auth0 export job and posts the gzipped NDJSON file here when it is ready; you can keep asking other questions in the meantime.
+   - *Usage Example:*
+     - `"Export all users"`
+
+9. *Look Up Many Users*
+   - *Description:* Paste several user IDs and/or emails, on one line or one per line, to get them back in one table, or a CSV file for long lists.
+   - *Usage Example:*
+     - `"Look up auth0|abc123, auth0|def456 and jane.doe@example.com"`
+
 ---
 
 *Note:* Replace `<user_id>` and `<email>` with the actual user ID and email address.
 
+*Tip:* Ask for several things at once, e.g. `"Show tenant settings and active users"`, or send one query per line, and they will be answered together in one reply.
+
 For more information and technical details, visit our <https://github.com/nicholas-gcc/querybot-for-auth0|GitHub repository>.
 """
 
@@ -93,7 +170,103 @@ AUTH0_API_AUDIENCE_TEMPLATE = 'https://{auth0_base_url}/api/v2/'
 AUTH0_API_BASE_URL_TEMPLATE = 'https://{auth0_base_url}/api/v2/{endpoint}'
 AUTHORIZATION_HEADER_TEMPLATE = 'Bearer {token}'
 
+# Auth0 HTTP connection pool configs
+AUTH0_HTTP_POOL_SIZE = int(os.getenv("AUTH0_HTTP_POOL_SIZE", "10"))  # Connections kept per tenant
+AUTH0_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("AUTH0_HTTP_KEEPALIVE_EXPIRY", "60"))  # Idle seconds before pooled connections are closed
+AUTH0_HTTP2_ENABLED = os.getenv("AUTH0_HTTP2_ENABLED", "true").lower() == "true"  # Async client only; needs the 'h2' package from httpx[http2]
+AUTH0_HTTP_CONNECT_TIMEOUT = float(os.getenv("AUTH0_HTTP_CONNECT_TIMEOUT", "3.05"))  # Seconds to establish a connection
+AUTH0_HTTP_READ_TIMEOUT = float(os.getenv("AUTH0_HTTP_READ_TIMEOUT", "10"))  # Seconds to wait for response data
+AUTH0_TOKEN_REFRESH_SKEW = float(os.getenv("AUTH0_TOKEN_REFRESH_SKEW", "60"))  # Seconds before expiry to refresh in the background
+
+# Auth0 Management API rate limiting, per tenant. The burst and rate are only
+# used until the first response tells us the tenant's real X-RateLimit-* budget
+AUTH0_RATE_LIMIT_BURST = int(os.getenv("AUTH0_RATE_LIMIT_BURST", "10"))  # Requests allowed back to back
+AUTH0_RATE_LIMIT_RATE = float(os.getenv("AUTH0_RATE_LIMIT_RATE", "2"))  # Requests per second once the burst is spent
+AUTH0_RATE_LIMIT_MAX_WAIT = float(os.getenv("AUTH0_RATE_LIMIT_MAX_WAIT", "5"))  # Seconds a request may queue before it is shed
+AUTH0_RATE_LIMIT_MAX_RETRIES = int(os.getenv("AUTH0_RATE_LIMIT_MAX_RETRIES", "2"))  # Retries after a 429
+AUTH0_RATE_LIMIT_DEFAULT_RETRY_AFTER = 1.0  # Seconds to back off when a 429 carries no Retry-After
+
+# Auth0 retries and circuit breaking, per tenant
+AUTH0_RETRY_MAX_RETRIES = int(os.getenv("AUTH0_RETRY_MAX_RETRIES", "2"))  # Retries of a GET after a network error or 5xx
+AUTH0_RETRY_BASE_DELAY = float(os.getenv("AUTH0_RETRY_BASE_DELAY", "0.2"))  # Seconds; doubles per retry, with full jitter
+AUTH0_RETRY_MAX_DELAY = float(os.getenv("AUTH0_RETRY_MAX_DELAY", "2"))  # Cap on a single backoff in seconds
+AUTH0_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AUTH0_CIRCUIT_FAILURE_THRESHOLD", "5"))  # Consecutive failures before failing fast
+AUTH0_CIRCUIT_RESET_TIMEOUT = float(os.getenv("AUTH0_CIRCUIT_RESET_TIMEOUT", "30"))  # Seconds before a probe request is let through
+
+# Auth0 Management API response cache, shared by every user of a tenant
+AUTH0_RESPONSE_CACHE_MAX_BYTES = int(os.getenv("AUTH0_RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))  # Response bodies kept in memory
+AUTH0_RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("AUTH0_RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))  # Larger bodies are not cached
+DAILY_STATS_ENDPOINT = "stats/daily"
+# Seconds a response is served without asking Auth0; endpoints not listed are never cached
+AUTH0_RESPONSE_CACHE_TTLS = {
+    "tenants/settings": float(os.getenv("AUTH0_CACHE_TTL_TENANT_SETTINGS", "300")),
+    "branding/templates/universal-login": float(os.getenv("AUTH0_CACHE_TTL_ULP_TEMPLATE", "300")),
+    "stats/active-users": float(os.getenv("AUTH0_CACHE_TTL_ACTIVE_USERS", "900")),
+    # Ranges that end before today never change and are kept until evicted
+    DAILY_STATS_ENDPOINT: float(os.getenv("AUTH0_CACHE_TTL_DAILY_STATS", "300")),
+}
+
+# Auth0 Management API pagination
+AUTH0_PAGE_SIZE = int(os.getenv("AUTH0_PAGE_SIZE", "100"))  # Items per page; 100 is Auth0's maximum
+AUTH0_PAGE_PREFETCH_WORKERS = int(os.getenv("AUTH0_PAGE_PREFETCH_WORKERS", "4"))  # Next pages fetched in the background across all searches
+AUTH0_USER_SEARCH_MAX_RESULTS = 1000  # Auth0 returns at most 1000 users for a search query
+USER_SEARCH_CSV_FIELDS = (
+    "user_id", "email", "name", "connection", "created_at", "last_login", "logins_count", "email_verified", "blocked",
+)
+USER_SEARCH_FILENAME = "users.{export_format}"
+
+# Batch lookups of the user IDs and emails pasted in one message
+BATCH_LOOKUP_MAX_USERS = int(os.getenv("BATCH_LOOKUP_MAX_USERS", "100"))  # Identifiers looked up from one message
+BATCH_LOOKUP_QUERY_CHUNK = int(os.getenv("BATCH_LOOKUP_QUERY_CHUNK", "50"))  # Identifiers folded into one search query
+BATCH_LOOKUP_CONCURRENCY = int(os.getenv("BATCH_LOOKUP_CONCURRENCY", "4"))  # Requests in flight for one lookup
+BATCH_LOOKUP_FIELDS = (
+    "lookup", "found", "user_id", "email", "name", "connection", "created_at", "last_login", "logins_count", "blocked",
+)
+BATCH_LOOKUP_TABLE_FIELDS = ("lookup", "found", "user_id", "email", "last_login", "logins_count")  # Columns of the inline reply
+BATCH_LOOKUP_FILENAME = "user-lookup.csv"
+
+# Daily stats analytics
+STATS_METRICS = ("logins", "signups", "leaked_passwords")  # Counters of the stats/daily records
+STATS_ROLLING_WINDOW = int(os.getenv("STATS_ROLLING_WINDOW", "7"))  # Days in rolling means and anomaly baselines
+STATS_ANOMALY_THRESHOLD = float(os.getenv("STATS_ANOMALY_THRESHOLD", "3"))  # Standard deviations from the baseline flagged as anomalies
+STATS_CSV_MIN_DAYS = int(os.getenv("STATS_CSV_MIN_DAYS", "8"))  # Days of data from which the per-day CSV is attached; 0 never attaches it
+STATS_STORE_MONGO_ENABLED = os.getenv("STATS_STORE_MONGO_ENABLED", "false").lower() == "true"  # Keep past days in MongoDB and fetch only missing ones
+STATS_CSV_FILENAME = "daily-stats.csv"
+STATS_SUMMARY_FIELDS = ("metric", "total", "daily_avg", "peak", "peak_date", "last_7d", "wow_change", "anomalies")
+
+# Bulk user exports through the Auth0 jobs API, polled in the background
+USERS_EXPORT_ENDPOINT = "jobs/users-exports"
+EXPORT_JOB_POLL_WORKERS = int(os.getenv("EXPORT_JOB_POLL_WORKERS", "4"))  # Job checks and downloads run concurrently
+EXPORT_JOB_MIN_POLL_INTERVAL = float(os.getenv("EXPORT_JOB_MIN_POLL_INTERVAL", "2"))  # Seconds before the first check
+EXPORT_JOB_MAX_POLL_INTERVAL = float(os.getenv("EXPORT_JOB_MAX_POLL_INTERVAL", "30"))  # Cap on the seconds between checks
+EXPORT_JOB_TIMEOUT = float(os.getenv("EXPORT_JOB_TIMEOUT", "3600"))  # Seconds before giving up on a job
+EXPORT_DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read from the export file at a time
+USERS_EXPORT_FILENAME = "users-export.ndjson.gz"
+USERS_EXPORT_STARTED_TEXT = "I'll post the file here when the export is ready."
+USERS_EXPORT_FAILED_TEXT = "The user export didn't finish: {reason}"
+
 # Mongo configs
 MONGODB_URI_ENV_VAR = "MONGODB_URI"
 MONGODB_DB_NAME = "auth0-querybot"
-M2M_CREDENTIALS_COLLECTION = "querybot-m2m-credentials"
\ No newline at end of file
+M2M_CREDENTIALS_COLLECTION = "querybot-m2m-credentials"
+SLACK_USER_ID_INDEX_NAME = "slack_user_id_unique"
+# Fields read back from the credentials collection
+M2M_CREDENTIALS_PROJECTION = {
+    "_id": 0,
+    "slack_user_id": 1,
+    "auth0_base_url": 1,
+    "auth0_client_id": 1,
+    "auth0_client_secret": 1,
+    "access_token": 1,
+    "token_expires_at": 1,
+}
+M2M_CREDENTIALS_CACHE_SIZE = int(os.getenv("M2M_CREDENTIALS_CACHE_SIZE", "1024"))  # Users kept in memory
+M2M_CREDENTIALS_CACHE_TTL = float(os.getenv("M2M_CREDENTIALS_CACHE_TTL", "300"))  # Seconds before re-reading Mongo
+SLACK_EVENTS_COLLECTION = "querybot-slack-events"
+SLACK_EVENTS_TTL_INDEX_NAME = "received_at_ttl"
+FORMATTED_TEMPLATES_COLLECTION = "querybot-formatted-templates"
+FORMATTED_TEMPLATES_TTL_INDEX_NAME = "stored_at_ttl"
+DAILY_STATS_COLLECTION = "querybot-daily-stats"
+DAILY_STATS_INDEX_NAME = "tenant_date_unique"
+# Requires a replica set; keeps the credentials cache coherent across replicas
+M2M_CREDENTIALS_CHANGE_STREAM_ENABLED = os.getenv("M2M_CREDENTIALS_CHANGE_STREAM_ENABLED", "false").lower() == "true"
\ No newline at end of file
@@ -0,0 +1,54 @@
+import json
+import tempfile
+from typing import IO, Any, Union
+
+from .constants import MAX_MESSAGE_LENGTH, UPLOAD_SPOOL_MAX_MEMORY
+
+# Characters gathered from the encoder before each write to the spool
+_WRITE_BATCH_SIZE = 64 * 1024
+
+
+def stream_json(
+    res: Any, limit: int = MAX_MESSAGE_LENGTH, indent: int = 4
+) -> Union[str, IO[bytes]]:
+    """
+    Pretty print JSON incrementally, keeping it in memory only if it fits in a message.
+
+    The encoder output is collected until it passes ``limit``; payloads that fit are
+    returned as a string. Longer ones are written chunk by chunk to a spooled
+    temporary file, which stays in memory up to UPLOAD_SPOOL_MAX_MEMORY bytes and
+    then moves to disk, so the full document never exists as one string.
+
+    Args:
+        res (Any): The JSON-serializable data.
+        limit (int): Longest output, in characters, returned as a string.
+        indent (int): The indentation level.
+
+    Returns:
+        Union[str, IO[bytes]]: The formatted JSON, or a binary file positioned at its
+        start when it is longer than the limit. The caller closes the file.
+    """
+    chunks = json.JSONEncoder(indent=indent).iterencode(res)
+    head = []
+    length = 0
+    for chunk in chunks:
+        head.append(chunk)
+        length += len(chunk)
+        if length > limit:
+            break
+    else:
+        return "".join(head)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    batch = head
+    batch_size = length
+    for chunk in chunks:
+        batch.append(chunk)
+        batch_size += len(chunk)
+        if batch_size >= _WRITE_BATCH_SIZE:
+            spool.write("".join(batch).encode("utf-8"))
+            batch = []
+            batch_size = 0
+    spool.write("".join(batch).encode("utf-8"))
+    spool.seek(0)
+    return spool
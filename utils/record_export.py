@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+import tempfile
+from typing import IO, Callable, Iterable, Sequence, Tuple
+
+from .constants import UPLOAD_SPOOL_MAX_MEMORY
+
+CSV_FORMAT = "csv"
+NDJSON_FORMAT = "ndjson"
+EXPORT_FORMATS = (CSV_FORMAT, NDJSON_FORMAT)
+
+
+def spool_records(
+    records: Iterable[dict],
+    export_format: str = CSV_FORMAT,
+    fields: Sequence[str] = (),
+    to_row: Callable[[dict], dict] = None,
+) -> Tuple[IO[bytes], int]:
+    """
+    Write records to a spooled temporary file as they are produced.
+
+    The file stays in memory up to UPLOAD_SPOOL_MAX_MEMORY bytes and then moves to
+    disk, so exporting many records never holds them all at once.
+
+    Args:
+        records (Iterable[dict]): The records, e.g. from a paginator.
+        export_format (str): "csv" for one row per record with ``fields`` as the
+            header, or "ndjson" for one JSON document per line.
+        fields (Sequence[str]): The CSV columns; other keys are dropped.
+        to_row (Callable[[dict], dict]): Builds a CSV row from a record; defaults to
+            the record itself.
+
+    Returns:
+        Tuple[IO[bytes], int]: The binary file positioned at its start, and the
+        number of records written. The caller closes the file.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{export_format}'.")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    count = 0
+    try:
+        if export_format == CSV_FORMAT:
+            writer = csv.DictWriter(text, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                writer.writerow(to_row(record) if to_row else record)
+                count += 1
+        else:
+            for record in records:
+                text.write(json.dumps(record, ensure_ascii=False))
+                text.write("\n")
+                count += 1
+        text.flush()
+    except BaseException:
+        text.close()
+        raise
+    # Hand back the binary file without closing it along with the wrapper
+    text.detach()
+    spool.seek(0)
+    return spool, count
+
+
+def format_table(rows: Sequence[dict], fields: Sequence[str]) -> str:
+    """
+    Lay records out as a plain-text table with aligned columns.
+
+    Args:
+        rows (Sequence[dict]): The records.
+        fields (Sequence[str]): The columns, in order; missing values are left blank.
+
+    Returns:
+        str: The header, a rule and one line per record.
+    """
+    cells = [[str(field) for field in fields]] + [
+        ["" if row.get(field) is None else str(row.get(field)) for field in fields]
+        for row in rows
+    ]
+    widths = [max(len(line[column]) for line in cells) for column in range(len(fields))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in cells]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
@@ -1,44 +1,61 @@
 import re
 
+# A code span is a ```block``` (which may span lines) or an `inline` segment
+CODE_SPAN = r'```.*?```|`[^`]+`'
+
+
+def _emphasis(marker, name):
+    # Emphasis stays on one line, but may wrap code spans. Each step takes a whole
+    # code span or one character, and the lookahead and backreference stop a span
+    # from being split on backtracking, so its contents never close the emphasis
+    step = rf'(?=(?P<{name}_step>{CODE_SPAN}|[^\n]))(?P={name}_step)'
+    return rf'{marker}(?P<{name}>(?:{step})*?){marker}'
+
+
+EMPHASIS = '|'.join(
+    _emphasis(marker, name)
+    for marker, name in (('_', 'underscore'), (r'\*', 'asterisk'), ('~', 'tilde'))
+)
+
+MARKUP_PATTERN = re.compile(
+    rf'(?P<code>{CODE_SPAN})'
+    r'|<[^|>]+\|(?P<label>[^>]+)>'
+    r'|<(?P<url>[^|>]+)>'
+    rf'|{EMPHASIS}',
+    re.DOTALL,
+)
+MARKUP_CHARACTERS = frozenset('`<_*~')
+
+
+def _replace_markup(match):
+    if match.group('code') is not None:
+        return match.group('code')
+    if match.group('url') is not None:
+        return match.group('url')
+    # Link labels and emphasis can themselves contain markup
+    return _strip_markup(match.group(match.lastgroup))
+
+
+def _strip_markup(text):
+    if MARKUP_CHARACTERS.isdisjoint(text):
+        return text
+    return MARKUP_PATTERN.sub(_replace_markup, text)
+
+
 class StringUtils(object):
-    
+
     @staticmethod
     def remove_format(text):
-        # Replace code blocks with placeholders
-        code_block_pattern = re.compile(r'```(.*?)```', re.DOTALL)
-        code_blocks = []
-        def code_block_replacer(match):
-            code_blocks.append(match.group(0))
-            return f"CODEBLOCK_{len(code_blocks)-1}"
-        text = code_block_pattern.sub(code_block_replacer, text)
-
-        # Replace inline code segments with placeholders
-        inline_code_pattern = re.compile(r'`([^`]+)`')
-        inline_codes = []
-        def inline_code_replacer(match):
-            inline_codes.append(match.group(0))
-            return f"INLINECODE_{len(inline_codes)-1}"
-        text = inline_code_pattern.sub(inline_code_replacer, text)
-
-        # Remove wrapping underscores, asterisks, and tildes
-        text = re.sub(r'_(.*?)_', r'\1', text)
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
-        text = re.sub(r'~(.*?)~', r'\1', text)
-
-        # Process links
-        # Replace <URL|DISPLAY_TEXT> with DISPLAY_TEXT
-        text = re.sub(r'<[^|>]+\|([^>]+)>', r'\1', text)
-        # Replace <URL> with URL
-        text = re.sub(r'<([^|>]+)>', r'\1', text)
-
-        # Restore inline code segments
-        for i, code in enumerate(inline_codes):
-            placeholder = f"INLINECODE_{i}"
-            text = text.replace(placeholder, code)
-
-        # Restore code blocks
-        for i, code in enumerate(code_blocks):
-            placeholder = f"CODEBLOCK_{i}"
-            text = text.replace(placeholder, code)
+        """
+        Remove Slack markdown from a message in a single scan, leaving code spans untouched.
 
-        return text
+        Emphasis markers (_, *, ~) are unwrapped, <URL|DISPLAY_TEXT> links become
+        DISPLAY_TEXT and <URL> links become URL.
+
+        Args:
+            text (str): The message text from Slack.
+
+        Returns:
+            str: The message without Slack formatting.
+        """
+        return _strip_markup(text)